@@ -0,0 +1,54 @@
+"""
+Post-processing of the beam loads of a dynamic history of the simple HALE aircraft template with the batched load
+recovery of :mod:`sharpy.structure.utils.loadrecovery` and with the per time step ``cbeam3_loads`` of the xbeam
+library.
+
+Run as a script to print the time of both implementations::
+
+    python benchmarks/bench_beamloads.py
+"""
+import copy
+import time
+
+import common
+
+num_steps = 200
+
+
+class BeamLoads(object):
+
+    def setup(self):
+        self.route = common.TemporaryRoute()
+        self.settings = common.generated_case('cases.coupled.simple_HALE.generate_hale', 'simple_HALE.sharpy',
+                                              self.route.route)
+        self.data = common.run_case(self.settings, ['BeamLoader', 'AerogridLoader', 'StaticTrim'])
+        # a long history made of copies of the trimmed state
+        structure = self.data.structure
+        structure.timestep_info = [structure.timestep_info[-1].copy() for _ in range(num_steps)]
+
+    def teardown(self):
+        self.route.clean()
+
+    def run_loads(self, xbeam_loads):
+        import sharpy.postproc.beamloads as beamloads
+
+        data = copy.copy(self.data)
+        postproc = beamloads.BeamLoads()
+        postproc.initialise(data, {'csv_output': False, 'xbeam_loads': xbeam_loads})
+        postproc.run(online=False)
+
+    def time_batched(self):
+        self.run_loads(False)
+
+    def time_xbeam(self):
+        self.run_loads(True)
+
+
+if __name__ == '__main__':
+    suite = BeamLoads()
+    suite.setup()
+    for name, xbeam_loads in [('batched', False), ('xbeam', True)]:
+        start = time.perf_counter()
+        suite.run_loads(xbeam_loads)
+        print('%-8s %8.4f s for %u time steps' % (name, time.perf_counter() - start, num_steps))
+    suite.teardown()
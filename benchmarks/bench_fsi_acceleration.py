@@ -0,0 +1,45 @@
+"""
+FSI iterations of the dynamic coupled solver on the simple HALE aircraft template with constant relaxation, Aitken
+relaxation and IQN-ILS (see :mod:`sharpy.utils.fsi_acceleration`).
+
+The ``track_*`` benchmarks store the number of FSI iterations of each accelerator. Run as a script to print them::
+
+    python benchmarks/bench_fsi_acceleration.py
+"""
+import common
+
+accelerators = {'Constant': {'fsi_accelerator': 'Constant'},
+                'Aitken': {'fsi_accelerator': 'Aitken'},
+                'IQN-ILS': {'fsi_accelerator': 'IQN-ILS', 'fsi_reuse_steps': 3}}
+
+
+class FSIAcceleration(common.HALEDynamic):
+
+    num_steps = 5
+
+    def time_constant(self):
+        self.run_dynamic(accelerators['Constant'])
+
+    def time_aitken(self):
+        self.run_dynamic(accelerators['Aitken'])
+
+    def time_iqn_ils(self):
+        self.run_dynamic(accelerators['IQN-ILS'])
+
+    def track_fsi_iterations_constant(self):
+        return self.run_dynamic(accelerators['Constant'])
+
+    def track_fsi_iterations_aitken(self):
+        return self.run_dynamic(accelerators['Aitken'])
+
+    def track_fsi_iterations_iqn_ils(self):
+        return self.run_dynamic(accelerators['IQN-ILS'])
+
+
+if __name__ == '__main__':
+    suite = FSIAcceleration()
+    suite.setup()
+    for accelerator, accelerator_settings in accelerators.items():
+        print('%-10s %4u FSI iterations in %u time steps' % (accelerator, suite.run_dynamic(accelerator_settings),
+                                                             suite.num_steps))
+    suite.teardown()
@@ -0,0 +1,54 @@
+"""
+Grid and velocity field generators evaluated on the aerodynamic lattice of a wing and on a flow field box
+"""
+import numpy as np
+
+
+
+class VelocityGenerators(object):
+
+    def setup(self):
+        import sharpy.generators
+        import sharpy.utils.generator_interface as gen_interface
+
+        # two surfaces of 16 x 32 panels
+        x, y = np.meshgrid(np.linspace(0., 1.8, 17), np.linspace(0., 6., 33), indexing='ij')
+        self.zeta = []
+        for sign in [1., -1.]:
+            self.zeta.append(np.array([x, sign * y, 0.05 * x]))
+        self.uext = [np.zeros_like(zeta) for zeta in self.zeta]
+        self.params = {'zeta': self.zeta, 'override': True, 't': 0.5, 'ts': 5, 'dt': 0.1,
+                       'for_pos': np.zeros((6,))}
+
+        self.steady = gen_interface.generator_from_string('SteadyVelocityField')()
+        self.steady.initialise({'u_inf': 10., 'u_inf_direction': [1., 0., 0.]})
+
+        self.shear = gen_interface.generator_from_string('ShearVelocityField')()
+        self.shear.initialise({'u_inf': 10., 'u_inf_direction': [1., 0., 0.], 'shear_direction': [0., 0., 1.],
+                               'shear_exp': 0.2, 'h_ref': 2., 'h_corr': 1.})
+
+        self.gust = gen_interface.generator_from_string('GustVelocityField')()
+        self.gust.initialise({'u_inf': 10., 'u_inf_direction': [1., 0., 0.], 'gust_shape': '1-cos',
+                              'gust_parameters': {'gust_length': 5., 'gust_intensity': 0.1},
+                              'offset': 1., 'relative_motion': True, 'print_info': False})
+
+        self.gridbox = gen_interface.generator_from_string('GridBox')()
+        self.gridbox.initialise({'coords_0': [-5., -10., -5.], 'coords_1': [15., 10., 5.],
+                                 'spacing': [0.5, 0.5, 0.5]})
+        _, grid = self.gridbox.generate({'for_pos': np.zeros((3,))})
+        self.points = np.concatenate([grid_z.reshape((3, -1)).T for grid_z in grid])
+
+    def time_steady(self):
+        self.steady.generate(self.params, self.uext)
+
+    def time_shear(self):
+        self.shear.generate(self.params, self.uext)
+
+    def time_gust(self):
+        self.gust.generate(self.params, self.uext)
+
+    def time_gridbox(self):
+        self.gridbox.generate({'for_pos': np.zeros((3,))})
+
+    def time_gust_at_points(self):
+        self.gust.generate_at_points(self.params, self.points)
@@ -0,0 +1,90 @@
+"""
+Goland wing: grid generation, force mapping, modal analysis, UVLM linearisation, frequency response, model
+reduction and one time step of the nonlinear dynamic coupled solver
+"""
+import copy
+
+import numpy as np
+
+import common
+from sharpy.utils.benchmark import repeat_setup
+
+
+def copy_loaded_state(suite):
+    suite.grid_data = copy.deepcopy(suite.loaded_data)
+
+
+def copy_static_state(suite):
+    suite.step_data = copy.deepcopy(suite.data)
+
+
+class Goland(object):
+
+    def setup(self):
+        self.route = common.TemporaryRoute()
+        self.ws, self.settings = common.goland_case(self.route.route)
+        self.loaded_data = common.run_case(self.settings, ['BeamLoader', 'AerogridLoader'])
+        self.data = common.run_case(self.settings, ['BeamLoader', 'AerogridLoader', 'StaticCoupled', 'Modal',
+                                                    'LinearAssembler'])
+
+        self.frequency = np.linspace(1e-3, 1., 50) * 2 * self.ws.u_inf / self.ws.c_ref
+        self.uvlm_ss = self.data.linear.linear_system.uvlm.ss
+
+    def teardown(self):
+        self.route.clean()
+
+    @repeat_setup(copy_loaded_state)
+    def time_grid_generation(self):
+        common.run_solver(self.grid_data, 'AerogridLoader')
+
+    def time_force_mapping(self):
+        import sharpy.aero.utils.mapping as mapping
+
+        tstep = self.data.structure.timestep_info[-1]
+        aero_tstep = self.data.aero.timestep_info[-1]
+        mapping.aero2struct_force_mapping(aero_tstep.forces,
+                                          self.data.aero.struct2aero_mapping,
+                                          aero_tstep.zeta,
+                                          tstep.pos,
+                                          tstep.psi,
+                                          self.data.structure.node_master_elem,
+                                          self.data.structure.connectivities,
+                                          tstep.cag())
+
+    def time_modal(self):
+        common.run_solver(self.data, 'Modal')
+
+    def time_uvlm_linearisation(self):
+        self.data.linear.linear_system.uvlm.assemble()
+
+    def time_linear_assembly(self):
+        common.run_solver(self.data, 'LinearAssembler')
+
+    def time_frequency_response(self):
+        self.data.linear.ss.freqresp(self.frequency)
+
+    def time_krylov_rom(self):
+        import sharpy.rom.krylov as krylov
+
+        rom = krylov.Krylov()
+        rom.initialise({'algorithm': 'mimo_rational_arnoldi',
+                        'r': 6,
+                        'frequency': [0.],
+                        'print_info': False})
+        rom.run(self.uvlm_ss)
+
+
+class GolandDynamic(object):
+
+    def setup(self):
+        self.route = common.TemporaryRoute()
+        self.ws, self.settings = common.goland_case(self.route.route, M=4, N=8)
+        self.data = common.run_case(self.settings, ['BeamLoader', 'AerogridLoader', 'StaticCoupled'])
+        self.step_settings = common.single_step(self.settings)
+
+    def teardown(self):
+        self.route.clean()
+
+    @repeat_setup(copy_static_state)
+    def time_dynamic_coupled_step(self):
+        common.run_solver(self.step_data, 'DynamicCoupled', self.step_settings)
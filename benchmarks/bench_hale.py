@@ -0,0 +1,32 @@
+"""
+Simple HALE aircraft template: trim and one time step of the nonlinear dynamic coupled solver
+"""
+import copy
+
+import common
+from sharpy.utils.benchmark import repeat_setup
+
+
+def copy_trimmed_state(suite):
+    suite.step_data = copy.deepcopy(suite.data)
+
+
+class HALE(object):
+
+    def setup(self):
+        self.route = common.TemporaryRoute()
+        self.settings = common.generated_case('cases.coupled.simple_HALE.generate_hale', 'simple_HALE.sharpy',
+                                              self.route.route)
+        self.data = common.run_case(self.settings, ['BeamLoader', 'AerogridLoader', 'StaticTrim'])
+        self.step_settings = common.single_step(self.settings)
+
+    def teardown(self):
+        self.route.clean()
+
+    @repeat_setup(copy_trimmed_state)
+    def time_dynamic_coupled_step(self):
+        common.run_solver(self.step_data, 'DynamicCoupled', self.step_settings)
+
+    @repeat_setup(copy_trimmed_state)
+    def time_beam_loads(self):
+        common.run_solver(self.step_data, 'BeamLoads', {'csv_output': False})
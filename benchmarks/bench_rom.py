@@ -0,0 +1,64 @@
+"""
+Model reduction and frequency response of random discrete-time state-space systems
+"""
+import warnings
+
+import numpy as np
+
+
+def sparse_system(n=1000, seed=36):
+    """Schur stable sparse state matrix with a random coupling pattern, as those of the sparse UVLM"""
+    import scipy.sparse as sparse
+    import sharpy.linear.src.libsparse as libsp
+
+    rng = np.random.default_rng(seed)
+    A = sparse.diags(np.linspace(-0.5, 0.9, n)) + 0.02 * sparse.random(n, n, density=5. / n, random_state=rng)
+    return libsp.csc_matrix(A.tocsc()), rng.random((n, 4)), rng.random((3, n))
+
+
+class ReducedOrderModels(object):
+
+    def setup(self):
+        import sharpy.linear.src.libss as libss
+
+        np.random.seed(10)
+        self.ss = libss.random_ss(300, 4, 3, dt=0.1)
+        self.frequency = np.linspace(0.01, np.pi / self.ss.dt, 100)
+        self.sparse_A, self.sparse_B, self.sparse_C = sparse_system()
+
+    def time_frequency_response(self):
+        self.ss.freqresp(self.frequency)
+
+    def time_balanced_direct(self):
+        import sharpy.rom.utils.librom as librom
+        librom.balreal_direct_py(self.ss.A, self.ss.B, self.ss.C, DLTI=True)
+
+    def time_balanced_adi(self):
+        import sharpy.rom.utils.librom as librom
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            librom.balreal_adi(self.ss.A, self.ss.B, self.ss.C, tol=1e-8)
+
+    def time_balanced_adi_sparse(self):
+        import sharpy.rom.utils.librom as librom
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            librom.balreal_adi(self.sparse_A, self.sparse_B, self.sparse_C, tol=1e-8)
+
+    def time_balanced_frequency_limited(self):
+        import sharpy.rom.utils.librom as librom
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            librom.balfreq(self.ss, {'frequency': 5., 'method_low': 'trapz', 'options_low': {'points': 12},
+                                     'method_high': 'trapz', 'options_high': {'points': 12},
+                                     'check_stability': False})
+
+    def time_krylov(self):
+        import sharpy.rom.krylov as krylov
+
+        rom = krylov.Krylov()
+        rom.initialise({'algorithm': 'mimo_rational_arnoldi',
+                        'r': 4,
+                        'frequency': [1.],
+                        'print_info': False})
+        rom.run(self.ss)
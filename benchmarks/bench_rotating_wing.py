@@ -0,0 +1,29 @@
+"""
+Rotating wing (prescribed motion test case): one time step of the dynamic coupled solver with the prescribed
+motion of the structure
+"""
+import copy
+
+import common
+from sharpy.utils.benchmark import repeat_setup
+
+
+def copy_static_state(suite):
+    suite.step_data = copy.deepcopy(suite.data)
+
+
+class RotatingWing(object):
+
+    def setup(self):
+        self.route = common.TemporaryRoute()
+        self.settings = common.generated_case('tests.coupled.prescribed.rotating_wing.generate_rotating_wing',
+                                              'rotating_wing.solver.txt', self.route.route)
+        self.data = common.run_case(self.settings, ['BeamLoader', 'AerogridLoader', 'StaticCoupled'])
+        self.step_settings = common.single_step(self.settings, 'DynamicPrescribedCoupled')
+
+    def teardown(self):
+        self.route.clean()
+
+    @repeat_setup(copy_static_state)
+    def time_dynamic_coupled_step(self):
+        common.run_solver(self.step_data, 'DynamicCoupled', self.step_settings)
@@ -0,0 +1,30 @@
+"""
+Smith wing (static coupled test cases): steady UVLM solution, force mapping and static aeroelastic equilibrium
+"""
+import common
+
+
+class SmithWing(object):
+
+    case = 'smith_nog_2deg'
+
+    def setup(self):
+        self.route = common.TemporaryRoute()
+        self.settings = common.generated_case('tests.coupled.static.%s.generate_%s' % (self.case, self.case),
+                                              self.case + '.solver.txt', self.route.route)
+        self.data = common.run_case(self.settings, ['BeamLoader', 'AerogridLoader'])
+        self.aero_settings = self.settings['StaticCoupled']['aero_solver_settings']
+
+    def teardown(self):
+        self.route.clean()
+
+    def time_static_uvlm(self):
+        common.run_solver(self.data, self.settings['StaticCoupled']['aero_solver'], self.aero_settings)
+
+    def time_static_coupled(self):
+        common.run_case(self.settings, ['BeamLoader', 'AerogridLoader', 'StaticCoupled'])
+
+
+class SmithWingGravity(SmithWing):
+
+    case = 'smith_g_2deg'
@@ -0,0 +1,55 @@
+"""
+Cold start of SHARPy: time to import the solver packages and to resolve the solvers of a minimal static flow in a
+new interpreter.
+
+Run as a script to print the times and the number of modules loaded::
+
+    python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+import sharpy.utils.sharpydir as sharpydir
+
+import_packages = ("import sharpy.sharpy_main\n"
+                   "import sharpy.solvers, sharpy.postproc, sharpy.generators, sharpy.controllers\n")
+
+minimal_flow = (import_packages +
+                "import sharpy.utils.solver_interface as solver_interface\n"
+                "for solver_name in ['BeamLoader', 'AerogridLoader', 'StaticUvlm']:\n"
+                "    solver_interface.initialise_solver(solver_name, print_info=False)\n")
+
+count_modules = "import sys\nprint(len(sys.modules))\n"
+
+
+def run_cold(code):
+    """Runs ``code`` in a new interpreter and returns its wall time and output"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = sharpydir.SharpyDir + os.pathsep + env.get('PYTHONPATH', '')
+    t0 = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            env=env, universal_newlines=True, check=True)
+    return time.perf_counter() - t0, output.stdout
+
+
+class ColdStart(object):
+
+    def time_interpreter(self):
+        run_cold('pass')
+
+    def time_import_packages(self):
+        run_cold(import_packages)
+
+    def time_minimal_flow(self):
+        run_cold(minimal_flow)
+
+
+if __name__ == '__main__':
+    for name, code in [('interpreter', ''), ('import packages', import_packages), ('minimal flow', minimal_flow)]:
+        times = []
+        for i_run in range(5):
+            wall_time, output = run_cold(code + count_modules)
+            times.append(wall_time)
+        print('%-16s %8.3f s (best of 5) %6s modules' % (name, min(times), output.split()[-1]))
@@ -0,0 +1,56 @@
+"""
+FSI iterations per time step of the dynamic coupled solver on the simple HALE aircraft template with the structural
+state predictors of :mod:`sharpy.utils.structural_predictor`.
+
+The ``track_*`` benchmarks store the average number of FSI iterations per time step of each predictor. Run as a
+script to print them::
+
+    python benchmarks/bench_structural_predictor.py
+"""
+import common
+
+predictors = ['Constant', 'Linear', 'Quadratic', 'AdamsBashforth']
+
+
+class StructuralPredictor(common.HALEDynamic):
+
+    num_steps = 10
+
+    def iterations_per_step(self, predictor):
+        return self.run_dynamic({'structural_predictor': predictor})/self.num_steps
+
+    def time_constant(self):
+        self.iterations_per_step('Constant')
+
+    def time_linear(self):
+        self.iterations_per_step('Linear')
+
+    def time_quadratic(self):
+        self.iterations_per_step('Quadratic')
+
+    def time_adams_bashforth(self):
+        self.iterations_per_step('AdamsBashforth')
+
+    def track_fsi_iterations_constant(self):
+        return self.iterations_per_step('Constant')
+
+    def track_fsi_iterations_linear(self):
+        return self.iterations_per_step('Linear')
+
+    def track_fsi_iterations_quadratic(self):
+        return self.iterations_per_step('Quadratic')
+
+    def track_fsi_iterations_adams_bashforth(self):
+        return self.iterations_per_step('AdamsBashforth')
+
+
+if __name__ == '__main__':
+    suite = StructuralPredictor()
+    suite.setup()
+    reference = suite.iterations_per_step('Constant')
+    print('%-15s %6.2f FSI iterations per time step' % ('Constant', reference))
+    for predictor in predictors[1:]:
+        iterations = suite.iterations_per_step(predictor)
+        print('%-15s %6.2f FSI iterations per time step (%+.1f%%)' %
+              (predictor, iterations, 100*(iterations - reference)/reference))
+    suite.teardown()
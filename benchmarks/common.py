@@ -0,0 +1,156 @@
+"""
+Helpers shared by the benchmark suites: generation of the test cases and partial execution of their flows
+"""
+import copy
+import importlib.util
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+
+import sharpy.utils.sharpydir as sharpydir
+
+if sharpydir.SharpyDir not in sys.path:
+    sys.path.insert(0, sharpydir.SharpyDir)
+
+
+def run_case(settings, flow):
+    """
+    Runs the solvers of ``flow`` with the ``settings`` of a case (as read from its ``.solver.txt`` file) and
+    returns the ``PreSharpy`` data. The screen output is switched off.
+    """
+    import sharpy.sharpy_main
+
+    settings = copy.deepcopy(settings)
+    settings['SHARPy']['flow'] = flow
+    settings['SHARPy']['write_screen'] = 'off'
+    settings['SHARPy']['write_log'] = 'off'
+    return sharpy.sharpy_main.main(sharpy_input_dict=settings)
+
+
+def run_solver(data, solver_name, custom_settings=None):
+    """Initialises and runs a solver or post-processor on ``data``"""
+    import sharpy.utils.solver_interface as solver_interface
+
+    solver = solver_interface.initialise_solver(solver_name, print_info=False)
+    if custom_settings is None:
+        solver.initialise(data)
+    else:
+        solver.initialise(data, custom_settings=copy.deepcopy(custom_settings))
+    return solver.run()
+
+
+def read_settings(solver_file):
+    import sharpy.utils.input_arg as input_arg
+    return input_arg.parse_settings(solver_file)
+
+
+def generated_case(module_name, solver_file, route):
+    """
+    Runs a copy in ``route`` of the generation script ``module_name`` of one of the repository test cases, which
+    writes the case files next to itself, and returns the settings of the ``solver_file`` it creates. The case
+    files are not written to the repository.
+    """
+    origin = importlib.util.find_spec(module_name).origin
+    script = os.path.join(route, os.path.basename(origin))
+    shutil.copy(origin, script)
+    runpy.run_path(script)
+    return read_settings(os.path.join(route, solver_file))
+
+
+class TemporaryRoute(object):
+    """Temporary folder for the files of the generated cases"""
+    def __init__(self):
+        self.route = tempfile.mkdtemp(prefix='sharpy_bench_')
+
+    def clean(self):
+        shutil.rmtree(self.route, ignore_errors=True)
+
+
+def goland_case(route, M=8, N=16, Mstar_fact=10, u_inf=140., num_modes=8):
+    """
+    Goland wing from the ``cases.templates.flying_wings`` template, with the default configuration and a linear
+    aeroelastic system (projected on ``num_modes`` structural modes) without model reduction
+
+    Returns:
+        tuple: ``(ws, settings)`` template instance and case settings
+    """
+    import cases.templates.flying_wings as wings
+
+    ws = wings.Goland(M=M,
+                      N=N,
+                      Mstar_fact=Mstar_fact,
+                      u_inf=u_inf,
+                      alpha=0.,
+                      rho=1.02,
+                      sweep=0,
+                      physical_time=0.1,
+                      n_surfaces=2,
+                      route=route,
+                      case_name='goland_bench')
+    ws.clean_test_files()
+    ws.update_derived_params()
+    ws.set_default_config_dict()
+    ws.generate_aero_file()
+    ws.generate_fem_file()
+
+    ws.config['Modal']['write_modes_vtk'] = False
+    beam_settings = ws.config['LinearAssembler']['linear_system_settings']['beam_settings']
+    beam_settings['modal_projection'] = True
+    beam_settings['inout_coords'] = 'modes'
+    beam_settings['num_modes'] = num_modes
+    beam_settings['print_info'] = 'off'
+    ws.config.write()
+
+    return ws, read_settings(ws.route + '/' + ws.case_name + '.solver.txt')
+
+
+def single_step(settings, solver_name='DynamicCoupled'):
+    """Settings of a dynamic coupled solver running one time step without post-processors"""
+    solver_settings = copy.deepcopy(settings[solver_name])
+    solver_settings['n_time_steps'] = 1
+    solver_settings['postprocessors'] = []
+    solver_settings['postprocessors_settings'] = dict()
+    return solver_settings
+
+
+class HALEDynamic(object):
+    """
+    Base of the suites comparing settings of the dynamic coupled solver on ``num_steps`` time steps of the trimmed
+    simple HALE aircraft template
+    """
+
+    num_steps = 5
+
+    def setup(self):
+        self.route = TemporaryRoute()
+        self.settings = generated_case('cases.coupled.simple_HALE.generate_hale', 'simple_HALE.sharpy',
+                                       self.route.route)
+        self.data = run_case(self.settings, ['BeamLoader', 'AerogridLoader', 'StaticTrim'])
+        self.step_settings = single_step(self.settings)
+        self.step_settings['n_time_steps'] = self.num_steps
+
+    def teardown(self):
+        self.route.clean()
+
+    def run_dynamic(self, dynamic_settings):
+        """
+        Runs the dynamic coupled solver from a copy of the trimmed state with ``dynamic_settings`` added to the
+        default ones
+
+        Returns:
+            int: Number of FSI iterations
+        """
+        import sharpy.utils.profiling as profiling
+
+        data = copy.deepcopy(self.data)
+        step_settings = copy.deepcopy(self.step_settings)
+        step_settings.update(dynamic_settings)
+        step_settings['print_info'] = 'off'
+
+        profiling.profiler.reset()
+        profiling.profiler.enable(True)
+        run_solver(data, 'DynamicCoupled', step_settings)
+        profiling.profiler.enable(False)
+        return profiling.profiler.counters.get('DynamicCoupled/fsi_iterations', 0)
@@ -0,0 +1,11 @@
+"""
+Runs the SHARPy benchmark suites and compares the results with the stored history.
+
+See :mod:`sharpy.utils.benchmark` and ``python benchmarks/run_benchmarks.py --help``.
+"""
+import sys
+
+import sharpy.utils.benchmark as benchmark
+
+if __name__ == '__main__':
+    sys.exit(benchmark.main())
@@ -57,6 +57,8 @@ import scipy
 import scipy.optimize as optimize
 from scipy.interpolate import Rbf
 import yaml
+import h5py as h5
+import multiprocessing as mpr
 import dill as pickle
 import GPyOpt
 
@@ -80,11 +82,16 @@ def driver():
     yaml_dict = read_yaml(parser.input_file)
     pprint.pprint(yaml_dict)
 
+    # database of evaluated designs
+    database = DesignDatabase(database_file(yaml_dict),
+                              parameters_bounds(yaml_dict),
+                              yaml_dict['optimiser']['numerics'].get('database_tolerance', 0.))
+
     # get previous cases
-    previous_x, previous_y = process_previous_cases(yaml_dict)
+    previous_x, previous_y = process_previous_cases(yaml_dict, database)
 
     # call optimiser
-    optimiser(yaml_dict, previous_x, previous_y)
+    optimiser(yaml_dict, previous_x, previous_y, database)
 
     # postprocess output
 
@@ -117,7 +124,7 @@ def read_yaml(file_name):
     return yaml_dict
 
 
-def optimiser(in_dict, previous_x, previous_y):
+def optimiser(in_dict, previous_x, previous_y, database=None):
     settings_dict = in_dict['settings']
     case_dict = in_dict['case']
     base_dict = in_dict['base']
@@ -171,52 +178,19 @@ def optimiser(in_dict, previous_x, previous_y):
                        'domain': in_dict['optimiser']['parameters_bounds'][k]})
         pprint.pprint(bounds)
 
-    constraints = list()
-    try:
-        length = in_dict['optimiser']['constraints']['ramp_length']
-        acc_var_i = None
-        release_vel_var_i = None
-        for k, v in in_dict['optimiser']['parameters'].items():
-            if v == 'acceleration':
-                acc_var_i = k
-
-            if v == 'release_velocity':
-                release_vel_var_i = k
-
-        # ramp_length = release_vel**2 / acceleration
-        constraints.append({'name': 'length',
-                            'constraint': '0.5*(x[:, ' + str(release_vel_var_i) + ']**2' +
-                                          '/x[:, ' + str(acc_var_i) + '])' +
-                                          ' - ' + str(length)})
-    except KeyError:
-        pass
-
-    try:
-        limit = in_dict['optimiser']['constraints']['incidence_angle']['limit']
-        base_aoa = in_dict['optimiser']['constraints']['incidence_angle']['base_aoa']
-
-        dAoA_var_i = None
-        ramp_angle_var_i = None
-        for k, v in in_dict['optimiser']['parameters'].items():
-            if v == 'dAoA':
-                dAoA_var_i = k
-            if v == 'ramp_angle':
-                ramp_angle_var_i = k
-
-        # base_aoa + dAoA - ramp_angle < limit
-        constraint_string = ''
-        constraint_string += str(base_aoa) + ' + '
-        constraint_string += 'x[:, ' + str(dAoA_var_i) + '] - '
-        constraint_string += 'x[:, ' + str(ramp_angle_var_i) + '] - '
-        constraint_string += str(limit)
-        constraints.append({'name': 'angle',
-                            'constraint': constraint_string})
-    except KeyError:
-        pass
-
+    constraints = get_constraints(in_dict)
     print(constraints)
 
-    gpyopt_wrapper = lambda x: wrapper(x, in_dict)
+    if in_dict['optimiser']['numerics'].get('method', 'gpyopt') == 'surrogate_batch':
+        x_opt, cost_opt = surrogate_batch_optimisation(in_dict, constraints, database)
+        print('*'*60)
+        print('Best one cost: ', cost_opt)
+        print('\tParameters: ', x_opt)
+        print('*'*60)
+        print('FINISHED')
+        return x_opt, cost_opt
+
+    gpyopt_wrapper = lambda x: wrapper(x, in_dict, database)
     batch_size = in_dict['optimiser']['numerics']['batch_size']
     num_cores = in_dict['optimiser']['numerics']['n_cores']
     opt = GPyOpt.methods.BayesianOptimization(
@@ -267,6 +241,59 @@ def optimiser(in_dict, previous_x, previous_y):
 
     import pdb; pdb.set_trace()
 
+def get_constraints(in_dict):
+    """get_constraints
+
+    Returns the list of constraints in GPyOpt format, i.e. strings that
+    evaluate to a value <= 0 when the constraint is satisfied for
+    every row of ``x``.
+    """
+    constraints = list()
+    try:
+        length = in_dict['optimiser']['constraints']['ramp_length']
+        acc_var_i = None
+        release_vel_var_i = None
+        for k, v in in_dict['optimiser']['parameters'].items():
+            if v == 'acceleration':
+                acc_var_i = k
+
+            if v == 'release_velocity':
+                release_vel_var_i = k
+
+        # ramp_length = release_vel**2 / acceleration
+        constraints.append({'name': 'length',
+                            'constraint': '0.5*(x[:, ' + str(release_vel_var_i) + ']**2' +
+                                          '/x[:, ' + str(acc_var_i) + '])' +
+                                          ' - ' + str(length)})
+    except KeyError:
+        pass
+
+    try:
+        limit = in_dict['optimiser']['constraints']['incidence_angle']['limit']
+        base_aoa = in_dict['optimiser']['constraints']['incidence_angle']['base_aoa']
+
+        dAoA_var_i = None
+        ramp_angle_var_i = None
+        for k, v in in_dict['optimiser']['parameters'].items():
+            if v == 'dAoA':
+                dAoA_var_i = k
+            if v == 'ramp_angle':
+                ramp_angle_var_i = k
+
+        # base_aoa + dAoA - ramp_angle < limit
+        constraint_string = ''
+        constraint_string += str(base_aoa) + ' + '
+        constraint_string += 'x[:, ' + str(dAoA_var_i) + '] - '
+        constraint_string += 'x[:, ' + str(ramp_angle_var_i) + '] - '
+        constraint_string += str(limit)
+        constraints.append({'name': 'angle',
+                            'constraint': constraint_string})
+    except KeyError:
+        pass
+
+    return constraints
+
+
 def local_optimisation(opt, yaml_dict=None, min_method='Powell'):
     x_in = opt.X
     y_in = opt.Y
@@ -404,18 +431,235 @@ def evaluate(x_dict, yaml_dict):
                 pass
             with open(yaml_dict['settings']['cases_folder'] +
                       '/' + yaml_dict['case']['name'] + '/' +
-                      'data.pkl', 'wb') as data_file:
+                      case_name + '.pkl', 'wb') as data_file:
                 pickle.dump(data, data_file, -1)
 
     return cost
 
 
-def wrapper(x, yaml_dict):
+def wrapper(x, yaml_dict, database=None):
+    if database is not None:
+        cached_cost = database.lookup(x)
+        if cached_cost is not None:
+            print('   Design found in the database; cost = ', cached_cost)
+            return cached_cost
+
     x_dict = unfold_x(x, yaml_dict['optimiser']['parameters'])
     cost = evaluate(x_dict, yaml_dict)
+
+    if database is not None:
+        database.add(x, cost, case_id(yaml_dict['case']['name'], x_dict))
     return cost
 
 
+def _pool_evaluate(x, yaml_dict):
+    x_dict = unfold_x(x, yaml_dict['optimiser']['parameters'])
+    return evaluate(x_dict, yaml_dict)
+
+
+def evaluate_batch(x_batch, yaml_dict, database, num_cores=1):
+    """evaluate_batch
+
+    Evaluates the designs in the rows of ``x_batch``. Designs already in
+    the database (or close enough to one, see ``DesignDatabase.lookup``)
+    are not run again; the rest are run concurrently in a pool of
+    ``num_cores`` processes and added to the database.
+
+    Returns:
+        np.ndarray: cost of each design
+    """
+    x_batch = np.atleast_2d(x_batch)
+    costs = np.zeros((x_batch.shape[0],))
+
+    pending = []
+    for i_x, x in enumerate(x_batch):
+        cached_cost = database.lookup(x)
+        if cached_cost is None:
+            pending.append(i_x)
+        else:
+            print('   Design found in the database; cost = ', cached_cost)
+            costs[i_x] = cached_cost
+
+    if pending:
+        # every case is run in a fresh process, generate.py and sharpy
+        # modules are already loaded in the parent
+        with mpr.get_context('fork').Pool(min(num_cores, len(pending)),
+                                          maxtasksperchild=1) as pool:
+            jobs = [pool.apply_async(_pool_evaluate, args=(x_batch[i_x, :], yaml_dict))
+                    for i_x in pending]
+            for i_x, job in zip(pending, jobs):
+                costs[i_x] = job.get()
+                x_dict = unfold_x(x_batch[i_x, :], yaml_dict['optimiser']['parameters'])
+                database.add(x_batch[i_x, :],
+                             costs[i_x],
+                             case_id(yaml_dict['case']['name'], x_dict))
+
+    return costs
+
+
+def constraints_satisfied(x_in, constraints):
+    """constraints_satisfied
+
+    Evaluates the GPyOpt-style constraints for every row of ``x_in``.
+    """
+    x = np.atleast_2d(x_in)
+    satisfied = np.ones((x.shape[0],), dtype=bool)
+    for constraint in constraints:
+        satisfied *= np.atleast_1d(eval(constraint['constraint'])) <= 0
+    return satisfied
+
+
+def propose_batch(rbf, database, bounds, constraints, batch_size, n_candidates):
+    """propose_batch
+
+    Proposes ``batch_size`` designs from the minima of the RBF surrogate.
+
+    A random set of ``n_candidates`` feasible designs is ranked by the
+    surrogate prediction. The best candidate is selected and every
+    candidate closer than ``min_distance`` (normalised by the bounds) to
+    the selected and the already evaluated designs is discarded before
+    picking the next one, so that the batch is spread over several
+    minima. The last design of the batch is the candidate furthest from
+    all the evaluated ones (pure exploration).
+    """
+    n_params = bounds.shape[0]
+    span = bounds[:, 1] - bounds[:, 0]
+    candidates = bounds[:, 0] + np.random.rand(n_candidates, n_params)*span
+    candidates = candidates[constraints_satisfied(candidates, constraints), :]
+
+    normalised = (candidates - bounds[:, 0])/span
+    evaluated = (database.x - bounds[:, 0])/span
+    min_distance = 0.5/batch_size**(1./n_params)
+
+    predicted = rbf(*(candidates.T))
+    distance = np.min(np.linalg.norm(normalised[:, None, :] - evaluated[None, :, :], axis=2), axis=1)
+
+    batch = []
+    available = distance > 1e-6
+    for i_batch in range(batch_size - 1):
+        available *= distance > min_distance
+        if not np.any(available):
+            break
+        i_best = np.argmin(np.where(available, predicted, np.inf))
+        batch.append(candidates[i_best, :])
+        distance = np.minimum(distance, np.linalg.norm(normalised - normalised[i_best, :], axis=1))
+
+    # exploration point
+    batch.append(candidates[np.argmax(distance), :])
+
+    return np.array(batch)
+
+
+def surrogate_batch_optimisation(in_dict, constraints, database):
+    """surrogate_batch_optimisation
+
+    Batch-parallel surrogate optimisation loop. In each iteration an RBF
+    surrogate (``create_rbf_surrogate``) is fitted to every design in the
+    database, a batch of designs is proposed with ``propose_batch`` and
+    evaluated concurrently with ``evaluate_batch``.
+
+    Returns:
+        tuple: best design and its cost
+    """
+    numerics = in_dict['optimiser']['numerics']
+    batch_size = numerics['batch_size']
+    num_cores = numerics['n_cores']
+    n_candidates = numerics.get('n_candidates', 10000)
+    bounds = parameters_bounds(in_dict)
+
+    # initial design
+    n_initial = max(numerics['initial_design_numdata'] - database.x.shape[0], 0)
+    if n_initial:
+        x_initial = np.zeros((0, bounds.shape[0]))
+        while x_initial.shape[0] < n_initial:
+            candidates = bounds[:, 0] + np.random.rand(n_initial, bounds.shape[0])*(bounds[:, 1] - bounds[:, 0])
+            x_initial = np.concatenate((x_initial,
+                                        candidates[constraints_satisfied(candidates, constraints), :]))
+        evaluate_batch(x_initial[:n_initial, :], in_dict, database, num_cores)
+
+    for i_iter in range(numerics['n_iter']):
+        rbf = create_rbf_surrogate(database.x, database.y)
+        x_batch = propose_batch(rbf, database, bounds, constraints, batch_size, n_candidates)
+        costs = evaluate_batch(x_batch, in_dict, database, num_cores)
+
+        i_best = np.argmin(database.y)
+        print('Iteration {}: batch costs = {}; best cost = {}'.format(i_iter, costs, database.y[i_best]))
+        if np.min(costs) < numerics['tolerance']:
+            break
+
+    i_best = np.argmin(database.y)
+    return database.x[i_best, :], database.y[i_best]
+
+
+def parameters_bounds(yaml_dict):
+    parameters = yaml_dict['optimiser']['parameters']
+    bounds = np.zeros((len(parameters), 2))
+    for k, v in parameters.items():
+        bounds[k, :] = yaml_dict['optimiser']['parameters_bounds'][k]
+    return bounds
+
+
+def database_file(yaml_dict):
+    try:
+        return yaml_dict['settings']['database']
+    except KeyError:
+        return (yaml_dict['settings']['cases_folder'] + '/' +
+                yaml_dict['case']['name'] + '/database.h5').replace('//', '/')
+
+
+class DesignDatabase(object):
+    """DesignDatabase
+
+    On-disk (HDF5) record of every evaluated design: the design vector
+    ``x``, its cost ``y`` and the case name. The file is rewritten after
+    every addition so it can be reused by later runs.
+
+    Designs whose distance to a stored one, normalised by the parameter
+    bounds, is less than ``tolerance`` are answered from the database.
+    """
+    def __init__(self, file_name, bounds, tolerance=0.):
+        self.file_name = file_name
+        self.bounds = bounds
+        self.tolerance = tolerance
+
+        self.x = np.zeros((0, bounds.shape[0]))
+        self.y = np.zeros((0,))
+        self.case_names = []
+
+        if os.path.exists(self.file_name):
+            with h5.File(self.file_name, 'r') as f:
+                self.x = f['x'][()]
+                self.y = f['y'][()]
+                self.case_names = [name.decode() if isinstance(name, bytes) else name
+                                   for name in f['case_names'][()]]
+            print('Loaded {} designs from {}'.format(len(self.y), self.file_name))
+
+    def lookup(self, x):
+        if not len(self.y):
+            return None
+        span = self.bounds[:, 1] - self.bounds[:, 0]
+        distance = np.linalg.norm((self.x - np.asarray(x).flatten())/span, axis=1)
+        i_min = np.argmin(distance)
+        if distance[i_min] <= self.tolerance:
+            return self.y[i_min]
+        return None
+
+    def add(self, x, cost, case_name):
+        self.x = np.concatenate((self.x, np.atleast_2d(x)))
+        self.y = np.concatenate((self.y, [cost]))
+        self.case_names.append(case_name)
+        self.save()
+
+    def save(self):
+        folder = os.path.dirname(self.file_name)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with h5.File(self.file_name, 'w') as f:
+            f.create_dataset('x', data=self.x)
+            f.create_dataset('y', data=self.y)
+            f.create_dataset('case_names', data=np.array(self.case_names, dtype='S'))
+
+
 def set_case(case_name, base_dict, x_dict, settings_dict, case_dict):
     """set_case: takes care of the setup of the case
 
@@ -616,7 +860,10 @@ def unfold_x(x, parameters_dict):
     return x_dict
 
 
-def process_previous_cases(yaml_dict):
+def process_previous_cases(yaml_dict, database=None):
+    if database is not None and len(database.y):
+        return database.x, database.y.reshape((-1, 1))
+
     try:
         previous_cases_string = yaml_dict['previous_data']['cases']
     except KeyError:
@@ -637,6 +884,9 @@ def process_previous_cases(yaml_dict):
         cost = cost_function(data, x_dict, yaml_dict['optimiser']['cost'])
         y_out[i, 0] = cost
 
+        if database is not None:
+            database.add(x_vec, cost, os.path.basename(f).replace('.pkl', ''))
+
     return x_out, y_out
 
 
@@ -1,5 +1,6 @@
 from sharpy.utils.sharpydir import SharpyDir
 import sharpy.utils.ctypes_utils as ct_utils
+import sharpy.utils.profiling as profiling
 
 import ctypes as ct
 import numpy as np
@@ -124,6 +125,7 @@ class SHWOptions(ct.Structure):
 t_2int = ct.POINTER(ct.c_int)*2
 
 
+@profiling.timed('uvlmlib/vlm_solver')
 def vlm_solver(ts_info, options):
     run_VLM = UvlmLib.run_VLM
     run_VLM.restype = None
@@ -160,6 +162,7 @@ def vlm_solver(ts_info, options):
     ts_info.remove_ctypes_pointers()
 
 
+@profiling.timed('uvlmlib/uvlm_init')
 def uvlm_init(ts_info, options):
     init_UVLM = UvlmLib.init_UVLM
     init_UVLM.restype = None
@@ -205,6 +208,7 @@ def uvlm_init(ts_info, options):
     ts_info.remove_ctypes_pointers()
 
 
+@profiling.timed('uvlmlib/uvlm_solver')
 def uvlm_solver(i_iter, ts_info, struct_ts_info, options, convect_wake=True, dt=None):
     run_UVLM = UvlmLib.run_UVLM
     run_UVLM.restype = None
@@ -259,6 +263,7 @@ def uvlm_solver(i_iter, ts_info, struct_ts_info, options, convect_wake=True, dt=
     # previous_ts_info.remove_ctypes_pointers()
 
 
+@profiling.timed('uvlmlib/shw_solver')
 def shw_solver(i_iter, ts_info, struct_ts_info, options, convect_wake=True, dt=None):
     run_SHW = UvlmLib.run_SHW
     run_SHW.restype = None
@@ -319,6 +324,7 @@ def shw_solver(i_iter, ts_info, struct_ts_info, options, convect_wake=True, dt=N
     ts_info.remove_ctypes_pointers()
 
 
+@profiling.timed('uvlmlib/uvlm_calculate_unsteady_forces')
 def uvlm_calculate_unsteady_forces(ts_info,
                                    struct_ts_info,
                                    options,
@@ -370,6 +376,7 @@ def uvlm_calculate_unsteady_forces(ts_info,
     ts_info.remove_ctypes_pointers()
 
 
+@profiling.timed('uvlmlib/uvlm_calculate_incidence_angle')
 def uvlm_calculate_incidence_angle(ts_info,
                                    struct_ts_info):
     calculate_incidence_angle = UvlmLib.UVLM_check_incidence_angle
@@ -393,6 +400,7 @@ def uvlm_calculate_incidence_angle(ts_info,
                               ts_info.postproc_cell['incidence_angle_ct_pointer'])
     ts_info.remove_ctypes_pointers()
 
+@profiling.timed('uvlmlib/uvlm_calculate_total_induced_velocity_at_points')
 def uvlm_calculate_total_induced_velocity_at_points(ts_info,
                                                    target_triads,
                                                    for_pos=np.zeros((6)),
@@ -0,0 +1,271 @@
+"""Wake Management
+
+Reduction of the number of wake panels of the unsteady UVLM between time steps of
+:class:`~sharpy.solvers.stepuvlm.StepUvlm`. The wake of every surface keeps ``near_rows`` rows behind the trailing
+edge at full resolution and manages the far wake with one of:
+
+    * ``None``: the wake is not modified.
+
+    * ``Merge``: groups of ``merge_rows`` consecutive far-wake rows are merged into a single coarse row. The
+      circulation of the merged panel conserves the vortex impulse of the group, :math:`\\Gamma A = \\sum_k
+      \\Gamma_k A_k`, which is the far field influence of the panels. The wake keeps the extent of the initial one
+      with fewer rows.
+
+    * ``Truncate``: the far-wake rows whose induced velocity on the collocation points of the lifting surfaces is
+      smaller than ``tolerance`` times the maximum relative flow velocity are removed. The removed rows are
+      estimated in the following steps as the extension of the last row up to the initial wake length, and the wake
+      grows back while their induced velocity is above the tolerance.
+
+The UVLM library sheds one row at the trailing edge and drops the last row of the wake in every convection. The
+managers append a zero circulation row of zero area at the end of the wake when the dropped row has to be kept.
+
+The number of rows represented by every wake row (``0`` for the padding row) is stored in
+``AeroTimeStepInfo.wake_row_span``.
+"""
+import ctypes as ct
+
+import numpy as np
+
+cfact_biot = 0.25/np.pi
+VORTEX_RADIUS_SQ = 1e-4  # squared numerical radius of the vortex segments, as in the UVLM library
+
+
+def panel_areas(zeta):
+    """
+    Args:
+        zeta (np.ndarray): Grid coordinates ``(3, M + 1, N + 1)``
+
+    Returns:
+        np.ndarray: Areas of the ``(M, N)`` panels
+    """
+    diagonal_02 = zeta[:, 1:, 1:] - zeta[:, :-1, :-1]
+    diagonal_13 = zeta[:, 1:, :-1] - zeta[:, :-1, 1:]
+    return 0.5*np.linalg.norm(np.cross(diagonal_02, diagonal_13, axis=0), axis=0)
+
+
+def collocation_points(zeta):
+    """
+    Args:
+        zeta (np.ndarray): Grid coordinates ``(3, M + 1, N + 1)``
+
+    Returns:
+        np.ndarray: Panel centres ``(M*N, 3)``
+    """
+    points = 0.25*(zeta[:, :-1, :-1] + zeta[:, 1:, :-1] + zeta[:, 1:, 1:] + zeta[:, :-1, 1:])
+    return points.reshape(3, -1).T
+
+
+def induced_velocity_row(zeta, gamma, points):
+    """
+    Velocity induced by the ring vortices of a row of panels
+
+    Args:
+        zeta (np.ndarray): Coordinates of the two grid lines of the row ``(3, 2, N + 1)``
+        gamma (np.ndarray): Circulation of the ``N`` panels
+        points (np.ndarray): Points ``(n_points, 3)``
+
+    Returns:
+        np.ndarray: Induced velocity ``(n_points, 3)``
+    """
+    corners = [zeta[:, 0, :-1], zeta[:, 0, 1:], zeta[:, 1, 1:], zeta[:, 1, :-1]]
+    velocity = np.zeros_like(points)
+    for i_segment in range(4):
+        zeta_a = corners[i_segment].T[None, :, :]
+        zeta_b = corners[(i_segment + 1) % 4].T[None, :, :]
+        r_a = points[:, None, :] - zeta_a
+        r_b = points[:, None, :] - zeta_b
+        r_ab = zeta_b - zeta_a
+        cross = np.cross(r_a, r_b)
+        cross_sq = np.sum(cross*cross, axis=-1)
+        norm_a = np.linalg.norm(r_a, axis=-1)
+        norm_b = np.linalg.norm(r_b, axis=-1)
+        inside = cross_sq < VORTEX_RADIUS_SQ*np.sum(r_ab*r_ab, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = cfact_biot*gamma[None, :]/cross_sq*(np.sum(r_ab*r_a, axis=-1)/norm_a -
+                                                         np.sum(r_ab*r_b, axis=-1)/norm_b)
+        factor[inside] = 0.
+        velocity += np.einsum('pn,pni->pi', factor, cross)
+    return velocity
+
+
+def set_wake(tstep, i_surf, lines, gamma_star, span):
+    """
+    Replaces the wake of the surface ``i_surf`` of ``tstep`` by the grid ``lines`` of the current one and the
+    circulation ``gamma_star``
+    """
+    tstep.zeta_star[i_surf] = np.ascontiguousarray(tstep.zeta_star[i_surf][:, lines, :], dtype=ct.c_double)
+    tstep.u_ext_star[i_surf] = np.ascontiguousarray(tstep.u_ext_star[i_surf][:, lines, :], dtype=ct.c_double)
+    tstep.gamma_star[i_surf] = np.ascontiguousarray(gamma_star, dtype=ct.c_double)
+    tstep.dimensions_star[i_surf, 0] = gamma_star.shape[0]
+    tstep.wake_row_span[i_surf] = span
+
+
+class NoWakeManagement(object):
+    """
+    Keeps the full wake
+
+    Args:
+        max_rows (np.ndarray): Initial number of wake rows of every surface
+        near_rows (int): Number of rows behind the trailing edge that are not modified
+        merge_rows (int): Number of rows merged into a far-wake row (``Merge``)
+        tolerance (float): Induced velocity tolerance relative to the flow velocity (``Truncate``)
+    """
+    management_id = 'None'
+
+    def __init__(self, max_rows, near_rows=10, merge_rows=4, tolerance=1e-4):
+        self.max_rows = np.array(max_rows, dtype=int)
+        self.near_rows = near_rows
+        self.merge_rows = merge_rows
+        self.tolerance = tolerance
+
+    def init_span(self, tstep):
+        if getattr(tstep, 'wake_row_span', None) is None:
+            tstep.wake_row_span = [np.ones((gamma_star.shape[0],), dtype=int) for gamma_star in tstep.gamma_star]
+
+    def manage(self, tstep):
+        """
+        Modifies the wake of ``tstep`` before its convection
+
+        Args:
+            tstep (sharpy.utils.datastructures.AeroTimeStepInfo): Aerodynamic time step
+        """
+        pass
+
+    def convected(self, tstep):
+        """
+        Updates the row spans of ``tstep`` after the convection of the wake, which sheds a new row and drops the
+        last one
+        """
+        if getattr(tstep, 'wake_row_span', None) is None:
+            return
+        for i_surf, span in enumerate(tstep.wake_row_span):
+            if len(span):
+                tstep.wake_row_span[i_surf] = np.concatenate(([1], span[:-1]))
+
+    def pad(self, tstep, i_surf):
+        """Appends a zero circulation row of zero area at the end of the wake"""
+        n_rows = tstep.gamma_star[i_surf].shape[0]
+        lines = np.concatenate((np.arange(n_rows + 1), [n_rows]))
+        gamma_star = np.concatenate((tstep.gamma_star[i_surf], np.zeros((1, tstep.gamma_star[i_surf].shape[1]))))
+        set_wake(tstep, i_surf, lines, gamma_star, np.concatenate((tstep.wake_row_span[i_surf], [0])))
+
+
+class MergeFarWake(NoWakeManagement):
+    """
+    Merges groups of ``merge_rows`` far-wake rows, conserving :math:`\\sum_k \\Gamma_k A_k`
+    """
+    management_id = 'Merge'
+
+    def merged_rows(self, n_rows):
+        """Number of rows of a wake of ``n_rows`` rows after merging its far wake"""
+        far_rows = max(n_rows - self.near_rows, 0)
+        return n_rows - far_rows + far_rows//self.merge_rows + far_rows % self.merge_rows
+
+    def manage(self, tstep):
+        if self.merge_rows < 2:
+            return
+        self.init_span(tstep)
+        for i_surf in range(len(tstep.gamma_star)):
+            span = tstep.wake_row_span[i_surf]
+            n_rows = len(span)
+
+            # groups of consecutive fine rows behind the near wake
+            groups = []
+            i_row = self.near_rows
+            while i_row + self.merge_rows <= n_rows:
+                if np.all(span[i_row:i_row + self.merge_rows] == 1):
+                    groups.append(i_row)
+                    i_row += self.merge_rows
+                else:
+                    i_row += 1
+
+            if groups:
+                self.merge(tstep, i_surf, groups)
+
+            if len(tstep.wake_row_span[i_surf]) < self.merged_rows(self.max_rows[i_surf]):
+                self.pad(tstep, i_surf)
+
+    def merge(self, tstep, i_surf, groups):
+        zeta_star = tstep.zeta_star[i_surf]
+        gamma_star = tstep.gamma_star[i_surf]
+        span = tstep.wake_row_span[i_surf]
+        areas = panel_areas(zeta_star)
+
+        keep_lines = np.ones((zeta_star.shape[1],), dtype=bool)
+        keep_rows = np.ones((gamma_star.shape[0],), dtype=bool)
+        new_gamma = gamma_star.copy()
+        new_span = span.copy()
+        for i_row in groups:
+            rows = np.s_[i_row:i_row + self.merge_rows]
+            merged_area = panel_areas(zeta_star[:, [i_row, i_row + self.merge_rows], :])[0]
+            impulse = np.sum(gamma_star[rows, :]*areas[rows, :], axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                new_gamma[i_row, :] = np.where(merged_area > 0., impulse/merged_area,
+                                               np.mean(gamma_star[rows, :], axis=0))
+            new_span[i_row] = np.sum(span[rows])
+            keep_lines[i_row + 1:i_row + self.merge_rows] = False
+            keep_rows[i_row + 1:i_row + self.merge_rows] = False
+
+        set_wake(tstep, i_surf, np.where(keep_lines)[0], new_gamma[keep_rows, :], new_span[keep_rows])
+
+
+class TruncateFarWake(NoWakeManagement):
+    """
+    Removes the far-wake rows whose induced velocity on the lifting surfaces is below the tolerance
+    """
+    management_id = 'Truncate'
+
+    def manage(self, tstep):
+        self.init_span(tstep)
+        points = np.concatenate([collocation_points(zeta) for zeta in tstep.zeta])
+        u_ref = max(np.max(np.linalg.norm(u_ext - zeta_dot, axis=0))
+                    for u_ext, zeta_dot in zip(tstep.u_ext, tstep.zeta_dot))
+        if u_ref == 0.:
+            return
+        tolerance = self.tolerance*u_ref
+
+        for i_surf in range(len(tstep.gamma_star)):
+            zeta_star = tstep.zeta_star[i_surf]
+            gamma_star = tstep.gamma_star[i_surf]
+            n_rows = gamma_star.shape[0]
+
+            # rows at the end of the wake whose induced velocity is below the tolerance. The last row kept is dropped
+            # in the convection. The rows truncated before are represented by the extension of the last row to the
+            # initial wake length
+            tail_velocity = np.zeros_like(points)
+            if 0 < n_rows < self.max_rows[i_surf]:
+                extension = zeta_star[:, [n_rows, n_rows], :]
+                extension[:, 1, :] += (self.max_rows[i_surf] - n_rows)*(zeta_star[:, n_rows, :] -
+                                                                        zeta_star[:, n_rows - 1, :])
+                tail_velocity += induced_velocity_row(extension, gamma_star[n_rows - 1, :], points)
+            n_keep = None
+            for i_row in range(n_rows - 1, self.near_rows - 1, -1):
+                tail_velocity += induced_velocity_row(zeta_star[:, i_row:i_row + 2, :], gamma_star[i_row, :], points)
+                if np.max(np.linalg.norm(tail_velocity, axis=1)) > tolerance:
+                    break
+                n_keep = i_row + 1
+
+            if n_keep is None:
+                if self.near_rows < n_rows < self.max_rows[i_surf]:
+                    # the last row is above the tolerance, keep it in the convection
+                    self.pad(tstep, i_surf)
+            elif n_keep < n_rows:
+                set_wake(tstep, i_surf, np.arange(n_keep + 1), gamma_star[:n_keep, :],
+                         tstep.wake_row_span[i_surf][:n_keep])
+
+
+wake_managers = {NoWakeManagement.management_id: NoWakeManagement,
+                 MergeFarWake.management_id: MergeFarWake,
+                 TruncateFarWake.management_id: TruncateFarWake}
+
+
+def wake_manager_from_string(management_id, max_rows, **kwargs):
+    """
+    Returns an instance of the wake manager ``management_id`` (``None``, ``Merge`` or ``Truncate``)
+
+    Args:
+        management_id (str): Wake management name
+        max_rows (np.ndarray): Initial number of wake rows of every surface
+        **kwargs: Parameters of the wake manager
+    """
+    return wake_managers[management_id](max_rows, **kwargs)
@@ -65,6 +65,4 @@ class SteadyVelocityField(generator_interface.BaseGenerator):
         for i_surf in range(len(zeta)):
             if override:
                 uext[i_surf].fill(0.0)
-            for i in range(zeta[i_surf].shape[1]):
-                for j in range(zeta[i_surf].shape[2]):
-                    uext[i_surf][:, i, j] += self.u_inf*self.u_inf_direction
+            uext[i_surf] += (self.u_inf*self.u_inf_direction)[:, None, None]
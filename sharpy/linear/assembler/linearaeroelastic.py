@@ -84,6 +84,9 @@ class LinearAeroelastic(ss_interface.BaseElement):
         self.Crs = None
         self.Crr = None
 
+        # Coupling of the fixed UVLM with updated beam systems
+        self.coupler = None
+
     def initialise(self, data):
 
         try:
@@ -235,6 +238,7 @@ class LinearAeroelastic(ss_interface.BaseElement):
                     Tas /= uvlm.sys.ScalingFacts['length']
 
         ss = libss.couple(ss01=uvlm.ss, ss02=beam.ss, K12=Tas, K21=Tsa)
+        self.coupler = None
         # Conditioning of A matrix
         # cond_a = np.linalg.cond(ss.A)
         # if type(uvlm.ss.A) != np.ndarray:
@@ -271,6 +275,9 @@ class LinearAeroelastic(ss_interface.BaseElement):
         Updates the aeroelastic scaled system with the new reference velocity.
 
         Only the beam equations need updating since the only dependency in the forward flight velocity resides there.
+        The UVLM side of the coupling is therefore computed in the first update and reused in the following ones,
+        which write the coupled system in place (see :class:`sharpy.linear.src.libss.Coupler`). The matrices of the
+        returned system are overwritten by the next update.
 
         Args:
               u_infty (float): New reference velocity
@@ -285,8 +292,9 @@ class LinearAeroelastic(ss_interface.BaseElement):
         self.beam.sys.assemble()
         self.beam.ss = self.beam.sys.SSdisc
 
-        self.ss = libss.couple(ss01=self.uvlm.ss, ss02=self.beam.ss,
-                               K12=self.couplings['Tas'], K21=self.couplings['Tsa'])
+        if self.coupler is None:
+            self.coupler = libss.Coupler(self.uvlm.ss, K12=self.couplings['Tas'], K21=self.couplings['Tsa'])
+        self.ss = self.coupler(self.beam.ss)
 
         return self.ss
 
@@ -394,7 +394,8 @@ class LinearBeam(BaseElement):
         q[:num_dof + rig_dof] = x_n[:num_dof + rig_dof]
         dqdt[:num_dof + rig_dof] = x_n[num_dof + rig_dof:]
         # Missing the forces
-        # dqddt = self.sys.Minv.dot(-self.sys.Cstr.dot(dqdt) - self.sys.Kstr.dot(q))
+        # dqddt = lingebm.solve_factorised(self.sys.factorise('M', self.sys.Mstr),
+        #                                  -self.sys.Cstr.dot(dqdt) - self.sys.Kstr.dot(q))
 
         for i_node in vdof[vdof >= 0]:
             pos[i_node + 1, :] = q[6*i_node: 6*i_node + 3]
@@ -546,6 +546,138 @@ def couple(ss01, ss02, K12, K21, out_sparse=False):
     return ss(A, B, C, D, dt=ss01.dt)
 
 
+class Coupler():
+    """
+    Couples a fixed dlti system ``ss01`` with systems ``ss02`` that change between calls, such as the beam in a
+    velocity sweep of a time scaled aeroelastic system. The result is the same as that of :func:`couple`.
+
+    The ``ss01`` matrices are converted to dense once and the products that only involve ``ss01`` and the gains are
+    computed when the class is created. Each call then only computes the coupling terms that depend on ``ss02`` and
+    writes the blocks of the coupled system in place into preallocated arrays.
+
+    Warnings:
+        The matrices of the returned system are overwritten by the following call. Copy them if they need to be kept.
+
+    Args:
+        ss01 (ss): Fixed system
+        K12 (np.ndarray): Gain from the output of ``ss02`` to the input of ``ss01``
+        K21 (np.ndarray): Gain from the output of ``ss01`` to the input of ``ss02``
+    """
+
+    def __init__(self, ss01, K12, K21):
+
+        assert K12.shape[0] == ss01.inputs, 'Gain K12 shape not matching with ss01 number of inputs'
+        assert K21.shape[1] == ss01.outputs, 'Gain K21 shape not matching with ss01 number of outputs'
+
+        self.dt = ss01.dt
+        self.A1 = libsp.dense(ss01.A)
+        self.B1 = libsp.dense(ss01.B)
+        self.C1 = libsp.dense(ss01.C)
+        self.D1 = libsp.dense(ss01.D)
+        self.K12 = libsp.dense(K12)
+        self.K21 = libsp.dense(K21)
+
+        # products independent of ss02
+        self.K21C1 = self.K21.dot(self.C1)
+        self.K21D1 = self.K21.dot(self.D1)
+        self.K22 = self.K21D1.dot(self.K12)
+
+        self.A = None
+        self.B = None
+        self.C = None
+        self.D = None
+
+        # whether the top left blocks currently hold the ss01 matrices
+        self.uncoupled_11 = False
+
+    def allocate(self, Nx2, Nu2, Ny2):
+        Nx1, Nu1 = self.B1.shape
+        Ny1 = self.C1.shape[0]
+
+        self.A = np.zeros((Nx1 + Nx2, Nx1 + Nx2))
+        self.B = np.zeros((Nx1 + Nx2, Nu1 + Nu2))
+        self.C = np.zeros((Ny1 + Ny2, Nx1 + Nx2))
+        self.D = np.zeros((Ny1 + Ny2, Nu1 + Nu2))
+        self.uncoupled_11 = False
+
+    def __call__(self, ss02):
+        """
+        Couples ``ss01`` with ``ss02``
+
+        Args:
+            ss02 (ss): System to couple
+
+        Returns:
+            ss: Coupled system
+        """
+        assert np.abs(self.dt - ss02.dt) < 1e-10 * self.dt, 'Time-steps not matching!'
+        assert self.K12.shape[1] == ss02.outputs and self.K21.shape[0] == ss02.inputs, \
+            'Gains shape not matching with ss02 number of inputs/outputs'
+
+        A2, B2, C2, D2 = [libsp.dense(M) for M in ss02.get_mats()]
+        Nx1, Nu1 = self.B1.shape
+        Ny1 = self.C1.shape[0]
+        Nx2, Nu2 = B2.shape
+        Ny2 = C2.shape[0]
+
+        if self.A is None or self.A.shape != (Nx1 + Nx2, Nx1 + Nx2) or self.B.shape[1] != Nu1 + Nu2:
+            self.allocate(Nx2, Nu2, Ny2)
+
+        # coupling terms
+        D2K21 = D2.dot(self.K21)
+        cpl_12 = np.linalg.solve(np.eye(Nu1) - self.K12.dot(D2K21.dot(self.D1)), self.K12)
+        L2inv = np.linalg.solve(np.eye(Nu2) - self.K22.dot(D2), np.eye(Nu2))
+        cpl_22 = L2inv.dot(self.K22)
+
+        B1cpl_12 = self.B1.dot(cpl_12)
+        D1cpl_12 = self.D1.dot(cpl_12)
+        B2L2inv = B2.dot(L2inv)
+        D2L2inv = D2.dot(L2inv)
+        B2cpl_22 = B2.dot(cpl_22)
+        D2cpl_22 = D2.dot(cpl_22)
+
+        s1 = slice(0, Nx1)
+        s2 = slice(Nx1, Nx1 + Nx2)
+        i1 = slice(0, Nu1)
+        i2 = slice(Nu1, Nu1 + Nu2)
+        o1 = slice(0, Ny1)
+        o2 = slice(Ny1, Ny1 + Ny2)
+
+        # ss01 diagonal blocks, coupled through the ss02 feedthrough as cpl_11 = cpl_12 D2 K21
+        if np.any(D2K21):
+            D2K21C1 = D2.dot(self.K21C1)
+            D2K21D1 = D2.dot(self.K21D1)
+            np.add(self.A1, B1cpl_12.dot(D2K21C1), out=self.A[s1, s1])
+            np.add(self.B1, B1cpl_12.dot(D2K21D1), out=self.B[s1, i1])
+            np.add(self.C1, D1cpl_12.dot(D2K21C1), out=self.C[o1, s1])
+            np.add(self.D1, D1cpl_12.dot(D2K21D1), out=self.D[o1, i1])
+            self.uncoupled_11 = False
+        elif not self.uncoupled_11:
+            self.A[s1, s1] = self.A1
+            self.B[s1, i1] = self.B1
+            self.C[o1, s1] = self.C1
+            self.D[o1, i1] = self.D1
+            self.uncoupled_11 = True
+
+        self.A[s1, s2] = B1cpl_12.dot(C2)
+        self.A[s2, s1] = B2L2inv.dot(self.K21C1)
+        self.A[s2, s2] = A2 + B2cpl_22.dot(C2)
+
+        self.B[s1, i2] = B1cpl_12.dot(D2)
+        self.B[s2, i1] = B2L2inv.dot(self.K21D1)
+        self.B[s2, i2] = B2 + B2cpl_22.dot(D2)
+
+        self.C[o1, s2] = D1cpl_12.dot(C2)
+        self.C[o2, s1] = D2L2inv.dot(self.K21C1)
+        self.C[o2, s2] = C2 + D2cpl_22.dot(C2)
+
+        self.D[o1, i2] = D1cpl_12.dot(D2)
+        self.D[o2, i1] = D2L2inv.dot(self.K21D1)
+        self.D[o2, i2] = D2 + D2cpl_22.dot(D2)
+
+        return ss(self.A, self.B, self.C, self.D, dt=self.dt)
+
+
 # def couple_wrong02(ss01, ss02, K12, K21):
 #     """
 #     Couples 2 dlti systems ss01 and ss02 through the gains K12 and K21, where
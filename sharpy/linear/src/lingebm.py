@@ -7,6 +7,7 @@ N. Goizueta
 
 import numpy as np
 import scipy as sc
+import scipy.linalg
 import scipy.signal as scsig
 import sharpy.linear.src.libss as libss
 import sharpy.utils.algebra as algebra
@@ -149,7 +150,9 @@ class FlexDynamic():
         # Store structure at linearisation and linearisation conditions
         self.structure = structure
         self.tsstruct0 = tsinfo
-        self.Minv = None
+
+        # Cached factorisations of the mass and Newmark matrices {name: (matrix, factorisation)}
+        self.factorisations = dict()
 
         self.scaled_reference_matrices = dict()  # keep reference values prior to time scaling
 
@@ -761,16 +764,14 @@ class FlexDynamic():
                         #     np.diag(self.freq_natural[:Nmodes] ** 2),
                         #     self.dt,
                         #     self.newmark_damp)
-                        Ass, Bss, Css, Dss = newmark_ss(
-                            # Phi.T.dot(self.Mstr.dot(Phi)),
-                            np.linalg.inv(np.dot(self.U[:, :Nmodes].T, np.dot(self.Mstr, self.U[:, :Nmodes]))),
-                            # np.eye(Nmodes),
+                        Mcut = np.dot(Phi.T, np.dot(self.Mstr, Phi))
+                        Ass, Bss, Css, Dss = newmark_ss_factorised(
+                            Mcut,
                             Ccut,
-                            np.dot(self.U[:, :Nmodes].T, np.dot(self.Kstr, self.U[:, :Nmodes])),
-                            # Phi.T.dot(self.Kstr.dot(Phi)),
-                            # np.diag(self.freq_natural[:Nmodes]**2),
+                            np.dot(Phi.T, np.dot(self.Kstr, Phi)),
                             self.dt,
-                            self.newmark_damp)
+                            self.newmark_damp,
+                            M_fact=self.factorise('M_modal', Mcut))
                         self.Kin = Phi.T
                         self.Kout = sc.linalg.block_diag(*[Phi, Phi])
                     else:
@@ -787,11 +788,10 @@ class FlexDynamic():
 
 
                 else:  # Full system
-                    self.Minv = np.linalg.inv(self.Mstr)
-
-                    Ass, Bss, Css, Dss = newmark_ss(
-                        self.Minv, self.Cstr, self.Kstr,
-                        self.dt, self.newmark_damp)
+                    Ass, Bss, Css, Dss = newmark_ss_factorised(
+                        self.Mstr, self.Cstr, self.Kstr,
+                        self.dt, self.newmark_damp,
+                        M_fact=self.factorise('M', self.Mstr))
                     self.Kin = None
                     self.Kout = None
                     self.SSdisc = libss.ss(Ass, Bss, Css, Dss, dt=self.dt)
@@ -855,11 +855,10 @@ class FlexDynamic():
                 Bss = np.zeros((2 * num_dof, num_dof))
                 Css = np.eye(2 * num_dof)
                 Dss = np.zeros((2 * num_dof, num_dof))
-                Minv_neg = -np.linalg.inv(self.Mstr)
+                M_fact = self.factorise('M', Mstr)
                 Ass[range(num_dof), range(num_dof, 2 * num_dof)] = 1.
-                Ass[num_dof:, :num_dof] = np.dot(Minv_neg, Kstr)
-                Ass[num_dof:, num_dof:] = np.dot(Minv_neg, Cstr)
-                Bss[num_dof:, :] = -Minv_neg
+                Ass[num_dof:, :] = -solve_factorised(M_fact, np.hstack((Kstr, Cstr)))
+                Bss[num_dof:, :] = invert_factorised(M_fact)
                 self.Kin = None
                 self.Kout = None
                 self.SScont = libss.ss(Ass, Bss, Css, Dss)
@@ -968,7 +967,16 @@ class FlexDynamic():
                 print('Warning, projecting system with damping onto undamped modes')
 
             # Eigenvalues are purely complex - only the complex part is calculated
-            eigenvalues, eigenvectors = np.linalg.eig(np.linalg.solve(self.Mstr, self.Kstr))
+            eigenvalues, eigenvectors = None, None
+            if is_symmetric(self.Mstr) and is_symmetric(self.Kstr):
+                try:
+                    eigenvalues, eigenvectors = sc.linalg.eigh(
+                        self.Kstr, self.Mstr, subset_by_index=[0, min(self.Nmodes, self.Mstr.shape[0]) - 1])
+                except np.linalg.LinAlgError:
+                    # mass matrix not positive definite
+                    pass
+            if eigenvalues is None:
+                eigenvalues, eigenvectors = np.linalg.eig(np.linalg.solve(self.Mstr, self.Kstr))
 
             omega = np.sqrt(eigenvalues)
             order = np.argsort(omega)[:self.Nmodes]
@@ -987,6 +995,31 @@ class FlexDynamic():
         else:
             raise NotImplementedError('Projection update for damped systems not yet implemented ')
 
+    def factorise(self, name, mat):
+        """
+        Returns the factorisation of ``mat`` (see :func:`factorise`).
+
+        The factorisation is cached under ``name`` and reused while the matrix does not change, such as when the
+        system is assembled again after :meth:`update_matrices_time_scale`, which leaves the mass matrix untouched.
+
+        Args:
+            name (str): Name of the cached factorisation
+            mat (np.ndarray): Matrix to factorise
+
+        Returns:
+            tuple: Factorisation to be used in :func:`solve_factorised`
+        """
+        try:
+            cached_mat, fact = self.factorisations[name]
+            if cached_mat.shape == mat.shape and np.array_equal(cached_mat, mat):
+                return fact
+        except KeyError:
+            pass
+
+        fact = factorise(mat)
+        self.factorisations[name] = (mat.copy(), fact)
+        return fact
+
     def update_truncated_modes(self, nmodes):
         r"""
         Updates the system to the specified number of modes
@@ -1225,6 +1258,156 @@ def newmark_ss(Minv, C, K, dt, num_damp=1e-4):
     return libss.SSconv(Ass, Bss0, Bss1, C=np.eye(2 * N), D=np.zeros((2 * N, N)))
 
 
+def newmark_ss_factorised(M, C, K, dt, num_damp=1e-4, M_fact=None, B=None):
+    r"""
+    Produces the same discrete-time state-space model as :func:`newmark_ss` without the inverse of the mass matrix.
+
+    Multiplying each block row of :math:`A_{ss1}` by :math:`M` gives the system
+
+    .. math::
+        \begin{bmatrix} M + a_1 K & a_1 C \\ b_1 K & M + b_1 C \end{bmatrix}
+        \begin{Bmatrix} \mathbf{x} \\ \mathbf{y} \end{Bmatrix} =
+        \begin{Bmatrix} \mathbf{r}_1 \\ \mathbf{r}_2 \end{Bmatrix}
+
+    which is solved by eliminating the :math:`M\mathbf{x}` terms:
+
+    .. math::
+        \mathbf{z} &= M^{-1}(b_1\mathbf{r}_1 - a_1\mathbf{r}_2) \\
+        (M + b_1 C + a_1 K)\,\mathbf{y} &= \mathbf{r}_2 - K\mathbf{z} \\
+        \mathbf{x} &= (a_1\mathbf{y} + \mathbf{z}) / b_1
+
+    such that only the factorisations of :math:`M` and of the Newmark matrix :math:`S = M + b_1 C + a_1 K`, both of
+    size :math:`N`, are required. The mass matrix is only solved against :math:`K`, :math:`C` and the input matrix
+    :math:`B`. For the default identity input, :math:`M^{-1}` is obtained from the factors of :math:`M` (see
+    :func:`invert_factorised`) instead.
+
+    Args:
+        M (np.array): Mass matrix :math:`\mathbf{M}`
+        C (np.array): Damping matrix :math:`\mathbf{C}`
+        K (np.array): Stiffness matrix :math:`\mathbf{K}`
+        dt (float): Timestep increment
+        num_damp (float): Numerical damping. Default ``1e-4``
+        M_fact (tuple): Factorisation of the mass matrix, as given by :func:`factorise`. Computed if not provided.
+        B (np.array): Input matrix, such that the forces are :math:`B\mathbf{u}`. Identity if not provided.
+
+    Returns:
+        tuple: the A, B, C, D matrices of the state space packed in a tuple with the predictor and delay term removed.
+    """
+
+    # weights
+    th1 = 0.5 + num_damp
+    th2 = 0.0625 + 0.25 * (th1 + th1 ** 2)
+
+    dt2 = dt ** 2
+    a1 = th2 * dt2
+    a0 = 0.5 * dt2 - a1
+    b1 = th1 * dt
+    b0 = dt - b1
+    c = a1 * b0 - a0 * b1
+
+    N = K.shape[0]
+    Imat = np.eye(N)
+    if M_fact is None:
+        M_fact = factorise(M)
+    S_fact = factorise(M + b1 * C + a1 * K)
+
+    if B is None:
+        B = Imat
+        MinvB = invert_factorised(M_fact)
+        MinvKC = solve_factorised(M_fact, np.hstack((K, C)))
+    else:
+        MinvKCB = solve_factorised(M_fact, np.hstack((K, C, B)))
+        MinvKC, MinvB = MinvKCB[:, :2 * N], MinvKCB[:, 2 * N:]
+    num_in = B.shape[1]
+
+    def solve_ss1(z, r2):
+        y = solve_factorised(S_fact, r2 - np.dot(K, z))
+        return np.concatenate(((a1 * y + z) / b1, y))
+
+    MinvKC *= c
+    MinvKC[:, :N] += b1 * Imat
+    MinvKC[:, N:] += (b1 * dt - a1) * Imat
+    Ass = solve_ss1(MinvKC, np.block([-b0 * K, M - b0 * C]))
+    Bss0 = solve_ss1(-c * MinvB, b0 * B)
+    Bss1 = solve_ss1(np.zeros((N, num_in)), b1 * B)
+
+    # eliminate predictior term Bss1
+    return libss.SSconv(Ass, Bss0, Bss1, C=np.eye(2 * N), D=np.zeros((2 * N, num_in)))
+
+
+def is_symmetric(mat, rtol=1e-10):
+    """Checks whether a dense matrix is symmetric to within a relative tolerance"""
+    return mat.shape[0] == mat.shape[1] and np.allclose(mat, mat.T, rtol=rtol, atol=rtol * np.max(np.abs(mat)))
+
+
+def factorise(mat, symmetric=None):
+    """
+    Factorises a dense matrix with a Cholesky decomposition if it is symmetric positive definite and with a LU
+    decomposition otherwise.
+
+    Args:
+        mat (np.ndarray): Matrix to factorise
+        symmetric (bool): Whether the matrix is symmetric. Checked if not provided.
+
+    Returns:
+        tuple: Factorisation type (``'cholesky'`` or ``'lu'``) and factors, to be used in :func:`solve_factorised`
+    """
+    if symmetric is None:
+        symmetric = is_symmetric(mat)
+    if symmetric:
+        try:
+            return 'cholesky', sc.linalg.cho_factor(mat)
+        except np.linalg.LinAlgError:
+            pass
+    return 'lu', sc.linalg.lu_factor(mat)
+
+
+def solve_factorised(fact, rhs):
+    """
+    Solves the system with the factorisation returned by :func:`factorise`
+
+    Args:
+        fact (tuple): Factorisation
+        rhs (np.ndarray): Right hand side
+
+    Returns:
+        np.ndarray: Solution
+    """
+    if fact[0] == 'cholesky':
+        return sc.linalg.cho_solve(fact[1], rhs)
+    else:
+        return sc.linalg.lu_solve(fact[1], rhs)
+
+
+def invert_factorised(fact):
+    """
+    Inverse of a matrix from the factorisation returned by :func:`factorise`, cheaper than solving the factorisation
+    against the identity matrix.
+
+    Args:
+        fact (tuple): Factorisation
+
+    Returns:
+        np.ndarray: Inverse matrix
+    """
+    if fact[0] == 'cholesky':
+        c, lower = fact[1]
+        potri, = sc.linalg.lapack.get_lapack_funcs(('potri',), (c,))
+        inv, info = potri(c, lower=lower)
+        # only the triangle of the factor is set
+        if lower:
+            inv = np.tril(inv) + np.tril(inv, -1).T
+        else:
+            inv = np.triu(inv) + np.triu(inv, 1).T
+    else:
+        lu, piv = fact[1]
+        getri, = sc.linalg.lapack.get_lapack_funcs(('getri',), (lu,))
+        inv, info = getri(lu, piv)
+    if info != 0:
+        raise np.linalg.LinAlgError('Matrix inversion failed with LAPACK info %d' % info)
+    return inv
+
+
 def sort_eigvals(eigv, eigabsv, tol=1e-6):
     """ sort by magnitude (frequency) and imaginary part if complex conj """
 
@@ -1100,14 +1100,20 @@ class Dynamic(Static):
               points. If True, this option also allows to automatically tune the
               balanced model.
 
+            - ``num_cores``: number of frequency solves run concurrently.
+
+            - ``tolerance_lowrank``: relative truncation tolerance of the low-rank
+              Gramian factors (see :func:`sharpy.rom.utils.librom.low_rank_update`).
+
+        The Gramian factors are accumulated in low-rank form as the frequencies
+        are solved, and stored in ``self.Zc`` and ``self.Zo``.
+
         Future options:
 
             - ``truncation_tolerance``: if ``get_frequency_response`` is True, allows
               to truncate the balanced model so as to achieved a prescribed
               tolerance in the low-frequwncy range.
 
-            - ``Ncpu``: for parallel run
-
         The following integration schemes are available:
 
             - ``trapz``: performs integration over equally spaced points using
@@ -1244,15 +1250,13 @@ class Dynamic(Static):
         wv = np.concatenate((wv_low, wv_high)) * self.SS.dt
         zv = np.cos(kvdt) + 1.j * np.sin(kvdt)
 
-        Qobs = np.zeros((self.SS.states, self.SS.outputs), dtype=np.complex_)
-        Zc = np.zeros((self.SS.states, 2 * self.SS.inputs * len(kvdt)), )
-        Zo = np.zeros((self.SS.states, 2 * self.SS.outputs * Nk_low), )
-
         if DictBalFreq['get_frequency_response']:
             self.Yfreq = np.empty((self.SS.outputs, self.SS.inputs, Nk_low,), dtype=np.complex_)
             self.kv = kv_low
 
-        for kk in range(len(kvdt)):
+        Bup = libsp.dense(Bup)
+
+        def solve_frequency(kk):
 
             zval = zv[kk]
             Intfact = wv[kk]  # integration factor
@@ -1260,10 +1264,11 @@ class Dynamic(Static):
             #  build terms that will be recycled
             Cw_cpx = self.get_Cw_cpx(zval)
             PwCw_T = Cw_cpx.T.dot(Pw.T)
-            Kernel = np.linalg.inv(zval * Eye - P - PwCw_T.T)
+            # the same factorisation is used for the controllability and observability solves
+            Kernel = scalg.lu_factor(zval * Eye - P - PwCw_T.T)
 
             ### ----- controllability
-            Ygamma=Intfact*np.dot(Kernel, Bup)
+            Ygamma=Intfact*scalg.lu_solve(Kernel, Bup)
             if self.remove_predictor:
                 Ygamma *= zval
             Ygamma_star = Cw_cpx.dot(Ygamma)
@@ -1278,26 +1283,19 @@ class Dynamic(Static):
             else:
                 raise NameError('Specify valid integration order')
 
-            kkvec=range( 2*kk*self.SS.inputs, 2*(kk+1)*self.SS.inputs )
-            Zc[:,kkvec[:self.SS.inputs]]= Qctrl.real #*Intfact
-            Zc[:,kkvec[self.SS.inputs:]]= Qctrl.imag #*Intfact
-
             ### ----- frequency response
             if DictBalFreq['get_frequency_response'] and kk < Nk_low:
                 self.Yfreq[:, :, kk] = np.dot(self.SS.C, Qctrl) / Intfact + self.SS.D
 
-            ### ----- frequency response
-            if DictBalFreq['get_frequency_response'] and kk<Nk_low:
-                self.Yfreq[:,:,kk]=np.dot( self.SS.C, Qctrl)/Intfact + self.SS.D
-
             ### ----- observability
             # solve (1./zval*I - A.T)^{-1} C^T (in low-frequency only)
             if kk >= Nk_low:
-                continue
+                return Qctrl, None
 
             zinv = 1. / zval
             Cw_cpx_H = Cw_cpx.conjugate().T
 
+            Qobs = np.zeros((self.SS.states, self.SS.outputs), dtype=np.complex_)
             Qobs[ii02, :] = zval * self.SS.C[:, ii02].T
             if self.integr_order == 2:
                 Qobs[ii03, :] = bm1 * zval ** 2 * self.SS.C[:, ii02].T
@@ -1308,7 +1306,7 @@ class Dynamic(Static):
                     (bp1*zval)*(PwCw_T.conj() + P.T) + \
                     (b0*zval+bm1*zval**2 )*Eye, self.SS.C[:,ii02].T)
 
-            Qobs[ii00, :] = np.dot(Kernel.conj().T, rhs)
+            Qobs[ii00, :] = scalg.lu_solve(Kernel, rhs, trans=2)
 
             Eye_star= libsp.csc_matrix(
                 ( zinv*np.ones((K_star,)), (range(K_star),range(K_star))),
@@ -1319,17 +1317,12 @@ class Dynamic(Static):
                                             (bp1*zval)*self.SS.C[:,ii02].T) +\
                                                             self.SS.C[:,ii01].T)
 
-            kkvec=range( 2*kk*self.SS.outputs, 2*(kk+1)*self.SS.outputs )
-            Zo[:,kkvec[:self.SS.outputs]]= Intfact*Qobs.real
-            Zo[:,kkvec[self.SS.outputs:]]= Intfact*Qobs.imag
+            return Qctrl, Intfact * Qobs
 
-        # delete full matrices
-        Kernel = None
-        Qctrl = None
-        Qobs = None
-
-        # self.Zc=Zc
-        # self.Zo=Zo
+        # low-rank factors of the Gramians, accumulated over the frequencies
+        Zc, Zo = librom.stream_gramian_factors(solve_frequency, len(kvdt),
+                                               DictBalFreq.get('num_cores', 1),
+                                               DictBalFreq.get('tolerance_lowrank', 0.))
 
         # LRSQM (optimised)
         U, hsv, Vh = scalg.svd(np.dot(Zo.T, Zc), full_matrices=False)
@@ -2139,14 +2132,17 @@ class DynamicBlock(Dynamic):
             points. If True, this option also allows to automatically tune the
             balanced model.
 
+            - 'num_cores': number of frequency solves run concurrently.
+
+            - 'tolerance_lowrank': relative truncation tolerance of the low-rank
+            Gramian factors, stored in self.Zc and self.Zo.
+
         Future options:
 
             - 'truncation_tolerance': if 'get_frequency_response' is True, allows
             to truncatethe balanced model so as to achieved a prescribed
             tolerance in the low-frequwncy range.
 
-            - Ncpu: for parallel run
-
 
         The following integration schemes are available:
             - 'trapz': performs integration over equally spaced points using
@@ -2274,15 +2270,11 @@ class DynamicBlock(Dynamic):
         wv = np.concatenate((wv_low, wv_high)) * self.SS.dt
         zv = np.cos(kvdt) + 1.j * np.sin(kvdt)
 
-        Qobs = np.zeros((self.SS.states, self.SS.outputs), dtype=np.complex_)
-        Zc = np.zeros((self.SS.states, 2 * self.SS.inputs * len(kvdt)), )
-        Zo = np.zeros((self.SS.states, 2 * self.SS.outputs * Nk_low), )
-
         if DictBalFreq['get_frequency_response']:
             self.Yfreq = np.empty((self.SS.outputs, self.SS.inputs, Nk_low,), dtype=np.complex_)
             self.kv = kv_low
 
-        for kk in range(len(kvdt)):
+        def solve_frequency(kk):
 
             zval = zv[kk]
             Intfact = wv[kk]  # integration factor
@@ -2290,10 +2282,11 @@ class DynamicBlock(Dynamic):
             #  build terms that will be recycled
             Cw_cpx=self.get_Cw_cpx(zval)
             P_PwCw = P + Cw_cpx.T.dot(Pw.T).T
-            Kernel = np.linalg.inv( zval*Eye - P_PwCw )
+            # the same factorisation is used for the controllability and observability solves
+            Kernel = scalg.lu_factor( zval*Eye - P_PwCw )
 
             ### ----- controllability
-            Ygamma=Intfact*np.dot(Kernel, Bup)
+            Ygamma=Intfact*scalg.lu_solve(Kernel, Bup)
             if self.remove_predictor:
                 Ygamma *= zval
             Ygamma_star = Cw_cpx.dot(Ygamma)
@@ -2308,18 +2301,6 @@ class DynamicBlock(Dynamic):
             else:
                 raise NameError('Specify valid integration order')
 
-            kkvec=range( 2*kk*self.SS.inputs, 2*(kk+1)*self.SS.inputs )
-            Zc[:,kkvec[:self.SS.inputs]]= Qctrl.real #*Intfact
-            Zc[:,kkvec[self.SS.inputs:]]= Qctrl.imag #*Intfact
-
-            ### ----- frequency response
-            if DictBalFreq['get_frequency_response'] and kk < Nk_low:
-                self.Yfreq[:, :, kk] = (1. / Intfact) * \
-                                       (np.dot(self.SS.C[0][0], Ygamma) + \
-                                        np.dot(self.SS.C[0][1], Ygamma_star) + \
-                                        dfact * np.dot(self.SS.C[0][2], Ygamma)) + \
-                                       np.hstack(self.SS.D[0])
-
             ### ----- frequency response
             if DictBalFreq['get_frequency_response'] and kk<Nk_low:
                 self.Yfreq[:,:,kk]= (1./Intfact)*\
@@ -2331,9 +2312,10 @@ class DynamicBlock(Dynamic):
             ### ----- observability
             # solve (1./zval*I - A.T)^{-1} C^T (in low-frequency only)
             if kk >= Nk_low:
-                continue
+                return Qctrl, None
 
             zinv=1./zval
+            Qobs = np.zeros((self.SS.states, self.SS.outputs), dtype=np.complex_)
             Qobs[ii02,:] = zinv*self.SS.C[0][2].T
             if self.integr_order==1:
                 raise NameError('Obs Gramian Integr not implemented')
@@ -2344,7 +2326,7 @@ class DynamicBlock(Dynamic):
             rhs = Cw_cpx.T.dot(self.SS.C[0][1].T) + self.SS.C[0][0].T + \
                   Qobs[ii02,:]*( b0 + zinv*bm1 ) + \
                   np.dot( P_PwCw.T, bp1*Qobs[ii02,:] )
-            Qobs[ii00,:] = np.dot( Kernel.T, rhs )
+            Qobs[ii00,:] = scalg.lu_solve(Kernel, rhs, trans=1)
 
             # solve wake
             Eye_star= libsp.csc_matrix(
@@ -2354,14 +2336,12 @@ class DynamicBlock(Dynamic):
                         Eye_star-self.SS.A[1][1].T,
                         self.SS.C[0][1].T + np.dot(Pw.T, Qobs[ii00,:] + bp1*Qobs[ii02,:]) )
 
-            kkvec=range( 2*kk*self.SS.outputs, 2*(kk+1)*self.SS.outputs )
-            Zo[:,kkvec[:self.SS.outputs]]= Intfact * Qobs.real
-            Zo[:,kkvec[self.SS.outputs:]]= Intfact * Qobs.imag
+            return Qctrl, Intfact * Qobs
 
-        # delete full matrices
-        Kernel = None
-        Qctrl = None
-        Qobs = None
+        # low-rank factors of the Gramians, accumulated over the frequencies
+        Zc, Zo = librom.stream_gramian_factors(solve_frequency, len(kvdt),
+                                               DictBalFreq.get('num_cores', 1),
+                                               DictBalFreq.get('tolerance_lowrank', 0.))
 
         # LRSQM (optimised)
         U,hsv,Vh=scalg.svd( np.dot(Zo.T,Zc), full_matrices=False)
@@ -7,6 +7,18 @@ import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
 
 
+def surface_total_forces(forces):
+    """
+    Args:
+        forces (list(np.ndarray)): Forces at the grid vertices of every surface ``[i_surf][6, M + 1, N + 1]``
+
+    Returns:
+        np.ndarray: Total force of every surface ``(n_surf, 3)``
+    """
+    total_forces = [np.sum(forces_surf[0:3, :, :].reshape((3, -1)), axis=1) for forces_surf in forces]
+    return np.array(total_forces).reshape((-1, 3))
+
+
 class ForcesContainer(object):
     def __init__(self):
         self.ts = 0
@@ -102,6 +114,19 @@ class AeroForcesCalculator(BaseSolver):
         return self.data
 
     def calculate_forces(self):
+        for self.ts in range(self.ts_max):
+            rot = algebra.quat2rotation(self.data.structure.timestep_info[self.ts].quat)
+
+            tstep = self.data.aero.timestep_info[self.ts]
+            total_steady_force = surface_total_forces(tstep.forces)
+            total_unsteady_force = surface_total_forces(tstep.dynamic_forces)
+            tstep.inertial_steady_forces[:, 0:3] = total_steady_force
+            tstep.inertial_unsteady_forces[:, 0:3] = total_unsteady_force
+            tstep.body_steady_forces[:, 0:3] = np.dot(total_steady_force, rot)
+            tstep.body_unsteady_forces[:, 0:3] = np.dot(total_unsteady_force, rot)
+
+    def calculate_forces_loop(self):
+        """Panel by panel version of :meth:`calculate_forces`, kept as reference"""
         for self.ts in range(self.ts_max):
             rot = algebra.quat2rotation(self.data.structure.timestep_info[self.ts].quat)
 
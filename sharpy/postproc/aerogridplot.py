@@ -1,7 +1,6 @@
 import os
 
 import numpy as np
-from tvtk.api import tvtk, write_data
 
 import sharpy.utils.algebra as algebra
 import sharpy.utils.cout_utils as cout
@@ -9,6 +8,7 @@ from sharpy.utils.settings import str2bool
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.aero.utils.uvlmlib as uvlmlib
+import sharpy.utils.vtkutils as vtkutils
 
 
 @solver
@@ -59,8 +59,25 @@ class AerogridPlot(BaseSolver):
     settings_types['num_cores'] = 'int'
     settings_default['num_cores'] = 1
 
+    settings_types['output_format'] = 'str'
+    settings_default['output_format'] = 'vtu'
+    settings_description['output_format'] = 'Output file format. ``vtu`` writes a file per surface and time step, ' \
+                                             '``multiblock`` a multi-block file per time step with the body and ' \
+                                             'wake of every surface, and ``vtkhdf`` a single time series file for ' \
+                                             'the body and one for the wake'
+    settings_options = dict()
+    settings_options['output_format'] = vtkutils.output_formats
+
+    settings_types['asynchronous'] = 'bool'
+    settings_default['asynchronous'] = True
+    settings_description['asynchronous'] = 'Write the files in a background thread'
+
+    settings_types['max_queue'] = 'int'
+    settings_default['max_queue'] = 4
+    settings_description['max_queue'] = 'Maximum number of time steps waiting to be written in the background'
+
     table = settings.SettingsTable()
-    __doc__ += table.generate(settings_types, settings_default, settings_description)
+    __doc__ += table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.settings = None
@@ -71,13 +88,18 @@ class AerogridPlot(BaseSolver):
         self.wake_filename = ''
         self.ts_max = 0
 
+        self.writer = None
+        self.series = dict()
+        self.connectivity = dict()
+        self.point_struct_id = dict()
+
     def initialise(self, data, custom_settings=None):
         self.data = data
         if custom_settings is None:
             self.settings = data.settings[self.solver_id]
         else:
             self.settings = custom_settings
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, self.settings_options)
         self.ts_max = self.data.ts + 1
         # create folder for containing files if necessary
         if not os.path.exists(self.settings['folder']):
@@ -93,204 +115,169 @@ class AerogridPlot(BaseSolver):
                               self.settings['name_prefix'] +
                               'wake_' +
                               self.data.settings['SHARPy']['case'])
+        self.step_filename = (self.folder +
+                              self.settings['name_prefix'] +
+                              self.data.settings['SHARPy']['case'])
+
+        self.writer = vtkutils.AsyncWriter(self.settings['asynchronous'].value, self.settings['max_queue'].value)
+        if self.settings['output_format'] == 'vtkhdf':
+            self.series['body'] = vtkutils.VTKHDFSeries(self.body_filename)
+            self.series['wake'] = vtkutils.VTKHDFSeries(self.wake_filename)
 
     def run(self, online=False):
         # TODO: Create a dictionary to plot any variable as in beamplot
         if not online:
             for self.ts in range(self.ts_max):
-                self.plot_body()
-                self.plot_wake()
+                self.write(self.plot_body(), self.plot_wake())
+            self.writer.flush()
             cout.cout_wrap('...Finished', 1)
         else:
             aero_tsteps = len(self.data.aero.timestep_info) - 1
             struct_tsteps = len(self.data.structure.timestep_info) - 1
             self.ts = np.max((aero_tsteps, struct_tsteps))
-            self.plot_body()
-            self.plot_wake()
+            self.write(self.plot_body(), self.plot_wake())
         return self.data
 
+    def finalise(self):
+        """Waits for the files queued by the online runs to be written"""
+        self.writer.close()
+
+    def write(self, body, wake):
+        """
+        Queues the body and wake grids of the current time step for writing in the selected format.
+
+        Args:
+            body (list(vtkutils.Grid)): body grid of each surface
+            wake (list(vtkutils.Grid)): wake grid of each surface
+        """
+        if self.settings['output_format'] == 'vtu':
+            for i_surf in range(len(body)):
+                self.writer.submit(vtkutils.write_grid, body[i_surf],
+                                   self.body_filename + '_' + '%02u_' % i_surf + '%06u' % self.ts)
+            for i_surf in range(len(wake)):
+                self.writer.submit(vtkutils.write_grid, wake[i_surf],
+                                   self.wake_filename + '_' + '%02u_' % i_surf + '%06u' % self.ts)
+        elif self.settings['output_format'] == 'multiblock':
+            blocks = dict()
+            for i_surf in range(len(body)):
+                blocks['body_%02u' % i_surf] = body[i_surf]
+            for i_surf in range(len(wake)):
+                blocks['wake_%02u' % i_surf] = wake[i_surf]
+            self.writer.submit(vtkutils.write_multiblock, blocks, self.step_filename + '_%06u' % self.ts)
+        elif self.settings['output_format'] == 'vtkhdf':
+            if self.settings['dt'].value > 0.:
+                time_value = self.ts*self.settings['dt'].value
+            else:
+                time_value = float(self.ts)
+            self.writer.submit(self.series['body'].append, time_value, vtkutils.merge_grids(body))
+            self.writer.submit(self.series['wake'].append, time_value, vtkutils.merge_grids(wake))
+
+    def get_connectivity(self, m, n):
+        try:
+            return self.connectivity[(m, n)]
+        except KeyError:
+            self.connectivity[(m, n)] = vtkutils.quad_connectivity(m, n)
+            return self.connectivity[(m, n)]
+
+    def get_coords(self, zeta):
+        coords = vtkutils.grid_points(zeta)
+        if self.settings['include_rbm']:
+            coords += self.data.structure.timestep_info[self.ts].for_pos[0:3]
+        if self.settings['include_forward_motion']:
+            coords[:, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
+        return coords
+
     def plot_body(self):
-        for i_surf in range(self.data.aero.timestep_info[self.ts].n_surf):
-            filename = (self.body_filename +
-                        '_' +
-                        '%02u_' % i_surf +
-                        '%06u' % self.ts)
-
-            dims = self.data.aero.timestep_info[self.ts].dimensions[i_surf, :]
-            point_data_dim = (dims[0]+1)*(dims[1]+1)  # + (dims_star[0]+1)*(dims_star[1]+1)
-            panel_data_dim = (dims[0])*(dims[1])  # + (dims_star[0])*(dims_star[1])
-
-            coords = np.zeros((point_data_dim, 3))
-            conn = []
-            panel_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_surf_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_gamma = np.zeros((panel_data_dim,))
-            panel_gamma_dot = np.zeros((panel_data_dim,))
-            normal = np.zeros((panel_data_dim, 3))
-            point_struct_id = np.zeros((point_data_dim,), dtype=int)
-            point_cf = np.zeros((point_data_dim, 3))
-            point_unsteady_cf = np.zeros((point_data_dim, 3))
-            zeta_dot = np.zeros((point_data_dim, 3))
-            u_inf = np.zeros((point_data_dim, 3))
-            if self.settings['include_velocities']:
-                vel = np.zeros((point_data_dim, 3))
-            counter = -1
+        """
+        Returns:
+            list(vtkutils.Grid): body grid of each surface at the current time step
+        """
+        tstep = self.data.aero.timestep_info[self.ts]
+        grids = []
+        for i_surf in range(tstep.n_surf):
+            dims = tstep.dimensions[i_surf, :]
+            point_data_dim = (dims[0]+1)*(dims[1]+1)
+            panel_data_dim = (dims[0])*(dims[1])
 
             # coordinates of corners
-            for i_n in range(dims[1]+1):
-                for i_m in range(dims[0]+1):
-                    counter += 1
-                    coords[counter, :] = self.data.aero.timestep_info[self.ts].zeta[i_surf][:, i_m, i_n]
-                    if self.settings['include_rbm']:
-                        coords[counter, :] += self.data.structure.timestep_info[self.ts].for_pos[0:3]
-                    if self.settings['include_forward_motion']:
-                        coords[counter, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
+            coords = self.get_coords(tstep.zeta[i_surf][:, :dims[0] + 1, :dims[1] + 1])
+
+            try:
+                point_struct_id = self.point_struct_id[i_surf]
+            except KeyError:
+                point_struct_id = np.repeat(np.array(self.data.aero.aero2struct_mapping[i_surf][:dims[1] + 1],
+                                                     dtype=int),
+                                            dims[0] + 1)
+                self.point_struct_id[i_surf] = point_struct_id
+
+            # point data
+            point_cf = vtkutils.grid_points(tstep.forces[i_surf][0:3, :dims[0] + 1, :dims[1] + 1])
+            point_arrays = dict()
+            for name in ['dynamic_forces', 'zeta_dot', 'u_ext']:
+                try:
+                    point_arrays[name] = vtkutils.grid_points(getattr(tstep, name)[i_surf][0:3, :dims[0] + 1,
+                                                                                            :dims[1] + 1])
+                except AttributeError:
+                    point_arrays[name] = np.zeros((point_data_dim, 3))
+
+            # cell data
+            panel_id = np.arange(panel_data_dim, dtype=int)
+            panel_surf_id = np.full((panel_data_dim,), i_surf, dtype=int)
+            panel_gamma = vtkutils.grid_cells(tstep.gamma[i_surf][:dims[0], :dims[1]])
+            panel_gamma_dot = vtkutils.grid_cells(tstep.gamma_dot[i_surf][:dims[0], :dims[1]])
+            normal = vtkutils.grid_cells(tstep.normals[i_surf][:, :dims[0], :dims[1]])
 
             with_incidence_angle = True
             try:
-                self.data.aero.timestep_info[self.ts].postproc_cell['incidence_angle']
+                incidence_angle = vtkutils.grid_cells(
+                    tstep.postproc_cell['incidence_angle'][i_surf][:dims[0], :dims[1]])
             except KeyError:
                 with_incidence_angle = False
-            else:
-                incidence_angle = np.zeros_like(panel_gamma)
-
-            counter = -1
-            node_counter = -1
-            for i_n in range(dims[1] + 1):
-                global_counter = self.data.aero.aero2struct_mapping[i_surf][i_n]
-                for i_m in range(dims[0] + 1):
-                    node_counter += 1
-                    # point data
-                    point_struct_id[node_counter] = global_counter
-                    point_cf[node_counter, :] = self.data.aero.timestep_info[self.ts].forces[i_surf][0:3, i_m, i_n]
-                    try:
-                        point_unsteady_cf[node_counter, :] = self.data.aero.timestep_info[self.ts].dynamic_forces[i_surf][0:3, i_m, i_n]
-                    except AttributeError:
-                        pass
-                    try:
-                        zeta_dot[node_counter, :] = self.data.aero.timestep_info[self.ts].zeta_dot[i_surf][0:3, i_m, i_n]
-                    except AttributeError:
-                        pass
-                    try:
-                        u_inf[node_counter, :] = self.data.aero.timestep_info[self.ts].u_ext[i_surf][0:3, i_m, i_n]
-                    except AttributeError:
-                        pass
-                    if i_n < dims[1] and i_m < dims[0]:
-                        counter += 1
-                    else:
-                        continue
-
-                    conn.append([node_counter + 0,
-                                 node_counter + 1,
-                                 node_counter + dims[0]+2,
-                                 node_counter + dims[0]+1])
-                    # cell data
-                    normal[counter, :] = self.data.aero.timestep_info[self.ts].normals[i_surf][:, i_m, i_n]
-                    panel_id[counter] = counter
-                    panel_surf_id[counter] = i_surf
-                    panel_gamma[counter] = self.data.aero.timestep_info[self.ts].gamma[i_surf][i_m, i_n]
-                    panel_gamma_dot[counter] = self.data.aero.timestep_info[self.ts].gamma_dot[i_surf][i_m, i_n]
-
-                    if with_incidence_angle:
-                        incidence_angle[counter] = \
-                            self.data.aero.timestep_info[self.ts].postproc_cell['incidence_angle'][i_surf][i_m, i_n]
 
-            if self.settings['include_velocities']:
-                vel = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(self.data.aero.timestep_info[self.ts],
-                                                                                              coords,
-                                                                                              self.data.aero.timestep_info[self.ts].for_pos,
-                                                                                              self.settings['numcores'])
-
-            ug = tvtk.UnstructuredGrid(points=coords)
-            ug.set_cells(tvtk.Quad().cell_type, conn)
-            ug.cell_data.scalars = panel_id
-            ug.cell_data.scalars.name = 'panel_n_id'
-            ug.cell_data.add_array(panel_surf_id)
-            ug.cell_data.get_array(1).name = 'panel_surface_id'
-            ug.cell_data.add_array(panel_gamma)
-            ug.cell_data.get_array(2).name = 'panel_gamma'
-            ug.cell_data.add_array(panel_gamma_dot)
-            ug.cell_data.get_array(3).name = 'panel_gamma_dot'
+            grid = vtkutils.Grid(coords, self.get_connectivity(dims[0], dims[1]), 'quad')
+            grid.add_cell_data('panel_n_id', panel_id)
+            grid.add_cell_data('panel_surface_id', panel_surf_id)
+            grid.add_cell_data('panel_gamma', panel_gamma)
+            grid.add_cell_data('panel_gamma_dot', panel_gamma_dot)
             if with_incidence_angle:
-                ug.cell_data.add_array(incidence_angle)
-                ug.cell_data.get_array(4).name = 'incidence_angle'
-            ug.cell_data.vectors = normal
-            ug.cell_data.vectors.name = 'panel_normal'
-            ug.point_data.scalars = np.arange(0, coords.shape[0])
-            ug.point_data.scalars.name = 'n_id'
-            ug.point_data.add_array(point_struct_id)
-            ug.point_data.get_array(1).name = 'point_struct_id'
-            ug.point_data.add_array(point_cf)
-            ug.point_data.get_array(2).name = 'point_steady_force'
-            ug.point_data.add_array(point_unsteady_cf)
-            ug.point_data.get_array(3).name = 'point_unsteady_force'
-            ug.point_data.add_array(zeta_dot)
-            ug.point_data.get_array(4).name = 'zeta_dot'
-            ug.point_data.add_array(u_inf)
-            ug.point_data.get_array(5).name = 'u_inf'
+                grid.add_cell_data('incidence_angle', incidence_angle)
+            grid.add_cell_data('panel_normal', normal)
+            grid.add_point_data('n_id', np.arange(0, coords.shape[0]))
+            grid.add_point_data('point_struct_id', point_struct_id)
+            grid.add_point_data('point_steady_force', point_cf)
+            grid.add_point_data('point_unsteady_force', point_arrays['dynamic_forces'])
+            grid.add_point_data('zeta_dot', point_arrays['zeta_dot'])
+            grid.add_point_data('u_inf', point_arrays['u_ext'])
             if self.settings['include_velocities']:
-                ug.point_data.add_array(vel)
-                ug.point_data.get_array(6).name = 'velocity'
-            write_data(ug, filename)
+                vel = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(tstep,
+                                                                              coords,
+                                                                              tstep.for_pos,
+                                                                              self.settings['num_cores'])
+                grid.add_point_data('velocity', vel)
+            grids.append(grid)
+        return grids
 
     def plot_wake(self):
-        for i_surf in range(self.data.aero.timestep_info[self.ts].n_surf):
-            filename = (self.wake_filename +
-                        '_' +
-                        '%02u_' % i_surf +
-                        '%06u' % self.ts)
-
-            dims_star = self.data.aero.timestep_info[self.ts].dimensions_star[i_surf, :]
-            dims_star[0] -= self.settings['minus_m_star']
+        """
+        Returns:
+            list(vtkutils.Grid): wake grid of each surface at the current time step
+        """
+        tstep = self.data.aero.timestep_info[self.ts]
+        grids = []
+        for i_surf in range(tstep.n_surf):
+            dims_star = tstep.dimensions_star[i_surf, :].copy()
+            dims_star[0] -= self.settings['minus_m_star'].value
 
-            point_data_dim = (dims_star[0]+1)*(dims_star[1]+1)
             panel_data_dim = (dims_star[0])*(dims_star[1])
 
-            coords = np.zeros((point_data_dim, 3))
-            conn = []
-            panel_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_surf_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_gamma = np.zeros((panel_data_dim,))
-            counter = -1
-            # rotation_mat = self.data.structure.timestep_info[self.ts].cga().T
             # coordinates of corners
-            for i_n in range(dims_star[1]+1):
-                for i_m in range(dims_star[0]+1):
-                    counter += 1
-                    coords[counter, :] = self.data.aero.timestep_info[self.ts].zeta_star[i_surf][:, i_m, i_n]
-                    if self.settings['include_rbm']:
-                        coords[counter, :] += self.data.structure.timestep_info[self.ts].for_pos[0:3]
-                    if self.settings['include_forward_motion']:
-                        coords[counter, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
-
-            counter = -1
-            node_counter = -1
-            # wake
-            for i_n in range(dims_star[1]+1):
-                for i_m in range(dims_star[0]+1):
-                    node_counter += 1
-                    # cell data
-                    if i_n < dims_star[1] and i_m < dims_star[0]:
-                        counter += 1
-                    else:
-                        continue
-
-                    conn.append([node_counter + 0,
-                                 node_counter + 1,
-                                 node_counter + dims_star[0]+2,
-                                 node_counter + dims_star[0]+1])
-                    panel_id[counter] = counter
-                    panel_surf_id[counter] = i_surf
-                    panel_gamma[counter] = self.data.aero.timestep_info[self.ts].gamma_star[i_surf][i_m, i_n]
-
-            ug = tvtk.UnstructuredGrid(points=coords)
-            ug.set_cells(tvtk.Quad().cell_type, conn)
-            ug.cell_data.scalars = panel_id
-            ug.cell_data.scalars.name = 'panel_n_id'
-            ug.cell_data.add_array(panel_surf_id)
-            ug.cell_data.get_array(1).name = 'panel_surface_id'
-            ug.cell_data.add_array(panel_gamma)
-            ug.cell_data.get_array(2).name = 'panel_gamma'
-            ug.point_data.scalars = np.arange(0, coords.shape[0])
-            ug.point_data.scalars.name = 'n_id'
-            write_data(ug, filename)
+            coords = self.get_coords(tstep.zeta_star[i_surf][:, :dims_star[0] + 1, :dims_star[1] + 1])
+
+            grid = vtkutils.Grid(coords, self.get_connectivity(dims_star[0], dims_star[1]), 'quad')
+            grid.add_cell_data('panel_n_id', np.arange(panel_data_dim, dtype=int))
+            grid.add_cell_data('panel_surface_id', np.full((panel_data_dim,), i_surf, dtype=int))
+            grid.add_cell_data('panel_gamma',
+                               vtkutils.grid_cells(tstep.gamma_star[i_surf][:dims_star[0], :dims_star[1]]))
+            grid.add_point_data('n_id', np.arange(0, coords.shape[0]))
+            grids.append(grid)
+        return grids
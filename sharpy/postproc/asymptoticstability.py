@@ -3,7 +3,7 @@ import warnings as warn
 import numpy as np
 import scipy.linalg as sclalg
 import sharpy.utils.settings as settings
-from sharpy.utils.solver_interface import solver, BaseSolver, initialise_solver
+from sharpy.utils.solver_interface import solver, BaseSolver, initialise_solver, finalise_postprocessors
 import sharpy.utils.h5utils as h5
 import sharpy.utils.cout_utils as cout
 import sharpy.utils.algebra as algebra
@@ -354,6 +354,7 @@ class AsymptoticStability(BaseSolver):
 
                 for postproc in postprocessor_list:
                     self.data = postprocessors[postproc].run(online=True)
+            finalise_postprocessors(postprocessors)
 
             # Delete 'modal' timesteps ready for next mode
             del self.data.structure.timestep_info[1:]
@@ -2,6 +2,7 @@ import numpy as np
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.structure.utils.xbeamlib as xbeamlib
+from sharpy.structure.utils.loadrecovery import BeamLoadRecovery, stack_timesteps
 
 
 @solver
@@ -9,6 +10,10 @@ class BeamLoads(BaseSolver):
     """
     Writes to file the total loads acting on the beam elements
 
+    The strains and loads of all the time steps are computed at once with
+    :class:`~sharpy.structure.utils.loadrecovery.BeamLoadRecovery`. The per time step ``cbeam3_loads`` of the xbeam
+    library is used instead with ``xbeam_loads``.
+
     """
     solver_id = 'BeamLoads'
     solver_classification = 'post-processor'
@@ -29,6 +34,11 @@ class BeamLoads(BaseSolver):
     settings_default['folder'] = './output'
     settings_description['folder'] = 'Output folder path'
 
+    settings_types['xbeam_loads'] = 'bool'
+    settings_default['xbeam_loads'] = False
+    settings_description['xbeam_loads'] = 'Compute the loads of every time step with ``cbeam3_loads`` of the xbeam ' \
+                                          'library (reference implementation) instead of the batched recovery'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -40,6 +50,8 @@ class BeamLoads(BaseSolver):
         self.folder = ''
         self.filename = ''
 
+        self.load_recovery = None
+
     def initialise(self, data, custom_settings=None):
         self.data = data
         if custom_settings is None:
@@ -47,6 +59,7 @@ class BeamLoads(BaseSolver):
         else:
             self.settings = custom_settings
         settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        self.load_recovery = BeamLoadRecovery(self.data.structure)
 
     def run(self, online=False):
         self.calculate_loads(online)
@@ -96,24 +109,32 @@ class BeamLoads(BaseSolver):
                 np.savetxt(filename, data, delimiter=',', header=header)
 
     def calculate_loads(self, online):
+        timestep_info = self.data.structure.timestep_info
         if online:
-            it = -1
-            (self.data.structure.timestep_info[it].postproc_cell['strain'],
-             self.data.structure.timestep_info[it].postproc_cell['loads']) = xbeamlib.cbeam3_loads(self.data.structure,
-                                                                                                   it)
-            self.calculate_coords_a(self.data.structure.timestep_info[it])
+            its = [len(timestep_info) - 1]
         else:
-            for it in range(len(self.data.structure.timestep_info)):
-                (self.data.structure.timestep_info[it].postproc_cell['strain'],
-                 self.data.structure.timestep_info[it].postproc_cell['loads']) = xbeamlib.cbeam3_loads(self.data.structure,
-                                                                                                       it)
-                self.calculate_coords_a(self.data.structure.timestep_info[it])
+            its = [it for it in range(len(timestep_info)) if timestep_info[it] is not None]
+        if not its:
+            return
+
+        if self.settings['xbeam_loads']:
+            for it in its:
+                (timestep_info[it].postproc_cell['strain'],
+                 timestep_info[it].postproc_cell['loads']) = xbeamlib.cbeam3_loads(self.data.structure, it)
+                self.calculate_coords_a(timestep_info[it])
+            return
+
+        timesteps = [timestep_info[it] for it in its]
+        pos, psi = stack_timesteps(timesteps)
+        strain, loads = self.load_recovery.strain_and_loads(pos, psi)
+        coords_a = self.load_recovery.coords_a(pos)
+        for i_tstep, tstep in enumerate(timesteps):
+            tstep.postproc_cell['strain'] = strain[i_tstep]
+            tstep.postproc_cell['loads'] = loads[i_tstep]
+            tstep.postproc_cell['coords_a'] = coords_a[i_tstep]
 
     def calculate_coords_a(self, timestep_info):
-        timestep_info.postproc_cell['coords_a'] = np.zeros((timestep_info.num_elem, 3))
-        for ielem in range(timestep_info.num_elem):
-            iglobal_node = self.data.structure.connectivities[ielem, 2]
-            timestep_info.postproc_cell['coords_a'][ielem, :] = timestep_info.pos[iglobal_node, :]
+        timestep_info.postproc_cell['coords_a'] = self.load_recovery.coords_a(timestep_info.pos[None, :, :])[0]
 
     # def calculate_loads(self):
     #     # initial (ini) loads
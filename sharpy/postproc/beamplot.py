@@ -1,12 +1,12 @@
 import os
 
 import numpy as np
-from tvtk.api import tvtk, write_data
 
 import sharpy.utils.cout_utils as cout
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
+import sharpy.utils.vtkutils as vtkutils
 
 
 @solver
@@ -49,8 +49,25 @@ class BeamPlot(BaseSolver):
     settings_default['output_rbm'] = True
     settings_description['output_rbm'] = 'Write ``csv`` file with rigid body motion data'
 
+    settings_types['output_format'] = 'str'
+    settings_default['output_format'] = 'vtu'
+    settings_description['output_format'] = 'Output file format of the beam. ``vtu`` writes a file per time step, ' \
+                                             '``multiblock`` a multi-block file per time step and ``vtkhdf`` a ' \
+                                             'single time series file. The frames of reference are always written ' \
+                                             'to a ``vtp`` file per time step'
+    settings_options = dict()
+    settings_options['output_format'] = vtkutils.output_formats
+
+    settings_types['asynchronous'] = 'bool'
+    settings_default['asynchronous'] = True
+    settings_description['asynchronous'] = 'Write the files in a background thread'
+
+    settings_types['max_queue'] = 'int'
+    settings_default['max_queue'] = 4
+    settings_description['max_queue'] = 'Maximum number of time steps waiting to be written in the background'
+
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
 
@@ -60,13 +77,19 @@ class BeamPlot(BaseSolver):
         self.folder = ''
         self.filename = ''
 
+        self.writer = None
+        self.series = None
+        self.connectivity = None
+        self.master_elem = None
+        self.master_node = None
+
     def initialise(self, data, custom_settings=None):
         self.data = data
         if custom_settings is None:
             self.settings = data.settings[self.solver_id]
         else:
             self.settings = custom_settings
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, self.settings_options)
         # create folder for containing files if necessary
         if not os.path.exists(self.settings['folder']):
             os.makedirs(self.settings['folder'])
@@ -82,13 +105,22 @@ class BeamPlot(BaseSolver):
                          'for_' +
                          self.data.settings['SHARPy']['case'])
 
+        self.writer = vtkutils.AsyncWriter(self.settings['asynchronous'].value, self.settings['max_queue'].value)
+        if self.settings['output_format'] == 'vtkhdf':
+            self.series = vtkutils.VTKHDFSeries(self.filename)
+
     def run(self, online=False):
         self.plot(online)
         if not online:
             self.write()
+            self.writer.flush()
             cout.cout_wrap('...Finished', 1)
         return self.data
 
+    def finalise(self):
+        """Waits for the files queued by the online runs to be written"""
+        self.writer.close()
+
     def write(self):
         if self.settings['output_rbm']:
             filename = self.filename + '_rbm_acc.csv'
@@ -116,34 +148,25 @@ class BeamPlot(BaseSolver):
                        '%06u' % it)
         num_nodes = self.data.structure.num_node
         num_elem = self.data.structure.num_elem
+        tstep = self.data.structure.timestep_info[it]
 
-        coords = np.zeros((num_nodes, 3))
-        conn = np.zeros((num_elem, 3), dtype=int)
-        node_id = np.zeros((num_nodes,), dtype=int)
-        elem_id = np.zeros((num_elem,), dtype=int)
-        coords_a_cell = np.zeros((num_elem, 3), dtype=int)
-        local_x = np.zeros((num_nodes, 3))
-        local_y = np.zeros((num_nodes, 3))
-        local_z = np.zeros((num_nodes, 3))
-        coords_a = np.zeros((num_nodes, 3))
-
-        app_forces = np.zeros((num_nodes, 3))
-        app_moment = np.zeros((num_nodes, 3))
-
-        forces_constraints_nodes = np.zeros((num_nodes, 3))
-        moments_constraints_nodes = np.zeros((num_nodes, 3))
+        # time invariant connectivity and master element of each node
+        if self.connectivity is None:
+            self.connectivity = np.array([self.data.structure.elements[i_elem].reordered_global_connectivities
+                                          for i_elem in range(num_elem)], dtype=int)
+            self.master_elem = self.data.structure.node_master_elem[:, 0].copy()
+            self.master_node = self.data.structure.node_master_elem[:, 1].copy()
 
         # aero2inertial rotation
-        aero2inertial = self.data.structure.timestep_info[it].cga()
+        aero2inertial = tstep.cga()
 
         # coordinates of corners
-        coords = self.data.structure.timestep_info[it].glob_pos(include_rbm=self.settings['include_rbm'])
+        coords = tstep.glob_pos(include_rbm=self.settings['include_rbm'])
 
         # check if I can output gravity forces
         with_gravity = False
         try:
-            gravity_forces = self.data.structure.timestep_info[it].gravity_forces[:]
-            gravity_forces_g = np.zeros_like(gravity_forces)
+            gravity_forces = tstep.gravity_forces[:]
             with_gravity = True
         except AttributeError:
             pass
@@ -151,24 +174,21 @@ class BeamPlot(BaseSolver):
         # check if postproc dicts are present and count/prepare
         with_postproc_cell = False
         try:
-            self.data.structure.timestep_info[it].postproc_cell
+            tstep.postproc_cell
             with_postproc_cell = True
         except AttributeError:
             pass
         with_postproc_node = False
         try:
-            self.data.structure.timestep_info[it].postproc_node
+            tstep.postproc_node
             with_postproc_node = True
         except AttributeError:
             pass
 
         # count number of arguments
-        postproc_cell_keys = self.data.structure.timestep_info[it].postproc_cell.keys()
-        postproc_cell_vals = self.data.structure.timestep_info[it].postproc_cell.values()
-        postproc_cell_scalar = []
         postproc_cell_vector = []
         postproc_cell_6vector = []
-        for k, v in self.data.structure.timestep_info[it].postproc_cell.items():
+        for k, v in tstep.postproc_cell.items():
             _, cols = v.shape
             if cols == 1:
                 raise NotImplementedError('scalar cell types not supported in beamplot (Easy to implement)')
@@ -180,12 +200,9 @@ class BeamPlot(BaseSolver):
             else:
                 raise AttributeError('Only scalar and 3-vector types supported in beamplot')
         # count number of arguments
-        postproc_node_keys = self.data.structure.timestep_info[it].postproc_node.keys()
-        postproc_node_vals = self.data.structure.timestep_info[it].postproc_node.values()
-        postproc_node_scalar = []
         postproc_node_vector = []
         postproc_node_6vector = []
-        for k, v in self.data.structure.timestep_info[it].postproc_node.items():
+        for k, v in tstep.postproc_node.items():
             _, cols = v.shape
             if cols == 1:
                 raise NotImplementedError('scalar node types not supported in beamplot (Easy to implement)')
@@ -197,155 +214,93 @@ class BeamPlot(BaseSolver):
             else:
                 raise AttributeError('Only scalar and 3-vector types supported in beamplot')
 
-        for i_node in range(num_nodes):
-            i_elem = self.data.structure.node_master_elem[i_node, 0]
-            i_local_node = self.data.structure.node_master_elem[i_node, 1]
-            node_id[i_node] = i_node
-
-            v1 = np.array([1., 0, 0])
-            v2 = np.array([0., 1, 0])
-            v3 = np.array([0., 0, 1])
-            cab = algebra.crv2rotation(
-                self.data.structure.timestep_info[it].psi[i_elem, i_local_node, :])
-            local_x[i_node, :] = np.dot(aero2inertial, np.dot(cab, v1))
-            local_y[i_node, :] = np.dot(aero2inertial, np.dot(cab, v2))
-            local_z[i_node, :] = np.dot(aero2inertial, np.dot(cab, v3))
-
-            if i_local_node == 2:
-                coords_a_cell[i_elem, :] = self.data.structure.timestep_info[it].pos[i_node, :]
-            coords_a[i_node, :] = self.data.structure.timestep_info[it].pos[i_node, :]
-
-            # applied forces
-            cab = algebra.crv2rotation(self.data.structure.timestep_info[it].psi[i_elem, i_local_node, :])
-            app_forces[i_node, :] = np.dot(aero2inertial,
-                                           np.dot(cab,
-                                                  self.data.structure.timestep_info[it].steady_applied_forces[i_node, 0:3]+
-                                                  self.data.structure.timestep_info[it].unsteady_applied_forces[i_node, 0:3]))
-            app_moment[i_node, :] = np.dot(aero2inertial,
-                                           np.dot(cab,
-                                                  self.data.structure.timestep_info[it].steady_applied_forces[i_node, 3:6]+
-                                                  self.data.structure.timestep_info[it].unsteady_applied_forces[i_node, 3:6]))
-            forces_constraints_nodes[i_node, :] = np.dot(aero2inertial,
-                                           np.dot(cab,
-                                                  self.data.structure.timestep_info[it].forces_constraints_nodes[i_node, 0:3]))
-            moments_constraints_nodes[i_node, :] = np.dot(aero2inertial,
-                                           np.dot(cab,
-                                                  self.data.structure.timestep_info[it].forces_constraints_nodes[i_node, 3:6]))
+        # nodal triads in the inertial frame: columns of C^{GA} C^{AB}
+        cab = algebra.crv2rotation_vec(tstep.psi[self.master_elem, self.master_node, :])
+        cgb = np.matmul(aero2inertial, cab)
+        local_x = np.array(cgb[:, :, 0])
+        local_y = np.array(cgb[:, :, 1])
+        local_z = np.array(cgb[:, :, 2])
 
-            if with_gravity:
-                gravity_forces_g[i_node, 0:3] = np.dot(aero2inertial,
-                                                     gravity_forces[i_node, 0:3])
-                gravity_forces_g[i_node, 3:6] = np.dot(aero2inertial,
-                                                     gravity_forces[i_node, 3:6])
-
-        for i_elem in range(num_elem):
-            conn[i_elem, :] = self.data.structure.elements[i_elem].reordered_global_connectivities
-            elem_id[i_elem] = i_elem
-
-        ug = tvtk.UnstructuredGrid(points=coords)
-        ug.set_cells(tvtk.Line().cell_type, conn)
-        ug.cell_data.scalars = elem_id
-        ug.cell_data.scalars.name = 'elem_id'
-        counter = 1
+        coords_a = tstep.pos.copy()
+        coords_a_cell = np.zeros((num_elem, 3))
+        last_node = self.master_node == 2
+        coords_a_cell[self.master_elem[last_node], :] = tstep.pos[last_node, :]
+
+        def to_inertial(b_vectors):
+            return np.matmul(cgb, b_vectors[:, :, None])[:, :, 0]
+
+        applied_forces = tstep.steady_applied_forces + tstep.unsteady_applied_forces
+        app_forces = to_inertial(applied_forces[:, 0:3])
+        app_moment = to_inertial(applied_forces[:, 3:6])
+        forces_constraints_nodes = to_inertial(tstep.forces_constraints_nodes[:, 0:3])
+        moments_constraints_nodes = to_inertial(tstep.forces_constraints_nodes[:, 3:6])
+
+        if with_gravity:
+            gravity_forces_g = np.zeros_like(gravity_forces)
+            gravity_forces_g[:, 0:3] = np.dot(gravity_forces[:, 0:3], aero2inertial.T)
+            gravity_forces_g[:, 3:6] = np.dot(gravity_forces[:, 3:6], aero2inertial.T)
+
+        grid = vtkutils.Grid(coords, self.connectivity, 'line')
+        grid.add_cell_data('elem_id', np.arange(num_elem, dtype=int))
         if with_postproc_cell:
             for k in postproc_cell_vector:
-                ug.cell_data.add_array(self.data.structure.timestep_info[it].postproc_cell[k])
-                ug.cell_data.get_array(counter).name = k + '_cell'
-                counter += 1
+                grid.add_cell_data(k + '_cell', np.array(tstep.postproc_cell[k]))
             for k in postproc_cell_6vector:
                 for i in range(0, 2):
-                    ug.cell_data.add_array(self.data.structure.timestep_info[it].postproc_cell[k][:, 3*i:3*(i+1)])
-                    ug.cell_data.get_array(counter).name = k + '_' + str(i) + '_cell'
-                    counter += 1
-        ug.cell_data.add_array(coords_a_cell)
-        ug.cell_data.get_array(counter).name = 'coords_a_elem'
-        counter += 1
-
-        ug.point_data.scalars = node_id
-        ug.point_data.scalars.name = 'node_id'
-        point_vector_counter = 1
-        ug.point_data.add_array(local_x, 'vector')
-        ug.point_data.get_array(point_vector_counter).name = 'local_x'
-        point_vector_counter += 1
-        ug.point_data.add_array(local_y, 'vector')
-        ug.point_data.get_array(point_vector_counter).name = 'local_y'
-        point_vector_counter += 1
-        ug.point_data.add_array(local_z, 'vector')
-        ug.point_data.get_array(point_vector_counter).name = 'local_z'
-        point_vector_counter += 1
-        ug.point_data.add_array(coords_a, 'vector')
-        ug.point_data.get_array(point_vector_counter).name = 'coords_a'
+                    grid.add_cell_data(k + '_' + str(i) + '_cell', np.array(tstep.postproc_cell[k][:, 3*i:3*(i+1)]))
+        grid.add_cell_data('coords_a_elem', coords_a_cell)
+
+        grid.add_point_data('node_id', np.arange(num_nodes, dtype=int))
+        grid.add_point_data('local_x', local_x)
+        grid.add_point_data('local_y', local_y)
+        grid.add_point_data('local_z', local_z)
+        grid.add_point_data('coords_a', coords_a)
         if self.settings['include_applied_forces']:
-            point_vector_counter += 1
-            ug.point_data.add_array(app_forces, 'vector')
-            ug.point_data.get_array(point_vector_counter).name = 'app_forces'
-            point_vector_counter += 1
-            ug.point_data.add_array(forces_constraints_nodes, 'vector')
-            ug.point_data.get_array(point_vector_counter).name = 'forces_constraints_nodes'
+            grid.add_point_data('app_forces', app_forces)
+            grid.add_point_data('forces_constraints_nodes', forces_constraints_nodes)
             if with_gravity:
-                point_vector_counter += 1
-                ug.point_data.add_array(gravity_forces_g[:, 0:3], 'vector')
-                ug.point_data.get_array(point_vector_counter).name = 'gravity_forces'
+                grid.add_point_data('gravity_forces', gravity_forces_g[:, 0:3])
 
         if self.settings['include_applied_moments']:
-            point_vector_counter += 1
-            ug.point_data.add_array(app_moment, 'vector')
-            ug.point_data.get_array(point_vector_counter).name = 'app_moments'
-            point_vector_counter += 1
-            ug.point_data.add_array(moments_constraints_nodes, 'vector')
-            ug.point_data.get_array(point_vector_counter).name = 'moments_constraints_nodes'
+            grid.add_point_data('app_moments', app_moment)
+            grid.add_point_data('moments_constraints_nodes', moments_constraints_nodes)
             if with_gravity:
-                point_vector_counter += 1
-                ug.point_data.add_array(gravity_forces_g[:, 3:6], 'vector')
-                ug.point_data.get_array(point_vector_counter).name = 'gravity_moments'
+                grid.add_point_data('gravity_moments', gravity_forces_g[:, 3:6])
         if with_postproc_node:
             for k in postproc_node_vector:
-                point_vector_counter += 1
-                ug.point_data.add_array(self.data.structure.timestep_info[it].postproc_node[k])
-                ug.point_data.get_array(point_vector_counter).name = k + '_point'
+                grid.add_point_data(k + '_point', np.array(tstep.postproc_node[k]))
             for k in postproc_node_6vector:
                 for i in range(0, 2):
-                    point_vector_counter += 1
-                    ug.point_data.add_array(self.data.structure.timestep_info[it].postproc_node[k][:, 3*i:3*(i+1)])
-                    ug.point_data.get_array(point_vector_counter).name = k + '_' + str(i) + '_point'
+                    grid.add_point_data(k + '_' + str(i) + '_point', np.array(tstep.postproc_node[k][:, 3*i:3*(i+1)]))
 
-        write_data(ug, it_filename)
+        if self.settings['output_format'] == 'vtu':
+            self.writer.submit(vtkutils.write_grid, grid, it_filename)
+        elif self.settings['output_format'] == 'multiblock':
+            self.writer.submit(vtkutils.write_multiblock, {'beam': grid}, it_filename)
+        elif self.settings['output_format'] == 'vtkhdf':
+            self.writer.submit(self.series.append, float(it), grid)
 
     def write_for(self, it):
         it_filename = (self.filename_for +
                        '%06u' % it)
-
-        forces_constraints_FoR = np.zeros((self.data.structure.num_bodies, 3))
-        moments_constraints_FoR = np.zeros((self.data.structure.num_bodies, 3))
-        # TODO: what should I do with the forces of the quaternion?
+        tstep = self.data.structure.timestep_info[it]
+        num_bodies = self.data.structure.num_bodies
 
         # aero2inertial rotation
-        aero2inertial = self.data.structure.timestep_info[it].cga()
+        aero2inertial = tstep.cga()
 
         # coordinates of corners
-        FoR_coords = np.zeros((self.data.structure.num_bodies, 3))
         if self.settings['include_rbm']:
             offset = np.zeros((3,))
         else:
-            offset = self.data.structure.timestep_info[it].mb_FoR_pos[0, 0:3]
-        for ibody in range(self.data.structure.num_bodies):
-            FoR_coords[ibody, :] = self.data.structure.timestep_info[it].mb_FoR_pos[ibody, 0:3] - offset
-
-        for ibody in range(self.data.structure.num_bodies):
-            forces_constraints_FoR[ibody, :] = np.dot(aero2inertial,
-                                                  self.data.structure.timestep_info[it].forces_constraints_FoR[ibody, 0:3])
-            moments_constraints_FoR[ibody, :] = np.dot(aero2inertial,
-                                                  self.data.structure.timestep_info[it].forces_constraints_FoR[ibody, 3:6])
-
-        FoRmesh = tvtk.PolyData()
-        FoRmesh.points = FoR_coords
-        for_vector_counter = -1
-        for_vector_counter += 1
-        FoRmesh.point_data.add_array(forces_constraints_FoR , 'vector')
-        FoRmesh.point_data.get_array(for_vector_counter).name = 'forces_constraints_FoR'
-
-        for_vector_counter += 1
-        FoRmesh.point_data.add_array(moments_constraints_FoR , 'vector')
-        FoRmesh.point_data.get_array(for_vector_counter).name = 'moments_constraints_FoR'
-
-        write_data(FoRmesh, it_filename)
+            offset = tstep.mb_FoR_pos[0, 0:3]
+        FoR_coords = tstep.mb_FoR_pos[:num_bodies, 0:3] - offset
+
+        # TODO: what should I do with the forces of the quaternion?
+        forces_constraints_FoR = np.dot(tstep.forces_constraints_FoR[:num_bodies, 0:3], aero2inertial.T)
+        moments_constraints_FoR = np.dot(tstep.forces_constraints_FoR[:num_bodies, 3:6], aero2inertial.T)
+
+        self.writer.submit(vtkutils.write_points, FoR_coords,
+                           [('forces_constraints_FoR', forces_constraints_FoR),
+                            ('moments_constraints_FoR', moments_constraints_FoR)],
+                           it_filename)
@@ -52,27 +52,35 @@ class LiftDistribution(BaseSolver):
         return self.data
 
     def lift_distribution(self):
-        # add entry to dictionary for postproc
         tstep = self.data.aero.timestep_info[self.ts]
-        tstep.postproc_cell['lift_distribution'] = init_matrix_structure(dimensions=tstep.dimensions,
-                                                                           with_dim_dimension=False)
+        norm = self.normalisation(tstep)
 
-        norm = 1.0
+        tstep.postproc_cell['lift_distribution'] = []
+        for i_surf in range(tstep.n_surf):
+            forces = tstep.forces[i_surf][0:3, :, :] + tstep.dynamic_forces[i_surf][0:3, :, :]
+            tstep.postproc_cell['lift_distribution'].append(np.sum(np.linalg.norm(forces, axis=0), axis=0)/norm)
+
+    def lift_distribution_loop(self):
+        """Panel by panel version of :meth:`lift_distribution`, kept as reference"""
+        tstep = self.data.aero.timestep_info[self.ts]
+        norm = self.normalisation(tstep)
 
+        tstep.postproc_cell['lift_distribution'] = []
         for i_surf in range(tstep.n_surf):
-            n_dim, n_m, n_n = tstep.zeta[i_surf].shape
+            _, n_m, n_n = tstep.zeta[i_surf].shape
 
-            forces = tstep.forces[i_surf] + tstep.unsteady_forces[i_surf]
+            forces = tstep.forces[i_surf] + tstep.dynamic_forces[i_surf]
             abs_forces = np.zeros((n_m, n_n))
-            chord = np.zeros((n_n,))
+            lift_distribution = np.zeros((n_n,))
             for i_n in range(n_n):
-                chord[i_n] = np.abs(tstep[i_surf].zeta[:, -1, i_n] - tstep[i_surf].zeta[:, 0, i_n])
-                if not i_surf and not i_n:
-                    if self.settings['normalise']:
-                        norm = chord[0]
-
                 for i_m in range(n_m):
-                    abs_forces[i_n, i_m] = np.abs(forces[:, i_m, i_n])
+                    abs_forces[i_m, i_n] = np.linalg.norm(forces[0:3, i_m, i_n])
 
-                tstep.postproc_cell['lift_distribution'][i_surf][i_n, i_m] = np.sum(abs_forces[i_n, :], axis = 2)/norm
+                lift_distribution[i_n] = np.sum(abs_forces[:, i_n])/norm
+            tstep.postproc_cell['lift_distribution'].append(lift_distribution)
 
+    def normalisation(self, tstep):
+        """Chord of the first section of the first surface if ``normalise``, 1 otherwise"""
+        if not self.settings['normalise']:
+            return 1.0
+        return np.linalg.norm(tstep.zeta[0][:, -1, 0] - tstep.zeta[0][:, 0, 0])
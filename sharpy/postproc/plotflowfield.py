@@ -18,6 +18,7 @@ from tvtk.api import tvtk, write_data
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.generator_interface as gen_interface
 import sharpy.utils.settings as settings
+import sharpy.utils.vtkutils as vtkutils
 import sharpy.aero.utils.uvlmlib as uvlmlib
 import ctypes as ct
 
@@ -31,7 +32,7 @@ class PlotFlowField(BaseSolver):
         self.settings_default = dict()
 
         self.settings_types['postproc_grid_generator'] = 'str'
-        self.settings_default['postproc_grid_generator'] = 'box'
+        self.settings_default['postproc_grid_generator'] = 'GridBox'
 
         self.settings_types['postproc_grid_input'] = 'dict'
         self.settings_default['postproc_grid_input'] = dict()
@@ -57,6 +58,9 @@ class PlotFlowField(BaseSolver):
         self.settings_types['num_cores'] = 'int'
         self.settings_default['num_cores'] = 1
 
+        self.settings_types['memory_limit'] = 'float'
+        self.settings_default['memory_limit'] = 256.
+
         self.settings = None
         self.data = None
         self.dir = 'output/'
@@ -96,82 +100,62 @@ class PlotFlowField(BaseSolver):
         vtk_info, grid = self.postproc_grid_generator.generate({
                 'for_pos': self.data.structure.timestep_info[ts].for_pos[0:3]})
 
-        # Compute the induced velocities
-        nx = grid[0].shape[1]
-        ny = grid[0].shape[2]
-        nz = len(grid)
+        # Points in the VTK ordering (x index running fastest, then y and z)
+        points = np.concatenate([vtkutils.grid_points(grid_z) for grid_z in grid])
+        n_points = points.shape[0]
+
+        u_ind = np.zeros((n_points, 3), dtype=float)
+        u_ext = np.zeros((n_points, 3), dtype=float)
+        params = {'t': ts*self.settings['dt'].value,
+                  'ts': ts,
+                  'dt': self.settings['dt'].value,
+                  'for_pos': 0*self.data.structure.timestep_info[ts].for_pos}
+        for_pos = self.data.structure.timestep_info[ts].for_pos[0:3]
+
+        # The points are processed in chunks that fit in the memory limit
+        for i_start, i_end in self.chunks(n_points):
+            if self.settings['include_induced']:
+                target_triads = np.ascontiguousarray(points[i_start:i_end, :], dtype=ct.c_double)
+                u_ind[i_start:i_end, :] = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(
+                    self.data.aero.timestep_info[ts],
+                    target_triads,
+                    for_pos,
+                    self.settings['num_cores'])
+
+            if self.settings['include_external']:
+                u_ext[i_start:i_end, :] = self.velocity_generator.generate_at_points(params,
+                                                                                    points[i_start:i_end, :])
 
         array_counter = 0
-        u_ind = np.zeros((nx, ny, nz, 3), dtype=float)
-        if self.settings['include_induced']:
-            target_triads = np.zeros((nx*ny*nz, 3))
-            ipoint = -1
-            for iz in range(nz):
-                for ix in range(nx):
-                    for iy in range(ny):
-                        ipoint += 1
-                        target_triads[ipoint, :] = grid[iz][:, ix, iy].astype(dtype=ct.c_double, order='F', copy=True)
-
-            u_ind_points = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(self.data.aero.timestep_info[ts],
-                                                                                                      target_triads,
-                                                                                                      self.data.structure.timestep_info[ts].for_pos[0:3],
-                                                                                                      self.settings['num_cores'])
-            ipoint = -1
-            for iz in range(nz):
-                for ix in range(nx):
-                    for iy in range(ny):
-                        ipoint += 1
-                        u_ind[ix, iy, iz, :] = u_ind_points[ipoint, :]
-
-            # Write the data
-            vtk_info.point_data.add_array(u_ind.reshape((-1, u_ind.shape[-1]), order='F')) # Reshape the array except from the last dimension
-            vtk_info.point_data.get_array(array_counter).name = 'induced_velocity'
-            vtk_info.point_data.update()
-            array_counter += 1
-
-        # Add the external velocities
-        u_ext_out = np.zeros((nx, ny, nz, 3), dtype=float)
-
-        if self.settings['include_external']:
-            u_ext = []
-            for iz in range(nz):
-                u_ext.append(np.zeros((3, nx, ny), dtype=ct.c_double))
-            self.velocity_generator.generate({'zeta': grid,
-                                              'override': True,
-                                              't': ts*self.settings['dt'].value,
-                                              'ts': ts,
-                                              'dt': self.settings['dt'].value,
-                                              'for_pos': 0*self.data.structure.timestep_info[ts].for_pos},
-                                             u_ext)
-            for iz in range(nz):
-                for ix in range(nx):
-                    for iy in range(ny):
-                        u_ext_out[ix, iy, iz, :] += u_ext[iz][:, ix, iy]
-
-            # Write the data
-            vtk_info.point_data.add_array(u_ext_out.reshape((-1, u_ext_out.shape[-1]), order='F')) # Reshape the array except from the last dimension
-            vtk_info.point_data.get_array(array_counter).name = 'external_velocity'
+        for name, array, include in (('induced_velocity', u_ind, self.settings['include_induced']),
+                                     ('external_velocity', u_ext, self.settings['include_external']),
+                                     ('velocity', u_ind + u_ext, True)):
+            if not include:
+                continue
+            vtk_info.point_data.add_array(array)
+            vtk_info.point_data.get_array(array_counter).name = name
             vtk_info.point_data.update()
             array_counter += 1
 
-        # add the data
-        u = u_ind + u_ext_out
-
-        # Write the data
-        vtk_info.point_data.add_array(u.reshape((-1, u.shape[-1]), order='F')) # Reshape the array except from the last dimension
-        vtk_info.point_data.get_array(array_counter).name = 'velocity'
-        vtk_info.point_data.update()
-        array_counter += 1
-
         filename = self.dir + "VelocityField_" + '%06u' % ts + ".vtk"
         write_data(vtk_info, filename)
 
+    def chunks(self, n_points):
+        """
+        Yields the ``(start, end)`` indices of the chunks of points processed at once so that the working arrays
+        (coordinates, induced and external velocities and the generator input and output) fit in ``memory_limit``
+        """
+        bytes_per_point = 5*3*np.dtype(float).itemsize
+        chunk_size = max(int(self.settings['memory_limit'].value*1024**2/bytes_per_point), 1)
+        for i_start in range(0, n_points, chunk_size):
+            yield i_start, min(i_start + chunk_size, n_points)
+
     def run(self, online=False):
         if online:
             if divmod(self.data.ts, self.settings['stride'].value)[1] == 0:
                 self.output_velocity_field(len(self.data.structure.timestep_info) - 1)
         else:
-            for ts in range(0, len(self.data.structure.timestep_info)):
+            for ts in range(0, len(self.data.structure.timestep_info), self.settings['stride'].value):
                 if not self.data.structure.timestep_info[ts] is None:
                     self.output_velocity_field(ts)
         return self.data
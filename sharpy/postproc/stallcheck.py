@@ -47,6 +47,8 @@ class StallCheck(BaseSolver):
         self.ts_max = None
         self.ts = None
 
+        self.stall_table = None
+
     def initialise(self, data, custom_settings=None):
         self.data = data
         if custom_settings is None:
@@ -55,6 +57,45 @@ class StallCheck(BaseSolver):
             self.settings = custom_settings
         settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
         self.ts_max = len(self.data.structure.timestep_info)
+        if self.settings['airfoil_stall_angles']:
+            self.stall_table = self.generate_stall_table()
+
+    def generate_stall_table(self):
+        """
+        Precomputes the spanwise panels associated to every node of the structural elements and their stall limits.
+
+        Every node of every element contributes once per entry of ``struct2aero_mapping``, excluding the last spanwise
+        vertex of the surfaces, which is not the leading edge of a panel.
+
+        Returns:
+            dict: ``i_surf`` and ``i_panel`` (index in the concatenated leading edge panels of all the surfaces) of
+            every entry, its lower and upper stall ``limits`` and the number of spanwise panels ``n_panels`` of the
+            surfaces
+        """
+        dimensions = self.data.aero.aero_dimensions
+        offsets = np.concatenate(([0], np.cumsum(dimensions[:, 1])))
+        i_surf_list = []
+        i_panel_list = []
+        limits_list = []
+        for i_elem in range(self.data.structure.num_elem):
+            for i_local_node in range(self.data.structure.num_node_elem):
+                airfoil_id = self.data.aero.aero_dict['airfoil_distribution'][i_elem, i_local_node]
+                i_global_node = self.data.structure.connectivities[i_elem, i_local_node]
+                for i_dict in self.data.aero.struct2aero_mapping[i_global_node]:
+                    i_surf = i_dict['i_surf']
+                    i_n = i_dict['i_n']
+                    if i_n == dimensions[i_surf, 1]:
+                        continue
+
+                    limits = self.settings['airfoil_stall_angles'][str(airfoil_id)]
+                    i_surf_list.append(i_surf)
+                    i_panel_list.append(offsets[i_surf] + i_n)
+                    limits_list.append([float(limits[0]), float(limits[1])])
+
+        return {'i_surf': np.array(i_surf_list, dtype=int),
+                'i_panel': np.array(i_panel_list, dtype=int),
+                'limits': np.array(limits_list, dtype=float).reshape((-1, 2)),
+                'n_panels': np.array(dimensions[:, 1], dtype=int)}
 
     def run(self, online=False):
         if not online:
@@ -83,6 +124,44 @@ class StallCheck(BaseSolver):
                                                self.data.structure.timestep_info[self.ts])
 
         # calculate ratio of stalled panels and print
+        stalled_panels, stalled_surfs = self.stalled_panels(tstep)
+
+        if stalled_panels:
+            if self.settings['print_info']:
+                cout.cout_wrap('Some panel has an incidence angle out of the linear region', 1)
+                cout.cout_wrap('The number of stalled panels per surface id are:', 1)
+                for i_surf in range(tstep.n_surf):
+                    cout.cout_wrap('\ti_surf = ' + str(i_surf) + ': ' + str(stalled_surfs[i_surf]) + ' panels.', 1)
+                # cout.cout_wrap('In total, the ratio of stalled panels is: ', str(stalled_surfs.sum()/))
+
+        if self.settings['output_degrees']:
+            for i_surf in range(tstep.n_surf):
+                tstep.postproc_cell['incidence_angle'][i_surf] *= 180/np.pi
+
+
+    def stalled_panels(self, tstep):
+        """
+        Args:
+            tstep (sharpy.utils.datastructures.AeroTimeStepInfo): Time step with the incidence angles in radians
+
+        Returns:
+            tuple: Whether any panel is out of the stall limits and the number of stalled panels per surface
+        """
+        stalled_surfs = np.zeros((tstep.n_surf, ), dtype=int)
+        if self.stall_table is None:
+            return False, stalled_surfs
+
+        leading_edge = np.concatenate([angle[0, :] for angle in tstep.postproc_cell['incidence_angle']])
+        angle = leading_edge[self.stall_table['i_panel']]
+        limits = self.stall_table['limits']
+        stalled = np.logical_or(angle < limits[:, 0], angle > limits[:, 1])
+
+        i_surf = self.stall_table['i_surf'][stalled]
+        stalled_surfs += np.bincount(i_surf, minlength=tstep.n_surf)*self.stall_table['n_panels']
+        return bool(np.any(stalled)), stalled_surfs
+
+    def stalled_panels_loop(self, tstep):
+        """Node by node version of :meth:`stalled_panels`, kept as reference"""
         stalled_panels = False
         stalled_surfs = np.zeros((tstep.n_surf, ), dtype=int)
         added_panels = []
@@ -111,16 +190,4 @@ class StallCheck(BaseSolver):
                         elif tstep.postproc_cell['incidence_angle'][i_surf][0, i_n] > float(limits[1]):
                             stalled_panels = True
                             stalled_surfs[i_surf] += tstep.postproc_cell['incidence_angle'][i_surf].shape[1]
-
-        if stalled_panels:
-            if self.settings['print_info']:
-                cout.cout_wrap('Some panel has an incidence angle out of the linear region', 1)
-                cout.cout_wrap('The number of stalled panels per surface id are:', 1)
-                for i_surf in range(tstep.n_surf):
-                    cout.cout_wrap('\ti_surf = ' + str(i_surf) + ': ' + str(stalled_surfs[i_surf]) + ' panels.', 1)
-                # cout.cout_wrap('In total, the ratio of stalled panels is: ', str(stalled_surfs.sum()/))
-
-        if self.settings['output_degrees']:
-            for i_surf in range(tstep.n_surf):
-                tstep.postproc_cell['incidence_angle'][i_surf] *= 180/np.pi
-
+        return stalled_panels, stalled_surfs
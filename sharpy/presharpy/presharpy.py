@@ -61,6 +61,13 @@ class PreSharpy(object):
     settings_default['log_folder'] = ''
     settings_description['log_folder'] = 'Log folder destination directory'
 
+    settings_types['profile'] = 'bool'
+    settings_default['profile'] = False
+    settings_description['profile'] = 'Time the solvers, post-processors, generators, calls to the compiled ' \
+                                      'libraries and FSI iterations, and write the profile to ' \
+                                      '``<route>/output/<case>/profile.json`` at the end of the run ' \
+                                      '(see :mod:`sharpy.utils.profiling`)'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description,
                                        header_line='The following are the settings that the PreSharpy class takes:')
@@ -161,6 +161,15 @@ class FrequencyLimited(BaseBalancedRom):
                                                      ' points. If True, this option also allows to automatically' \
                                                      ' tune the balanced model.'
 
+    settings_types['num_cores'] = 'int'
+    settings_default['num_cores'] = 1
+    settings_description['num_cores'] = 'Number of frequency solves run concurrently'
+
+    settings_types['tolerance_lowrank'] = 'float'
+    settings_default['tolerance_lowrank'] = 0.
+    settings_description['tolerance_lowrank'] = 'Relative tolerance used to truncate the low-rank factors of the ' \
+                                                'Gramians as these are accumulated over the integration points'
+
     # Integrator options
     settings_options_types = dict()
     settings_options_default = dict()
@@ -215,6 +224,7 @@ class Iterative(BaseBalancedRom):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['lowrank'] = 'bool'
     settings_default['lowrank'] = True
@@ -232,8 +242,25 @@ class Iterative(BaseBalancedRom):
     settings_default['tolSVD'] = 1e-6
     settings_description['tolSVD'] = 'SVD threshold'
 
+    settings_types['method'] = 'str'
+    settings_default['method'] = 'smith'
+    settings_description['method'] = 'Low-rank solver of the Lyapunov equations. ``smith`` uses the squared Smith ' \
+                                     'iteration (:func:`sharpy.rom.utils.librom.balreal_iter`), ``adi`` the ' \
+                                     'low-rank ADI method with automatic shifts ' \
+                                     '(:func:`sharpy.rom.utils.librom.balreal_adi`), suitable for large sparse ' \
+                                     'systems. With ``adi``, ``smith_tol`` is the ADI residual tolerance.'
+    settings_options['method'] = ['smith', 'adi']
+
+    settings_types['num_shifts'] = 'int'
+    settings_default['num_shifts'] = 20
+    settings_description['num_shifts'] = 'Number of ADI shifts'
+
+    settings_types['maxiter'] = 'int'
+    settings_default['maxiter'] = 200
+    settings_description['maxiter'] = 'Maximum number of ADI iterations'
+
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.settings = dict()
@@ -242,16 +269,23 @@ class Iterative(BaseBalancedRom):
         if in_settings is not None:
             self.settings = in_settings
 
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, self.settings_options)
 
     def run(self, ss):
 
         A, B, C, D = ss.get_mats()
 
-        s, T, Tinv, rcmax, romax = librom.balreal_iter(A, B, C,
-                                                       lowrank=self.settings['lowrank'],
-                                                       tolSmith=self.settings['smith_tol'].value,
-                                                       tolSVD=self.settings['tolSVD'].value)
+        if self.settings['method'] == 'adi':
+            s, T, Tinv, rcmax, romax = librom.balreal_adi(A, B, C,
+                                                          tol=self.settings['smith_tol'].value,
+                                                          tolSVD=self.settings['tolSVD'].value,
+                                                          num_shifts=self.settings['num_shifts'].value,
+                                                          maxiter=self.settings['maxiter'].value)
+        else:
+            s, T, Tinv, rcmax, romax = librom.balreal_iter(A, B, C,
+                                                           lowrank=self.settings['lowrank'],
+                                                           tolSmith=self.settings['smith_tol'].value,
+                                                           tolSVD=self.settings['tolSVD'].value)
 
         Ar = Tinv.dot(A.dot(T))
         Br = Tinv.dot(B)
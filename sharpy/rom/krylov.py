@@ -4,6 +4,7 @@ import sharpy.linear.src.libsparse as libsp
 import scipy.linalg as sclalg
 import sharpy.linear.src.libss as libss
 import time
+from concurrent.futures import ThreadPoolExecutor
 import sharpy.utils.settings as settings
 import sharpy.utils.cout_utils as cout
 import sharpy.utils.rom_interface as rom_interface
@@ -79,6 +80,11 @@ class Krylov(rom_interface.BaseRom):
     settings_default['restart_arnoldi'] = False
     settings_description['restart_arnoldi'] = 'Restart Arnoldi iteration with r-=1 if ROM is unstable'
 
+    settings_types['num_cores'] = 'int'
+    settings_default['num_cores'] = 1
+    settings_description['num_cores'] = 'Number of threads used to factorise the shifted systems and build the ' \
+                                        'Krylov bases of the different interpolation points'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -105,6 +111,10 @@ class Krylov(rom_interface.BaseRom):
         self.stable = None
         self.cpu_summary = dict()
         self.eigenvalue_table = None
+        self.num_cores = 1
+
+        # LU factorisations of (sigma I - A) for each interpolation point, reused while A does not change
+        self.lu_cache = dict()
 
     def initialise(self, in_settings=None):
 
@@ -128,6 +138,7 @@ class Krylov(rom_interface.BaseRom):
         self.frequency = np.array(self.settings['frequency'], dtype=complex)
         self.r = self.settings['r'].value
         self.restart_arnoldi = self.settings['restart_arnoldi'].value
+        self.num_cores = self.settings['num_cores'].value
         print(self.frequency)
         # breakpoint()
         try:
@@ -157,6 +168,8 @@ class Krylov(rom_interface.BaseRom):
         Returns:
             (libss.ss): Reduced state space system
         """
+        if ss is not self.ss:
+            self.lu_cache = dict()
         self.ss = ss
 
         try:
@@ -253,7 +266,7 @@ class Krylov(rom_interface.BaseRom):
         nx = A.shape[0]
 
         if frequency != np.inf and frequency is not None:
-            lu_A = krylovutils.lu_factor(frequency, A)
+            lu_A = self.lu_factor(frequency)
             V = krylovutils.construct_krylov(r, lu_A, B, 'Pade', 'b')
         else:
             V = krylovutils.construct_krylov(r, A, B, 'partial_realisation', 'b')
@@ -305,7 +318,7 @@ class Krylov(rom_interface.BaseRom):
         nx = A.shape[0]
 
         if frequency != np.inf and frequency is not None:
-            lu_A = krylovutils.lu_factor(frequency, A)
+            lu_A = self.lu_factor(frequency)
             V = krylovutils.construct_krylov(r, lu_A, B, 'Pade', 'b')
             W = krylovutils.construct_krylov(r, lu_A, C.T, 'Pade', 'c')
         else:
@@ -532,8 +545,9 @@ class Krylov(rom_interface.BaseRom):
         V = np.zeros((nx, rom_dim), dtype=complex)
         W = np.zeros((nx, rom_dim), dtype=complex)
 
+        self.factorise_points(np.concatenate((fc, fo)))
+
         we = 0
-        dict_of_luas = dict()
         for i in range(len(fc)):
             sigma = fc[i]
             if sigma == np.inf:
@@ -541,11 +555,7 @@ class Krylov(rom_interface.BaseRom):
                 lu_A = A
             else:
                 approx_type = 'Pade'
-                try:
-                    lu_A = dict_of_luas[sigma]
-                except KeyError:
-                    lu_A = krylovutils.lu_factor(sigma, A)
-                    dict_of_luas[sigma] = lu_A
+                lu_A = self.lu_factor(sigma)
             V[:, we:we+rc[i]] = krylovutils.construct_krylov(rc[i], lu_A, B.dot(right_tangent[:, i:i+1]), approx_type, 'b')
 
             we += rc[i]
@@ -558,11 +568,7 @@ class Krylov(rom_interface.BaseRom):
                 lu_A = A
             else:
                 approx_type = 'Pade'
-                try:
-                    lu_A = dict_of_luas[sigma]
-                except KeyError:
-                    lu_A = krylovutils.lu_factor(sigma, A)
-                    dict_of_luas[sigma] = lu_A
+                lu_A = self.lu_factor(sigma)
             W[:, we:we+ro[i]] = krylovutils.construct_krylov(ro[i], lu_A, C.T.dot(left_tangent[:, i:i+1]), approx_type, 'c')
 
             we += ro[i]
@@ -577,8 +583,6 @@ class Krylov(rom_interface.BaseRom):
         Br = W.T.dot(self.ss.B)
         Cr = self.ss.C.dot(V.dot(Tinv))
 
-        del dict_of_luas
-
         self.cpu_summary['algorithm'] = time.time() - t0
 
         return Ar, Br, Cr
@@ -630,24 +634,30 @@ class Krylov(rom_interface.BaseRom):
         B = self.ss.B
         C = self.ss.C
 
-        for i in range(self.nfreq):
-
-            if frequency[i] == np.inf or frequency[i].real == np.inf:
+        def point_bases(sigma):
+            if sigma == np.inf or sigma.real == np.inf:
                 lu_a = self.ss.A
                 approx_type = 'partial_realisation'
             else:
                 approx_type = 'Pade'
-                lu_a = krylovutils.lu_factor(frequency[i], self.ss.A)
-            if i == 0:
-                V = krylovutils.construct_mimo_krylov(r_c, lu_a, B, approx_type=approx_type, side='controllability')
-                W = krylovutils.construct_mimo_krylov(r_o, lu_a, C.T, approx_type=approx_type, side='observability')
-            else:
-                Vi = krylovutils.construct_mimo_krylov(r_c, lu_a, B, approx_type=approx_type, side='controllability')
-                Wi = krylovutils.construct_mimo_krylov(r_o, lu_a, C.T, approx_type=approx_type, side='observability')
-                V = np.block([V, Vi])
-                W = np.block([W, Wi])
-                V = krylovutils.mgs_ortho(V)
-                W = krylovutils.mgs_ortho(W)
+                lu_a = self.lu_factor(sigma)
+            Vi = krylovutils.construct_mimo_krylov(r_c, lu_a, B, approx_type=approx_type, side='controllability')
+            Wi = krylovutils.construct_mimo_krylov(r_o, lu_a, C.T, approx_type=approx_type, side='observability')
+            return Vi, Wi
+
+        frequency = np.array(frequency, dtype=complex).reshape(-1)[:self.nfreq]
+        if self.num_cores > 1 and self.nfreq > 1:
+            with ThreadPoolExecutor(max_workers=self.num_cores) as executor:
+                bases = list(executor.map(point_bases, frequency))
+        else:
+            bases = [point_bases(sigma) for sigma in frequency]
+
+        # Merge the bases of all interpolation points
+        if self.nfreq == 1:
+            V, W = bases[0]
+        else:
+            V = krylovutils.block_mgs_ortho([Vi for Vi, _ in bases])
+            W = krylovutils.block_mgs_ortho([Wi for _, Wi in bases])
 
         # Match number of columns in each matrix
         min_cols = min(V.shape[1], W.shape[1])
@@ -680,7 +690,7 @@ class Krylov(rom_interface.BaseRom):
                 F = A
                 G = B
             else:
-                lu_a = krylovutils.lu_factor(frequency[i], A)
+                lu_a = self.lu_factor(frequency[i])
                 F = krylovutils.lu_solve(lu_a, np.eye(n))
                 G = krylovutils.lu_solve(lu_a, B)
 
@@ -698,6 +708,48 @@ class Krylov(rom_interface.BaseRom):
 
         return Ar, Br, Cr
 
+    def lu_factor(self, sigma):
+        """
+        LU factorisation of :math:`(\sigma\mathbf{I} - \mathbf{A})` (see :func:`krylovutils.lu_factor`).
+
+        Factorisations are cached by interpolation point and reused, e.g. when the Arnoldi iteration is restarted or
+        the same point is used for the controllability and observability spaces.
+
+        Args:
+            sigma (complex): Interpolation point
+
+        Returns:
+            tuple or SuperLU: LU factorisation
+        """
+        sigma = complex(sigma)
+        try:
+            return self.lu_cache[sigma]
+        except KeyError:
+            lu_a = krylovutils.lu_factor(sigma, self.ss.A)
+            self.lu_cache[sigma] = lu_a
+            return lu_a
+
+    def factorise_points(self, frequency):
+        """
+        Computes the factorisations of the finite interpolation points that are not yet cached, in parallel if
+        ``num_cores > 1``.
+
+        Args:
+            frequency (np.ndarray): Interpolation points
+        """
+        points = []
+        for sigma in np.array(frequency, dtype=complex).reshape(-1):
+            if np.isfinite(sigma) and sigma not in self.lu_cache and sigma not in points:
+                points.append(sigma)
+
+        if self.num_cores > 1 and len(points) > 1:
+            with ThreadPoolExecutor(max_workers=self.num_cores) as executor:
+                for sigma, lu_a in zip(points, executor.map(lambda x: krylovutils.lu_factor(x, self.ss.A), points)):
+                    self.lu_cache[sigma] = lu_a
+        else:
+            for sigma in points:
+                self.lu_factor(sigma)
+
     def check_stability(self, restart_arnoldi=False):
         r"""
         Checks the stability of the ROM by computing its eigenvalues.
@@ -774,7 +826,9 @@ class Krylov(rom_interface.BaseRom):
 
             if self.r > 1:
                 self.r -= 1
-                self.run(self.algorithm, self.r, self.frequency)
+                # the plant matrix is unchanged, so the cached factorisations are reused
+                Ar, Br, Cr = self.__getattribute__(self.algorithm)(self.frequency, self.r)
+                self.ssrom = libss.ss(Ar, Br, Cr, self.ss.D, self.ss.dt)
             else:
                 print('Unable to reduce ROM any further - ROM still unstable...')
 
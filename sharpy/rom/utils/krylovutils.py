@@ -76,6 +76,32 @@ def mgs_ortho(X):
     return Q
 
 
+def block_mgs_ortho(blocks):
+    r"""
+    Block Gram-Schmidt Orthogonalisation
+
+    Orthogonalises the column concatenation of the input blocks. Each block is projected out of the preceding
+    (already orthonormal) columns with two passes of block classical Gram-Schmidt and then orthogonalised column by
+    column with :func:`mgs_ortho`. The result is the same as that of ``mgs_ortho(np.block(blocks))`` but the
+    projections are carried out as matrix products, which is significantly faster when merging the bases of several
+    interpolation points.
+
+    Args:
+        blocks (list(np.ndarray)): Blocks of dimensions :math:`n` by :math:`m_i`.
+
+    Returns:
+        np.ndarray: Orthogonalised matrix of dimensions :math:`n` by :math:`\sum_i m_i`.
+    """
+    Q = mgs_ortho(blocks[0])
+    for X in blocks[1:]:
+        X = np.array(X, dtype=complex)
+        for i_pass in range(2):
+            X -= Q.dot(Q.T.dot(X))
+        Q = np.block([Q, mgs_ortho(X)])
+
+    return Q
+
+
 def construct_krylov(r, lu_A, B, approx_type='Pade', side='b'):
     r"""
     Contructs a Krylov subspace in an iterative manner following the methods of Gugercin [1].
@@ -4,8 +4,11 @@ S. Maraniello, 14 Feb 2018
 """
 
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import scipy.linalg as scalg
+import scipy.sparse as sparse
+import scipy.sparse.linalg as spalg
 
 # from IPython import embed
 import sharpy.linear.src.libsparse as libsp
@@ -660,6 +663,230 @@ def low_rank_smith(A, Q, tol=1e-10, Square=True, tolSVD=1e-12, tolAbs=False,
     return Zk
 
 
+### low-rank ADI
+
+def adi_shifts(A, num_shifts=20, k_plus=40, k_minus=20, factors=None):
+    """
+    Automatic selection of the ADI shifts for the low-rank solution of the Stein equations of the DLTI system with
+    state matrix ``A`` (see :func:`lyap_lradi`).
+
+    The equations are solved in their continuous-time form, obtained through the bilinear transformation
+    :math:`\mathbf{A}_c = (\mathbf{A}+\mathbf{I})^{-1}(\mathbf{A}-\mathbf{I})`. ``k_plus`` Ritz values of
+    :math:`\mathbf{A}_c` and ``k_minus`` of its inverse are computed with the implicitly restarted Arnoldi method,
+    and the shifts are selected among them with the heuristic of Penzl, which minimises the magnitude of the ADI
+    rational function over the Ritz values.
+
+    Args:
+        A (np.ndarray or scipy.sparse matrix): discrete-time state matrix
+        num_shifts (int): (approximate) number of shifts. Complex shifts are always returned with their conjugate.
+        k_plus (int): number of Ritz values of :math:`\mathbf{A}_c`
+        k_minus (int): number of Ritz values of :math:`\mathbf{A}_c^{-1}`
+        factors (dict): cache of factorisations of :math:`z\mathbf{I}-\mathbf{A}`, see :func:`lyap_lradi`
+
+    Returns:
+        np.ndarray: ADI shifts, with negative real part
+
+    References:
+        Penzl, T. - A cyclic low-rank Smith method for large sparse Lyapunov equations. SIAM Journal on Scientific
+        Computing, 2000.
+    """
+
+    N = A.shape[0]
+    if factors is None:
+        factors = dict()
+    solve_p = _cached_resolvent(A, -1., factors)     # (-I - A)^-1
+    solve_m = _cached_resolvent(A, 1., factors)      # (I - A)^-1
+
+    if N <= max(k_plus, k_minus) + 2:
+        Ac = libsp.dense(-solve_p(libsp.dense(A) - np.eye(N)))
+        ritz = scalg.eigvals(Ac)
+    else:
+        Aop = spalg.LinearOperator((N, N), dtype=complex,
+                                   matvec=lambda v: -solve_p(A.dot(v) - v))
+        Ainvop = spalg.LinearOperator((N, N), dtype=complex,
+                                      matvec=lambda v: -solve_m(A.dot(v) + v))
+        ritz = spalg.eigs(Aop, k=k_plus, which='LM', return_eigenvectors=False)
+        ritz = np.concatenate((ritz, 1. / spalg.eigs(Ainvop, k=k_minus, which='LM', return_eigenvectors=False)))
+
+    ritz = ritz[ritz.real < 0.]
+    if len(ritz) == 0:
+        raise ValueError('Unable to find stable Ritz values for the ADI shifts: the system may be unstable')
+
+    def adi_function(shifts, x):
+        return np.prod(np.abs((x[:, None] - np.conj(shifts)[None, :]) / (x[:, None] + shifts[None, :])), axis=1)
+
+    # first shift: minimises the maximum of the rational function over the Ritz values
+    max_values = [np.max(adi_function(_conj_pair(p), ritz)) for p in ritz]
+    shifts = _conj_pair(ritz[np.argmin(max_values)])
+
+    # following shifts: placed where the rational function is maximum
+    while len(shifts) < min(num_shifts, len(ritz)):
+        p = ritz[np.argmax(adi_function(shifts, ritz))]
+        if np.min(np.abs(shifts - p)) < 1e-14 * np.abs(p):
+            break
+        shifts = np.concatenate((shifts, _conj_pair(p)))
+
+    return shifts
+
+
+def _conj_pair(p, tol=1e-12):
+    if np.abs(p.imag) > tol * np.abs(p):
+        return np.array([p, np.conj(p)])
+    return np.array([p.real], dtype=complex)
+
+
+def _cached_resolvent(A, zval, factors):
+    key = complex(zval)
+    if key not in factors:
+        factors[key] = resolvent_factor(A, zval, factors.get('perm_c', None))
+    return factors[key]
+
+
+def lyap_lradi(A, B, shifts=None, tol=1e-10, maxiter=200, tolSVD=1e-12, trans=False, factors=None, Print=False):
+    """
+    Low-rank ADI solution of the Stein equation
+
+    .. math:: \mathbf{A}\mathbf{X}\mathbf{A}^T - \mathbf{X} = -\mathbf{B}\mathbf{B}^T
+
+    (or :math:`\mathbf{A}^T\mathbf{X}\mathbf{A} - \mathbf{X} = -\mathbf{B}\mathbf{B}^T` if ``trans`` is True).
+
+    The equation is transformed into the equivalent continuous-time Lyapunov equation through the bilinear
+    transformation, which preserves the solution, and solved with the low-rank ADI method. Each ADI step requires a
+    solve with :math:`z_j\mathbf{I}-\mathbf{A}`, where :math:`z_j = (1-p_j)/(1+p_j)` depends on the shift
+    :math:`p_j`, so ``A`` can be sparse and is never inverted nor squared. The factorisations are computed once per
+    shift and reused over the ADI cycles (and for the transposed equation, if the same ``factors`` dictionary is
+    passed).
+
+    The solution is returned in the factorised form :math:`\mathbf{X}=\mathbf{Z}\mathbf{Z}^T`, with :math:`\mathbf{Z}`
+    real and compressed after each cycle with tolerance ``tolSVD`` (see :func:`low_rank_update`).
+
+    Args:
+        A (np.ndarray or scipy.sparse matrix): Schur stable state matrix
+        B (np.ndarray): factor of the constant term
+        shifts (np.ndarray): ADI shifts (negative real part, closed under conjugation). If ``None``, computed with
+          :func:`adi_shifts`.
+        tol (float): tolerance on the normalised ADI residual :math:`\|\mathbf{W}_j\|^2/\|\mathbf{W}_0\|^2`
+        maxiter (int): maximum number of ADI steps
+        tolSVD (float): relative truncation tolerance of the factor
+        trans (bool): solve the transposed equation
+        factors (dict): cache of factorisations of :math:`z\mathbf{I}-\mathbf{A}`
+        Print (bool): print the convergence history
+
+    Returns:
+        np.ndarray: low-rank factor ``Z``
+
+    References:
+        Benner, P., Kuerschner, P., Saak, J. - Efficient handling of complex shift parameters in the low-rank ADI
+        method. Numerical Algorithms, 2013.
+    """
+
+    if factors is None:
+        factors = dict()
+    if 'perm_c' not in factors:
+        factors['perm_c'] = resolvent_ordering(A, -1.)
+    if shifts is None:
+        shifts = adi_shifts(A, factors=factors)
+
+    mode = 'T' if trans else 'N'
+    if trans:
+        AT = A.T
+    else:
+        AT = A
+
+    # continuous-time input: Bc = sqrt(2) (A + I)^-1 B
+    W = -np.sqrt(2.) * _cached_resolvent(A, -1., factors)(libsp.dense(B), trans=mode)
+    W0norm = np.linalg.norm(W) ** 2
+
+    if Print:
+        print('Iter\tResidual\trank')
+
+    # complex shifts are applied in conjugate pairs, after which the residual and the update of the factor are real
+    pair_end = np.ones(len(shifts), dtype=bool)
+    for jj in range(len(shifts) - 1):
+        if pair_end[jj] and shifts[jj].imag != 0. and shifts[jj + 1] == np.conj(shifts[jj]):
+            pair_end[jj] = False
+
+    Z = None
+    Zcycle = []
+    kk = 0
+    res = 1.
+    while kk < maxiter:
+        jj = kk % len(shifts)
+        p = shifts[jj]
+        zval = (1. - p) / (1. + p)
+
+        # V = (Ac + p I)^-1 W = -(1+p)^-1 (zI - A)^-1 (A + I) W
+        V = -_cached_resolvent(A, zval, factors)(AT.dot(W) + W, trans=mode) / (1. + p)
+        W = W - 2. * p.real * V
+        Zcycle.append(np.sqrt(-2. * p.real) * V)
+        kk += 1
+
+        if not pair_end[jj]:
+            continue
+
+        res = np.linalg.norm(W) ** 2 / W0norm
+        if jj == len(shifts) - 1 or res < tol:
+            Z = low_rank_update(Z, np.hstack([np.hstack((Zj.real, Zj.imag)) for Zj in Zcycle]), tolSVD)
+            Zcycle = []
+
+        if Print:
+            print('%.4d\t%.3e\t%.5d' % (kk, res, 0 if Z is None else Z.shape[1]))
+        if res < tol:
+            break
+
+    if len(Zcycle) > 0:
+        Z = low_rank_update(Z, np.hstack([np.hstack((Zj.real, Zj.imag)) for Zj in Zcycle]), tolSVD)
+
+    if res >= tol:
+        warnings.warn('Low-rank ADI did not converge after %d iterations (residual %.2e)' % (kk, res))
+
+    return Z
+
+
+def balreal_adi(A, B, C, tol=1e-10, tolSVD=1e-12, num_shifts=20, maxiter=200, Print=False, outFacts=False):
+    """
+    Find balanced realisation of DLTI system using low-rank factors of the Gramians computed with the ADI method
+    (see :func:`lyap_lradi`) and the square-root algorithm.
+
+    Unlike :func:`balreal_iter`, ``A`` is never squared, hence its sparsity is preserved: the cost is dominated by one
+    sparse LU factorisation per ADI shift, which is shared by the controllability and observability equations.
+
+    Args:
+        A (np.ndarray or scipy.sparse matrix): state matrix
+        B (np.ndarray): input matrix
+        C (np.ndarray): output matrix
+        tol (float): ADI residual tolerance
+        tolSVD (float): relative truncation tolerance of the Gramian factors
+        num_shifts (int): number of ADI shifts
+        maxiter (int): maximum number of ADI steps
+        Print (bool): print the convergence history
+        outFacts (bool): return the Gramian factors instead of the balancing transformations
+
+    Returns:
+        tuple: ``(s, T, Tinv, rc, ro)`` Hankel singular values, balancing transformations (such that the balanced
+        system is ``Tinv A T``, ``Tinv B``, ``C T``) and rank of the Gramian factors; or ``(s, Zc, Zo)`` if
+        ``outFacts`` is True.
+    """
+
+    factors = {'perm_c': resolvent_ordering(A, -1.)}
+    shifts = adi_shifts(A, num_shifts=num_shifts, factors=factors)
+
+    Zc = lyap_lradi(A, B, shifts, tol=tol, maxiter=maxiter, tolSVD=tolSVD, factors=factors, Print=Print)
+    Zo = lyap_lradi(A, libsp.dense(C).T, shifts, tol=tol, maxiter=maxiter, tolSVD=tolSVD, trans=True,
+                    factors=factors, Print=Print)
+    factors = None
+
+    U, s, Vh = scalg.svd(np.dot(Zo.T, Zc), full_matrices=False)
+    if outFacts:
+        return s, Zc, Zo
+
+    sinv = s ** (-0.5)
+    T = np.dot(Zc, Vh.T * sinv)
+    Tinv = np.dot((U * sinv).T, Zo.T)
+
+    return s, T, Tinv, Zc.shape[1], Zo.shape[1]
+
+
 ### utilities for balfreq
 
 def get_trapz_weights(k0,kend,Nk,knyq=False):
@@ -725,6 +952,170 @@ def get_gauss_weights(k0,kend,Npart,order):
     return kv,wv
 
 
+def low_rank_update(L, Q, tol=0.):
+    """
+    Updates the low-rank factor ``L`` of a Gramian, :math:`\mathbf{W}\approx\mathbf{L}\mathbf{L}^T`, with the
+    contribution of the new columns ``Q``, such that
+
+    .. math:: \mathbf{L}_{new}\mathbf{L}_{new}^T = \mathbf{L}\mathbf{L}^T + \mathbf{Q}\mathbf{Q}^T
+
+    The factor is kept in the form :math:`\mathbf{U\Sigma}`, with :math:`\mathbf{U}` orthonormal, hence its number of
+    columns never exceeds the number of states. Singular values smaller than ``tol`` times the largest are discarded.
+
+    Args:
+        L (np.ndarray): current factor of size ``(states, r)`` or ``None``
+        Q (np.ndarray): new factor columns of size ``(states, q)``
+        tol (float): relative truncation tolerance. If ``0``, only exactly zero singular values are discarded.
+
+    Returns:
+        np.ndarray: updated low-rank factor
+    """
+
+    if L is not None:
+        Q = np.hstack((L, Q))
+    if Q.shape[1] == 0:
+        return Q
+
+    Qm, R = scalg.qr(Q, mode='economic')
+    U, s, _ = scalg.svd(R, full_matrices=False)
+    keep = s > tol * s[0]
+
+    return np.dot(Qm, U[:, keep] * s[keep])
+
+
+def resolvent_solve(A, zval, B=None, Ct=None, perm_c=None):
+    """
+    Solves :math:`(z\mathbf{I}-\mathbf{A})^{-1}\mathbf{B}` and :math:`(\bar{z}\mathbf{I}-\mathbf{A}^T)^{-1}\mathbf{C}^T`
+    with a single LU factorisation, as for real :math:`\mathbf{A}` the second operator is the conjugate transpose of
+    the first.
+
+    For sparse ``A``, the column ordering ``perm_c`` of a previous factorisation (see :func:`resolvent_ordering`) can
+    be passed to skip the ordering step, as the sparsity pattern of :math:`z\mathbf{I}-\mathbf{A}` does not change
+    with the frequency.
+
+    Args:
+        A (np.ndarray or scipy.sparse matrix): state matrix
+        zval (complex): point of evaluation
+        B (np.ndarray): right hand side of the controllability solve (dense)
+        Ct (np.ndarray): right hand side of the observability solve (dense)
+        perm_c (np.ndarray): column ordering for sparse ``A``
+
+    Returns:
+        tuple: solutions of the controllability and observability problems (``None`` if the corresponding right hand
+        side is not given)
+    """
+
+    solve = resolvent_factor(A, zval, perm_c)
+
+    X, Y = None, None
+    if B is not None:
+        X = solve(B)
+    if Ct is not None:
+        Y = solve(Ct, trans='H')
+
+    return X, Y
+
+
+def resolvent_factor(A, zval, perm_c=None):
+    """
+    LU factorisation of :math:`z\mathbf{I}-\mathbf{A}`.
+
+    Args:
+        A (np.ndarray or scipy.sparse matrix): state matrix
+        zval (complex): point of evaluation
+        perm_c (np.ndarray): column permutation for sparse ``A``, such that ``M[:, perm_c]`` is factorised (see
+          :func:`resolvent_ordering`)
+
+    Returns:
+        callable: ``solve(rhs, trans='N')`` returning :math:`(z\mathbf{I}-\mathbf{A})^{-1}\mathbf{rhs}`, or the solution
+        with the transposed (``trans='T'``) or conjugate transposed (``trans='H'``) operator.
+    """
+
+    if sparse.issparse(A):
+        M = (zval * sparse.eye(A.shape[0], format='csc') - A).tocsc()
+        cpx = np.iscomplexobj(M.data)
+        if perm_c is None:
+            lu = spalg.splu(M)
+            def solve(rhs, trans='N'):
+                return _splu_solve(lu, np.asarray(rhs), trans, cpx)
+        else:
+            lu = spalg.splu(M[:, perm_c], permc_spec='NATURAL')
+            def solve(rhs, trans='N'):
+                rhs = np.asarray(rhs)
+                if trans == 'N':
+                    X = _splu_solve(lu, rhs, trans, cpx)
+                    X[perm_c] = X.copy()
+                    return X
+                return _splu_solve(lu, rhs[perm_c], trans, cpx)
+    else:
+        lu = scalg.lu_factor(zval * np.eye(A.shape[0]) - A)
+        trans_codes = {'N': 0, 'T': 1, 'H': 2}
+        def solve(rhs, trans='N'):
+            return scalg.lu_solve(lu, rhs, trans=trans_codes[trans])
+
+    return solve
+
+
+def _splu_solve(lu, rhs, trans, cpx):
+    if cpx:
+        return lu.solve(rhs.astype(complex), trans=trans)
+    if np.iscomplexobj(rhs):
+        return lu.solve(np.ascontiguousarray(rhs.real), trans=trans) + \
+               1.j * lu.solve(np.ascontiguousarray(rhs.imag), trans=trans)
+    return lu.solve(rhs.astype(float), trans=trans)
+
+
+def resolvent_ordering(A, zval):
+    """
+    Returns the fill-reducing column permutation of :math:`z\mathbf{I}-\mathbf{A}` for sparse ``A`` (``None`` if
+    ``A`` is dense), to be reused by :func:`resolvent_solve` at other frequencies.
+
+    SuperLU factorises ``M[:, argsort(lu.perm_c)]``, hence the permutation applied to the columns is
+    ``argsort(lu.perm_c)`` and not ``lu.perm_c`` itself.
+    """
+    if not sparse.issparse(A):
+        return None
+    return np.argsort(spalg.splu((zval * sparse.eye(A.shape[0], format='csc') - A).tocsc()).perm_c)
+
+
+def stream_gramian_factors(solve_frequency, Nk, num_cores=1, tol=0.):
+    """
+    Integrates the controllability and observability Gramians in low-rank factorised form.
+
+    The frequency solves ``solve_frequency(kk)``, for ``kk in range(Nk)``, are run in batches of ``num_cores``
+    concurrent threads. Each of them returns the weighted solutions ``(Qctrl, Qobs)`` at the ``kk``-th integration
+    point (``Qobs`` may be ``None`` if the observability Gramian is not integrated at that point). After each batch,
+    real and imaginary parts are merged into the low-rank factors (see :func:`low_rank_update`) and the solutions
+    released, so the full quadrature factors are never held in memory.
+
+    Args:
+        solve_frequency (callable): frequency solver
+        Nk (int): number of integration points
+        num_cores (int): number of concurrent frequency solves
+        tol (float): relative truncation tolerance of the low-rank factors
+
+    Returns:
+        tuple: low-rank factors ``(Lc, Lo)`` such that :math:`\mathbf{W}_c\approx\mathbf{L}_c\mathbf{L}_c^T` and
+        :math:`\mathbf{W}_o\approx\mathbf{L}_o\mathbf{L}_o^T`
+    """
+
+    num_cores = max(int(num_cores), 1)
+    Lc, Lo = None, None
+    with ThreadPoolExecutor(max_workers=num_cores) as executor:
+        for k0 in range(0, Nk, num_cores):
+            batch = list(executor.map(solve_frequency, range(k0, min(k0 + num_cores, Nk))))
+
+            Qc = [np.hstack((Qctrl.real, Qctrl.imag)) for Qctrl, _ in batch]
+            Lc = low_rank_update(Lc, np.hstack(Qc), tol)
+
+            Qo = [np.hstack((Qobs.real, Qobs.imag)) for _, Qobs in batch if Qobs is not None]
+            if len(Qo) > 0:
+                Lo = low_rank_update(Lo, np.hstack(Qo), tol)
+            batch, Qc, Qo = None, None, None
+
+    return Lc, Lo
+
+
 def balfreq(SS,DictBalFreq):
     """
     Method for frequency limited balancing.
@@ -775,9 +1166,19 @@ def balfreq(SS,DictBalFreq):
           points. If True, this option also allows to automatically tune the
           balanced model.
 
+        - ``num_cores``: number of frequency solves run concurrently (default 1).
+
+        - ``tolerance_lowrank``: relative tolerance used to truncate the low-rank
+          factors of the Gramians as these are accumulated over the integration
+          points (default 0, i.e. no truncation). See :func:`low_rank_update`.
 
-    Future options:
-        - Ncpu: for parallel run
+    The Gramians are integrated in streaming form (see :func:`stream_gramian_factors`):
+    a single LU factorisation of :math:`z\mathbf{I}-\mathbf{A}` is used for both the
+    controllability and observability solves at each frequency, the sparse column
+    ordering is computed once, and the quadrature factors are merged into low-rank
+    factors ``Lc``, ``Lo`` as they are computed. If ``output_modes`` is True, these
+    factors are returned in place of ``Zc`` and ``Zo``, with
+    ``Lc Lc^T = Zc Zc^T`` and ``Lo Lo^T = Zo Zo^T``.
 
 
     The following integration schemes are available:
@@ -897,51 +1298,42 @@ def balfreq(SS,DictBalFreq):
     wv = np.concatenate( (wv_low,wv_high) ) * SS.dt
     zv = np.cos(kvdt)+1.j*np.sin(kvdt)
 
-    Eye=libsp.eye_as(SS.A)
-    Zc=np.zeros( (SS.states,2*SS.inputs*len(kvdt)),)
-    Zo=np.zeros( (SS.states,2*SS.outputs*Nk_low),)
-
     if DictBalFreq['get_frequency_response']:
         Yfreq=np.empty((SS.outputs,SS.inputs,Nk_low,),dtype=np.complex_)
         kv=kv_low
 
-    for kk in range( len(kvdt) ):
+    # dense right hand sides and column ordering shared by all frequencies
+    B=libsp.dense(SS.B)
+    Ct=libsp.dense(SS.C).T
+    perm_c=resolvent_ordering(SS.A, zv[0])
 
+    def solve_frequency(kk):
         zval=zv[kk]
         Intfact=wv[kk]   # integration factor
 
-        Qctrl = Intfact * libsp.solve(zval*Eye-SS.A,SS.B)
-        kkvec=range( 2*kk*SS.inputs, 2*(kk+1)*SS.inputs )
-        Zc[:,kkvec[:SS.inputs]]= Qctrl.real
-        Zc[:,kkvec[SS.inputs:]]= Qctrl.imag
-
+        Qctrl, Qobs = resolvent_solve(SS.A, zval, B, Ct if kk<Nk_low else None, perm_c)
+        Qctrl *= Intfact
 
         ### ----- frequency response
         if DictBalFreq['get_frequency_response'] and kk<Nk_low:
             Yfreq[:,:,kk]= (1./Intfact)*\
-            				 libsp.dot(SS.C,Qctrl,type_out=np.ndarray)+SS.D
+                             libsp.dot(SS.C,Qctrl,type_out=np.ndarray)+SS.D
 
         ### ----- observability
-        if kk>=Nk_low:
-            continue
-
-        Qobs = Intfact * libsp.solve(np.conj(zval)*Eye-SS.A.T,SS.C.T)
+        if Qobs is not None:
+            Qobs *= Intfact**2
 
-        kkvec=range( 2*kk*SS.outputs, 2*(kk+1)*SS.outputs )
-        Zo[:,kkvec[:SS.outputs]]= Intfact*Qobs.real
-        Zo[:,kkvec[SS.outputs:]]= Intfact*Qobs.imag
+        return Qctrl, Qobs
 
-    # delete full matrices
-    Kernel=None
-    Qctrl=None
-    Qobs=None
+    Zc, Zo = stream_gramian_factors(solve_frequency, len(kvdt),
+                                    DictBalFreq.get('num_cores', 1),
+                                    DictBalFreq.get('tolerance_lowrank', 0.))
 
     # LRSQM (optimised)
     U,hsv,Vh=scalg.svd( np.dot(Zo.T,Zc), full_matrices=False)
     sinv=hsv**(-0.5)
     T=np.dot(Zc,Vh.T*sinv)
     Ti=np.dot((U*sinv).T,Zo.T)
-    # Zc,Zo=None,None
 
     ### build frequency balanced model
     Ab = libsp.dot( Ti, libsp.dot(SS.A, T) )
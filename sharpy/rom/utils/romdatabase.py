@@ -0,0 +1,361 @@
+"""Parametric ROM Database
+
+Offline generation, storage and online interpolation of a family of reduced order models computed over a grid of
+flight conditions.
+
+The offline stage runs the base case (including the ``LinearAssembler`` with the desired ROM in the
+``rom_method`` of the UVLM settings) over the grid of parameters with the :class:`~sharpy.utils.campaign.Campaign`
+runner, i.e. in parallel worker processes. The reduced UVLM of each case is collected together with its projection
+bases ``V`` and ``W^T`` (if given by the ROM, as in :class:`~sharpy.rom.krylov.Krylov`) into a single HDF5 database
+indexed by the parameter values.
+
+Parameters are given a name and the list of settings paths where they are applied. For instance, the free stream
+velocity typically appears in the linear UVLM settings and in the aerodynamic solvers, and the altitude is
+given through the corresponding air density. Parameters with string values (such as mass cases defined by different
+``case`` names) are treated as categorical and no interpolation across them is performed.
+
+The online stage, :class:`ROMInterpolator`, projects the ROMs of each categorical group onto common generalised
+coordinates once using :class:`~sharpy.rom.utils.librom_interp.InterpROM` and, at query time, returns the
+multilinear interpolation between the ROMs at the corners of the grid cell containing the point.
+
+Note:
+    ROMs can only be interpolated if they share the number of states, inputs and outputs and the time step. For
+    interpolation in velocity, the UVLM should therefore be assembled in non-dimensional form (``ScalingDict``).
+
+Examples:
+
+    .. code-block:: python
+
+        import sharpy.rom.utils.romdatabase as romdatabase
+
+        database = romdatabase.build_rom_database(
+            './cases/goland.sharpy',
+            parameters={'u_inf': [140., 150., 160.],
+                        'rho': [1.02, 1.1, 1.2]},
+            parameter_paths={'u_inf': ['StaticCoupled.aero_solver_settings.velocity_field_input.u_inf',
+                                       'LinearAssembler.linear_system_settings.aero_settings.u_inf'],
+                             'rho': ['StaticCoupled.aero_solver_settings.rho',
+                                     'LinearAssembler.linear_system_settings.aero_settings.density']},
+            output_folder='./output/goland_roms/',
+            num_cores=4)
+
+        rom = romdatabase.ROMInterpolator(database)
+        ssrom = rom(u_inf=145., rho=1.05)
+
+"""
+import os
+import itertools
+import functools
+
+import h5py as h5
+import numpy as np
+
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+import sharpy.rom.utils.librom_interp as librom_interp
+
+
+def rom_results(data, rom_name=None):
+    """
+    Extracts the reduced UVLM and its projection bases from the output of a case. Used as the post-processing
+    function of the database :class:`~sharpy.utils.campaign.Campaign`.
+
+    Args:
+        data (sharpy.presharpy.PreSharpy): Output data of a case that run the ``LinearAssembler``
+        rom_name (str): ROM whose bases are saved. If ``None``, the last ROM applied to the UVLM is used.
+
+    Returns:
+        dict: ``A``, ``B``, ``C``, ``D`` and ``dt`` of the reduced system and, if available, the bases ``V`` and
+        ``WT``.
+    """
+    uvlm = data.linear.linear_system.uvlm
+    ss = uvlm.ss
+
+    results = {'A': libsp.dense(ss.A),
+               'B': libsp.dense(ss.B),
+               'C': libsp.dense(ss.C),
+               'D': libsp.dense(ss.D),
+               'dt': ss.dt if ss.dt is not None else 0.}
+
+    if uvlm.rom:
+        if rom_name is None:
+            rom_name = list(uvlm.rom.keys())[-1]
+        rom = uvlm.rom[rom_name]
+        V = getattr(rom, 'V', None)
+        W = getattr(rom, 'W', None)
+        if V is not None and W is not None:
+            results['V'] = V
+            results['WT'] = W.T
+
+    return results
+
+
+class ROMDatabase(object):
+    """
+    HDF5 database of reduced order models indexed by their parameters.
+
+    Each ROM is saved in the group ``roms/<key>`` with the datasets ``A``, ``B``, ``C``, ``D``, ``dt`` and,
+    optionally, ``V`` and ``WT``. The group ``index`` holds one dataset per parameter with its value for each key,
+    such that the parameter space can be read without loading the ROMs.
+
+    Args:
+        file_name (str): Path to the HDF5 file
+    """
+    def __init__(self, file_name):
+        self.file_name = file_name
+
+    def add(self, key, parameters, results, update_index=True):
+        """
+        Adds (or replaces) a ROM in the database.
+
+        Args:
+            key (str): ROM identifier
+            parameters (dict): ``{parameter_name: value}``
+            results (dict): System matrices and bases, as returned by :func:`rom_results`
+            update_index (bool): Write the index after adding the ROM. When adding many ROMs, :meth:`write_index`
+              can be called once at the end instead.
+        """
+        with h5.File(self.file_name, 'a') as f:
+            roms = f.require_group('roms')
+            if key in roms:
+                del roms[key]
+            grp = roms.create_group(key)
+            for k, v in parameters.items():
+                grp.attrs[k] = v
+            for k, v in results.items():
+                grp.create_dataset(k, data=np.asarray(v))
+        if update_index:
+            self.write_index()
+
+    def write_index(self):
+        with h5.File(self.file_name, 'a') as f:
+            if 'index' in f:
+                del f['index']
+            index = f.create_group('index')
+            keys = sorted(f['roms'].keys())
+            index.create_dataset('keys', data=np.array(keys, dtype='S'))
+            if not keys:
+                return
+            for name in f['roms'][keys[0]].attrs.keys():
+                values = [f['roms'][k].attrs[name] for k in keys]
+                if isinstance(values[0], str):
+                    index.create_dataset(name, data=np.array(values, dtype='S'))
+                else:
+                    index.create_dataset(name, data=np.array(values, dtype=float))
+
+    def read_index(self):
+        """
+        Returns:
+            tuple: List of keys and dictionary ``{parameter_name: list_of_values}`` in the same order
+        """
+        with h5.File(self.file_name, 'r') as f:
+            index = f['index']
+            keys = [k.decode() for k in index['keys'][()]]
+            parameters = dict()
+            for name, values in index.items():
+                if name == 'keys':
+                    continue
+                values = values[()]
+                if values.dtype.kind == 'S':
+                    parameters[name] = [v.decode() for v in values]
+                else:
+                    parameters[name] = list(values)
+        return keys, parameters
+
+    def read(self, key):
+        """
+        Returns:
+            tuple: ``libss.ss`` ROM and its ``V`` and ``WT`` bases (``None`` if not stored)
+        """
+        with h5.File(self.file_name, 'r') as f:
+            grp = f['roms'][key]
+            dt = float(grp['dt'][()])
+            ss = libss.ss(grp['A'][()], grp['B'][()], grp['C'][()], grp['D'][()], dt=dt if dt != 0. else None)
+            V = grp['V'][()] if 'V' in grp else None
+            WT = grp['WT'][()] if 'WT' in grp else None
+        return ss, V, WT
+
+
+def build_rom_database(base_settings, parameters, parameter_paths, output_folder='./output/rom_database/',
+                       name='rom_database', num_cores=1, max_retries=0, resume=True, rom_name=None):
+    """
+    Runs the base case over the full grid of parameters in parallel and saves the resulting ROMs to the database
+    ``<output_folder>/<name>.roms.h5``.
+
+    Cases already completed in the campaign results store are not run again when ``resume=True``, such that the
+    database can be completed by calling this function again with the same grid after a failure.
+
+    Args:
+        base_settings (str or dict): Path to the base ``.sharpy`` file or equivalent settings dictionary. The flow
+          must include the ``LinearAssembler`` with a ROM applied to the UVLM.
+        parameters (dict): Grid of parameters ``{parameter_name: list_of_values}``
+        parameter_paths (dict): Settings paths where each parameter is applied ``{parameter_name: list_of_paths}``
+        output_folder (str): Output folder of the cases and the database
+        name (str): Database name
+        num_cores (int): Number of worker processes
+        max_retries (int): Number of times a failed case is run again
+        resume (bool): Skip the cases that are completed in an existing results store
+        rom_name (str): ROM whose bases are saved (see :func:`rom_results`)
+
+    Returns:
+        ROMDatabase: Database of the completed cases
+    """
+    import sharpy.utils.campaign as campaign
+
+    names = list(parameters.keys())
+    grid = [dict(zip(names, values)) for values in itertools.product(*[parameters[n] for n in names])]
+    samples = [{path: point[n] for n in names for path in parameter_paths[n]} for point in grid]
+
+    case_campaign = campaign.Campaign(base_settings,
+                                      samples=samples,
+                                      output_folder=output_folder,
+                                      name=name,
+                                      num_cores=num_cores,
+                                      max_retries=max_retries,
+                                      resume=resume,
+                                      postprocess=functools.partial(rom_results, rom_name=rom_name))
+    results = case_campaign.run()
+
+    database = ROMDatabase(os.path.abspath(output_folder) + '/' + name + '.roms.h5')
+    for i_case, point in enumerate(grid):
+        key = campaign.case_id(i_case)
+        if key in results and results[key]['status'] == 'completed':
+            database.add(key, point, results[key]['results'], update_index=False)
+    database.write_index()
+
+    return database
+
+
+class ROMInterpolator(object):
+    """
+    Online interpolation of the ROMs of a :class:`ROMDatabase`.
+
+    Numerical parameters are interpolated (multilinear) on the grid formed by their values in the database. String
+    parameters are categorical and must match one of the values in the database.
+
+    The ROMs of each categorical group are projected onto the generalised coordinates of a reference ROM (the first
+    one of the group, unless ``reference`` is given) when the interpolator is created, so that evaluating the
+    interpolated system only requires the weighted sum of the matrices at the corners of the grid cell.
+
+    Args:
+        database (ROMDatabase or str): Database or path to its HDF5 file
+        method_proj (str): Projection method of :class:`~sharpy.rom.utils.librom_interp.InterpROM`. Only used if
+          the bases are stored in the database. If ``None``, the ROMs are assumed to be defined over the same
+          generalised coordinates.
+        reference (dict): Parameters of the reference ROM (numerical parameters only)
+    """
+    def __init__(self, database, method_proj='weakMAC', reference=None):
+        if isinstance(database, str):
+            database = ROMDatabase(database)
+        self.database = database
+
+        keys, parameters = database.read_index()
+        if not keys:
+            raise ValueError('The ROM database %s is empty' % database.file_name)
+
+        self.categorical = [n for n, v in parameters.items() if isinstance(v[0], str)]
+        self.numerical = [n for n, v in parameters.items() if not isinstance(v[0], str)]
+        self.axes = [np.unique(parameters[n]) for n in self.numerical]
+
+        # sort the ROMs by categorical group and grid index
+        groups = dict()
+        for i_key, key in enumerate(keys):
+            category = tuple(parameters[n][i_key] for n in self.categorical)
+            grid_index = tuple(int(np.searchsorted(axis, parameters[n][i_key]))
+                               for n, axis in zip(self.numerical, self.axes))
+            groups.setdefault(category, dict())[grid_index] = key
+
+        self.groups = dict()
+        for category, group_keys in groups.items():
+            self.groups[category] = self.project_group(group_keys, method_proj, reference)
+
+    def project_group(self, group_keys, method_proj, reference):
+        grid_indices = list(group_keys.keys())
+        ss_list = []
+        V_list = []
+        WT_list = []
+        for grid_index in grid_indices:
+            ss, V, WT = self.database.read(group_keys[grid_index])
+            ss_list.append(ss)
+            V_list.append(V)
+            WT_list.append(WT)
+
+        i_ref = 0
+        if reference is not None:
+            ref_index = tuple(int(np.searchsorted(axis, reference[n]))
+                              for n, axis in zip(self.numerical, self.axes))
+            i_ref = grid_indices.index(ref_index)
+
+        if method_proj is None or any(V is None for V in V_list):
+            interp = librom_interp.InterpROM(ss_list)
+        else:
+            interp = librom_interp.InterpROM(ss_list, VV=V_list, WWT=WT_list,
+                                             Vref=V_list[i_ref], WTref=WT_list[i_ref], method_proj=method_proj)
+            interp.project()
+
+        # stacked matrices for the weighted sum at query time
+        return {'position': {grid_index: i for i, grid_index in enumerate(grid_indices)},
+                'A': np.array(interp.AA),
+                'B': np.array(interp.BB),
+                'C': np.array(interp.CC),
+                'D': np.array(interp.DD),
+                'dt': ss_list[0].dt}
+
+    def weights(self, point):
+        """
+        Multilinear interpolation weights of the numerical parameters.
+
+        Args:
+            point (dict): ``{parameter_name: value}``
+
+        Returns:
+            list(tuple): Grid index and weight of the corners of the cell containing the point
+        """
+        axis_weights = []
+        for name, axis in zip(self.numerical, self.axes):
+            value = point[name]
+            if value < axis[0] or value > axis[-1]:
+                raise ValueError('Parameter %s = %g out of the database range [%g, %g]' %
+                                 (name, value, axis[0], axis[-1]))
+            if len(axis) == 1:
+                axis_weights.append([(0, 1.)])
+                continue
+            i = min(max(int(np.searchsorted(axis, value)) - 1, 0), len(axis) - 2)
+            xi = (value - axis[i]) / (axis[i + 1] - axis[i])
+            axis_weights.append([(i, 1. - xi), (i + 1, xi)])
+
+        corners = []
+        for corner in itertools.product(*axis_weights):
+            weight = np.prod([w for _, w in corner])
+            if weight != 0.:
+                corners.append((tuple(i for i, _ in corner), weight))
+        return corners
+
+    def __call__(self, **point):
+        """
+        Returns the interpolated ROM at the given point.
+
+        Args:
+            **point: Value of every parameter in the database
+
+        Returns:
+            libss.ss: Interpolated ROM
+        """
+        category = tuple(point[n] for n in self.categorical)
+        try:
+            group = self.groups[category]
+        except KeyError:
+            raise ValueError('No ROMs in the database for %s' % dict(zip(self.categorical, category)))
+
+        corners = self.weights(point)
+        try:
+            positions = [group['position'][grid_index] for grid_index, _ in corners]
+        except KeyError:
+            raise ValueError('The database does not include all the ROMs surrounding %s' % point)
+        wv = np.array([w for _, w in corners])
+
+        return libss.ss(np.tensordot(wv, group['A'][positions], axes=1),
+                        np.tensordot(wv, group['B'][positions], axes=1),
+                        np.tensordot(wv, group['C'][positions], axes=1),
+                        np.tensordot(wv, group['D'][positions], axes=1),
+                        dt=group['dt'])
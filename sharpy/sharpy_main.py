@@ -29,6 +29,7 @@ def main(args=None, sharpy_input_dict=None):
 
     import sharpy.utils.input_arg as input_arg
     import sharpy.utils.solver_interface as solver_interface
+    import sharpy.utils.profiling as profiling
     from sharpy.presharpy.presharpy import PreSharpy
     from sharpy.utils.cout_utils import start_writer, finish_writer
     # Loading solvers and postprocessors
@@ -56,29 +57,35 @@ def main(args=None, sharpy_input_dict=None):
         else:
             args = parser.parse_args()
 
-    if args.docs:
-        import subprocess
-        import sharpy.utils.docutils as docutils
-        import sharpy.utils.sharpydir as sharpydir
-        docutils.generate_documentation()
+        if args.docs:
+            import subprocess
+            import sharpy.utils.docutils as docutils
+            import sharpy.utils.sharpydir as sharpydir
+            docutils.generate_documentation()
 
-        # run make
-        cout.cout_wrap('Running make html in sharpy/docs')
-        subprocess.Popen(['make', 'html'],
-                         stdout=None,
-                         cwd=sharpydir.SharpyDir + '/docs')
+            # run make
+            cout.cout_wrap('Running make html in sharpy/docs')
+            subprocess.Popen(['make', 'html'],
+                             stdout=None,
+                             cwd=sharpydir.SharpyDir + '/docs')
 
-        return 0
+            return 0
 
-    if args.input_filename == '':
-        parser.error('input_filename is a required argument of sharpy.')
-    settings = input_arg.read_settings(args)
-    if args.restart is None:
+        if args.input_filename == '':
+            parser.error('input_filename is a required argument of sharpy.')
+        settings = input_arg.read_settings(args)
+        restart = args.restart
+    else:
+        # Case for input from dictionary
+        settings = sharpy_input_dict
+        restart = None
+
+    if restart is None:
         # run preSHARPy
         data = PreSharpy(settings)
     else:
         try:
-            with open(args.restart, 'rb') as restart_file:
+            with open(restart, 'rb') as restart_file:
                 data = pickle.load(restart_file)
         except FileNotFoundError:
             raise FileNotFoundError('The file specified for the snapshot \
@@ -86,11 +93,9 @@ def main(args=None, sharpy_input_dict=None):
 
         # update the settings
         data.update_settings(settings)
-    # else:
-        # # Case for input from dictionary
-        # settings = input_arg.read_settings(args)
-        # # run preSHARPy
-        # data = PreSharpy(settings)
+
+    profiling.profiler.reset()
+    profiling.profiler.enable(data.settings['SHARPy']['profile'].value)
 
     # Loop for the solvers specified in *.solver.txt['SHARPy']['flow']
     for solver_name in settings['SHARPy']['flow']:
@@ -100,6 +105,12 @@ def main(args=None, sharpy_input_dict=None):
 
     cpu_time = time.process_time() - t
     wall_time = time.perf_counter() - t0_wall
+    if profiling.profiler.enabled:
+        profiling.profiler.add_time('total', wall_time)
+        profile_file = data.case_route + 'output/' + data.case_name + '/profile.json'
+        profiling.profiler.write(profile_file)
+        profiling.profiler.enable(False)
+        cout.cout_wrap('Profile written to %s' % profile_file, 2)
     cout.cout_wrap('FINISHED - Elapsed time = %f6 seconds' % wall_time, 2)
     cout.cout_wrap('FINISHED - CPU process time = %f6 seconds' % cpu_time, 2)
     finish_writer()
@@ -13,6 +13,9 @@ import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
 import sharpy.structure.utils.xbeamlib as xbeam
 import sharpy.utils.exceptions as exc
+import sharpy.utils.profiling as profiling
+import sharpy.utils.fsi_acceleration as fsi_acceleration
+import sharpy.utils.structural_predictor as structural_predictor
 
 
 @solver
@@ -31,6 +34,7 @@ class DynamicCoupled(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['print_info'] = 'bool'
     settings_default['print_info'] = True
@@ -92,6 +96,20 @@ class DynamicCoupled(BaseSolver):
     settings_default['dynamic_relaxation'] = False
     settings_description['dynamic_relaxation'] = 'Controls if relaxation factor is modified during the FSI iteration process'
 
+    settings_types['fsi_accelerator'] = 'str'
+    settings_default['fsi_accelerator'] = 'Constant'
+    settings_description['fsi_accelerator'] = 'Acceleration of the FSI iterations. ``Constant`` relaxes the structural forces with ``relaxation_factor``, ``Aitken`` uses Aitken\'s dynamic relaxation and ``IQN-ILS`` an interface quasi-Newton method. See :mod:`sharpy.utils.fsi_acceleration`'
+    settings_options['fsi_accelerator'] = list(fsi_acceleration.accelerators.keys())
+
+    settings_types['fsi_reuse_steps'] = 'int'
+    settings_default['fsi_reuse_steps'] = 0
+    settings_description['fsi_reuse_steps'] = 'Number of previous time steps whose FSI iterations are reused by the ``IQN-ILS`` accelerator'
+
+    settings_types['structural_predictor'] = 'str'
+    settings_default['structural_predictor'] = 'Constant'
+    settings_description['structural_predictor'] = 'Extrapolation of the structural state from the previous time steps that generates the aerodynamic grid of the first FSI iteration. ``Constant`` uses the previous time step. See :mod:`sharpy.utils.structural_predictor`'
+    settings_options['structural_predictor'] = list(structural_predictor.predictors.keys())
+
     settings_types['postprocessors'] = 'list(str)'
     settings_default['postprocessors'] = list()
     settings_description['postprocessors'] = 'List of the postprocessors to run at the end of every time step'
@@ -125,7 +143,7 @@ class DynamicCoupled(BaseSolver):
     settings_description['pseudosteps_ramp_unsteady_force'] = 'Length of the ramp with which unsteady force contribution is introduced every time step during the FSI iteration process'
 
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.data = None
@@ -144,7 +162,8 @@ class DynamicCoupled(BaseSolver):
         self.substep_dt = 0.
         self.initial_n_substeps = None
 
-        self.predictor = False
+        self.predictor = None
+        self.accelerator = None
         self.residual_table = None
         self.postprocessors = dict()
         self.with_postprocessors = False
@@ -190,7 +209,8 @@ class DynamicCoupled(BaseSolver):
             self.settings = custom_settings
         settings.to_custom_types(self.settings,
                                  self.settings_types,
-                                 self.settings_default)
+                                 self.settings_default,
+                                 self.settings_options)
 
         self.original_settings = copy.deepcopy(self.settings)
 
@@ -200,11 +220,22 @@ class DynamicCoupled(BaseSolver):
         self.initial_n_substeps = self.settings['structural_substeps'].value
 
         self.print_info = self.settings['print_info']
+        self.accelerator = fsi_acceleration.accelerator_from_string(
+            self.settings['fsi_accelerator'],
+            reuse_steps=self.settings['fsi_reuse_steps'].value)
         if self.settings['cleanup_previous_solution']:
             # if there's data in timestep_info[>0], copy the last one to
             # timestep_info[0] and remove the rest
             self.cleanup_timestep_info()
 
+        self.predictor = structural_predictor.predictor_from_string(
+            self.settings['structural_predictor'],
+            dt=self.dt.value)
+        if self.predictor.n_steps:
+            for tstep in self.data.structure.timestep_info[-self.predictor.n_steps:]:
+                if tstep is not None:
+                    self.predictor.add_step(tstep)
+
         self.structural_solver = solver_interface.initialise_solver(
             self.settings['structural_solver'])
         self.structural_solver.initialise(
@@ -323,6 +354,7 @@ class DynamicCoupled(BaseSolver):
                 len(self.data.structure.timestep_info),
                 self.settings['n_time_steps'].value + len(self.data.structure.timestep_info)):
             initial_time = time.perf_counter()
+            profiling.set_timestep(self.data.ts)
             structural_kstep = self.data.structure.timestep_info[-1].copy()
             aero_kstep = self.data.aero.timestep_info[-1].copy()
 
@@ -344,7 +376,11 @@ class DynamicCoupled(BaseSolver):
             controlled_structural_kstep = structural_kstep.copy()
             controlled_aero_kstep = aero_kstep.copy()
 
+            # the first FSI iteration uses the predicted geometry
+            structural_kstep = self.predictor.predict(structural_kstep)
+
             k = 0
+            self.accelerator.new_step()
             for k in range(self.settings['fsi_substeps'].value + 1):
                 if (k == self.settings['fsi_substeps'].value and
                         self.settings['fsi_substeps']):
@@ -375,6 +411,7 @@ class DynamicCoupled(BaseSolver):
                                                  convect_wake=True,
                                                  unsteady_contribution=unsteady_contribution)
                 self.time_aero += time.perf_counter() - ini_time_aero
+                profiling.profiler.add_time('DynamicCoupled/aero', time.perf_counter() - ini_time_aero)
 
                 previous_kstep = structural_kstep.copy()
                 structural_kstep = controlled_structural_kstep.copy()
@@ -382,16 +419,18 @@ class DynamicCoupled(BaseSolver):
                 # move the aerodynamic surface according the the structural one
                 self.aero_solver.update_custom_grid(structural_kstep,
                                                     aero_kstep)
-                self.map_forces(aero_kstep,
-                                structural_kstep,
-                                force_coeff)
+                with profiling.timer('DynamicCoupled/map_forces'):
+                    self.map_forces(aero_kstep,
+                                    structural_kstep,
+                                    force_coeff)
 
                 # relaxation
                 relax_factor = self.relaxation_factor(k)
                 relax(self.data.structure,
                       structural_kstep,
                       previous_kstep,
-                      relax_factor)
+                      relax_factor,
+                      self.accelerator)
 
                 # check if nan anywhere.
                 # if yes, raise exception
@@ -419,6 +458,7 @@ class DynamicCoupled(BaseSolver):
                         dt=self.substep_dt)
 
                 self.time_struc += time.perf_counter() - ini_time_struc
+                profiling.profiler.add_time('DynamicCoupled/structural', time.perf_counter() - ini_time_struc)
 
                 # check convergence
                 if self.convergence(k,
@@ -430,6 +470,8 @@ class DynamicCoupled(BaseSolver):
                         aero_kstep)
                     break
 
+            profiling.count('DynamicCoupled/fsi_iterations', k + 1)
+
             # move the aerodynamic surface according the the structural one
             self.aero_solver.update_custom_grid(structural_kstep, aero_kstep)
 
@@ -437,6 +479,7 @@ class DynamicCoupled(BaseSolver):
             self.data.aero.timestep_info[-1] = aero_kstep.copy()
             self.structural_solver.add_step()
             self.data.structure.timestep_info[-1] = structural_kstep.copy()
+            self.predictor.add_step(structural_kstep)
 
             final_time = time.perf_counter()
 
@@ -457,6 +500,11 @@ class DynamicCoupled(BaseSolver):
                 for postproc in self.postprocessors:
                     self.data = self.postprocessors[postproc].run(online=True)
 
+        profiling.set_timestep(None)
+
+        # complete the output of the postprocessors that write in the background
+        solver_interface.finalise_postprocessors(self.postprocessors)
+
         if self.print_info:
             cout.cout_wrap('...Finished', 1)
         return self.data
@@ -598,11 +646,27 @@ class DynamicCoupled(BaseSolver):
         return out_step
 
 
-def relax(beam, timestep, previous_timestep, coeff):
-    timestep.steady_applied_forces[:] = ((1.0 - coeff)*timestep.steady_applied_forces +
-            coeff*previous_timestep.steady_applied_forces)
-    timestep.unsteady_applied_forces[:] = ((1.0 - coeff)*timestep.unsteady_applied_forces +
-            coeff*previous_timestep.unsteady_applied_forces)
+def relax(beam, timestep, previous_timestep, coeff, accelerator=None):
+    """
+    Relaxes the applied forces of ``timestep`` with those of ``previous_timestep`` (used in the last FSI iteration)
+    with a constant relaxation factor ``coeff`` or with one of the accelerators of :mod:`sharpy.utils.fsi_acceleration`
+    """
+    if accelerator is None or type(accelerator) is fsi_acceleration.ConstantRelaxation:
+        timestep.steady_applied_forces[:] = ((1.0 - coeff)*timestep.steady_applied_forces +
+                coeff*previous_timestep.steady_applied_forces)
+        timestep.unsteady_applied_forces[:] = ((1.0 - coeff)*timestep.unsteady_applied_forces +
+                coeff*previous_timestep.unsteady_applied_forces)
+        return
+
+    # steady and unsteady forces are accelerated as a single interface vector
+    num_steady = timestep.steady_applied_forces.size
+    relaxed = accelerator.relax(np.concatenate((previous_timestep.steady_applied_forces.ravel(),
+                                                previous_timestep.unsteady_applied_forces.ravel())),
+                                np.concatenate((timestep.steady_applied_forces.ravel(),
+                                                timestep.unsteady_applied_forces.ravel())),
+                                coeff)
+    timestep.steady_applied_forces[:] = relaxed[:num_steady].reshape(timestep.steady_applied_forces.shape)
+    timestep.unsteady_applied_forces[:] = relaxed[num_steady:].reshape(timestep.unsteady_applied_forces.shape)
 
 
 def normalise_quaternion(tstep):
@@ -159,6 +159,7 @@ class DynamicUVLM(BaseSolver):
                 for postproc in self.postprocessors:
                     self.data = self.postprocessors[postproc].run(online=True)
 
+        solver_interface.finalise_postprocessors(self.postprocessors)
         if self.print_info:
             cout.cout_wrap('...Finished', 1)
 
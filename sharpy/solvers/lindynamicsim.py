@@ -1,7 +1,7 @@
 import numpy as np
 import os
 import h5py as h5
-from sharpy.utils.solver_interface import solver, BaseSolver, initialise_solver
+from sharpy.utils.solver_interface import solver, BaseSolver, initialise_solver, finalise_postprocessors
 import sharpy.utils.settings as settings
 import sharpy.linear.src.libss as libss
 import scipy.linalg as sclalg
@@ -186,6 +186,7 @@ class LinDynamicSim(BaseSolver):
                 for postproc in self.postprocessors:
                     self.data = self.postprocessors[postproc].run(online=True)
 
+        finalise_postprocessors(self.postprocessors)
         return self.data
 
     def read_files(self):
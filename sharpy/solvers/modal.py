@@ -6,7 +6,6 @@ import ctypes as ct
 import numpy as np
 import scipy as sc
 import os
-import itertools
 import warnings
 import sharpy.structure.utils.xbeamlib as xbeamlib
 from sharpy.utils.solver_interface import solver, BaseSolver
@@ -104,6 +103,18 @@ class Modal(BaseSolver):
     settings_default['rigid_modes_cg'] = False
     settings_description['rigid_modes_cg'] = 'Modify the ridid body modes such that they are defined wrt to the CG'
 
+    settings_types['symmetric_eigensolver'] = 'bool'
+    settings_default['symmetric_eigensolver'] = True
+    settings_description['symmetric_eigensolver'] = 'Solve for the undamped modes as a generalised symmetric ' \
+                                                    'eigenvalue problem (only the ``NumLambda`` lowest modes are ' \
+                                                    'computed). Used only if ``M`` and ``K`` are symmetric, ' \
+                                                    'otherwise the eigenvalues of ``M^{-1}K`` are computed'
+
+    settings_types['sparse_eigensolver'] = 'bool'
+    settings_default['sparse_eigensolver'] = True
+    settings_description['sparse_eigensolver'] = 'Use the sparse shift-invert Lanczos solver (``eigsh``) for the ' \
+                                                 'symmetric eigenvalue problem, with the dense ``eigh`` as fallback'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -273,12 +284,9 @@ class Modal(BaseSolver):
 
         # Check if the damping matrix is zero (issue working)
         if self.settings['use_undamped_modes'].value:
-            zero_FullCglobal = True
-            for i,j in itertools.product(range(num_dof),range(num_dof)):
-                if np.absolute(FullCglobal[i, j]) > np.finfo(float).eps:
-                    zero_FullCglobal = False
-                    warnings.warn('Projecting a system with damping on undamped modal shapes')
-                    break
+            zero_FullCglobal = not np.any(np.absolute(FullCglobal) > np.finfo(float).eps)
+            if not zero_FullCglobal:
+                warnings.warn('Projecting a system with damping on undamped modal shapes')
         # Check if the damping matrix is skew-symmetric
         # skewsymmetric_FullCglobal = True
         # for i in range(num_dof):
@@ -292,17 +300,24 @@ class Modal(BaseSolver):
 
         if self.settings['use_undamped_modes'].value:
 
-            # Solve for eigenvalues (with unit eigenvectors)            
-            eigenvalues,eigenvectors=np.linalg.eig(
-                                       np.linalg.solve(FullMglobal,FullKglobal))
+            if self.settings['symmetric_eigensolver'] and \
+                    modalutils.is_symmetric(FullMglobal) and modalutils.is_symmetric(FullKglobal):
+                # Generalised symmetric problem, only the lowest NumLambda modes
+                eigenvalues, eigenvectors = modalutils.undamped_modes(FullMglobal, FullKglobal, NumLambda,
+                                                                      use_sparse=self.settings['sparse_eigensolver'].value)
+                freq_natural = np.sqrt(eigenvalues)
+            else:
+                # Solve for eigenvalues (with unit eigenvectors)
+                eigenvalues,eigenvectors=np.linalg.eig(
+                                           np.linalg.solve(FullMglobal,FullKglobal))
+                # Define vibration frequencies and damping
+                freq_natural = np.sqrt(eigenvalues)
+                order = np.argsort(freq_natural)[:NumLambda]
+                freq_natural = freq_natural[order]
+                #freq_damped = freq_natural
+                eigenvalues = eigenvalues[order]
+                eigenvectors = eigenvectors[:,order]
             eigenvectors_left=None
-            # Define vibration frequencies and damping
-            freq_natural = np.sqrt(eigenvalues)
-            order = np.argsort(freq_natural)[:NumLambda]
-            freq_natural = freq_natural[order]
-            #freq_damped = freq_natural
-            eigenvalues = eigenvalues[order]
-            eigenvectors = eigenvectors[:,order]
             damping = np.zeros((NumLambda,))
 
         else:
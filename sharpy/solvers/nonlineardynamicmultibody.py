@@ -1,5 +1,7 @@
 import ctypes as ct
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as splinalg
 
 from sharpy.utils.solver_interface import solver, BaseSolver, solver_from_string
 import sharpy.utils.settings as settings
@@ -13,6 +15,21 @@ import sharpy.utils.exceptions as exc
 _BaseStructural = solver_from_string('_BaseStructural')
 
 
+def constraints_signature(value):
+    """
+    Hashable key of the constraint entries of a multibody dictionary.
+
+    Arrays are represented by their type, shape and raw data, so that any change in their values changes the key.
+    """
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, np.ascontiguousarray(value).tobytes())
+    if isinstance(value, dict):
+        return ('dict', tuple((key, constraints_signature(value[key])) for key in sorted(value, key=str)))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(constraints_signature(item) for item in value))
+    return (type(value).__name__, repr(value))
+
+
 @solver
 class NonLinearDynamicMultibody(_BaseStructural):
     """
@@ -28,6 +45,12 @@ class NonLinearDynamicMultibody(_BaseStructural):
     settings_default = _BaseStructural.settings_default.copy()
     settings_description = _BaseStructural.settings_description.copy()
 
+    settings_types['sparse_solver'] = 'bool'
+    settings_default['sparse_solver'] = True
+    settings_description['sparse_solver'] = 'Assemble the system in sparse format and solve it with a sparse LU ' \
+                                            'factorisation. The column ordering of the first factorisation is ' \
+                                            'reused in the following iterations and time steps'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -42,9 +65,18 @@ class NonLinearDynamicMultibody(_BaseStructural):
         self.lc_list = None
         self.num_LM_eq = None
 
+        # Nodes, elements and dofs of each body
+        self.partition = None
+
         self.gamma = None
         self.beta = None
 
+        # Cached constraints and the MBdict constraints they were generated from
+        self.lc_signature = None
+
+        # Column permutation of the system applied in the sparse LU factorisations
+        self.perm_c = None
+
     def initialise(self, data, custom_settings=None):
 
         self.data = data
@@ -63,12 +95,14 @@ class NonLinearDynamicMultibody(_BaseStructural):
         self.beta = 0.25*(self.gamma + 0.5)*(self.gamma + 0.5)
 
         # Define the number of equations
-        self.lc_list = lagrangeconstraints.initialize_constraints(self.data.structure.ini_mb_dict)
-        self.num_LM_eq = lagrangeconstraints.define_num_LM_eq(self.lc_list)
+        self.update_constraints(self.data.structure.ini_mb_dict)
 
         # Define the number of dofs
         self.define_sys_size()
 
+        # Nodes, elements and dofs of each body
+        self.partition = mb.MultibodyPartition(self.data.structure)
+
     def add_step(self):
         self.data.structure.next_step()
 
@@ -84,9 +118,25 @@ class NonLinearDynamicMultibody(_BaseStructural):
             if (MBdict['body_%02d' % ibody]['FoR_movement'] == 'free'):
                 self.sys_size += 10
 
+    def update_constraints(self, MBdict):
+        """
+        Generates the list of Lagrange constraints from ``MBdict``.
+
+        The constraints are only generated again if the constraint entries in ``MBdict`` have changed since the last
+        call (i.e. a constraint has been removed), otherwise the cached ``lc_list`` is kept.
+        """
+        signature = constraints_signature([MBdict['constraint_%02d' % iconstraint]
+                                           for iconstraint in range(MBdict['num_constraints'])])
+        if signature != self.lc_signature:
+            self.lc_list = lagrangeconstraints.initialize_constraints(MBdict)
+            self.num_LM_eq = lagrangeconstraints.define_num_LM_eq(self.lc_list)
+            self.lc_signature = signature
+
     def assembly_MB_eq_system(self, MB_beam, MB_tstep, ts, dt, Lambda, Lambda_dot, MBdict):
-        self.lc_list = lagrangeconstraints.initialize_constraints(MBdict)
-        self.num_LM_eq = lagrangeconstraints.define_num_LM_eq(self.lc_list)
+        self.update_constraints(MBdict)
+
+        if self.settings['sparse_solver']:
+            return self.assembly_MB_eq_system_sparse(MB_beam, MB_tstep, ts, dt, Lambda, Lambda_dot)
 
         MB_M = np.zeros((self.sys_size+self.num_LM_eq, self.sys_size+self.num_LM_eq), dtype=ct.c_double, order='F')
         MB_C = np.zeros((self.sys_size+self.num_LM_eq, self.sys_size+self.num_LM_eq), dtype=ct.c_double, order='F')
@@ -149,6 +199,88 @@ class NonLinearDynamicMultibody(_BaseStructural):
 
         return MB_Asys, MB_Q
 
+    def assembly_MB_eq_system_sparse(self, MB_beam, MB_tstep, ts, dt, Lambda, Lambda_dot):
+        """
+        Sparse version of :meth:`assembly_MB_eq_system`.
+
+        The Newmark system matrix of each body is formed from its (dense) ``M``, ``C`` and ``K`` and only its non-zero
+        entries are added to the global matrix, together with the Lagrange multiplier coupling blocks.
+
+        Returns:
+            tuple: System matrix in ``scipy.sparse.csc_matrix`` format and vector of residuals
+        """
+        size = self.sys_size + self.num_LM_eq
+        c_fact = self.gamma/(self.beta*dt)
+        m_fact = 1./(self.beta*dt*dt)
+
+        MB_Q = np.zeros((size,), dtype=ct.c_double, order='F')
+        rows = []
+        cols = []
+        vals = []
+
+        first_dof = 0
+        for ibody in range(len(MB_beam)):
+            if MB_beam[ibody].FoR_movement == 'prescribed':
+                last_dof = first_dof + MB_beam[ibody].num_dof.value
+                M, C, K, Q = xbeamlib.cbeam3_asbly_dynamic(MB_beam[ibody], MB_tstep[ibody], self.settings)
+
+            elif MB_beam[ibody].FoR_movement == 'free':
+                last_dof = first_dof + MB_beam[ibody].num_dof.value + 10
+                M, C, K, Q = xbeamlib.xbeam3_asbly_dynamic(MB_beam[ibody], MB_tstep[ibody], self.settings)
+
+            body_Asys = sp.coo_matrix(K + C*c_fact + M*m_fact)
+            rows.append(body_Asys.row + first_dof)
+            cols.append(body_Asys.col + first_dof)
+            vals.append(body_Asys.data)
+
+            MB_Q[first_dof:last_dof] = Q
+
+            first_dof = last_dof
+
+        if self.num_LM_eq:
+            LM_C, LM_K, LM_Q = lagrangeconstraints.generate_lagrange_matrix_sparse(
+                self.lc_list,
+                MB_beam,
+                MB_tstep,
+                ts,
+                self.num_LM_eq,
+                self.sys_size,
+                dt,
+                Lambda,
+                Lambda_dot,
+                "dynamic")
+
+            rows.extend([LM_K.row, LM_C.row])
+            cols.extend([LM_K.col, LM_C.col])
+            vals.extend([LM_K.data, LM_C.data*c_fact])
+            MB_Q += LM_Q
+
+        # duplicated entries are summed in the conversion
+        MB_Asys = sp.csc_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                                shape=(size, size))
+
+        return MB_Asys, MB_Q
+
+    def solve_sparse(self, MB_Asys, rhs):
+        """
+        Solves the sparse system with a LU factorisation.
+
+        The fill-reducing column ordering computed in the first factorisation is stored and reused in the following
+        ones, since the sparsity pattern of the system does not change between iterations and time steps.
+
+        SuperLU factorises ``A[:, perm]`` with ``perm = argsort(perm_c)``, so the reused ordering is applied in the
+        same way and the solution is scattered back with ``perm``.
+        """
+        if self.perm_c is None or self.perm_c.shape[0] != MB_Asys.shape[0]:
+            lu = splinalg.splu(MB_Asys)
+            self.perm_c = np.argsort(lu.perm_c)
+            return lu.solve(rhs)
+
+        lu = splinalg.splu(MB_Asys[:, self.perm_c], permc_spec='NATURAL')
+        sol = np.zeros_like(rhs)
+        sol[self.perm_c] = lu.solve(rhs)
+        return sol
+
     def integrate_position(self, MB_beam, MB_tstep, dt):
         vel = np.zeros((6,),)
         acc = np.zeros((6,),)
@@ -179,8 +311,8 @@ class NonLinearDynamicMultibody(_BaseStructural):
             return
 
         # TODO the output of this routine is wrong. check at some point.
-        LM_C, LM_K, LM_Q = lagrangeconstraints.generate_lagrange_matrix(self.lc_list, MB_beam, MB_tstep, ts, self.num_LM_eq, self.sys_size, dt, Lambda, Lambda_dot, "dynamic")
-        F = -np.dot(LM_C[:, -self.num_LM_eq:], Lambda_dot) - np.dot(LM_K[:, -self.num_LM_eq:], Lambda)
+        LM_C, LM_K, LM_Q = lagrangeconstraints.generate_lagrange_matrix_sparse(self.lc_list, MB_beam, MB_tstep, ts, self.num_LM_eq, self.sys_size, dt, Lambda, Lambda_dot, "dynamic")
+        F = -LM_C.tocsc()[:, -self.num_LM_eq:].dot(Lambda_dot) - LM_K.tocsc()[:, -self.num_LM_eq:].dot(Lambda)
 
         first_dof = 0
         for ibody in range(len(MB_beam)):
@@ -214,15 +346,15 @@ class NonLinearDynamicMultibody(_BaseStructural):
         else:
             self.settings['dt'] = ct.c_float(dt)
 
-        self.lc_list = lagrangeconstraints.initialize_constraints(MBdict)
-        self.num_LM_eq = lagrangeconstraints.define_num_LM_eq(self.lc_list)
+        self.update_constraints(MBdict)
 
         # TODO: only working for constant forces
         MB_beam, MB_tstep = mb.split_multibody(
             self.data.structure,
             structural_step,
             MBdict,
-            self.data.ts)
+            self.data.ts,
+            partition=self.partition)
 
         # Lagrange multipliers parameters
         num_LM_eq = self.num_LM_eq
@@ -276,7 +408,10 @@ class NonLinearDynamicMultibody(_BaseStructural):
             # invT = np.matrix(T).I
             # MB_Q_balanced = np.dot(invT, MB_Q).T
 
-            Dq = np.linalg.solve(MB_Asys, -MB_Q)
+            if self.settings['sparse_solver']:
+                Dq = self.solve_sparse(MB_Asys, -MB_Q)
+            else:
+                Dq = np.linalg.solve(MB_Asys, -MB_Q)
             # least squares solver
             # Dq = np.linalg.lstsq(np.dot(MB_Asys_balanced, invT), -MB_Q_balanced, rcond=None)[0]
 
@@ -334,7 +469,8 @@ class NonLinearDynamicMultibody(_BaseStructural):
         if self.settings['gravity_on']:
             for ibody in range(len(MB_beam)):
                 xbeamlib.cbeam3_correct_gravity_forces(MB_beam[ibody], MB_tstep[ibody], self.settings)
-        mb.merge_multibody(MB_tstep, MB_beam, self.data.structure, structural_step, MBdict, dt)
+        mb.merge_multibody(MB_tstep, MB_beam, self.data.structure, structural_step, MBdict, dt,
+                           partition=self.partition)
 
         # structural_step.q[:] = q[:self.sys_size].copy()
         # structural_step.dqdt[:] = dqdt[:self.sys_size].copy()
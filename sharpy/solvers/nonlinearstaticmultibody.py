@@ -40,6 +40,9 @@ class NonLinearStaticMultibody(_BaseStructural):
         self.lc_list = None
         self.num_LM_eq = None
 
+        # Nodes, elements and dofs of each body
+        self.partition = None
+
         # self.gamma = None
         # self.beta = None
 
@@ -67,6 +70,9 @@ class NonLinearStaticMultibody(_BaseStructural):
         # Define the number of dofs
         self.define_sys_size()
 
+        # Nodes, elements and dofs of each body
+        self.partition = mb.MultibodyPartition(self.data.structure)
+
     def add_step(self):
         self.data.structure.next_step()
 
@@ -223,7 +229,8 @@ class NonLinearStaticMultibody(_BaseStructural):
         self.num_LM_eq = lagrangeconstraints.define_num_LM_eq(self.lc_list)
 
         # TODO: only working for constant forces
-        MB_beam, MB_tstep = mb.split_multibody(self.data.structure, structural_step, MBdict, 0)
+        MB_beam, MB_tstep = mb.split_multibody(self.data.structure, structural_step, MBdict, 0,
+                                               partition=self.partition)
         q = np.zeros((self.sys_size + self.num_LM_eq,), dtype=ct.c_double, order='F')
         dqdt = np.zeros((self.sys_size + self.num_LM_eq,), dtype=ct.c_double, order='F')
         dqddt = np.zeros((self.sys_size + self.num_LM_eq,), dtype=ct.c_double, order='F')
@@ -266,7 +273,8 @@ class NonLinearStaticMultibody(_BaseStructural):
         if self.settings['gravity_on']:
             for ibody in range(len(MB_beam)):
                 xbeamlib.cbeam3_correct_gravity_forces(MB_beam[ibody], MB_tstep[ibody], self.settings)
-        mb.merge_multibody(MB_tstep, MB_beam, self.data.structure, structural_step, MBdict, 0.)
+        mb.merge_multibody(MB_tstep, MB_beam, self.data.structure, structural_step, MBdict, 0.,
+                           partition=self.partition)
 
         # # Initialize
         # q = np.zeros((self.sys_size + num_LM_eq,), dtype=ct.c_double, order='F')
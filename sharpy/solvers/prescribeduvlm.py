@@ -159,6 +159,7 @@ class PrescribedUvlm(BaseSolver):
                 for postproc in self.postprocessors:
                     self.data = self.postprocessors[postproc].run(online=True)
 
+        solver_interface.finalise_postprocessors(self.postprocessors)
         return self.data
 
 #
@@ -8,6 +8,8 @@ import sharpy.utils.solver_interface as solver_interface
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
+import sharpy.utils.profiling as profiling
+import sharpy.utils.fsi_acceleration as fsi_acceleration
 
 
 @solver
@@ -22,6 +24,7 @@ class StaticCoupled(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['print_info'] = 'bool'
     settings_default['print_info'] = True
@@ -59,8 +62,17 @@ class StaticCoupled(BaseSolver):
     settings_default['relaxation_factor'] = 0.
     settings_description['relaxation_factor'] = 'Relaxation parameter in the FSI iteration. 0 is no relaxation and -> 1 is very relaxed'
 
+    settings_types['fsi_accelerator'] = 'str'
+    settings_default['fsi_accelerator'] = 'Constant'
+    settings_description['fsi_accelerator'] = 'Acceleration of the FSI iterations. ``Constant`` relaxes the structural forces with ``relaxation_factor``, ``Aitken`` uses Aitken\'s dynamic relaxation and ``IQN-ILS`` an interface quasi-Newton method. See :mod:`sharpy.utils.fsi_acceleration`'
+    settings_options['fsi_accelerator'] = list(fsi_acceleration.accelerators.keys())
+
+    settings_types['fsi_reuse_steps'] = 'int'
+    settings_default['fsi_reuse_steps'] = 0
+    settings_description['fsi_reuse_steps'] = 'Number of previous load steps whose FSI iterations are reused by the ``IQN-ILS`` accelerator'
+
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
 
@@ -70,6 +82,7 @@ class StaticCoupled(BaseSolver):
         self.aero_solver = None
 
         self.previous_force = None
+        self.accelerator = None
 
         self.residual_table = None
 
@@ -79,9 +92,12 @@ class StaticCoupled(BaseSolver):
             self.settings = data.settings[self.solver_id]
         else:
             self.settings = input_dict
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, self.settings_options)
 
         self.print_info = self.settings['print_info']
+        self.accelerator = fsi_acceleration.accelerator_from_string(
+            self.settings['fsi_accelerator'],
+            reuse_steps=self.settings['fsi_reuse_steps'].value)
 
         self.structural_solver = solver_interface.initialise_solver(self.settings['structural_solver'])
         self.structural_solver.initialise(self.data, self.settings['structural_solver_settings'])
@@ -130,21 +146,34 @@ class StaticCoupled(BaseSolver):
                 self.increase_ts()
 
             for i_iter in range(self.settings['max_iter'].value):
+                profiling.count('StaticCoupled/fsi_iterations')
                 # run aero
                 self.data = self.aero_solver.run()
 
                 # map force
-                struct_forces = mapping.aero2struct_force_mapping(
-                    self.data.aero.timestep_info[self.data.ts].forces,
-                    self.data.aero.struct2aero_mapping,
-                    self.data.aero.timestep_info[self.data.ts].zeta,
-                    self.data.structure.timestep_info[self.data.ts].pos,
-                    self.data.structure.timestep_info[self.data.ts].psi,
-                    self.data.structure.node_master_elem,
-                    self.data.structure.connectivities,
-                    self.data.structure.timestep_info[self.data.ts].cag())
-
-                if not self.settings['relaxation_factor'].value == 0.:
+                with profiling.timer('StaticCoupled/map_forces'):
+                    struct_forces = mapping.aero2struct_force_mapping(
+                        self.data.aero.timestep_info[self.data.ts].forces,
+                        self.data.aero.struct2aero_mapping,
+                        self.data.aero.timestep_info[self.data.ts].zeta,
+                        self.data.structure.timestep_info[self.data.ts].pos,
+                        self.data.structure.timestep_info[self.data.ts].psi,
+                        self.data.structure.node_master_elem,
+                        self.data.structure.connectivities,
+                        self.data.structure.timestep_info[self.data.ts].cag())
+
+                if type(self.accelerator) is not fsi_acceleration.ConstantRelaxation:
+                    # relaxation with the forces applied in the previous iteration
+                    if i_iter == 0:
+                        self.accelerator.new_step()
+                    else:
+                        struct_forces = self.accelerator.relax(self.previous_force.ravel(),
+                                                               struct_forces.ravel(),
+                                                               self.settings['relaxation_factor'].value).reshape(
+                            struct_forces.shape)
+                    self.previous_force = struct_forces.copy()
+
+                elif not self.settings['relaxation_factor'].value == 0.:
                     if i_iter == 0:
                         self.previous_force = struct_forces.copy()
 
@@ -5,6 +5,7 @@ import scipy.signal
 
 import sharpy.utils.algebra as algebra
 import sharpy.aero.utils.uvlmlib as uvlmlib
+import sharpy.aero.utils.wake_management as wake_management
 import sharpy.utils.settings as settings
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.generator_interface as gen_interface
@@ -92,6 +93,28 @@ class StepUvlm(BaseSolver):
     settings_default['rho'] = 1.225
     settings_description['rho'] = 'Air density'
 
+    settings_types['wake_management'] = 'str'
+    settings_default['wake_management'] = 'None'
+    settings_description['wake_management'] = 'Reduction of the far-wake panels before every convection. ``Merge`` ' \
+                                              'merges groups of ``wake_merge_rows`` rows conserving their vortex ' \
+                                              'impulse and ``Truncate`` removes the rows whose induced velocity is ' \
+                                              'below ``wake_tolerance``. See :mod:`sharpy.aero.utils.wake_management`'
+    settings_options['wake_management'] = list(wake_management.wake_managers.keys())
+
+    settings_types['wake_near_rows'] = 'int'
+    settings_default['wake_near_rows'] = 10
+    settings_description['wake_near_rows'] = 'Number of wake rows behind the trailing edge that are not modified by ' \
+                                             'the ``wake_management``'
+
+    settings_types['wake_merge_rows'] = 'int'
+    settings_default['wake_merge_rows'] = 4
+    settings_description['wake_merge_rows'] = 'Number of far-wake rows merged into one with ``Merge`` wake management'
+
+    settings_types['wake_tolerance'] = 'float'
+    settings_default['wake_tolerance'] = 1e-4
+    settings_description['wake_tolerance'] = 'Induced velocity of the truncated rows on the lifting surfaces, ' \
+                                             'relative to the flow velocity, with ``Truncate`` wake management'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
@@ -99,6 +122,7 @@ class StepUvlm(BaseSolver):
         self.data = None
         self.settings = None
         self.velocity_generator = None
+        self.wake_manager = None
 
     def initialise(self, data, custom_settings=None):
         """
@@ -143,6 +167,13 @@ class StepUvlm(BaseSolver):
         self.velocity_generator.initialise(
             self.settings['velocity_field_input'])
 
+        self.wake_manager = wake_management.wake_manager_from_string(
+            self.settings['wake_management'],
+            self.data.aero.aero_dimensions_star[:, 0],
+            near_rows=self.settings['wake_near_rows'].value,
+            merge_rows=self.settings['wake_merge_rows'].value,
+            tolerance=self.settings['wake_tolerance'].value)
+
     def run(self,
             aero_tstep=None,
             structure_tstep=None,
@@ -174,6 +205,8 @@ class StepUvlm(BaseSolver):
                                           'dt': dt,
                                           'for_pos': structure_tstep.for_pos},
                                          aero_tstep.u_ext)
+        if convect_wake:
+            self.wake_manager.manage(aero_tstep)
         if self.settings['convection_scheme'].value > 1 and convect_wake:
             # generate uext_star
             self.velocity_generator.generate({'zeta': aero_tstep.zeta_star,
@@ -190,6 +223,8 @@ class StepUvlm(BaseSolver):
                             self.settings,
                             convect_wake=convect_wake,
                             dt=dt)
+        if convect_wake:
+            self.wake_manager.convected(aero_tstep)
 
         if unsteady_contribution:
             # calculate unsteady (added mass) forces:
@@ -1,6 +1,9 @@
+import collections
 import ctypes as ct
+import multiprocessing as mpr
 import numpy as np
 import scipy.optimize
+import threading
 import warnings
 
 import sharpy.aero.utils.mapping as mapping
@@ -86,6 +89,31 @@ class Trim(BaseSolver):
     settings_default['refine_solution'] = False
     settings_description['refine_solution'] = 'If ``True`` and the optimiser routine allows for it, the optimiser will try to improve the solution with hybrid methods'
 
+    settings_types['cache_evaluations'] = 'bool'
+    settings_default['cache_evaluations'] = True
+    settings_description['cache_evaluations'] = 'Store the resultants of every evaluated trim vector and reuse them ' \
+                                                'if the optimiser requests the same point again'
+
+    settings_types['warm_start'] = 'bool'
+    settings_default['warm_start'] = False
+    settings_description['warm_start'] = 'Start every coupled solution from the converged structural state of the ' \
+                                         'closest trim vector evaluated by the optimiser instead of ``ini_info``'
+
+    settings_types['warm_start_states'] = 'int'
+    settings_default['warm_start_states'] = 10
+    settings_description['warm_start_states'] = 'Number of converged structural states kept for ``warm_start``. ' \
+                                                'When it is exceeded the oldest state is dropped'
+
+    settings_types['fd_step'] = 'float'
+    settings_default['fd_step'] = 0.05
+    settings_description['fd_step'] = 'Step size of the finite differences used in the gradient-based refinement'
+
+    settings_types['num_cores'] = 'int'
+    settings_default['num_cores'] = 1
+    settings_description['num_cores'] = 'Number of processes used to evaluate the finite difference gradient in ' \
+                                        'the refinement step. ``1`` uses the serial scipy gradient. The processes ' \
+                                        'are forked, see :meth:`Trim.gradient`'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -99,6 +127,8 @@ class Trim(BaseSolver):
 
         self.with_special_case = False
 
+        self.cache = None
+
     def initialise(self, data):
         self.data = data
         self.settings = data.settings[self.solver_id]
@@ -203,6 +233,9 @@ class Trim(BaseSolver):
                     if self.settings['special_case']['case_name'] == 'differential_thrust':
                         self.bounds[v] = (-0.5, 0.5)
 
+        if self.settings['cache_evaluations'] or self.settings['warm_start']:
+            self.cache = TrimEvaluationCache(self.settings['warm_start_states'].value)
+
     def increase_ts(self):
         self.data.ts += 1
         self.structural_solver.next_step()
@@ -240,6 +273,70 @@ class Trim(BaseSolver):
         # self.optimise(self.solver_wrapper, )
         pass
 
+    def initial_structural_state(self, x):
+        """
+        Structural state from which the coupled solution at ``x`` is started.
+
+        Returns a copy of ``ini_info`` unless ``warm_start`` is selected, in which case the converged state of the
+        stored trim vector closest to ``x`` is used.
+
+        Args:
+            x (np.ndarray): Trim vector
+
+        Returns:
+            sharpy.utils.datastructures.StructTimeStepInfo: Initial structural state
+        """
+        if self.settings['warm_start'] and self.cache is not None:
+            state = self.cache.nearest_state(x)
+            if state is not None:
+                return state.copy()
+        return self.data.structure.ini_info.copy()
+
+    def gradient(self, x, *args):
+        """
+        Forward finite difference gradient of the trim objective with the perturbed points evaluated in parallel.
+
+        The worker processes are forked from the current process, so each one runs the coupled solver on its own copy
+        of the data without pickling it. Only the thread calling ``fork`` is copied to the workers, so a lock held by
+        any other thread of the parent stays locked in the workers and they would deadlock on it. The perturbed points
+        are evaluated serially instead if the parent runs other threads, if it is a daemonic process (e.g. a worker of
+        a :mod:`sharpy.utils.campaign`) or if ``fork`` is not available on the platform (see
+        :func:`fork_available`).
+
+        Resultants computed for the perturbed points are added to the evaluation cache and counted as finite
+        difference solutions.
+
+        Args:
+            x (np.ndarray): Trim vector
+            *args: Arguments of :func:`solver_wrapper` after ``x``
+
+        Returns:
+            np.ndarray: Gradient of the objective function
+        """
+        eps = self.settings['fd_step'].value
+        f0 = solver_wrapper(x, *args)
+
+        perturbed_x = []
+        for i_var in range(len(x)):
+            x_pert = np.array(x, dtype=float)
+            x_pert[i_var] += eps
+            perturbed_x.append(x_pert)
+
+        if fork_available():
+            with mpr.get_context('fork').Pool(min(self.settings['num_cores'].value, len(x)),
+                                              initializer=_pool_initialiser,
+                                              initargs=(self,)) as pool:
+                totals = pool.map(_pool_evaluate_totals, perturbed_x)
+        else:
+            totals = [evaluate_totals(x_pert, self.x_info, self) for x_pert in perturbed_x]
+
+        grad = np.zeros_like(x, dtype=float)
+        for i_var in range(len(x)):
+            if self.cache is not None:
+                self.cache.add(perturbed_x[i_var], totals[i_var], finite_difference=True)
+            grad[i_var] = (objective_from_totals(totals[i_var], args[2], self) - f0)/eps
+        return grad
+
     def optimise(self, func, tolerance, print_info, method, refine):
         args = (self.x_info, self, -2)
 
@@ -253,21 +350,123 @@ class Trim(BaseSolver):
                                                     'fatol': 1e-4})
         if refine:
             cout.cout_wrap('Refining results with a gradient-based method', 1)
+            if self.settings['num_cores'].value > 1:
+                jac = self.gradient
+            else:
+                jac = None
             solution = scipy.optimize.minimize(func,
                                                solution.x,
                                                args=args,
                                                method='BFGS',
+                                               jac=jac,
                                                options={'disp': print_info,
-                                                        'eps': 0.05,
+                                                        'eps': self.settings['fd_step'].value,
                                                         'maxfev': 5000,
                                                         'fatol': 1e-4})
 
         cout.cout_wrap('Solution = ')
         cout.cout_wrap(solution.x)
+        if self.cache is not None:
+            cout.cout_wrap('Coupled solutions: %u, finite difference solutions: %u, cached evaluations reused: %u' %
+                           (self.cache.n_solves, self.cache.n_fd_solves, self.cache.n_hits), 1)
         # pretty_print_x(x, x_info)
         return solution
 
 
+class TrimEvaluationCache(object):
+    """
+    Record of the trim vectors evaluated by the optimiser.
+
+    For every evaluated trim vector the resultant forces and moments are stored. The converged structural states
+    of the latest ``max_states`` evaluations are kept as well, as starting points of the evaluations with
+    ``warm_start``.
+
+    Args:
+        max_states (int): Number of structural states kept. The oldest one is dropped when it is exceeded
+
+    Attributes:
+        states (collections.deque): Pairs of trim vector and converged structural state, from oldest to latest
+        n_solves (int): Number of coupled solutions requested by the optimiser and added to the cache
+        n_fd_solves (int): Number of coupled solutions of the perturbed points of the parallel finite difference
+          gradient added to the cache
+        n_hits (int): Number of evaluations answered from the cache
+    """
+    def __init__(self, max_states=10):
+        self.totals = dict()
+        self.states = collections.deque(maxlen=max_states)
+
+        self.n_solves = 0
+        self.n_fd_solves = 0
+        self.n_hits = 0
+
+    @staticmethod
+    def key(x):
+        return tuple(np.asarray(x, dtype=float))
+
+    def get(self, x):
+        """
+        Returns the resultants stored for ``x`` or ``None`` if ``x`` has not been evaluated.
+        """
+        try:
+            totals = self.totals[self.key(x)]
+        except KeyError:
+            return None
+        self.n_hits += 1
+        return totals.copy()
+
+    def add(self, x, totals, state=None, finite_difference=False):
+        """
+        Adds an evaluation to the cache.
+
+        Args:
+            x (np.ndarray): Trim vector
+            totals (np.ndarray): Resultant forces and moments ``[Fx, Fy, Fz, Mx, My, Mz]``
+            state (sharpy.utils.datastructures.StructTimeStepInfo): Converged structural state (optional)
+            finite_difference (bool): The evaluation is a perturbed point of the finite difference gradient
+        """
+        self.totals[self.key(x)] = np.array(totals, dtype=float)
+        if finite_difference:
+            self.n_fd_solves += 1
+        else:
+            self.n_solves += 1
+        if state is not None:
+            self.states.append((np.array(x, dtype=float), state))
+
+    def nearest_state(self, x):
+        """
+        Returns the stored structural state whose trim vector is closest to ``x`` or ``None`` if no state is stored.
+        """
+        if not self.states:
+            return None
+        distance = [np.linalg.norm(x_state - x) for x_state, _ in self.states]
+        return self.states[int(np.argmin(distance))][1]
+
+
+def fork_available():
+    """
+    Returns:
+        bool: ``True`` if worker processes can be safely forked from the current process: ``fork`` is available,
+        the current process is not daemonic (daemonic processes cannot have children) and it runs no other threads
+        whose locks would be copied locked to the workers.
+    """
+    return ('fork' in mpr.get_all_start_methods() and
+            not mpr.current_process().daemon and
+            threading.active_count() == 1)
+
+
+# Trim solver of the processes forked by ``Trim.gradient``, set by ``_pool_initialiser`` in every worker
+_pool_solver_data = None
+
+
+def _pool_initialiser(solver_data):
+    global _pool_solver_data
+    _pool_solver_data = solver_data
+
+
+def _pool_evaluate_totals(x):
+    return evaluate_totals(x, _pool_solver_data.x_info, _pool_solver_data)
+
+
 # def pretty_print_x(x, x_info):
 #     cout.cout_wrap('X vector:', 1)
 #     for k, v in x_info:
@@ -283,11 +482,48 @@ def solver_wrapper(x, x_info, solver_data, i_dim=-1):
     if solver_data.settings['print_info']:
         cout.cout_wrap('x = ' + str(x), 1)
     # print('x = ', x)
+    totals = None
+    if solver_data.cache is not None and solver_data.settings['cache_evaluations']:
+        totals = solver_data.cache.get(x)
+    if totals is None:
+        totals = evaluate_totals(x, x_info, solver_data)
+        if solver_data.cache is not None:
+            state = None
+            if solver_data.settings['warm_start']:
+                state = solver_data.data.structure.timestep_info[solver_data.data.ts].copy()
+            solver_data.cache.add(x, totals, state)
+    if solver_data.settings['print_info']:
+        cout.cout_wrap(' forces = ' + str(totals), 1)
+    # print('total forces = ', totals)
+    # try:
+    #     totals += x[x_info['i_none']]
+    # except KeyError:
+    #     pass
+    # return resultant forces and moments
+    # return np.linalg.norm(totals)
+    return objective_from_totals(totals, i_dim, solver_data)
+
+
+def objective_from_totals(totals, i_dim, solver_data):
+    if i_dim >= 0:
+        return totals[i_dim]
+    elif i_dim == -1:
+        # return [np.sum(totals[0:3]**2), np.sum(totals[4:6]**2)]
+        return totals
+    elif i_dim == -2:
+        coeffs = np.array([1.0, 1.0, 1.0, 2, 2, 2])
+        # print('return = ', np.dot(coeffs*totals, coeffs*totals))
+        if solver_data.settings['print_info']:
+            cout.cout_wrap(' val = ' + str(np.dot(coeffs*totals, coeffs*totals)), 1)
+        return np.dot(coeffs*totals, coeffs*totals)
+
+
+def evaluate_totals(x, x_info, solver_data):
     alpha = x[x_info['i_alpha']]
     beta = x[x_info['i_beta']]
     roll = x[x_info['i_roll']]
     # change input data
-    solver_data.data.structure.timestep_info[solver_data.data.ts] = solver_data.data.structure.ini_info.copy()
+    solver_data.data.structure.timestep_info[solver_data.data.ts] = solver_data.initial_structural_state(x)
     tstep = solver_data.data.structure.timestep_info[solver_data.data.ts]
     aero_tstep = solver_data.data.aero.timestep_info[solver_data.data.ts]
     orientation_quat = algebra.euler2quat(np.array([roll, alpha, beta]))
@@ -324,23 +560,4 @@ def solver_wrapper(x, x_info, solver_data, i_dim=-1):
     totals = np.zeros((6,))
     totals[0:3] = forces
     totals[3:6] = moments
-    if solver_data.settings['print_info']:
-        cout.cout_wrap(' forces = ' + str(totals), 1)
-    # print('total forces = ', totals)
-    # try:
-    #     totals += x[x_info['i_none']]
-    # except KeyError:
-    #     pass
-    # return resultant forces and moments
-    # return np.linalg.norm(totals)
-    if i_dim >= 0:
-        return totals[i_dim]
-    elif i_dim == -1:
-        # return [np.sum(totals[0:3]**2), np.sum(totals[4:6]**2)]
-        return totals
-    elif i_dim == -2:
-        coeffs = np.array([1.0, 1.0, 1.0, 2, 2, 2])
-        # print('return = ', np.dot(coeffs*totals, coeffs*totals))
-        if solver_data.settings['print_info']:
-            cout.cout_wrap(' val = ' + str(np.dot(coeffs*totals, coeffs*totals)), 1)
-        return np.dot(coeffs*totals, coeffs*totals)
+    return totals
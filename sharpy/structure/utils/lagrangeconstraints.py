@@ -19,6 +19,7 @@ import sharpy.utils.cout_utils as cout
 import os
 import ctypes as ct
 import numpy as np
+import scipy.sparse as sp
 import sharpy.utils.algebra as algebra
 
 dict_of_lc = {}
@@ -165,6 +166,108 @@ def define_FoR_dof(MB_beam, FoR_body):
     return FoR_dof
 
 
+class SparseLagrangeMatrix(object):
+    """
+    SparseLagrangeMatrix
+
+    Square matrix that stores the blocks added to it by the constraint equations as COO triplets
+
+    It replaces the dense ``LM_C`` and ``LM_K`` matrices in the calls to ``staticmat`` and ``dynamicmat``: indexing
+    it with slices returns a block of zeros, so the in-place ``+=`` and ``-=`` of the constraints store the
+    non-zero entries of the increment.
+
+    Args:
+        size (int): number of rows and columns
+
+    Attributes:
+        shape (tuple): shape of the matrix
+        rows (list(np.ndarray)): row indices of the stored blocks
+        cols (list(np.ndarray)): column indices of the stored blocks
+        vals (list(np.ndarray)): values of the stored blocks
+    """
+    def __init__(self, size):
+        self.shape = (size, size)
+        self.rows = []
+        self.cols = []
+        self.vals = []
+
+    def _indices(self, key):
+        return [np.arange(*index.indices(size)) if isinstance(index, slice) else np.atleast_1d(index)
+                for index, size in zip(key, self.shape)]
+
+    def __getitem__(self, key):
+        rows, cols = self._indices(key)
+        return np.zeros((len(rows), len(cols)), dtype=ct.c_double)
+
+    def __setitem__(self, key, value):
+        rows, cols = self._indices(key)
+        value = np.broadcast_to(value, (len(rows), len(cols)))
+        irow, icol = np.nonzero(value)
+        self.rows.append(rows[irow])
+        self.cols.append(cols[icol])
+        self.vals.append(value[irow, icol])
+
+    def triplets(self):
+        """Returns the ``(rows, cols, vals)`` of the stored entries, with repeated entries not summed"""
+        if len(self.vals) == 0:
+            return np.zeros((0,), dtype=int), np.zeros((0,), dtype=int), np.zeros((0,), dtype=ct.c_double)
+        return np.concatenate(self.rows), np.concatenate(self.cols), np.concatenate(self.vals)
+
+
+class LagrangePattern(object):
+    """
+    LagrangePattern
+
+    Sparsity pattern of the contributions of a constraint to the damping or stiffness matrix
+
+    The pattern is stored as sorted linear indices (``row*size + col``) so that the entries generated by the
+    constraint in every iteration are scattered into a fixed array of values. It is extended only if a constraint
+    generates an entry out of the pattern (e.g. a block that was zero when the pattern was built).
+
+    Args:
+        size (int): number of rows and columns of the matrix
+    """
+    def __init__(self, size):
+        self.size = size
+        self.linear = np.zeros((0,), dtype=int)
+        self.rows = np.zeros((0,), dtype=int)
+        self.cols = np.zeros((0,), dtype=int)
+
+    def values(self, rows, cols, vals):
+        """
+        Sums the entries ``(rows, cols, vals)`` into the values of the pattern
+
+        Returns:
+            np.ndarray: values at ``(self.rows, self.cols)``
+        """
+        linear = rows*self.size + cols
+        index = np.searchsorted(self.linear, linear)
+        index_valid = np.minimum(index, len(self.linear) - 1)
+        if len(linear) > 0 and (len(self.linear) == 0 or np.any(self.linear[index_valid] != linear)):
+            self.linear = np.union1d(self.linear, linear)
+            self.rows, self.cols = np.divmod(self.linear, self.size)
+            index = np.searchsorted(self.linear, linear)
+        return np.bincount(index, weights=vals, minlength=len(self.linear))
+
+
+def dof_signature(MB_beam, sys_size, num_LM_eq):
+    """
+    dof_signature
+
+    Defines the distribution of degrees of freedom of the multibody system. The sparsity patterns of the constraints
+    are only valid for the signature they were generated with.
+
+    Args:
+        MB_beam(list): list of 'Beam'
+        sys_size(int): total number of degrees of freedom of the multibody system
+        num_LM_eq(int): number of equations associated to the Lagrange multipliers
+
+    Returns:
+        tuple: number of degrees of freedom and ``FoR_movement`` of every body and size of the system
+    """
+    return tuple((beam.num_dof.value, beam.FoR_movement) for beam in MB_beam) + (sys_size, num_LM_eq)
+
+
 ################################################################################
 # Equations
 ################################################################################
@@ -1353,6 +1456,84 @@ def generate_lagrange_matrix(lc_list, MB_beam, MB_tstep, ts, num_LM_eq, sys_size
     return LM_C, LM_K, LM_Q
 
 
+def generate_lagrange_matrix_sparse(lc_list, MB_beam, MB_tstep, ts, num_LM_eq, sys_size, dt, Lambda, Lambda_dot, dynamic_or_static):
+    """
+    generate_lagrange_matrix_sparse
+
+    Sparse version of :func:`generate_lagrange_matrix`
+
+    The contributions of every constraint are stored in :class:`SparseLagrangeMatrix` instead of dense matrices and
+    summed into the sparsity pattern of the constraint (:class:`LagrangePattern`). The patterns are generated in
+    the first call and stored in the constraints, so in the following iterations only their values are computed.
+
+    Args:
+        lc_list(): list of all the defined contraints
+        MB_beam(list): list of 'beams' of each of the bodies that form the system
+        MB_tstep(list): list of 'StructTimeStepInfo' of each of the bodies that form the system
+        num_LM_eq(int): number of new equations needed to define the boundary boundary conditions
+        sys_size(int): total number of degrees of freedom of the multibody system
+        dt(float): time step
+        Lambda(numpy array): list of Lagrange multipliers values
+        Lambda_dot(numpy array): list of the first derivative of the Lagrange multipliers values
+        dynamic_or_static (str): string defining if the computation is dynamic or static
+
+    Returns:
+        LM_C (scipy.sparse.coo_matrix): Damping matrix associated to the Lagrange Multipliers equations
+        LM_K (scipy.sparse.coo_matrix): Stiffness matrix associated to the Lagrange Multipliers equations
+        LM_Q (numpy array): Vector of independent terms associated to the Lagrange Multipliers equations
+
+    Notes:
+        Repeated entries of the COO matrices are not present within the contributions of a single constraint but
+        can appear between constraints. They are summed when the matrices are converted to other formats.
+
+    """
+    penaltyFactor = 0.0
+    scalingFactor = 1.0
+
+    size = sys_size + num_LM_eq
+    signature = dof_signature(MB_beam, sys_size, num_LM_eq)
+    LM_Q = np.zeros((size,), dtype=ct.c_double, order='F')
+
+    triplets = {'C': ([], [], []), 'K': ([], [], [])}
+    for lc in lc_list:
+        LM_C = SparseLagrangeMatrix(size)
+        LM_K = SparseLagrangeMatrix(size)
+        if dynamic_or_static.lower() == "static":
+            lc.staticmat(LM_C=LM_C, LM_K=LM_K, LM_Q=LM_Q, MB_beam=MB_beam, MB_tstep=MB_tstep, ts=ts,
+                         num_LM_eq=num_LM_eq, sys_size=sys_size, dt=dt, Lambda=Lambda, Lambda_dot=Lambda_dot,
+                         scalingFactor=scalingFactor, penaltyFactor=penaltyFactor)
+        elif dynamic_or_static.lower() == "dynamic":
+            lc.dynamicmat(LM_C=LM_C, LM_K=LM_K, LM_Q=LM_Q, MB_beam=MB_beam, MB_tstep=MB_tstep, ts=ts,
+                          num_LM_eq=num_LM_eq, sys_size=sys_size, dt=dt, Lambda=Lambda, Lambda_dot=Lambda_dot,
+                          scalingFactor=scalingFactor, penaltyFactor=penaltyFactor)
+
+        # patterns of the constraint for the current distribution of dofs
+        patterns = getattr(lc, '_lm_patterns', None)
+        if patterns is None or patterns[0] != signature:
+            patterns = (signature, dict())
+            lc._lm_patterns = patterns
+        for name, matrix in [('C', LM_C), ('K', LM_K)]:
+            key = (dynamic_or_static.lower(), name)
+            if key not in patterns[1]:
+                patterns[1][key] = LagrangePattern(size)
+            pattern = patterns[1][key]
+            vals = pattern.values(*matrix.triplets())
+            triplets[name][0].append(pattern.rows)
+            triplets[name][1].append(pattern.cols)
+            triplets[name][2].append(vals)
+
+    matrices = []
+    for name in ['C', 'K']:
+        rows, cols, vals = triplets[name]
+        if len(vals) == 0:
+            matrices.append(sp.coo_matrix((size, size), dtype=ct.c_double))
+        else:
+            matrices.append(sp.coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                                          shape=(size, size)))
+
+    return matrices[0], matrices[1], LM_Q
+
+
 def postprocess(lc_list, MB_beam, MB_tstep, dynamic_or_static):
 
     for lc in lc_list:
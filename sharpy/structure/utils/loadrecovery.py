@@ -0,0 +1,112 @@
+"""Beam Load Recovery
+
+Batched evaluation of the strains and internal loads of the beam elements for many time steps at once. It is the
+vectorised counterpart of :func:`sharpy.structure.utils.xbeamlib.cbeam3_loads`, which is kept as the reference
+implementation and computes one time step per call in the xbeam library.
+
+The strains are evaluated at the mid point of every element, :math:`\\eta=0`, from the shape functions of the
+displacement based beam element. For the 3-noded element the mid node defines the rotation at that point and the end
+nodes the derivatives along the beam:
+
+.. math:: \\boldsymbol{\\gamma} = C^{Ba}(\\boldsymbol{\\Psi}_m)\\frac{\\mathbf{r}_1 - \\mathbf{r}_0}{\\Delta s_0}, \\quad
+    \\boldsymbol{\\kappa} = T(\\boldsymbol{\\Psi}_m)\\frac{\\boldsymbol{\\Psi}_1 - \\boldsymbol{\\Psi}_0}{\\Delta s_0}
+
+where :math:`\\Delta s_0` is the distance between the end nodes in the undeformed configuration. The strains are taken
+relative to those of the undeformed beam (``ini_info``) and the internal loads (forces and moments in the material
+frame ``B``) are the product of the element stiffness matrix and the strains.
+"""
+import numpy as np
+
+import sharpy.utils.algebra as algebra
+
+
+def stack_timesteps(timestep_info):
+    """
+    Stacks the nodal positions and rotations of a list of structural time steps
+
+    Args:
+        timestep_info (list(sharpy.utils.datastructures.StructTimeStepInfo)): Structural time steps
+
+    Returns:
+        tuple: ``pos`` ``(n_tstep, num_node, 3)`` and ``psi`` ``(n_tstep, num_elem, num_node_elem, 3)``
+    """
+    pos = np.stack([tstep.pos for tstep in timestep_info])
+    psi = np.stack([tstep.psi for tstep in timestep_info])
+    return pos, psi
+
+
+def element_strain_measures(pos, psi, connectivities, length):
+    """
+    Strain measures :math:`\\boldsymbol{\\gamma}` and :math:`\\boldsymbol{\\kappa}` at the mid point of the elements
+
+    Args:
+        pos (np.ndarray): Nodal positions ``(n_tstep, num_node, 3)``
+        psi (np.ndarray): Nodal rotations ``(n_tstep, num_elem, num_node_elem, 3)``
+        connectivities (np.ndarray): Element connectivities ``(num_elem, num_node_elem)``
+        length (np.ndarray): Distance between the end nodes of the undeformed elements ``(num_elem,)``
+
+    Returns:
+        np.ndarray: Strain measures ``(n_tstep, num_elem, 6)``
+    """
+    n_tstep, num_elem, num_node_elem, _ = psi.shape
+    if num_node_elem == 3:
+        psi_mid = psi[:, :, 2, :]
+    else:
+        psi_mid = 0.5*(psi[:, :, 0, :] + psi[:, :, 1, :])
+    psi_mid = psi_mid.reshape((-1, 3))
+
+    dpos = (pos[:, connectivities[:, 1], :] - pos[:, connectivities[:, 0], :])/length[None, :, None]
+    dpsi = (psi[:, :, 1, :] - psi[:, :, 0, :])/length[None, :, None]
+
+    cba = np.transpose(algebra.crv2rotation_vec(psi_mid), (0, 2, 1))
+    tan = algebra.crv2tan_vec(psi_mid)
+
+    strain = np.zeros((n_tstep, num_elem, 6))
+    strain[:, :, 0:3] = np.matmul(cba, dpos.reshape((-1, 3, 1))).reshape((n_tstep, num_elem, 3))
+    strain[:, :, 3:6] = np.matmul(tan, dpsi.reshape((-1, 3, 1))).reshape((n_tstep, num_elem, 3))
+    return strain
+
+
+class BeamLoadRecovery(object):
+    """
+    Strains and internal loads of the elements of a beam for stacked time steps
+
+    The undeformed strains and the ``(num_elem, 6, 6)`` stiffness blocks of the elements are computed once.
+
+    Args:
+        beam (sharpy.structure.models.beam.Beam): Beam structure
+    """
+    def __init__(self, beam):
+        self.connectivities = np.array(beam.connectivities, dtype=int)
+        pos_ini = beam.ini_info.pos
+        self.length = np.linalg.norm(pos_ini[self.connectivities[:, 1], :] - pos_ini[self.connectivities[:, 0], :],
+                                     axis=1)
+        self.stiffness = beam.stiffness_db[beam.elem_stiffness, :, :]
+        self.strain_ini = element_strain_measures(pos_ini[None, :, :],
+                                                  beam.ini_info.psi[None, :, :, :],
+                                                  self.connectivities,
+                                                  self.length)[0]
+
+    def strain_and_loads(self, pos, psi):
+        """
+        Args:
+            pos (np.ndarray): Nodal positions ``(n_tstep, num_node, 3)``
+            psi (np.ndarray): Nodal rotations ``(n_tstep, num_elem, num_node_elem, 3)``
+
+        Returns:
+            tuple: Strains and internal loads ``(n_tstep, num_elem, 6)``, with the same ordering as the output of
+            :func:`~sharpy.structure.utils.xbeamlib.cbeam3_loads`
+        """
+        strain = element_strain_measures(pos, psi, self.connectivities, self.length) - self.strain_ini[None, :, :]
+        loads = np.einsum('eij,tej->tei', self.stiffness, strain)
+        return strain, loads
+
+    def coords_a(self, pos):
+        """
+        Args:
+            pos (np.ndarray): Nodal positions ``(n_tstep, num_node, 3)``
+
+        Returns:
+            np.ndarray: Position of the mid node of the elements ``(n_tstep, num_elem, 3)``
+        """
+        return pos[:, self.connectivities[:, 2 if self.connectivities.shape[1] > 2 else 0], :]
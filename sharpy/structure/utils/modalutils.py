@@ -1,4 +1,7 @@
 import numpy as np
+import scipy.linalg as sclalg
+import scipy.sparse as sparse
+import scipy.sparse.linalg as spalg
 import sharpy.utils.cout_utils as cout
 import sharpy.utils.algebra as algebra
 from tvtk.api import tvtk, write_data
@@ -38,6 +41,59 @@ def cg(M):
     return -np.array([Mrr[2, 4], Mrr[0, 5], Mrr[1, 3]]) / Mrr[0, 0]
 
 
+def is_symmetric(mat, rtol=1e-10):
+    """
+    Checks whether a matrix is symmetric to a tolerance relative to its largest entry.
+    """
+    mat_max = np.max(np.abs(mat))
+    if mat_max == 0.:
+        return True
+    return np.max(np.abs(mat - mat.T)) <= rtol * mat_max
+
+
+def undamped_modes(M, K, num_modes, use_sparse=True, sigma=-1.):
+    r"""
+    Lowest ``num_modes`` natural modes of the symmetric undamped system
+
+        .. math:: (-\omega_n^2\,\mathbf{M} + \mathbf{K})\mathbf{\Phi} = 0
+
+    The problem is solved as a generalised symmetric eigenvalue problem. If ``use_sparse``, the matrices are converted
+    to sparse format and only the requested modes are computed with shift-invert Lanczos iterations
+    (``scipy.sparse.linalg.eigsh``) about the shift ``sigma``. The shift is negative by default such that
+    :math:`\mathbf{K}-\sigma\mathbf{M}` is positive definite even if the structure has rigid body modes.
+
+    If the sparse solver is not used, not applicable (``num_modes`` too close to the size of the problem) or fails, the
+    dense symmetric solver ``scipy.linalg.eigh`` is used instead, restricted to the requested modes.
+
+    Args:
+        M (np.ndarray): Symmetric positive definite mass matrix
+        K (np.ndarray): Symmetric stiffness matrix
+        num_modes (int): Number of modes to retain
+        use_sparse (bool): Use the sparse shift-invert Lanczos solver
+        sigma (float): Shift for the shift-invert mode
+
+    Returns:
+        tuple: Eigenvalues :math:`\omega_n^2` in ascending order and the corresponding mass-normalised eigenvectors
+    """
+    num_dof = M.shape[0]
+    num_modes = min(num_modes, num_dof)
+
+    if use_sparse and num_modes < num_dof - 1:
+        try:
+            eigenvalues, eigenvectors = spalg.eigsh(sparse.csc_matrix(K),
+                                                    k=num_modes,
+                                                    M=sparse.csc_matrix(M),
+                                                    sigma=sigma,
+                                                    which='LM')
+            order = np.argsort(eigenvalues)
+            return eigenvalues[order], eigenvectors[:, order]
+        except (spalg.ArpackError, RuntimeError):
+            cout.cout_wrap('Sparse eigenvalue solver failed, using dense solver', 3)
+
+    eigenvalues, eigenvectors = sclalg.eigh(K, M, subset_by_index=[0, num_modes - 1])
+    return eigenvalues, eigenvectors
+
+
 def scale_mode(data, eigenvector, rot_max_deg=15, perc_max=0.15):
     """
     Scales the eigenvector such that:
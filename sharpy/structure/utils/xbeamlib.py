@@ -5,6 +5,7 @@ import scipy.integrate
 
 import sharpy.utils.algebra as algebra
 import sharpy.utils.ctypes_utils as ct_utils
+import sharpy.utils.profiling as profiling
 from sharpy.utils.sharpydir import SharpyDir
 # from sharpy.utils.datastructures import StructTimeStepInfo
 import sharpy.utils.cout_utils as cout
@@ -68,6 +69,7 @@ intP = ct.POINTER(ct.c_int)
 charP = ct.POINTER(ct.c_char_p)
 
 
+@profiling.timed('xbeamlib/cbeam3_solv_nlnstatic')
 def cbeam3_solv_nlnstatic(beam, settings, ts):
     """@brief Python wrapper for f_cbeam3_solv_nlnstatic
      Alfonso del Carre
@@ -129,6 +131,7 @@ def cbeam3_solv_nlnstatic(beam, settings, ts):
                             )
 
 
+@profiling.timed('xbeamlib/cbeam3_loads')
 def cbeam3_loads(beam, ts):
     """@brief Python wrapper for f_cbeam3_loads
      Alfonso del Carre
@@ -159,6 +162,7 @@ def cbeam3_loads(beam, ts):
     return strain, loads
 
 
+@profiling.timed('xbeamlib/cbeam3_solv_nlndyn')
 def cbeam3_solv_nlndyn(beam, settings):
     f_cbeam3_solv_nlndyn = xbeamlib.cbeam3_solv_nlndyn_python
     f_cbeam3_solv_nlndyn.restype = None
@@ -251,6 +255,7 @@ def cbeam3_solv_nlndyn(beam, settings):
         beam.timestep_info[i].psi_dot[:] = psi_dot_def_history[i, :]
 
 
+@profiling.timed('xbeamlib/cbeam3_step_nlndyn')
 def cbeam3_step_nlndyn(beam, settings, ts, tstep=None, dt=None):
     f_cbeam3_solv_nlndyn_step = xbeamlib.cbeam3_solv_nlndyn_step_python
     f_cbeam3_solv_nlndyn_step.restype = None
@@ -335,6 +340,7 @@ f_xbeam_solv_couplednlndyn = xbeamlib.xbeam_solv_couplednlndyn_python
 f_xbeam_solv_couplednlndyn.restype = None
 
 
+@profiling.timed('xbeamlib/xbeam_solv_couplednlndyn')
 def xbeam_solv_couplednlndyn(beam, settings):
     n_elem = ct.c_int(beam.num_elem)
     n_nodes = ct.c_int(beam.num_node)
@@ -453,6 +459,7 @@ def xbeam_solv_couplednlndyn(beam, settings):
         beam.integrate_position(it + 1, dt.value)
 
 
+@profiling.timed('xbeamlib/xbeam_step_couplednlndyn')
 def xbeam_step_couplednlndyn(beam, settings, ts, tstep=None, dt=None):
     # library load
     f_xbeam_solv_nlndyn_step_python = xbeamlib.xbeam_solv_nlndyn_step_python
@@ -537,6 +544,7 @@ def xbeam_step_couplednlndyn(beam, settings, ts, tstep=None, dt=None):
                                     tstep.dqddt.ctypes.data_as(doubleP))
 
 
+@profiling.timed('xbeamlib/xbeam_init_couplednlndyn')
 def xbeam_init_couplednlndyn(beam, settings, ts, dt=None):
     # library load
     f_xbeam_solv_nlndyn_init_python = xbeamlib.xbeam_solv_nlndyn_init_python
@@ -607,6 +615,7 @@ def xbeam_init_couplednlndyn(beam, settings, ts, dt=None):
                                     beam.timestep_info[ts].dqddt.ctypes.data_as(doubleP))
 
 
+@profiling.timed('xbeamlib/xbeam_solv_state2disp')
 def xbeam_solv_state2disp(beam, tstep, cbeam3=False):
     numdof = beam.num_dof.value
     cbeam3_solv_state2disp(beam, tstep)
@@ -615,6 +624,7 @@ def xbeam_solv_state2disp(beam, tstep, cbeam3=False):
         tstep.for_acc = tstep.dqddt[numdof:numdof+6].astype(dtype=ct.c_double, order='F', copy=True)
         tstep.quat = algebra.unit_vector(tstep.dqdt[numdof+6:]).astype(dtype=ct.c_double, order='F', copy=True)
 
+@profiling.timed('xbeamlib/cbeam3_solv_state2disp')
 def cbeam3_solv_state2disp(beam, tstep):
     # library load
     f_cbeam3_solv_state2disp = xbeamlib.cbeam3_solv_state2disp_python
@@ -643,6 +653,7 @@ def cbeam3_solv_state2disp(beam, tstep):
         tstep.dqdt.ctypes.data_as(doubleP))
 
 
+@profiling.timed('xbeamlib/xbeam_solv_disp2state')
 def xbeam_solv_disp2state(beam, tstep):
     numdof = beam.num_dof.value
     cbeam3_solv_disp2state(beam, tstep)
@@ -653,6 +664,7 @@ def xbeam_solv_disp2state(beam, tstep):
     # tstep.dqdt[numdof+6:] = algebra.unit_quat(tstep.quat)
 
 
+@profiling.timed('xbeamlib/cbeam3_solv_disp2state')
 def cbeam3_solv_disp2state(beam, tstep):
     # library load
     f_cbeam3_solv_disp2state = xbeamlib.cbeam3_solv_disp2state_python
@@ -676,6 +688,7 @@ def cbeam3_solv_disp2state(beam, tstep):
         tstep.q.ctypes.data_as(doubleP),
         tstep.dqdt.ctypes.data_as(doubleP))
 
+@profiling.timed('xbeamlib/cbeam3_solv_modal')
 def cbeam3_solv_modal(beam, settings, ts, FullMglobal, FullCglobal, FullKglobal):
     """
     cbeam3_solv_modal
@@ -770,6 +783,7 @@ def cbeam3_solv_modal(beam, settings, ts, FullMglobal, FullCglobal, FullKglobal)
                         FullKglobal.ctypes.data_as(doubleP))
 
 
+@profiling.timed('xbeamlib/cbeam3_asbly_dynamic')
 def cbeam3_asbly_dynamic(beam, tstep, settings):
     """
     cbeam3_asbly_dynamic
@@ -874,6 +888,7 @@ def cbeam3_asbly_dynamic(beam, tstep, settings):
 
     return Mglobal, Cglobal, Kglobal, Qglobal
 
+@profiling.timed('xbeamlib/xbeam3_asbly_dynamic')
 def xbeam3_asbly_dynamic(beam, tstep, settings):
     """
     xbeam3_asbly_dynamic
@@ -979,6 +994,7 @@ def xbeam3_asbly_dynamic(beam, tstep, settings):
 
     return Mtotal, Ctotal, Ktotal, Qtotal
 
+@profiling.timed('xbeamlib/cbeam3_correct_gravity_forces')
 def cbeam3_correct_gravity_forces(beam, tstep, settings):
     """
     cbeam3_correct_gravity_forces
@@ -1024,6 +1040,7 @@ def cbeam3_correct_gravity_forces(beam, tstep, settings):
                             beam.fortran['fdof'].ctypes.data_as(intP),
                             tstep.gravity_forces.ctypes.data_as(doubleP))
 
+@profiling.timed('xbeamlib/cbeam3_asbly_static')
 def cbeam3_asbly_static(beam, tstep, settings, iLoadStep):
     """
     cbeam3_asbly_static
@@ -542,6 +542,150 @@ def crv2rotation(psi):
     return rot_matrix
 
 
+def crv2rotation_vec(psi):
+    r"""
+    Rotation matrices of an array of Cartesian rotation vectors. Equivalent to calling :func:`crv2rotation` on every
+    row of ``psi``, including the series expansion for :math:`||\boldsymbol{\Psi}||<10^{-15}`.
+
+    Args:
+        psi (np.array): ``(n, 3)`` Cartesian rotation vectors
+
+    Returns:
+        np.array: ``(n, 3, 3)`` rotation matrices
+    """
+
+    psi = np.asarray(psi, dtype=float).reshape((-1, 3))
+    norm_psi = np.linalg.norm(psi, axis=1)
+    small = norm_psi < 1e-15
+
+    # the expansion for small rotations is obtained with unit coefficients and the unnormalised vector
+    safe_norm = np.where(small, 1., norm_psi)
+    normal = np.where(small[:, None], psi, psi/safe_norm[:, None])
+    coeff_1 = np.where(small, 1., np.sin(norm_psi))
+    coeff_2 = np.where(small, 0.5, 1.0 - np.cos(norm_psi))
+
+    skew_normal = skew_vec(normal)
+    rot_matrix = np.tile(np.eye(3), (psi.shape[0], 1, 1))
+    rot_matrix += coeff_1[:, None, None]*skew_normal
+    rot_matrix += coeff_2[:, None, None]*np.matmul(skew_normal, skew_normal)
+
+    return rot_matrix
+
+
+def skew_vec(vectors):
+    """
+    Skew-symmetric matrices (see :func:`skew`) of an array of 3-dimensional vectors
+
+    Args:
+        vectors (np.ndarray): ``(n, 3)`` vectors
+
+    Returns:
+        np.ndarray: ``(n, 3, 3)`` skew-symmetric matrices
+    """
+    matrix = np.zeros((vectors.shape[0], 3, 3))
+    matrix[:, 1, 2] = -vectors[:, 0]
+    matrix[:, 2, 0] = -vectors[:, 1]
+    matrix[:, 0, 1] = -vectors[:, 2]
+    matrix[:, 2, 1] = vectors[:, 0]
+    matrix[:, 0, 2] = vectors[:, 1]
+    matrix[:, 1, 0] = vectors[:, 2]
+    return matrix
+
+
+def rotation2crv_vec(Cab):
+    r"""
+    Minimal Cartesian rotation vectors of an array of rotation matrices. Equivalent to calling :func:`rotation2crv`
+    on every matrix of ``Cab``.
+
+    Args:
+        Cab (np.array): ``(n, 3, 3)`` rotation matrices
+
+    Returns:
+        np.array: ``(n, 3)`` Cartesian rotation vectors
+    """
+
+    Cab = np.asarray(Cab, dtype=float).reshape((-1, 3, 3))
+    if np.any(np.linalg.norm(Cab, axis=(1, 2)) < 1e-6):
+        raise AttributeError(\
+                 'Element Vector V is not orthogonal to reference line (51105)')
+    n = Cab.shape[0]
+
+    # rotation2quat
+    s = np.zeros((n, 4, 4))
+    s[:, 0, 0] = 1.0 + np.trace(Cab, axis1=1, axis2=2)
+    s[:, 0, 1] = Cab[:, 2, 1] - Cab[:, 1, 2]
+    s[:, 0, 2] = Cab[:, 0, 2] - Cab[:, 2, 0]
+    s[:, 0, 3] = Cab[:, 1, 0] - Cab[:, 0, 1]
+
+    s[:, 1, 0] = Cab[:, 2, 1] - Cab[:, 1, 2]
+    s[:, 1, 1] = 1.0 + Cab[:, 0, 0] - Cab[:, 1, 1] - Cab[:, 2, 2]
+    s[:, 1, 2] = Cab[:, 0, 1] + Cab[:, 1, 0]
+    s[:, 1, 3] = Cab[:, 0, 2] + Cab[:, 2, 0]
+
+    s[:, 2, 0] = Cab[:, 0, 2] - Cab[:, 2, 0]
+    s[:, 2, 1] = Cab[:, 1, 0] + Cab[:, 0, 1]
+    s[:, 2, 2] = 1.0 - Cab[:, 0, 0] + Cab[:, 1, 1] - Cab[:, 2, 2]
+    s[:, 2, 3] = Cab[:, 1, 2] + Cab[:, 2, 1]
+
+    s[:, 3, 0] = Cab[:, 1, 0] - Cab[:, 0, 1]
+    s[:, 3, 1] = Cab[:, 0, 2] + Cab[:, 2, 0]
+    s[:, 3, 2] = Cab[:, 1, 2] + Cab[:, 2, 1]
+    s[:, 3, 3] = 1.0 - Cab[:, 0, 0] - Cab[:, 1, 1] + Cab[:, 2, 2]
+
+    diag = np.diagonal(s, axis1=1, axis2=2)
+    ismax = np.argmax(diag, axis=1)
+    rows = np.arange(n)
+    qmax = 0.5*np.sqrt(diag[rows, ismax])
+    quat = 0.25*s[rows, ismax, :]/qmax[:, None]
+    quat[rows, ismax] = qmax
+    # quat_bound
+    quat[quat[:, 0] < 0, :] *= -1.
+
+    # quat2crv
+    crv_norm = 2.0*np.arccos(np.clip(quat[:, 0], -1.0, 1.0))
+    small = np.abs(crv_norm) < 1e-15
+    safe_sin = np.where(small, 1., np.sin(crv_norm*0.5))
+    psi = np.where(small[:, None], 0., crv_norm[:, None]*quat[:, 1:4]/safe_sin[:, None])
+
+    # crv_bounds
+    norm_ini = np.linalg.norm(psi, axis=1)
+    norm = norm_ini - 2.0*np.pi*np.trunc(norm_ini/(2*np.pi))
+    norm = np.where(norm > np.pi, norm - 2.0*np.pi, norm)
+    norm = np.where(norm < -np.pi, norm + 2.0*np.pi, norm)
+    zero = norm == 0.0
+    scale = np.where(zero, 0., norm/np.where(zero, 1., norm_ini))
+
+    return psi*scale[:, None]
+
+
+def crv2tan_vec(psi):
+    r"""
+    Tangential operators of an array of Cartesian rotation vectors. Equivalent to calling :func:`crv2tan` on every
+    row of ``psi``, including the series expansion for :math:`||\boldsymbol{\Psi}||<10^{-8}`.
+
+    Args:
+        psi (np.array): ``(n, 3)`` Cartesian rotation vectors
+
+    Returns:
+        np.array: ``(n, 3, 3)`` tangential operators
+    """
+
+    psi = np.asarray(psi, dtype=float).reshape((-1, 3))
+    norm_psi = np.linalg.norm(psi, axis=1)
+    psi_skew = skew_vec(psi)
+
+    small = norm_psi < 1e-8
+    safe_norm = np.where(small, 1., norm_psi)
+    k1 = np.where(small, -0.5, (np.cos(norm_psi) - 1.0)/(safe_norm*safe_norm))
+    k2 = np.where(small, 1.0/6.0, (1.0 - np.sin(norm_psi)/safe_norm)/(safe_norm*safe_norm))
+
+    tan = np.tile(np.eye(3), (psi.shape[0], 1, 1))
+    tan += k1[:, None, None]*psi_skew
+    tan += k2[:, None, None]*np.matmul(psi_skew, psi_skew)
+
+    return tan
+
+
 def rotation2crv(Cab):
     r"""
     Given a rotation matrix :math:`C^{AB}` rotating the frame A onto B, the function returns
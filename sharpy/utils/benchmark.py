@@ -0,0 +1,329 @@
+"""Benchmark harness
+
+Lightweight runner for the performance benchmarks in the ``benchmarks`` folder of the repository, written in the
+style of `asv <https://asv.readthedocs.io>`_ so that the suites can also be run with it:
+
+    * A benchmark suite is a ``bench_*.py`` module defining classes with optional ``setup`` and ``teardown``
+      methods and any number of ``time_*`` methods, each of them a benchmark named ``module.Class.time_method``.
+
+    * ``track_*`` methods return a value to be tracked instead of timed (e.g. a number of iterations). They are run
+      once and their value is stored as ``value``.
+
+    * ``setup`` is run once per class. Benchmarks whose ``setup`` raises :class:`SkipBenchmark` (or fails to import
+      an optional dependency or to load the compiled libraries) are reported as skipped.
+
+    * Benchmarks that modify the state built by ``setup`` rebuild it before every timing with the
+      :func:`repeat_setup` decorator, which also sets their ``number`` of calls per timing to one. A ``number``
+      attribute of a benchmark method overrides the one given to the runner.
+
+    * The results of every run are appended, together with the commit hash, machine name and date, to a JSON
+      database (:class:`ResultsDatabase`). A benchmark is flagged as a regression when its median time (or tracked
+      value) exceeds the reference (median of the last runs stored) by more than a relative ``threshold``.
+
+Examples:
+
+    From the root of the repository
+
+    .. code-block:: bash
+
+        python benchmarks/run_benchmarks.py --bench goland --threshold 0.2
+
+"""
+import argparse
+import datetime
+import functools
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.sharpydir as sharpydir
+
+
+class SkipBenchmark(Exception):
+    """Raised by the ``setup`` of a benchmark suite that cannot be run in the current environment"""
+    pass
+
+
+def repeat_setup(setup):
+    """
+    Decorator of the benchmark methods that modify the state of their suite: ``setup(suite)`` is run before every
+    timing, outside of it, and each timing makes a single call.
+
+    Args:
+        setup (callable): function of the suite instance rebuilding the state used by the benchmark
+    """
+    def decorator(method):
+        method.repeat_setup = setup
+        method.number = 1
+        return method
+    return decorator
+
+
+def timeit(function, repeat=5, number=1, setup=None):
+    """
+    Times a function
+
+    Args:
+        function (callable): function without arguments
+        repeat (int): number of timings
+        number (int): number of calls per timing
+        setup (callable): function without arguments run before every timing and not timed
+
+    Returns:
+        dict: ``min``, ``median``, ``mean`` and ``std`` of the time per call [s], ``repeat`` and ``number``
+    """
+    times = np.zeros((repeat,))
+    for i_repeat in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            function()
+        times[i_repeat] = (time.perf_counter() - t0) / number
+
+    return {'min': float(np.min(times)),
+            'median': float(np.median(times)),
+            'mean': float(np.mean(times)),
+            'std': float(np.std(times)),
+            'repeat': repeat,
+            'number': number}
+
+
+def discover(path, pattern='bench_*.py'):
+    """
+    Finds the benchmarks in the suites of ``path``
+
+    Args:
+        path (str): folder with the benchmark suites
+        pattern (str): regular expression (with ``*`` as wildcard) of the suite file names
+
+    Returns:
+        list: ``(name, class, [methods])`` of every benchmark class
+    """
+    regex = re.compile('^' + pattern.replace('.', r'\.').replace('*', '.*') + '$')
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+    suites = []
+    for file_name in sorted(os.listdir(path)):
+        if not regex.match(file_name):
+            continue
+        module_name = os.path.splitext(file_name)[0]
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(path, file_name))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module_name:
+                continue
+            methods = sorted(name for name, _ in inspect.getmembers(cls, inspect.isfunction)
+                             if name.startswith('time_') or name.startswith('track_'))
+            if len(methods) > 0:
+                suites.append((module_name + '.' + class_name, cls, methods))
+    return suites
+
+
+def run_suites(suites, select=None, repeat=5, number=1, print_info=True):
+    """
+    Runs the benchmarks
+
+    Args:
+        suites (list): output of :func:`discover`
+        select (str): regular expression matching the names of the benchmarks to run (all if ``None``)
+        repeat (int): number of timings per benchmark
+        number (int): number of calls per timing
+        print_info (bool): print the results as they are obtained
+
+    Returns:
+        tuple: ``(results, skipped)`` dictionaries of benchmark name to timing statistics (see :func:`timeit`) or
+        tracked ``value`` and to the reason why it was not run
+    """
+    results = dict()
+    skipped = dict()
+    for suite_name, cls, methods in suites:
+        names = [suite_name + '.' + method for method in methods]
+        run = [select is None or re.search(select, name) is not None for name in names]
+        if not any(run):
+            continue
+
+        suite = cls()
+        try:
+            if hasattr(suite, 'setup'):
+                suite.setup()
+        except (SkipBenchmark, ImportError, OSError, SystemExit) as error:
+            # the loading of the compiled libraries exits if they are not found
+            for name, run_method in zip(names, run):
+                if run_method:
+                    skipped[name] = '%s: %s' % (type(error).__name__, error)
+                    if print_info:
+                        print('%-60s skipped (%s)' % (name, skipped[name]))
+            if hasattr(suite, 'teardown'):
+                try:
+                    suite.teardown()
+                except Exception:
+                    pass
+            continue
+
+        try:
+            for name, method, run_method in zip(names, methods, run):
+                if not run_method:
+                    continue
+                bench = getattr(suite, method)
+                setup = getattr(bench, 'repeat_setup', None)
+                if setup is not None:
+                    setup = functools.partial(setup, suite)
+                if method.startswith('track_'):
+                    if setup is not None:
+                        setup()
+                    results[name] = {'value': float(bench())}
+                    if print_info:
+                        print('%-60s %12.6g' % (name, results[name]['value']))
+                    continue
+                results[name] = timeit(bench, repeat=repeat, number=getattr(bench, 'number', number), setup=setup)
+                if print_info:
+                    print('%-60s %12.6f s' % (name, results[name]['median']))
+        finally:
+            if hasattr(suite, 'teardown'):
+                suite.teardown()
+
+    return results, skipped
+
+
+def result_value(result):
+    """Median time of a timed benchmark or value of a tracked one"""
+    try:
+        return result['median']
+    except KeyError:
+        return result['value']
+
+
+def find_regressions(results, reference, threshold=0.1):
+    """
+    Compares the median times (or tracked values) of ``results`` against the ``reference`` ones
+
+    Args:
+        results (dict): benchmark name to timing statistics or tracked value
+        reference (dict): benchmark name to reference median time or value
+        threshold (float): relative increase in time flagged as a regression
+
+    Returns:
+        list: ``(name, time, reference_time, ratio)`` of the regressions, slowest first
+    """
+    regressions = []
+    for name, result in results.items():
+        if reference.get(name) is None:
+            continue
+        ratio = result_value(result) / reference[name]
+        if ratio > 1. + threshold:
+            regressions.append((name, result_value(result), reference[name], ratio))
+    return sorted(regressions, key=lambda x: -x[3])
+
+
+class ResultsDatabase(object):
+    """
+    History of benchmark runs stored in a JSON file
+
+    Each run is a dictionary with the ``date``, ``commit``, ``machine`` and ``results`` (benchmark name to timing
+    statistics).
+
+    Args:
+        filename (str): path to the JSON file (created on the first :meth:`append`)
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self.runs = []
+        if os.path.isfile(filename):
+            with open(filename, 'r') as f:
+                self.runs = json.load(f)
+
+    def append(self, results, commit=None, machine=None):
+        """Stores the results of a run and writes the database to disk"""
+        if commit is None:
+            try:
+                commit = cout.get_git_revision_hash()
+            except (subprocess.CalledProcessError, OSError):
+                commit = ''
+        if machine is None:
+            machine = platform.node()
+        self.runs.append({'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                          'commit': commit,
+                          'machine': machine,
+                          'results': results})
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.filename, 'w') as f:
+            json.dump(self.runs, f, indent=1)
+
+    def history(self, name, machine=None):
+        """Returns the ``(date, commit, median)`` of the runs of a benchmark (``value`` for the tracked ones)"""
+        return [(run['date'], run['commit'], result_value(run['results'][name]))
+                for run in self.runs
+                if name in run['results'] and (machine is None or run['machine'] == machine)]
+
+    def reference(self, num_runs=5, machine=None):
+        """
+        Reference times: median over the last ``num_runs`` runs (of the given machine) of each benchmark's median
+        time
+        """
+        names = set()
+        for run in self.runs:
+            names.update(run['results'].keys())
+
+        reference = dict()
+        for name in names:
+            times = [entry[2] for entry in self.history(name, machine)][-num_runs:]
+            if len(times) > 0:
+                reference[name] = float(np.median(times))
+        return reference
+
+
+def main(args=None):
+    """
+    Command line interface: runs the benchmarks, compares them with the stored history and appends the results
+
+    Returns:
+        int: ``1`` if ``--fail`` is given and regressions were found, ``0`` otherwise
+    """
+    parser = argparse.ArgumentParser(prog='run_benchmarks', description='Runs the SHARPy benchmark suites')
+    parser.add_argument('--path', help='folder with the benchmark suites', type=str,
+                        default=sharpydir.SharpyDir + '/benchmarks')
+    parser.add_argument('-b', '--bench', help='regular expression selecting the benchmarks', type=str, default=None)
+    parser.add_argument('-r', '--repeat', help='number of timings per benchmark', type=int, default=5)
+    parser.add_argument('-n', '--number', help='number of calls per timing', type=int, default=1)
+    parser.add_argument('--results', help='JSON results database', type=str, default=None)
+    parser.add_argument('--threshold', help='relative slow-down flagged as a regression', type=float, default=0.1)
+    parser.add_argument('--num-runs', help='number of stored runs used as reference', type=int, default=5)
+    parser.add_argument('--no-store', help='do not store the results', action='store_true')
+    parser.add_argument('--fail', help='exit with an error code if there are regressions', action='store_true')
+    args = parser.parse_args(args)
+
+    if args.results is None:
+        args.results = os.path.join(args.path, 'results', 'benchmarks.json')
+
+    database = ResultsDatabase(args.results)
+    machine = platform.node()
+    reference = database.reference(args.num_runs, machine)
+
+    results, skipped = run_suites(discover(args.path), args.bench, args.repeat, args.number)
+
+    regressions = find_regressions(results, reference, args.threshold)
+    for name, time_run, time_reference, ratio in regressions:
+        unit = '' if 'value' in results[name] else ' s'
+        print('Regression in %s: %.6g%s (reference %.6g%s, x%.2f)' % (name, time_run, unit, time_reference, unit,
+                                                                      ratio))
+    print('%u benchmarks run, %u skipped, %u regressions' % (len(results), len(skipped), len(regressions)))
+
+    if not args.no_store and len(results) > 0:
+        database.append(results, machine=machine)
+
+    if args.fail and len(regressions) > 0:
+        return 1
+    return 0
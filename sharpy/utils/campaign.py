@@ -0,0 +1,464 @@
+"""Campaign Runner
+
+Utilities to run parametric campaigns of SHARPy cases, i.e. many independent simulations that share a base settings
+file and differ in a handful of parameters (load cases, flight envelope points, etc).
+
+A campaign takes the base settings (a ``.sharpy`` file or the equivalent dictionary) and either a grid of parameters
+(full factorial) or a list of samples. Parameters are addressed by a dotted path into the settings, such as
+``'StaticCoupled.aero_solver_settings.velocity_field_input.u_inf'``.
+
+Cases are run in a pool of worker processes forked from the process that creates the campaign, such that the
+solver, post-processor and generator modules are only loaded once. Each case writes its log and the output of its
+solvers to its own folder ``<output_folder>/<case_id>/`` and the results of all cases are collected in a single HDF5
+file ``<output_folder>/<name>.results.h5`` indexed by case. Failed cases are retried and, when the campaign is run
+again with ``resume=True``, cases already completed in the results store with the same parameters are skipped.
+
+Examples:
+    The campaign can be run from Python
+
+    .. code-block:: python
+
+        from sharpy.utils.campaign import Campaign
+
+        campaign = Campaign('./cases/goland.sharpy',
+                            parameters={'StaticCoupled.aero_solver_settings.velocity_field_input.u_inf': [100, 120]},
+                            output_folder='./output/goland_campaign/',
+                            num_cores=4)
+        campaign.run()
+
+    or from the command line with a YAML input file
+
+    .. code-block:: yaml
+
+        campaign:
+            name: goland_campaign
+            base: ./cases/goland.sharpy
+            output_folder: ./output/goland_campaign/
+            num_cores: 4
+            max_retries: 1
+            resume: true
+        parameters:
+            StaticCoupled.aero_solver_settings.velocity_field_input.u_inf: [100, 120]
+
+    .. code-block:: bash
+
+        python -m sharpy.utils.campaign campaign.yaml
+
+"""
+import os
+import sys
+import copy
+import time
+import itertools
+import importlib
+import traceback
+import argparse
+import hashlib
+import json
+import multiprocessing as mpr
+
+import h5py as h5
+import numpy as np
+import yaml
+
+
+def generate_case_list(parameters=None, samples=None):
+    """
+    Generates the list of parameter dictionaries of a campaign.
+
+    Args:
+        parameters (dict): Dictionary of ``{setting_path: list_of_values}``. The full factorial combination of the
+          values is generated.
+        samples (list(dict)): List of ``{setting_path: value}`` dictionaries, one per case. Appended after the grid.
+
+    Returns:
+        list(dict): Parameters of each case, in order.
+    """
+    case_list = []
+    if parameters:
+        keys = list(parameters.keys())
+        for values in itertools.product(*[parameters[k] for k in keys]):
+            case_list.append(dict(zip(keys, values)))
+    if samples:
+        for sample in samples:
+            case_list.append(dict(sample))
+    return case_list
+
+
+def set_setting(settings, path, value):
+    """
+    Sets the value of a setting given by its dotted path, creating the intermediate dictionaries if required.
+
+    Args:
+        settings (dict): SHARPy settings dictionary
+        path (str): Dotted path to the setting, i.e. ``'StaticUvlm.velocity_field_input.u_inf'``
+        value: New value of the setting
+    """
+    keys = path.split('.')
+    sub_dict = settings
+    for key in keys[:-1]:
+        sub_dict = sub_dict.setdefault(key, dict())
+    sub_dict[keys[-1]] = value
+
+
+def settings_to_dict(settings):
+    """
+    Returns a deep copy of a settings ``ConfigObj`` (or ``dict``) as nested plain dictionaries.
+    """
+    if isinstance(settings, dict):
+        return {k: settings_to_dict(v) for k, v in settings.items()}
+    return copy.deepcopy(settings)
+
+
+def isolate_case(settings, case_folder):
+    """
+    Redirects the log and every ``folder`` setting to ``case_folder``, including those nested in the settings of other
+    solvers (e.g. ``DynamicCoupled.postprocessors_settings.BeamPlot.folder``). Solvers of the flow with a ``folder``
+    setting that is not given are also redirected.
+
+    Args:
+        settings (dict): Settings of the case (modified in place)
+        case_folder (str): Output folder of the case
+    """
+    import sharpy.utils.solver_interface as solver_interface
+
+    settings['SHARPy']['write_log'] = True
+    settings['SHARPy']['write_screen'] = False
+    settings['SHARPy']['log_folder'] = case_folder
+
+    for solver_name in settings['SHARPy']['flow']:
+        try:
+            solver_cls = solver_interface.solver_from_string(solver_name)
+        except KeyError:
+            continue
+        if 'folder' in solver_cls.settings_types:
+            settings.setdefault(solver_name, dict())['folder'] = case_folder
+
+    redirect_folders(settings, case_folder)
+
+
+def redirect_folders(settings, case_folder):
+    """
+    Sets every ``folder`` key of the nested dictionaries of ``settings`` to ``case_folder``
+    """
+    for key, value in settings.items():
+        if isinstance(value, dict):
+            redirect_folders(value, case_folder)
+        elif key == 'folder':
+            settings[key] = case_folder
+
+
+def parameters_hash(parameters):
+    """
+    Returns:
+        str: Hash of the parameters of a case, independent of the order of the keys
+    """
+    def default(value):
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+        return repr(value)
+
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True, default=default).encode()).hexdigest()
+
+
+def settings_names(settings):
+    """
+    Returns:
+        set(str): Keys and string values of the nested dictionaries and lists of ``settings``, which include the names
+        of the solvers, postprocessors, generators and controllers used by a case
+    """
+    names = set()
+    if isinstance(settings, dict):
+        for key, value in settings.items():
+            names.add(key)
+            names.update(settings_names(value))
+    elif isinstance(settings, (list, tuple)):
+        for value in settings:
+            names.update(settings_names(value))
+    elif isinstance(settings, str):
+        names.add(settings)
+    return names
+
+
+def load_case_modules(settings):
+    """
+    Imports the modules of the solvers, postprocessors, generators and controllers named in ``settings``.
+
+    The registries only scan the source files of their packages (see :mod:`sharpy.utils.registry`), so the modules
+    of the classes used by a case have to be requested for them to be imported.
+
+    Args:
+        settings (dict): Settings of a case
+    """
+    import sharpy.solvers
+    import sharpy.postproc
+    import sharpy.generators
+    import sharpy.controllers
+    import sharpy.utils.solver_interface as solver_interface
+    import sharpy.utils.generator_interface as generator_interface
+    import sharpy.utils.controller_interface as controller_interface
+
+    names = settings_names(settings)
+    for registry in [solver_interface.dict_of_solvers,
+                     generator_interface.dict_of_generators,
+                     controller_interface.dict_of_controllers]:
+        for name in names & set(registry.index):
+            registry[name]
+
+
+def case_id(i_case):
+    return 'case_%05u' % i_case
+
+
+def load_postprocess_function(name):
+    """
+    Imports a results function given as ``'module:function'``.
+    """
+    module_name, function_name = name.split(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+class ResultsStore(object):
+    """
+    HDF5 store of the results of a campaign.
+
+    Every case is saved as a group named after its case id holding the parameters, their hash (see
+    :func:`parameters_hash`), status, number of attempts, wall time and error message (if any) as attributes and the
+    outputs of the results function as datasets.
+
+    Args:
+        file_name (str): Path to the HDF5 file
+    """
+    def __init__(self, file_name):
+        self.file_name = file_name
+
+    def completed_cases(self):
+        """
+        Returns:
+            dict: ``{case_id: parameters_hash}`` of the cases stored as completed (``None`` hash for stores written
+            without it)
+        """
+        if not os.path.exists(self.file_name):
+            return dict()
+        with h5.File(self.file_name, 'r') as f:
+            return {k: f[k].attrs.get('parameters_hash', None) for k in f.keys()
+                    if f[k].attrs['status'] == 'completed'}
+
+    def write(self, case_id, parameters, status, attempts, wall_time, results=None, error=''):
+        with h5.File(self.file_name, 'a') as f:
+            if case_id in f:
+                del f[case_id]
+            grp = f.create_group(case_id)
+            grp.attrs['status'] = status
+            grp.attrs['attempts'] = attempts
+            grp.attrs['wall_time'] = wall_time
+            grp.attrs['error'] = error
+            grp.attrs['parameters_hash'] = parameters_hash(parameters)
+            param_grp = grp.create_group('parameters')
+            for k, v in parameters.items():
+                param_grp.attrs[k] = v
+            if results is not None:
+                res_grp = grp.create_group('results')
+                for k, v in results.items():
+                    res_grp.create_dataset(k, data=np.asarray(v))
+
+    def read(self):
+        """
+        Returns:
+            dict: ``{case_id: {'status', 'attempts', 'wall_time', 'error', 'parameters', 'results'}}``
+        """
+        output = dict()
+        if not os.path.exists(self.file_name):
+            return output
+        with h5.File(self.file_name, 'r') as f:
+            for key, grp in f.items():
+                case = dict(grp.attrs)
+                case['parameters'] = dict(grp['parameters'].attrs)
+                case['results'] = dict()
+                if 'results' in grp:
+                    for res_name, res in grp['results'].items():
+                        case['results'][res_name] = res[()]
+                output[key] = case
+        return output
+
+
+def run_case(case_id, settings, case_folder, postprocess=None):
+    """
+    Runs a single case of the campaign. Executed in the worker processes.
+
+    Args:
+        case_id (str): Case id
+        settings (dict): Full settings of the case
+        case_folder (str): Output folder of the case
+        postprocess (callable): Function taking the output ``PreSharpy`` data and returning a dictionary of arrays
+          to be saved to the results store.
+
+    Returns:
+        dict: Case id, status, wall time, results and error message of the case
+    """
+    import sharpy.sharpy_main
+
+    output = {'case_id': case_id, 'status': 'failed', 'results': None, 'error': ''}
+    t0 = time.perf_counter()
+    try:
+        os.makedirs(case_folder, exist_ok=True)
+        data = sharpy.sharpy_main.main(sharpy_input_dict=settings)
+        if postprocess is not None:
+            output['results'] = postprocess(data)
+        output['status'] = 'completed'
+    except Exception:
+        output['error'] = traceback.format_exc()
+    output['wall_time'] = time.perf_counter() - t0
+    return output
+
+
+class Campaign(object):
+    """
+    Parametric campaign of SHARPy cases.
+
+    Args:
+        base_settings (str or dict): Path to the base ``.sharpy`` file or equivalent settings dictionary
+        parameters (dict): Grid of parameters ``{setting_path: list_of_values}``
+        samples (list(dict)): List of cases ``{setting_path: value}``
+        output_folder (str): Campaign output folder
+        name (str): Campaign name, used for the results file
+        num_cores (int): Number of worker processes
+        max_retries (int): Number of times a failed case is run again
+        resume (bool): Skip the cases that are completed in an existing results store
+        postprocess (callable or str): Function (or ``'module:function'``) taking the output data of a case and
+          returning a dictionary of arrays to be saved in the results store
+    """
+    def __init__(self, base_settings, parameters=None, samples=None, output_folder='./output/campaign/',
+                 name='campaign', num_cores=1, max_retries=0, resume=True, postprocess=None):
+        import sharpy.utils.settings as settings_utils
+
+        if isinstance(base_settings, str):
+            base_settings = settings_utils.load_config_file(os.path.realpath(base_settings))
+        self.base_settings = settings_to_dict(base_settings)
+
+        self.case_list = generate_case_list(parameters, samples)
+        self.output_folder = os.path.abspath(output_folder)
+        self.name = name
+        self.num_cores = num_cores
+        self.max_retries = max_retries
+        self.resume = resume
+        if isinstance(postprocess, str):
+            postprocess = load_postprocess_function(postprocess)
+        self.postprocess = postprocess
+
+        self.store = ResultsStore(self.output_folder + '/' + self.name + '.results.h5')
+
+    def case_settings(self, i_case):
+        """
+        Returns:
+            tuple: Case id, settings and output folder of the ``i_case``-th case
+        """
+        i_case_id = case_id(i_case)
+        case_folder = self.output_folder + '/' + i_case_id + '/'
+        settings = settings_to_dict(self.base_settings)
+        for path, value in self.case_list[i_case].items():
+            set_setting(settings, path, value)
+        isolate_case(settings, case_folder)
+        return i_case_id, settings, case_folder
+
+    def pending_cases(self):
+        """
+        Returns:
+            list(int): Indices of the cases to run. With ``resume``, the cases stored as completed with the same
+            parameters are skipped. A case whose stored parameters differ (e.g. the grid has been edited or
+            reordered) is run again.
+        """
+        completed = self.store.completed_cases() if self.resume else dict()
+        return [i_case for i_case in range(len(self.case_list))
+                if completed.get(case_id(i_case), None) != parameters_hash(self.case_list[i_case])]
+
+    def run(self):
+        """
+        Runs the pending cases of the campaign.
+
+        Returns:
+            dict: Contents of the results store after the run (see :meth:`ResultsStore.read`)
+        """
+        os.makedirs(self.output_folder, exist_ok=True)
+        pending = self.pending_cases()
+        print('Campaign %s: %u cases, %u pending' % (self.name, len(self.case_list), len(pending)))
+
+        # Loading the modules of the solvers, postprocessors, generators and controllers of the cases in the parent
+        # process so that the forked workers share them instead of importing them again
+        for i_case in pending:
+            load_case_modules(self.case_settings(i_case)[1])
+
+        attempts = {i_case: 0 for i_case in pending}
+        context = mpr.get_context('fork')
+        while pending:
+            failed = []
+            # a fresh process per case so that no state is carried over from one case to the next
+            with context.Pool(self.num_cores, maxtasksperchild=1) as pool:
+                jobs = dict()
+                for i_case in pending:
+                    i_case_id, settings, case_folder = self.case_settings(i_case)
+                    jobs[i_case] = pool.apply_async(run_case,
+                                                    args=(i_case_id, settings, case_folder, self.postprocess))
+                    attempts[i_case] += 1
+
+                for i_case, job in jobs.items():
+                    output = job.get()
+                    retry = output['status'] != 'completed' and attempts[i_case] <= self.max_retries
+                    if retry:
+                        failed.append(i_case)
+                    print('%s: %s in %.2f s%s' % (output['case_id'], output['status'], output['wall_time'],
+                                                 ' (retrying)' if retry else ''))
+                    self.store.write(output['case_id'],
+                                     self.case_list[i_case],
+                                     output['status'],
+                                     attempts[i_case],
+                                     output['wall_time'],
+                                     output['results'],
+                                     output['error'])
+            pending = failed
+
+        return self.store.read()
+
+
+def campaign_from_yaml(file_name):
+    """
+    Creates a :class:`Campaign` from a YAML input file with a ``campaign`` section holding the arguments of
+    :class:`Campaign` and ``parameters`` and/or ``samples`` sections.
+    """
+    with open(file_name, 'r') as f:
+        in_dict = yaml.safe_load(f)
+
+    campaign_settings = in_dict['campaign']
+    base = campaign_settings.pop('base')
+    return Campaign(base,
+                    parameters=in_dict.get('parameters', None),
+                    samples=in_dict.get('samples', None),
+                    **campaign_settings)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='sharpy_campaign',
+                                     description='Runs a parametric campaign of SHARPy cases in parallel')
+    parser.add_argument('input_file', help='campaign input file in YAML format', type=str)
+    parser.add_argument('-n', '--num_cores', help='number of worker processes (overrides the input file)',
+                        type=int, default=None)
+    parser.add_argument('--no-resume', help='run all the cases again even if they are stored as completed',
+                        action='store_true')
+    args = parser.parse_args(args)
+
+    campaign = campaign_from_yaml(args.input_file)
+    if args.num_cores is not None:
+        campaign.num_cores = args.num_cores
+    if args.no_resume:
+        campaign.resume = False
+
+    results = campaign.run()
+    n_failed = len([k for k, v in results.items() if v['status'] != 'completed'])
+    print('Campaign finished: %u cases completed, %u failed' % (len(results) - n_failed, n_failed))
+    return results
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
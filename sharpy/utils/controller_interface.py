@@ -1,8 +1,9 @@
 from abc import ABCMeta, abstractmethod
 import sharpy.utils.cout_utils as cout
 import os
+import sharpy.utils.registry as registry
 
-dict_of_controllers = {}
+dict_of_controllers = registry.LazyRegistry('controller')
 controllers = {}  # for internal working
 
 
@@ -20,7 +21,8 @@ def controller(arg):
 
 def print_available_controllers():
     cout.cout_wrap('The available controllers in this session are:', 2)
-    for name, i_controller in dict_of_controllers.items():
+    dict_of_controllers.load_all()
+    for name, i_controller in list(dict_of_controllers.items()):
         cout.cout_wrap('%s ' % i_controller.controller_id, 2)
 
 
@@ -32,19 +34,7 @@ def controller_from_string(string):
 
 
 def controller_list_from_path(cwd):
-    onlyfiles = [f for f in os.listdir(cwd) if os.path.isfile(os.path.join(cwd, f))]
-
-    for i_file in range(len(onlyfiles)):
-        if ".py" in onlyfiles[i_file]:
-            if onlyfiles[i_file] == "__init__.py":
-                onlyfiles[i_file] = ""
-                continue
-            onlyfiles[i_file] = onlyfiles[i_file].replace('.py', '')
-        else:
-            onlyfiles[i_file] = ""
-
-    files = [file for file in onlyfiles if not file == ""]
-    return files
+    return registry.list_from_path(cwd)
 
 
 def initialise_controller(controller_name):
@@ -55,8 +45,9 @@ def initialise_controller(controller_name):
 
 def dictionary_of_controllers():
     import sharpy.controllers
+    dict_of_controllers.load_all()
     dictionary = dict()
-    for controller in dict_of_controllers:
+    for controller in list(dict_of_controllers.keys()):
         init_controller = initialise_controller(controller)
         dictionary[controller] = init_controller.settings_default
 
@@ -113,6 +113,9 @@ class AeroTimeStepInfo(object):
 
         self.control_surface_deflection = np.array([])
 
+        # number of convected rows represented by every wake row (see sharpy.aero.utils.wake_management)
+        self.wake_row_span = None
+
     def copy(self):
         copied = AeroTimeStepInfo(self.dimensions, self.dimensions_star)
         # generate placeholder for aero grid zeta coordinates
@@ -168,6 +171,9 @@ class AeroTimeStepInfo(object):
 
         copied.control_surface_deflection = self.control_surface_deflection.astype(dtype=ct.c_double, copy=True)
 
+        if self.wake_row_span is not None:
+            copied.wake_row_span = [span.copy() for span in self.wake_row_span]
+
         return copied
 
     def generate_ctypes_pointers(self):
@@ -472,6 +478,16 @@ class StructTimeStepInfo(object):
         return copied
 
     def glob_pos(self, include_rbm=True):
+        """
+        Returns the nodal coordinates projected in the G frame (``include_rbm`` adds the position of the A FoR)
+        """
+        coords = np.dot(self.pos, self.cga().T)
+        if include_rbm:
+            coords += self.for_pos[0:3]
+        return coords
+
+    def glob_pos_loop(self, include_rbm=True):
+        """Reference implementation of :meth:`glob_pos` looping over the nodes"""
         coords = self.pos.copy()
         c = self.cga()
         for i_node in range(self.num_node):
@@ -496,7 +512,7 @@ class StructTimeStepInfo(object):
         return algebra.quat2euler(self.quat)
 
 
-    def get_body(self, beam, num_dof_ibody, ibody):
+    def get_body(self, beam, num_dof_ibody, ibody, partition=None):
         """
         get_body
 
@@ -510,6 +526,7 @@ class StructTimeStepInfo(object):
             self(StructTimeStepInfo): timestep information of the multibody system
             beam(Beam): beam information of the multibody system
             ibody(int): body number to be extracted
+            partition(MultibodyPartition): precomputed nodes, elements and degrees of freedom of the bodies
 
         Returns:
         	ibody_StructTimeStepInfo(StructTimeStepInfo): timestep information of the isolated body
@@ -521,16 +538,21 @@ class StructTimeStepInfo(object):
         """
 
         # Define the nodes and elements belonging to the body
-        ibody_elems, ibody_nodes = mb.get_elems_nodes_list(beam, ibody)
+        if partition is None:
+            ibody_elems, ibody_nodes = mb.get_elems_nodes_list(beam, ibody)
+
+            ibody_first_dof = 0
+            for index_body in range(ibody - 1):
+                aux_elems, aux_nodes = mb.get_elems_nodes_list(beam, index_body)
+                ibody_first_dof += np.sum(beam.vdof[aux_nodes] > -1)*6
+        else:
+            ibody_elems = partition.elems[ibody]
+            ibody_nodes = partition.nodes[ibody]
+            ibody_first_dof = partition.first_dof[ibody]
 
         ibody_num_node = len(ibody_nodes)
         ibody_num_elem = len(ibody_elems)
 
-        ibody_first_dof = 0
-        for index_body in range(ibody - 1):
-            aux_elems, aux_nodes = mb.get_elems_nodes_list(beam, index_body)
-            ibody_first_dof += np.sum(beam.vdof[aux_nodes] > -1)*6
-
         # Initialize the new StructTimeStepInfo
         ibody_StructTimeStepInfo = StructTimeStepInfo(ibody_num_node, ibody_num_elem, self.num_node_elem, num_dof = num_dof_ibody, num_bodies = beam.num_bodies)
 
@@ -596,6 +618,126 @@ class StructTimeStepInfo(object):
 
         Examples:
 
+        Notes:
+            The nodal and elemental variables are transformed at once (see :meth:`change_to_local_AFoR_loop` for
+            the node by node implementation)
+
+        """
+
+        # Define the rotation matrices between the different FoR
+        CAslaveG = algebra.quat2rotation(self.mb_quat[global_ibody,:]).T
+        CGAmaster = algebra.quat2rotation(self.mb_quat[0,:])
+        Csm = np.dot(CAslaveG, CGAmaster)
+
+        delta_pos_ms = self.mb_FoR_pos[global_ibody,:] - self.mb_FoR_pos[0,:]
+        delta_vel_ms = self.mb_FoR_vel[global_ibody,:] - self.mb_FoR_vel[0,:]
+
+        # Modify position
+        pos_previous = self.pos.copy()
+        self.pos[:] = np.dot(pos_previous, Csm.T) - np.dot(CAslaveG, delta_pos_ms[0:3])
+        self.pos_dot[:] = (np.dot(self.pos_dot, Csm.T) -
+                           np.dot(CAslaveG, delta_vel_ms[0:3]) -
+                           np.cross(np.dot(CAslaveG, self.mb_FoR_vel[global_ibody, 3:6]), self.pos) +
+                           np.dot(np.cross(np.dot(CGAmaster.T, self.mb_FoR_vel[0, 3:6]), pos_previous), Csm.T))
+
+        self.gravity_forces[:, 0:3] = np.dot(self.gravity_forces[:, 0:3], Csm.T)
+        self.gravity_forces[:, 3:6] = np.dot(self.gravity_forces[:, 3:6], Csm.T)
+
+        # Modify local rotations
+        num_elem = self.psi.shape[0]
+        psi_previous = self.psi.reshape((-1, 3))
+        psi = algebra.rotation2crv_vec(np.matmul(Csm, algebra.crv2rotation_vec(psi_previous)))
+        tan_psi_dot = (np.einsum('nji,nj->ni', algebra.crv2tan_vec(psi_previous), self.psi_dot.reshape((-1, 3))) -
+                       np.dot(CGAmaster.T, delta_vel_ms[3:6]))
+        self.psi_dot[:] = np.einsum('nij,nj->ni', np.matmul(algebra.crv2tan_vec(psi), Csm),
+                                    tan_psi_dot).reshape((num_elem, -1, 3))
+        self.psi[:] = psi.reshape((num_elem, -1, 3))
+
+        # Set the output FoR variables
+        self.for_pos = self.mb_FoR_pos[global_ibody,:].astype(dtype=ct.c_double, order='F', copy=True)
+        self.for_vel[0:3] = np.dot(CAslaveG,self.mb_FoR_vel[global_ibody,0:3])
+        self.for_vel[3:6] = np.dot(CAslaveG,self.mb_FoR_vel[global_ibody,3:6])
+        self.for_acc[0:3] = np.dot(CAslaveG,self.mb_FoR_acc[global_ibody,0:3])
+        self.for_acc[3:6] = np.dot(CAslaveG,self.mb_FoR_acc[global_ibody,3:6])
+        self.quat = self.mb_quat[global_ibody,:].astype(dtype=ct.c_double, order='F', copy=True)
+        self.dqdt[-4:] = self.quat.astype(dtype=ct.c_double, order='F', copy=True)
+
+    def change_to_global_AFoR(self, global_ibody):
+        """
+        change_to_global_AFoR
+
+        Reference a StructTimeStepInfo to the global A frame of reference
+
+        Given 'self' as a StructTimeStepInfo class, this function references
+        it to the global A frame of reference
+
+        Args:
+            self(StructTimeStepInfo): timestep information
+            global_ibody(int): body number (as defined in the mutibody system) to be modified
+
+        Returns:
+
+        Examples:
+
+        Notes:
+            The nodal and elemental variables are transformed at once (see :meth:`change_to_global_AFoR_loop` for
+            the node by node implementation)
+
+        """
+
+        # Define the rotation matrices between the different FoR
+        CAslaveG = algebra.quat2rotation(self.mb_quat[global_ibody,:]).T
+        CGAmaster = algebra.quat2rotation(self.mb_quat[0,:])
+        Csm = np.dot(CAslaveG, CGAmaster)
+
+        delta_pos_ms = self.mb_FoR_pos[global_ibody,:] - self.mb_FoR_pos[0,:]
+        delta_vel_ms = self.mb_FoR_vel[global_ibody,:] - self.mb_FoR_vel[0,:]
+
+        pos_previous = self.pos.copy()
+        self.pos[:] = np.dot(pos_previous, Csm) + np.dot(CGAmaster.T, delta_pos_ms[0:3])
+        self.pos_dot[:] = (np.dot(self.pos_dot, Csm) +
+                           np.dot(CGAmaster.T, delta_vel_ms[0:3]) +
+                           np.dot(np.cross(np.dot(CAslaveG, self.mb_FoR_vel[global_ibody, 3:6]), pos_previous), Csm) -
+                           np.cross(np.dot(CGAmaster.T, self.mb_FoR_vel[0, 3:6]), self.pos))
+        self.gravity_forces[:, 0:3] = np.dot(self.gravity_forces[:, 0:3], Csm)
+        self.gravity_forces[:, 3:6] = np.dot(self.gravity_forces[:, 3:6], Csm)
+
+        num_elem = self.psi.shape[0]
+        psi_previous = self.psi.reshape((-1, 3))
+        psi = algebra.rotation2crv_vec(np.matmul(Csm.T, algebra.crv2rotation_vec(psi_previous)))
+        tan_psi_dot = (np.dot(np.einsum('nji,nj->ni', algebra.crv2tan_vec(psi_previous),
+                                        self.psi_dot.reshape((-1, 3))), Csm) +
+                       np.dot(CGAmaster.T, delta_vel_ms[3:6]))
+        self.psi_dot[:] = np.einsum('nij,nj->ni', algebra.crv2tan_vec(psi), tan_psi_dot).reshape((num_elem, -1, 3))
+        self.psi[:] = psi.reshape((num_elem, -1, 3))
+
+        # Set the output FoR variables
+        self.for_pos = self.mb_FoR_pos[0,:].astype(dtype=ct.c_double, order='F', copy=True)
+        self.for_vel[0:3] = np.dot(np.transpose(CGAmaster),self.mb_FoR_vel[0,0:3])
+        self.for_vel[3:6] = np.dot(np.transpose(CGAmaster),self.mb_FoR_vel[0,3:6])
+        self.for_acc[0:3] = np.dot(np.transpose(CGAmaster),self.mb_FoR_acc[0,0:3])
+        self.for_acc[3:6] = np.dot(np.transpose(CGAmaster),self.mb_FoR_acc[0,3:6])
+        self.quat = self.mb_quat[0,:].astype(dtype=ct.c_double, order='F', copy=True)
+
+    def change_to_local_AFoR_loop(self, global_ibody):
+        """
+        change_to_local_AFoR_loop
+
+        Reference implementation of :meth:`change_to_local_AFoR` looping over the nodes and elements
+
+        Reference a StructTimeStepInfo to the local A frame of reference
+
+        Given 'self' as a StructTimeStepInfo class, this function references
+        it to the local A frame of reference
+
+        Args:
+            self(StructTimeStepInfo): timestep information
+            global_ibody(int): body number (as defined in the mutibody system) to be modified
+
+        Returns:
+
+        Examples:
+
         Notes:
 
         """
@@ -644,9 +786,11 @@ class StructTimeStepInfo(object):
         self.quat = self.mb_quat[global_ibody,:].astype(dtype=ct.c_double, order='F', copy=True)
         self.dqdt[-4:] = self.quat.astype(dtype=ct.c_double, order='F', copy=True)
 
-    def change_to_global_AFoR(self, global_ibody):
+    def change_to_global_AFoR_loop(self, global_ibody):
         """
-        change_to_global_AFoR
+        change_to_global_AFoR_loop
+
+        Reference implementation of :meth:`change_to_global_AFoR` looping over the nodes and elements
 
         Reference a StructTimeStepInfo to the global A frame of reference
 
@@ -72,3 +72,27 @@ class NotValidSetting(DefaultValueBaseException):
             cout.cout_wrap.print_separator(3)
             cout.cout_wrap(message, 3)
             cout.cout_wrap.print_separator(3)
+
+
+class NotValidSettings(DefaultValueBaseException):
+    """
+    Raised when several settings are missing, not valid or cannot be converted to their type. The errors of each
+    setting are stored in ``errors``.
+    """
+
+    def __init__(self, errors, unknown_keys=(), value=None, message=''):
+        self.errors = errors
+        self.unknown_keys = list(unknown_keys)
+        message = 'The settings %s are missing, not valid or cannot be converted to their type' % \
+                  ', '.join(errors.keys())
+        if self.unknown_keys:
+            message += ' (unknown settings, possibly misspelt: %s)' % ', '.join(self.unknown_keys)
+        super().__init__(', '.join(errors.keys()), value, message=message)
+        if cout.cout_wrap is None:
+            print(message)
+        else:
+            cout.cout_wrap.print_separator(3)
+            cout.cout_wrap(message, 3)
+            for k, error in errors.items():
+                cout.cout_wrap('    %s: %s' % (k, repr(error)), 3)
+            cout.cout_wrap.print_separator(3)
@@ -0,0 +1,191 @@
+"""FSI Coupling Accelerators
+
+Relaxation of the interface vector (the structural forces mapped from the aerodynamic solver) in the strong coupling
+iterations of :class:`~sharpy.solvers.dynamiccoupled.DynamicCoupled` and
+:class:`~sharpy.solvers.staticcoupled.StaticCoupled`.
+
+In every iteration ``k`` the coupled solvers compute the new interface vector :math:`\\tilde{x}^{k} = H(x^k)` from the
+one used in the structural solution, :math:`x^k`. The accelerators return the next interface vector
+:math:`x^{k+1}` from both of them:
+
+    * ``Constant``: constant under-relaxation, :math:`x^{k+1} = (1 - c)\\tilde{x}^k + c x^k`, where ``c`` is the
+      ``relaxation_factor`` of the solvers (0 is no relaxation).
+
+    * ``Aitken``: Aitken's dynamic relaxation, updating the relaxation weight :math:`\\omega = 1 - c` with the
+      residuals :math:`r^k = \\tilde{x}^k - x^k` of two consecutive iterations.
+
+    * ``IQN-ILS``: interface quasi-Newton with an inverse Jacobian from a least-squares model. The differences of the
+      residuals and of the interface vectors of the current and of the ``reuse_steps`` previous time (or load) steps
+      approximate the inverse Jacobian of the residual.
+
+References:
+    Degroote, J., Bathe, K.-J. and Vierendeels, J. Performance of a new partitioned procedure versus a monolithic
+    procedure in fluid-structure interaction. Computers & Structures, 2009.
+"""
+import numpy as np
+
+
+class ConstantRelaxation(object):
+    """
+    Constant under-relaxation of the interface vector
+    """
+    accelerator_id = 'Constant'
+
+    def __init__(self, **kwargs):
+        pass
+
+    def new_step(self):
+        """Starts the iterations of a new time (or load) step"""
+        pass
+
+    def relax(self, previous, new, coeff):
+        """
+        Args:
+            previous (np.ndarray): Interface vector used in the last iteration, :math:`x^k`
+            new (np.ndarray): Interface vector computed from ``previous``, :math:`\\tilde{x}^k`
+            coeff (float): Relaxation factor ``c`` (0 is no relaxation)
+
+        Returns:
+            np.ndarray: Interface vector for the next iteration, :math:`x^{k+1}`
+        """
+        return (1.0 - coeff)*new + coeff*previous
+
+
+class AitkenRelaxation(ConstantRelaxation):
+    """
+    Aitken's dynamic relaxation of the interface vector.
+
+    The first iteration of every step is relaxed with the given relaxation factor. The following ones use
+
+    .. math:: \\omega^k = -\\omega^{k-1}\\frac{r^{k-1}\\cdot(r^k - r^{k-1})}{||r^k - r^{k-1}||^2}
+
+    bounded to ``[min_weight, max_weight]``.
+
+    Args:
+        min_weight (float): Minimum relaxation weight :math:`\\omega`
+        max_weight (float): Maximum relaxation weight :math:`\\omega`
+    """
+    accelerator_id = 'Aitken'
+
+    def __init__(self, min_weight=1e-2, max_weight=1.5, **kwargs):
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        self.weight = None
+        self.previous_residual = None
+
+    def new_step(self):
+        self.previous_residual = None
+
+    def relax(self, previous, new, coeff):
+        residual = new - previous
+        if self.previous_residual is None:
+            weight = 1.0 - coeff
+        else:
+            delta_residual = residual - self.previous_residual
+            norm = np.dot(delta_residual, delta_residual)
+            if norm > 0.:
+                weight = -self.weight*np.dot(self.previous_residual, delta_residual)/norm
+                weight = min(max(weight, self.min_weight), self.max_weight)
+            else:
+                weight = self.weight
+
+        self.weight = weight
+        self.previous_residual = residual
+        return previous + weight*residual
+
+
+class IQNILS(ConstantRelaxation):
+    """
+    Interface quasi-Newton acceleration with inverse Jacobian from a least-squares model (IQN-ILS).
+
+    The columns of :math:`V` and :math:`W` are the differences between the residuals and between the computed
+    interface vectors of consecutive iterations. The next interface vector is
+
+    .. math:: x^{k+1} = \\tilde{x}^k + W\\alpha, \\quad \\alpha = \\arg\\min ||V\\alpha + r^k||
+
+    The columns of the ``reuse_steps`` previous steps are kept, which allows a quasi-Newton update from the first
+    iteration of a step. Columns that are (nearly) linearly dependent on the most recent ones are filtered out. If
+    there are no columns the interface vector is relaxed with the given relaxation factor.
+
+    Args:
+        reuse_steps (int): Number of previous steps whose differences are reused
+        filter_tolerance (float): Columns whose diagonal entry in the QR decomposition of :math:`V` is smaller than
+            ``filter_tolerance`` times the largest one are removed
+    """
+    accelerator_id = 'IQN-ILS'
+
+    def __init__(self, reuse_steps=0, filter_tolerance=1e-8, **kwargs):
+        self.reuse_steps = reuse_steps
+        self.filter_tolerance = filter_tolerance
+
+        self.delta_residuals = []
+        self.delta_new = []
+        self.history = []  # [(delta_residuals, delta_new)] of previous steps, most recent first
+
+        self.previous_residual = None
+        self.previous_new = None
+
+    def new_step(self):
+        if self.delta_residuals:
+            self.history.insert(0, (self.delta_residuals, self.delta_new))
+        del self.history[self.reuse_steps:]
+        self.delta_residuals = []
+        self.delta_new = []
+        self.previous_residual = None
+        self.previous_new = None
+
+    def columns(self):
+        """
+        Returns:
+            tuple: ``(V, W)`` matrices with the differences of the residuals and of the computed interface vectors,
+            most recent first
+        """
+        delta_residuals = self.delta_residuals[::-1]
+        delta_new = self.delta_new[::-1]
+        for step_delta_residuals, step_delta_new in self.history:
+            delta_residuals += step_delta_residuals[::-1]
+            delta_new += step_delta_new[::-1]
+        if not delta_residuals:
+            return None, None
+        return np.array(delta_residuals).T, np.array(delta_new).T
+
+    def relax(self, previous, new, coeff):
+        residual = new - previous
+        if self.previous_residual is not None:
+            self.delta_residuals.append(residual - self.previous_residual)
+            self.delta_new.append(new - self.previous_new)
+        self.previous_residual = residual.copy()
+        self.previous_new = new.copy()
+
+        V, W = self.columns()
+        if V is not None:
+            # at most as many columns as the size of the interface vector
+            V = V[:, :V.shape[0]]
+            W = W[:, :V.shape[0]]
+            while V.shape[1]:
+                Q, R = np.linalg.qr(V)
+                diagonal = np.abs(np.diag(R))
+                dependent = diagonal < self.filter_tolerance*max(diagonal.max(), np.finfo(float).tiny)
+                if not dependent.any():
+                    alpha = np.linalg.solve(R, -np.dot(Q.T, residual))
+                    return new + np.dot(W, alpha)
+                V = V[:, ~dependent]
+                W = W[:, ~dependent]
+
+        return (1.0 - coeff)*new + coeff*previous
+
+
+accelerators = {ConstantRelaxation.accelerator_id: ConstantRelaxation,
+                AitkenRelaxation.accelerator_id: AitkenRelaxation,
+                IQNILS.accelerator_id: IQNILS}
+
+
+def accelerator_from_string(accelerator_id, **kwargs):
+    """
+    Returns an instance of the accelerator ``accelerator_id`` (``Constant``, ``Aitken`` or ``IQN-ILS``)
+
+    Args:
+        accelerator_id (str): Accelerator name
+        **kwargs: Parameters of the accelerator (e.g. ``reuse_steps`` for ``IQN-ILS``)
+    """
+    return accelerators[accelerator_id](**kwargs)
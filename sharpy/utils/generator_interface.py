@@ -2,10 +2,13 @@
 """
 from abc import ABCMeta, abstractmethod
 import sharpy.utils.cout_utils as cout
+import sharpy.utils.profiling as profiling
 import os
+import sharpy.utils.registry as registry
+import numpy as np
 import shutil
 
-dict_of_generators = {}
+dict_of_generators = registry.LazyRegistry('generator')
 generators = {}  # for internal working
 
 
@@ -18,36 +21,47 @@ def generator(arg):
     except AttributeError:
         raise AttributeError('Class defined as generator has no generator_id attribute')
     dict_of_generators[arg.generator_id] = arg
+    profiling.instrument_class(arg, 'generator', 'generator_id', 'generate')
     return arg
 
 
 def print_available_generators():
     cout.cout_wrap('The available generators on this session are:', 2)
-    for name, i_generator in dict_of_generators.items():
+    dict_of_generators.load_all()
+    for name, i_generator in list(dict_of_generators.items()):
         cout.cout_wrap('%s ' % i_generator.generator_id, 2)
 
 
 class BaseGenerator(metaclass=ABCMeta):
-    pass
+
+    def generate_at_points(self, params, points):
+        """
+        Batched evaluation of a velocity field generator at a set of points.
+
+        The points are passed to :meth:`generate` as a single ``(3, n_points, 1)`` surface, so that
+        generators written for the aerodynamic grid can be used on arbitrary point clouds. Generators with a
+        cheaper vectorised evaluation may override this method.
+
+        Args:
+            params (dict): parameters passed to ``generate`` (``zeta`` and ``override`` are set here)
+            points (np.ndarray): ``(n_points, 3)`` coordinates
+
+        Returns:
+            np.ndarray: ``(n_points, 3)`` velocities
+        """
+        zeta = [np.ascontiguousarray(points.T.reshape((3, -1, 1)), dtype=float)]
+        uext = [np.zeros_like(zeta[0])]
+        params = dict(params, zeta=zeta, override=True)
+        self.generate(params, uext)
+        return uext[0][:, :, 0].T
+
 
 def generator_from_string(string):
     return dict_of_generators[string]
 
 
 def generator_list_from_path(cwd):
-    onlyfiles = [f for f in os.listdir(cwd) if os.path.isfile(os.path.join(cwd, f))]
-
-    for i_file in range(len(onlyfiles)):
-        if ".py" in onlyfiles[i_file]:
-            if onlyfiles[i_file] == "__init__.py":
-                onlyfiles[i_file] = ""
-                continue
-            onlyfiles[i_file] = onlyfiles[i_file].replace('.py', '')
-        else:
-            onlyfiles[i_file] = ""
-
-    files = [file for file in onlyfiles if not file == ""]
-    return files
+    return registry.list_from_path(cwd)
 
 
 def initialise_generator(generator_name):
@@ -59,8 +73,9 @@ def initialise_generator(generator_name):
 def dictionary_of_generators():
 
     import sharpy.generators
+    dict_of_generators.load_all()
     dictionary = dict()
-    for gen in dict_of_generators:
+    for gen in list(dict_of_generators.keys()):
         init_gen = initialise_generator(gen)
         dictionary[gen] = init_gen.settings_default
 
@@ -84,7 +99,8 @@ def output_documentation(route=None):
 
     created_generators = dict()
 
-    for k, v in dict_of_generators.items():
+    dict_of_generators.load_all()
+    for k, v in list(dict_of_generators.items()):
         if k[0] == '_':
             continue
         generator_class = v()
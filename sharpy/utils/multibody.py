@@ -14,13 +14,201 @@ Notes:
 
 """
 import numpy as np
+import sharpy.structure.models.beamstructures as beamstructures
 import sharpy.structure.utils.xbeamlib as xbeamlib
 import sharpy.utils.algebra as algebra
 import ctypes as ct
 import traceback
 
 
-def split_multibody(beam, tstep, mb_data_dict, ts):
+class MultibodyPartition(object):
+    """
+    MultibodyPartition
+
+    Partition of a multibody system in its bodies
+
+    The topology of the system does not change during the simulation, so the elements, nodes, renumbered
+    connectivities and degrees of freedom of each body are computed once. The structural information of each body
+    (``Beam``) is generated in the first split and, in the following ones, only its ``ini_info`` and
+    ``timestep_info`` are updated. The stiffness and mass databases of the bodies are shared with the multibody
+    system instead of copied.
+
+    Args:
+        beam (beam): structural information of the multibody system
+
+    Attributes:
+        num_bodies (int): number of bodies
+        elems (list(np.ndarray)): global numbering of the elements of each body
+        nodes (list(np.ndarray)): global numbering of the nodes of each body (in the order of the body numbering)
+        connectivities (list(np.ndarray)): connectivities of each body in the body numbering
+        num_dof (list(int)): number of structural degrees of freedom of each body
+        first_dof (list(int)): first degree of freedom of each body in the vector of states of the system, as read
+            when splitting it (see ``StructTimeStepInfo.get_body``)
+        lumped_masses (list(np.ndarray)): indices of the lumped masses of the system located in each body
+        beams (list(beam)): structural information of each body, ``None`` until the first split
+
+    Examples:
+
+        The partition is generated in the initialisation of the multibody solvers and passed to the split and
+        merge functions
+
+        .. code-block:: python
+
+            partition = mb.MultibodyPartition(beam)
+            MB_beam, MB_tstep = mb.split_multibody(beam, tstep, mb_data_dict, ts, partition=partition)
+            mb.merge_multibody(MB_tstep, MB_beam, beam, tstep, mb_data_dict, dt, partition=partition)
+
+    """
+    def __init__(self, beam):
+        self.num_bodies = beam.num_bodies
+
+        self.elems = []
+        self.nodes = []
+        self.connectivities = []
+        self.num_dof = []
+        self.first_dof = []
+        self.lumped_masses = []
+        self.beams = [None]*self.num_bodies
+
+        self._global_nodes_num = []
+        local_node = np.zeros((beam.num_node,), dtype=int)
+        for ibody in range(self.num_bodies):
+            ibody_elems, ibody_nodes = get_elems_nodes_list(beam, ibody)
+            self._global_nodes_num.append(ibody_nodes)
+            ibody_nodes = np.array(ibody_nodes, dtype=int)
+            self.elems.append(ibody_elems)
+            self.nodes.append(ibody_nodes)
+
+            local_node[ibody_nodes] = np.arange(len(ibody_nodes))
+            self.connectivities.append(
+                local_node[beam.connectivities[ibody_elems, :]].astype(beam.connectivities.dtype))
+            self.num_dof.append(int(np.sum(beam.vdof[ibody_nodes] > -1)*6))
+
+            if beam.lumped_mass_nodes is None:
+                self.lumped_masses.append(None)
+            else:
+                self.lumped_masses.append(np.where(np.isin(beam.lumped_mass_nodes, ibody_nodes))[0])
+
+        # the states of body ``ibody`` are read after those of bodies ``0`` to ``ibody - 2``
+        for ibody in range(self.num_bodies):
+            self.first_dof.append(int(np.sum(self.num_dof[:max(ibody - 1, 0)])))
+
+    def get_beam(self, beam, ibody):
+        """
+        get_beam
+
+        Structural information of the body ``ibody``, equivalent to ``beam.get_body(ibody)`` but generated only once
+
+        Args:
+            beam (beam): structural information of the multibody system
+            ibody (int): body number
+
+        Returns:
+            ibody_beam (beam): structural information of the body, with ``ini_info`` and ``timestep_info`` extracted
+            from the current state of the system
+        """
+        ibody_beam = self.beams[ibody]
+        if ibody_beam is None:
+            ibody_beam = self.generate_beam(beam, ibody)
+            self.beams[ibody] = ibody_beam
+        else:
+            ibody_beam.ini_info = beam.ini_info.get_body(beam, ibody_beam.num_dof, ibody, partition=self)
+            ibody_beam.timestep_info = beam.timestep_info[-1].get_body(beam, ibody_beam.num_dof, ibody,
+                                                                       partition=self)
+        return ibody_beam
+
+    def generate_beam(self, beam, ibody):
+        """
+        generate_beam
+
+        Generates the structural information of the body ``ibody`` from the partition
+
+        Args:
+            beam (beam): structural information of the multibody system
+            ibody (int): body number
+
+        Returns:
+            ibody_beam (beam): structural information of the body
+        """
+        ibody_elems = self.elems[ibody]
+        ibody_nodes = self.nodes[ibody]
+
+        ibody_beam = beam.__class__()
+        ibody_beam.global_elems_num = ibody_elems
+        ibody_beam.global_nodes_num = self._global_nodes_num[ibody]
+
+        ibody_beam.settings = beam.settings.copy()
+
+        ibody_beam.num_node_elem = beam.num_node_elem.astype(dtype=ct.c_int, order='F', copy=True)
+        ibody_beam.num_node = len(ibody_nodes)
+        ibody_beam.num_elem = len(ibody_elems)
+        ibody_beam.connectivities = self.connectivities[ibody]
+
+        ibody_beam.elem_stiffness = beam.elem_stiffness[ibody_elems].astype(dtype=ct.c_int, order='F', copy=True)
+        ibody_beam.stiffness_db = beam.stiffness_db
+        ibody_beam.inv_stiffness_db = beam.inv_stiffness_db
+        ibody_beam.n_stiff = beam.n_stiff
+
+        ibody_beam.elem_mass = beam.elem_mass[ibody_elems].astype(dtype=ct.c_int, order='F', copy=True)
+        ibody_beam.mass_db = beam.mass_db
+        ibody_beam.n_mass = beam.n_mass
+
+        ibody_beam.frame_of_reference_delta = beam.frame_of_reference_delta[ibody_elems, :, :].astype(
+            dtype=ct.c_double, order='F', copy=True)
+        ibody_beam.structural_twist = beam.structural_twist[ibody_elems, :].astype(dtype=ct.c_double, order='F',
+                                                                                   copy=True)
+        ibody_beam.boundary_conditions = beam.boundary_conditions[ibody_nodes].astype(dtype=ct.c_int, order='F',
+                                                                                      copy=True)
+        ibody_beam.beam_number = beam.beam_number[ibody_elems].astype(dtype=ct.c_int, order='F', copy=True)
+
+        lumped_masses = self.lumped_masses[ibody]
+        if lumped_masses is not None:
+            ibody_beam.n_lumped_mass = len(lumped_masses)
+            if ibody_beam.n_lumped_mass > 0:
+                local_node = np.zeros((beam.num_node,), dtype=int)
+                local_node[ibody_nodes] = np.arange(len(ibody_nodes))
+                ibody_beam.lumped_mass_nodes = local_node[beam.lumped_mass_nodes[lumped_masses]]
+                ibody_beam.lumped_mass = np.array(beam.lumped_mass)[lumped_masses]
+                ibody_beam.lumped_mass_inertia = np.array(beam.lumped_mass_inertia)[lumped_masses]
+                ibody_beam.lumped_mass_position = np.array(beam.lumped_mass_position)[lumped_masses]
+
+        ibody_beam.steady_app_forces = beam.steady_app_forces[ibody_nodes, :].astype(dtype=ct.c_double, order='F',
+                                                                                    copy=True)
+        ibody_beam.num_bodies = 1
+        ibody_beam.body_number = beam.body_number[ibody_elems].astype(dtype=ct.c_int, order='F', copy=True)
+
+        ibody_beam.generate_dof_arrays()
+
+        ibody_beam.ini_info = beam.ini_info.get_body(beam, ibody_beam.num_dof, ibody, partition=self)
+        ibody_beam.timestep_info = beam.timestep_info[-1].get_body(beam, ibody_beam.num_dof, ibody, partition=self)
+
+        # The elements and undeformed geometry are defined in the master FoR
+        for ielem in range(ibody_beam.num_elem):
+            ibody_beam.elements.append(
+                beamstructures.Element(
+                    ielem,
+                    ibody_beam.num_node_elem,
+                    ibody_beam.connectivities[ielem, :],
+                    ibody_beam.ini_info.pos[ibody_beam.connectivities[ielem, :], :],
+                    ibody_beam.frame_of_reference_delta[ielem, :, :],
+                    ibody_beam.structural_twist[ielem, :],
+                    ibody_beam.beam_number[ielem],
+                    ibody_beam.elem_stiffness[ielem],
+                    ibody_beam.elem_mass[ielem]))
+            ibody_beam.elements[ielem].add_attributes({'stiffness_index': ibody_beam.elem_stiffness[ielem],
+                                                       'mass_index': ibody_beam.elem_mass[ielem]})
+
+        ibody_beam.generate_master_structure()
+
+        if ibody_beam.lumped_mass is not None:
+            ibody_beam.lump_masses()
+
+        ibody_beam.generate_fortran()
+
+        return ibody_beam
+
+
+def split_multibody(beam, tstep, mb_data_dict, ts, partition=None):
     """
     split_multibody
 
@@ -32,6 +220,9 @@ def split_multibody(beam, tstep, mb_data_dict, ts):
     	beam (beam): structural information of the multibody system
     	tstep (StructTimeStepInfo): timestep information of the multibody system
         mb_data_dict (): Dictionary including the multibody information
+        ts (int): time step number
+        partition (MultibodyPartition): partition of the system. If given, the structural information of the bodies
+            is reused between calls instead of being extracted from ``beam`` every time
 
     Returns:
         MB_beam (list of beam): each entry represents a body
@@ -51,10 +242,13 @@ def split_multibody(beam, tstep, mb_data_dict, ts):
     for ibody in range(beam.num_bodies):
         ibody_beam = None
         ibody_tstep = None
-        ibody_beam = beam.get_body(ibody = ibody)
+        if partition is None:
+            ibody_beam = beam.get_body(ibody = ibody)
+        else:
+            ibody_beam = partition.get_beam(beam, ibody)
         ibody_beam.ini_info.change_to_local_AFoR(ibody)
         ibody_beam.timestep_info.change_to_local_AFoR(ibody)
-        ibody_tstep = tstep.get_body(beam, ibody_beam.num_dof, ibody = ibody)
+        ibody_tstep = tstep.get_body(beam, ibody_beam.num_dof, ibody = ibody, partition=partition)
         ibody_tstep.change_to_local_AFoR(ibody)
 
         ibody_beam.FoR_movement = mb_data_dict['body_%02d' % ibody]['FoR_movement']
@@ -72,7 +266,7 @@ def split_multibody(beam, tstep, mb_data_dict, ts):
 
     return MB_beam, MB_tstep
 
-def merge_multibody(MB_tstep, MB_beam, beam, tstep, mb_data_dict, dt):
+def merge_multibody(MB_tstep, MB_beam, beam, tstep, mb_data_dict, dt, partition=None):
     """
     merge_multibody
 
@@ -87,6 +281,8 @@ def merge_multibody(MB_tstep, MB_beam, beam, tstep, mb_data_dict, dt):
     	tstep (StructTimeStepInfo): timestep information of the multibody system
         mb_data_dict (): Dictionary including the multibody information
         dt(int): time step
+        partition (MultibodyPartition): partition of the system (the nodes and elements of each body are read from
+            ``MB_beam`` if not given)
 
     Returns:
         beam (beam): structural information of the multibody system
@@ -103,8 +299,12 @@ def merge_multibody(MB_tstep, MB_beam, beam, tstep, mb_data_dict, dt):
     first_dof = 0
     for ibody in range(beam.num_bodies):
         # Renaming for clarity
-        ibody_elems = MB_beam[ibody].global_elems_num
-        ibody_nodes = MB_beam[ibody].global_nodes_num
+        if partition is None:
+            ibody_elems = MB_beam[ibody].global_elems_num
+            ibody_nodes = MB_beam[ibody].global_nodes_num
+        else:
+            ibody_elems = partition.elems[ibody]
+            ibody_nodes = partition.nodes[ibody]
 
         # Merge tstep
         MB_tstep[ibody].change_to_global_AFoR(ibody)
@@ -0,0 +1,226 @@
+"""Profiling
+
+Registry of timers used to instrument the solvers, post-processors, generators, calls to the compiled libraries and
+fluid-structure sub-iterations.
+
+The timers are disabled by default, in which case they only cost a flag check. They are enabled with the ``profile``
+setting of the ``SHARPy`` header, and the profile is written at the end of the run to
+``<route>/output/<case>/profile.json``:
+
+    * ``timers``: number of calls, total, minimum and maximum time of each timer [s]
+
+    * ``timesteps``: for every time step, the time and number of calls of the timers run within it, the counters
+      (e.g. FSI iterations) and the memory high-water mark of the process [MB] at the end of the step
+
+    * ``counters``: totals of the counters
+
+    * ``max_memory``: memory high-water mark of the process [MB]
+
+Examples:
+
+    Timers can be used as context managers or decorators
+
+    .. code-block:: python
+
+        import sharpy.utils.profiling as profiling
+
+        with profiling.timer('DynamicCoupled/aero'):
+            ...
+
+        @profiling.timed('uvlmlib/uvlm_solver')
+        def uvlm_solver(...):
+            ...
+"""
+import contextlib
+import functools
+import json
+import os
+import platform
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def max_memory():
+    """Memory high-water mark of the process [MB] (``None`` if not available in the platform)"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes in Linux, bytes in macOS
+    if platform.system() == 'Darwin':
+        return max_rss / 1024 ** 2
+    return max_rss / 1024
+
+
+class Profiler(object):
+    """
+    Registry of timers and counters, recorded in total and per time step
+
+    Attributes:
+        enabled (bool): timers and counters are only recorded if ``True``
+        timers (dict): timer name to ``[calls, total, min, max]``
+        counters (dict): counter name to total value
+        timesteps (dict): time step to ``{'timers': {name: [calls, total]}, 'counters': {}, 'max_memory': float}``
+    """
+    def __init__(self):
+        self.enabled = False
+        self.timers = dict()
+        self.counters = dict()
+        self.timesteps = dict()
+        self.ts = None
+
+    def reset(self):
+        self.timers = dict()
+        self.counters = dict()
+        self.timesteps = dict()
+        self.ts = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def set_timestep(self, ts):
+        """
+        Sets the time step the following records are assigned to (``None`` for records outside of the time
+        loops) and stores the memory high-water mark of the previous one
+        """
+        if not self.enabled:
+            return
+        self._close_timestep()
+        self.ts = ts
+        if ts is not None:
+            self.timesteps.setdefault(ts, {'timers': dict(), 'counters': dict(), 'max_memory': None})
+
+    def _close_timestep(self):
+        if self.ts is not None:
+            self.timesteps[self.ts]['max_memory'] = max_memory()
+
+    def add_time(self, name, elapsed):
+        """Records ``elapsed`` seconds in the timer ``name``"""
+        if not self.enabled:
+            return
+        try:
+            record = self.timers[name]
+            record[0] += 1
+            record[1] += elapsed
+            record[2] = min(record[2], elapsed)
+            record[3] = max(record[3], elapsed)
+        except KeyError:
+            self.timers[name] = [1, elapsed, elapsed, elapsed]
+
+        if self.ts is not None:
+            record = self.timesteps[self.ts]['timers'].setdefault(name, [0, 0.])
+            record[0] += 1
+            record[1] += elapsed
+
+    def count(self, name, value=1):
+        """Adds ``value`` to the counter ``name``"""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + value
+        if self.ts is not None:
+            counters = self.timesteps[self.ts]['counters']
+            counters[name] = counters.get(name, 0) + value
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """Context manager timing the enclosed block under ``name``"""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def timed(self, name):
+        """Decorator timing every call to the function under ``name``"""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.add_time(name, time.perf_counter() - t0)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """Returns the profile as a dictionary that can be serialised to JSON"""
+        self._close_timestep()
+        return {'timers': {name: {'calls': record[0],
+                                  'total': record[1],
+                                  'min': record[2],
+                                  'max': record[3]} for name, record in self.timers.items()},
+                'counters': dict(self.counters),
+                'timesteps': [{'ts': ts,
+                               'timers': {name: {'calls': record[0], 'total': record[1]}
+                                          for name, record in step['timers'].items()},
+                               'counters': dict(step['counters']),
+                               'max_memory': step['max_memory']} for ts, step in sorted(self.timesteps.items())],
+                'max_memory': max_memory()}
+
+    def write(self, filename):
+        """Writes the profile to a JSON file"""
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        with open(filename, 'w') as f:
+            json.dump(self.summary(), f, indent=1)
+
+
+profiler = Profiler()
+
+
+def timer(name):
+    """Context manager timing the enclosed block with the global profiler"""
+    return profiler.timer(name)
+
+
+def timed(name):
+    """Decorator timing the calls to a function with the global profiler"""
+    return profiler.timed(name)
+
+
+def count(name, value=1):
+    """Adds ``value`` to the counter ``name`` of the global profiler"""
+    profiler.count(name, value)
+
+
+def set_timestep(ts):
+    """Sets the time step of the records of the global profiler"""
+    profiler.set_timestep(ts)
+
+
+def timed_method(prefix, id_attribute):
+    """
+    Wraps a method so that every call is timed as ``prefix/<id>``, with ``<id>`` the value of
+    ``id_attribute`` of the instance (so that inherited methods are recorded under the subclass id)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not profiler.enabled:
+                return method(self, *args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                profiler.add_time(prefix + '/' + getattr(self, id_attribute), time.perf_counter() - t0)
+        wrapper.profiled = True
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls, prefix, id_attribute, method_name):
+    """Replaces ``method_name``, if defined by ``cls`` itself, by a timed version (see :func:`timed_method`)"""
+    method = cls.__dict__.get(method_name)
+    if method is None or getattr(method, 'profiled', False) or not callable(method):
+        return cls
+    setattr(cls, method_name, timed_method(prefix, id_attribute)(method))
+    return cls
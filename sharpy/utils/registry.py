@@ -0,0 +1,112 @@
+"""Lazy Registries
+
+Registries of the classes defined with the ``@solver``, ``@generator`` and ``@controller`` decorators.
+
+The packages holding those classes (e.g. ``sharpy.solvers``) do not import their modules when they are imported.
+Instead, the source files are scanned for the decorated classes and their ids, and a module is only imported the
+first time one of its classes is requested. A minimal flow thus does not load the dependencies of the solvers and
+post-processors it does not use (``tvtk``, the linear and ROM libraries...).
+"""
+import importlib
+import os
+import re
+
+
+def list_from_path(cwd):
+    """
+    Names of the modules (``.py`` files other than ``__init__.py``) in the folder ``cwd``
+    """
+    return [f[:-3] for f in os.listdir(cwd)
+            if os.path.isfile(os.path.join(cwd, f)) and f.endswith('.py') and not f == '__init__.py']
+
+
+class LazyRegistry(dict):
+    """
+    Dictionary of decorated classes indexed by their id that imports the module defining a class on its first
+    access.
+
+    The modules of the packages added with :meth:`add_package` are scanned (without importing them) for classes
+    preceded by ``@<decorator>`` or ``@<module>.<decorator>`` that define ``<decorator>_id = '<name>'``. When a
+    ``name`` that has not been registered yet is requested, its module is imported, which runs the decorator and
+    registers the class. Names not found in the scan are looked for by importing every module of the packages.
+
+    Iterating over the registry only goes through the classes that have been imported. Use :meth:`load_all`
+    before listing all the available classes.
+
+    Args:
+        decorator (str): Name of the decorator (``solver``, ``generator`` or ``controller``)
+    """
+    def __init__(self, decorator):
+        super().__init__()
+        self.decorator = decorator
+        self.index = dict()  # class id: module name
+        self.modules = dict()  # module name: (dictionary of imported modules, file)
+
+        self._decorated_class = re.compile(r'^@(?:\w+\.)?%s[ \t]*\n(?:@.*\n)*class\s+\w+' % decorator,
+                                           re.MULTILINE)
+        self._class_id = re.compile(r'^[ \t]+%s_id\s*=\s*[\'"]([^\'"]+)[\'"]' % decorator, re.MULTILINE)
+        self._end_of_class = re.compile(r'^(?:class|def|@)\b', re.MULTILINE)
+
+    def scan(self, source):
+        """
+        Ids of the decorated classes in a source file
+
+        Args:
+            source (str): Contents of the file
+
+        Returns:
+            list(str): Ids of the classes
+        """
+        ids = []
+        for match in self._decorated_class.finditer(source):
+            end = self._end_of_class.search(source, match.end())
+            body = source[match.end():end.start() if end is not None else len(source)]
+            class_id = self._class_id.search(body)
+            if class_id is not None:
+                ids.append(class_id.group(1))
+        return ids
+
+    def add_package(self, path, package, imported_modules):
+        """
+        Adds the modules in a package to the index of the registry
+
+        Args:
+            path (str): Folder of the package
+            package (str): Name of the package (e.g. ``sharpy.solvers``)
+            imported_modules (dict): Dictionary where the imported modules are stored under their file name
+        """
+        for file in sorted(list_from_path(path)):
+            module_name = package + '.' + file
+            self.modules[module_name] = (imported_modules, file)
+            with open(os.path.join(path, file + '.py'), 'r') as source_file:
+                source = source_file.read()
+            for class_id in self.scan(source):
+                self.index.setdefault(class_id, module_name)
+
+    def import_module(self, module_name):
+        imported_modules, file = self.modules[module_name]
+        imported_modules[file] = importlib.import_module(module_name)
+
+    def load_all(self):
+        """Imports all the modules of the packages in the registry"""
+        for module_name in list(self.modules.keys()):
+            self.import_module(module_name)
+
+    def available(self):
+        """
+        Returns:
+            list(str): Ids of the registered classes and of those found in the packages and not imported yet
+        """
+        return list(self.keys()) + [class_id for class_id in self.index if not dict.__contains__(self, class_id)]
+
+    def __missing__(self, key):
+        try:
+            module_name = self.index[key]
+        except KeyError:
+            self.load_all()
+        else:
+            self.import_module(module_name)
+        # dict.__getitem__ would call __missing__ again
+        if not dict.__contains__(self, key):
+            raise KeyError(key)
+        return dict.get(self, key)
@@ -34,6 +34,285 @@ def cast(k, v, pytype, ctype, default):
 
 
 def to_custom_types(dictionary, types, default, options=dict(), no_ctype=False):
+    """
+    Converts (in place) the entries of a settings dictionary to the types of the settings declaration of a solver,
+    using the defaults for the missing entries, and checks that they are valid options.
+
+    The declaration (``types`` and ``options``) is compiled once into a :class:`SettingsSchema` (see
+    :func:`compile_schema`), so repeated initialisations of a solver do not parse it again.
+
+    Args:
+        dictionary (dict): Settings to convert
+        types (dict): Settings types
+        default (dict): Settings default values
+        options (dict): Settings valid options (may be empty)
+        no_ctype (bool): Convert ``int``, ``float`` and ``bool`` settings to Python types instead of ``ctypes``
+
+    Keys of ``dictionary`` that are not in ``types`` are ignored with a warning.
+
+    Raises:
+        exceptions.NotValidSettings: if more than one setting is missing, not valid or cannot be converted, or if
+            any is and ``dictionary`` has unknown keys (possibly misspelt settings). A single error without unknown
+            keys raises the original exception (e.g. :class:`~sharpy.utils.exceptions.NoDefaultValueException`).
+    """
+    compile_schema(types, options, no_ctype).convert(dictionary, default)
+
+
+_schemas = dict()
+_max_schemas = 512
+
+
+def compile_schema(types, options=dict(), no_ctype=False):
+    """
+    Returns the :class:`SettingsSchema` of a settings declaration, compiling it only the first time it is requested.
+
+    Schemas are cached by the identity of the ``types`` and ``options`` dictionaries (the class attributes of the
+    solvers) and compiled again if settings are added to them.
+    """
+    key = (id(types), id(options), no_ctype)
+    try:
+        schema = _schemas[key]
+        if schema.types is types and schema.options is options and schema.num_settings == (len(types), len(options)):
+            return schema
+    except KeyError:
+        pass
+
+    schema = SettingsSchema(types, options, no_ctype)
+    if len(_schemas) >= _max_schemas:
+        del _schemas[next(iter(_schemas))]
+    _schemas[key] = schema
+    return schema
+
+
+class SettingsSchema(object):
+    """
+    Settings declaration of a solver compiled into one converter per setting.
+
+    :meth:`convert` goes through the settings once, collecting all the errors instead of stopping at the first one.
+    The converted values are memoised for repeated identical inputs (and defaults): a hit copies the stored values
+    instead of converting them again, without the notifications of the defaults used. Settings of types ``dict`` and
+    ``list(dict)``, which are converted in place or kept by reference, are always converted.
+
+    Args:
+        types (dict): Settings types
+        options (dict): Settings valid options (may be empty)
+        no_ctype (bool): Convert ``int``, ``float`` and ``bool`` settings to Python types instead of ``ctypes``
+    """
+    max_results = 32
+    not_memoised = ['dict', 'list(dict)']
+
+    def __init__(self, types, options=dict(), no_ctype=False):
+        self.types = types
+        self.options = options
+        self.no_ctype = no_ctype
+        self.num_settings = (len(types), len(options))
+
+        self.converters = [(k, compile_converter(k, v, no_ctype)) for k, v in types.items()]
+        self.memoised = [k for k, v in types.items() if v not in self.not_memoised]
+        self.checks = [(k, compile_check(types[k], options[k])) for k in options]
+
+        self.results = dict()
+
+    def unknown_keys(self, dictionary):
+        """Keys of ``dictionary`` that are not in the settings declaration"""
+        return [k for k in dictionary if k not in self.types]
+
+    def fingerprint(self, dictionary, default):
+        try:
+            return tuple(freeze(dictionary[k]) if k in dictionary else (default_value, freeze(default.get(k)))
+                         for k in self.memoised)
+        except TypeError:
+            return None
+
+    def convert(self, dictionary, default):
+        """
+        Converts (in place) the entries of ``dictionary`` and checks their options, see :func:`to_custom_types`.
+        """
+        key = self.fingerprint(dictionary, default)
+        result = self.results.get(key) if key is not None else None
+
+        errors = dict()
+        for k, converter in self.converters:
+            try:
+                if result is not None and k in result:
+                    dictionary[k] = copy_value(result[k])
+                else:
+                    converter(dictionary, k, default)
+            except Exception as error:
+                errors[k] = error
+
+        if result is None:
+            for k, check in self.checks:
+                if k not in errors:
+                    try:
+                        check(k, dictionary[k])
+                    except Exception as error:
+                        errors[k] = error
+
+        unknown_keys = self.unknown_keys(dictionary)
+        if errors:
+            if len(errors) == 1 and not unknown_keys:
+                raise next(iter(errors.values()))
+            raise exceptions.NotValidSettings(errors, unknown_keys) from next(iter(errors.values()))
+        if unknown_keys:
+            cout.cout_wrap('--- Unknown settings, possibly misspelt, are ignored: ' + ', '.join(unknown_keys), 3)
+
+        if result is None and key is not None:
+            if len(self.results) >= self.max_results:
+                del self.results[next(iter(self.results))]
+            self.results[key] = {k: copy_value(dictionary[k]) for k in self.memoised}
+
+
+default_value = object()
+
+
+def freeze(value):
+    """
+    Hashable representation of a setting value (including its type), raising ``TypeError`` for values that cannot
+    be represented.
+    """
+    if value is None or isinstance(value, (str, bool, int, float, complex)):
+        return type(value), value
+    elif isinstance(value, ct._SimpleCData):
+        return type(value), value.value
+    elif isinstance(value, np.ndarray):
+        return np.ndarray, value.dtype.str, value.shape, value.tobytes()
+    elif isinstance(value, np.generic):
+        return type(value), value.item()
+    elif isinstance(value, (list, tuple)):
+        return (type(value),) + tuple(freeze(item) for item in value)
+    raise TypeError('Settings of type %s are not memoised' % type(value))
+
+
+def copy_value(value):
+    if isinstance(value, ct._SimpleCData):
+        return type(value)(value.value)
+    elif isinstance(value, np.ndarray):
+        return value.copy()
+    elif isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+def compile_converter(k, v, no_ctype=False):
+    """
+    Returns the function ``converter(dictionary, k, default)`` that converts the setting ``k`` of type ``v`` in
+    ``dictionary`` (or sets its default value).
+    """
+    if v == 'int':
+        return scalar_converter(int, int if no_ctype else ct.c_int)
+    elif v == 'float':
+        return scalar_converter(float, float if no_ctype else ct.c_double)
+    elif v == 'str':
+        return scalar_converter(str, str)
+    elif v == 'bool':
+        return scalar_converter(str2bool, bool if no_ctype else ct.c_bool)
+    elif v == 'list(str)':
+        return convert_list_str
+    elif v == 'list(dict)':
+        return convert_list_dict
+    elif v == 'list(float)':
+        return array_converter(float, lambda x, sep: np.fromstring(x, sep=sep, dtype=ct.c_double))
+    elif v == 'list(int)':
+        return array_converter(int, lambda x, sep: np.fromstring(x, sep=sep).astype(ct.c_int))
+    elif v == 'list(complex)':
+        return array_converter(float, lambda x, sep: np.fromstring(x, sep=sep).astype(complex))
+    elif v == 'dict':
+        return convert_dict
+    raise TypeError('Variable %s has an unknown type (%s) that cannot be casted' % (k, v))
+
+
+def set_default(dictionary, k, default, value):
+    if default[k] is None:
+        raise exceptions.NoDefaultValueException(k)
+    dictionary[k] = value(default[k])
+    notify_default_value(k, dictionary[k])
+
+
+def scalar_converter(pytype, ctype):
+    def converter(dictionary, k, default):
+        try:
+            dictionary[k] = cast(k, dictionary[k], pytype, ctype, default[k])
+        except KeyError:
+            set_default(dictionary, k, default, lambda x: cast(k, x, pytype, ctype, x))
+    return converter
+
+
+def convert_list_str(dictionary, k, default):
+    try:
+        # getting rid of leading and trailing spaces
+        dictionary[k] = list(map(lambda x: x.strip(), dictionary[k]))
+    except KeyError:
+        set_default(dictionary, k, default, lambda x: x.copy())
+
+
+def convert_list_dict(dictionary, k, default):
+    try:
+        for i in range(len(dictionary[k])):
+            dictionary[k][i] = ast.literal_eval(dictionary[k][i])
+    except KeyError:
+        set_default(dictionary, k, default, lambda x: x.copy())
+
+
+def array_converter(item_type, from_string):
+    def converter(dictionary, k, default):
+        try:
+            value = dictionary[k]
+        except KeyError:
+            set_default(dictionary, k, default, lambda x: x.copy())
+            value = dictionary[k]
+
+        if isinstance(value, np.ndarray):
+            return
+        if isinstance(value, list):
+            # the elements of the list are converted in place
+            for i in range(len(value)):
+                value[i] = item_type(value[i])
+            dictionary[k] = np.array(value)
+            return
+        dictionary[k] = from_string(value.strip('[]'), ' ' if value.find(',') < 0 else ',')
+    return converter
+
+
+def convert_dict(dictionary, k, default):
+    try:
+        if not isinstance(dictionary[k], dict):
+            raise TypeError
+    except KeyError:
+        set_default(dictionary, k, default, lambda x: x.copy())
+
+
+def compile_check(v, options):
+    """
+    Returns the function ``check(k, value)`` that checks that the converted setting ``k`` of type ``v`` is one of the
+    valid ``options`` (see :func:`check_settings`).
+    """
+    if v == 'int':
+        def check(k, value):
+            value = getattr(value, 'value', value)
+            if value not in options:
+                raise exceptions.NotValidSetting(k, value, options)
+    elif v == 'str':
+        def check(k, value):
+            # checks that the value is within the options and that it is not an empty string.
+            if value not in options and value:
+                raise exceptions.NotValidSetting(k, value, options)
+    elif v == 'list(str)':
+        def check(k, value):
+            for item in value:
+                if item not in options and item:
+                    raise exceptions.NotValidSetting(k, item, options)
+    else:
+        def check(k, value):
+            pass  # no other checks implemented / required
+    return check
+
+
+def to_custom_types_uncompiled(dictionary, types, default, options=dict(), no_ctype=False):
+    """
+    Reference implementation of :func:`to_custom_types` that dispatches on the type names of every setting in each
+    call.
+    """
     for k, v in types.items():
         if v == 'int':
             if no_ctype:
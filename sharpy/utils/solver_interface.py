@@ -1,11 +1,13 @@
 from abc import ABCMeta, abstractmethod
 import sharpy.utils.cout_utils as cout
 import os
+import sharpy.utils.registry as registry
 import sharpy.utils.settings as settings
+import sharpy.utils.profiling as profiling
 import inspect
 import shutil
 
-dict_of_solvers = {}
+dict_of_solvers = registry.LazyRegistry('solver')
 solvers = {}  # for internal working
 
 
@@ -19,6 +21,12 @@ def solver(arg):
         raise AttributeError('Class defined as solver has no solver_id attribute')
     dict_of_solvers[arg.solver_id] = arg
 
+    # time the runs of solvers and post-processors
+    if 'postproc' in arg.__module__.split('.'):
+        profiling.instrument_class(arg, 'postproc', 'solver_id', 'run')
+    else:
+        profiling.instrument_class(arg, 'solver', 'solver_id', 'run')
+
     # a = arg()
     # settings.SettingsTable().print(a)
 
@@ -27,7 +35,8 @@ def solver(arg):
 
 def print_available_solvers():
     cout.cout_wrap('The available solvers on this session are:', 2)
-    for name, i_solver in dict_of_solvers.items():
+    dict_of_solvers.load_all()
+    for name, i_solver in list(dict_of_solvers.items()):
         cout.cout_wrap('%s ' % i_solver.solver_id, 2)
 
 
@@ -66,19 +75,7 @@ def solver_from_string(string):
 
 
 def solver_list_from_path(cwd):
-    onlyfiles = [f for f in os.listdir(cwd) if os.path.isfile(os.path.join(cwd, f))]
-
-    for i_file in range(len(onlyfiles)):
-        if ".py" in onlyfiles[i_file]:
-            if onlyfiles[i_file] == "__init__.py":
-                onlyfiles[i_file] = ""
-                continue
-            onlyfiles[i_file] = onlyfiles[i_file].replace('.py', '')
-        else:
-            onlyfiles[i_file] = ""
-
-    files = [file for file in onlyfiles if not file == ""]
-    return files
+    return registry.list_from_path(cwd)
 
 
 def initialise_solver(solver_name, print_info=True):
@@ -88,11 +85,26 @@ def initialise_solver(solver_name, print_info=True):
     solver = cls_type()
     return solver
 
+
+def finalise_postprocessors(postprocessors):
+    """
+    Calls the ``finalise`` method of the postprocessors that have one at the end of a simulation that runs them
+    online, so that the files they write in the background are completed.
+
+    Args:
+        postprocessors (dict): Postprocessors ``{name: instance}``
+    """
+    for postproc in postprocessors.values():
+        finalise = getattr(postproc, 'finalise', None)
+        if finalise is not None:
+            finalise()
+
 def dictionary_of_solvers(print_info=True):
     import sharpy.solvers
     import sharpy.postproc
+    dict_of_solvers.load_all()
     dictionary = dict()
-    for solver in dict_of_solvers:
+    for solver in list(dict_of_solvers.keys()):
         if not solver.lower() == 'SaveData'.lower():
             # TODO: why it does not work for savedata?
             init_solver = initialise_solver(solver, print_info)
@@ -126,7 +138,8 @@ def output_documentation(route=None):
 
     created_solvers = dict()
 
-    for k, v in dict_of_solvers.items():
+    dict_of_solvers.load_all()
+    for k, v in list(dict_of_solvers.items()):
         if k[0] == '_':
             continue
         solver = v()
@@ -0,0 +1,182 @@
+"""Structural State Predictors
+
+Extrapolation of the structural state at the start of a time step of
+:class:`~sharpy.solvers.dynamiccoupled.DynamicCoupled` from the states of the previous time steps. The predicted state
+generates the aerodynamic grid of the first FSI iteration (see
+:meth:`~sharpy.aero.models.aerogrid.Aerogrid.generate_zeta_timestep_info`), which otherwise is that of the previous
+time step.
+
+The predictors keep a ring buffer with the predicted fields of the last time steps, most recent first. With fewer
+stored steps than those required, the order of the prediction is reduced:
+
+    * ``Constant``: :math:`x_{n+1} = x_n`. The state is not modified, which is the default behaviour of the solver.
+
+    * ``Linear``: :math:`x_{n+1} = 2x_n - x_{n-1}`.
+
+    * ``Quadratic``: :math:`x_{n+1} = 3x_n - 3x_{n-1} + x_{n-2}`.
+
+    * ``AdamsBashforth``: second order Adams-Bashforth integration of the time derivatives stored in the time step,
+      :math:`x_{n+1} = x_n + \\Delta t(\\frac{3}{2}\\dot{x}_n - \\frac{1}{2}\\dot{x}_{n-1})`. The fields without a
+      derivative (``for_pos`` and ``quat``) are extrapolated linearly.
+
+The predicted fields are the structural states ``q`` and ``dqdt``, the velocities of the frame of reference
+``for_vel`` and the nodal variables that define the aerodynamic grid. The quaternion is normalised after the
+prediction.
+"""
+import collections
+
+import numpy as np
+
+import sharpy.utils.algebra as algebra
+
+
+class ConstantPredictor(object):
+    """
+    Keeps the state of the previous time step, the default initial guess of the FSI iterations
+
+    Args:
+        dt (float): Time step
+    """
+    predictor_id = 'Constant'
+    n_steps = 0
+
+    fields = ('q', 'dqdt', 'for_vel', 'for_pos', 'quat', 'pos', 'pos_dot', 'psi', 'psi_dot')
+
+    def __init__(self, dt=None, **kwargs):
+        self.dt = dt
+        self.history = collections.deque(maxlen=self.n_steps)
+
+    def stored_fields(self):
+        return self.fields
+
+    def add_step(self, tstep):
+        """
+        Stores the predicted fields of a converged time step
+
+        Args:
+            tstep (sharpy.utils.datastructures.StructTimeStepInfo): Structural time step
+        """
+        if not self.n_steps:
+            return
+        self.history.appendleft({field: getattr(tstep, field).copy() for field in self.stored_fields()})
+
+    def reset(self):
+        """Removes the stored time steps"""
+        self.history.clear()
+
+    def coefficients(self):
+        """
+        Returns:
+            np.ndarray: Coefficients of the stored time steps in the extrapolation, most recent first
+        """
+        n = len(self.history)
+        return np.array([(-1)**j*binomial(n, j + 1) for j in range(n)], dtype=float)
+
+    def extrapolate(self, field, coefficients):
+        value = coefficients[0]*self.history[0][field]
+        for coeff, state in zip(coefficients[1:], list(self.history)[1:]):
+            value += coeff*state[field]
+        return value
+
+    def predict(self, tstep):
+        """
+        Writes the predicted fields in ``tstep``
+
+        Args:
+            tstep (sharpy.utils.datastructures.StructTimeStepInfo): Structural time step, modified in place
+
+        Returns:
+            sharpy.utils.datastructures.StructTimeStepInfo: ``tstep``
+        """
+        if not self.history:
+            return tstep
+
+        coefficients = self.coefficients()
+        for field in self.fields:
+            getattr(tstep, field)[...] = self.extrapolate(field, coefficients)
+        tstep.quat[:] = algebra.unit_vector(tstep.quat)
+        return tstep
+
+
+class LinearPredictor(ConstantPredictor):
+    """
+    Linear extrapolation of the last two time steps
+    """
+    predictor_id = 'Linear'
+    n_steps = 2
+
+
+class QuadraticPredictor(ConstantPredictor):
+    """
+    Quadratic extrapolation of the last three time steps
+    """
+    predictor_id = 'Quadratic'
+    n_steps = 3
+
+
+class AdamsBashforthPredictor(ConstantPredictor):
+    """
+    Second order Adams-Bashforth integration of the time derivatives of the last two time steps.
+
+    The derivatives are taken from the time step: ``dqdt`` for the flexible degrees of freedom of ``q``, ``dqddt``
+    for ``dqdt``, ``for_acc`` for ``for_vel`` and the nodal ``pos_dot``, ``pos_ddot``, ``psi_dot`` and
+    ``psi_ddot``. The structural solver must store them for the prediction to be consistent.
+    """
+    predictor_id = 'AdamsBashforth'
+    n_steps = 2
+
+    # field: (derivative, entries of the field with that derivative)
+    derivatives = {'q': ('dqdt', np.s_[:-10]),
+                   'dqdt': ('dqddt', np.s_[...]),
+                   'for_vel': ('for_acc', np.s_[...]),
+                   'pos': ('pos_dot', np.s_[...]),
+                   'pos_dot': ('pos_ddot', np.s_[...]),
+                   'psi': ('psi_dot', np.s_[...]),
+                   'psi_dot': ('psi_ddot', np.s_[...])}
+
+    def __init__(self, dt=None, **kwargs):
+        if dt is None:
+            raise ValueError('The AdamsBashforth predictor requires the time step dt')
+        super().__init__(dt, **kwargs)
+
+    def stored_fields(self):
+        return self.fields + tuple(derivative for derivative, _ in self.derivatives.values())
+
+    def extrapolate(self, field, coefficients):
+        value = super().extrapolate(field, coefficients)
+        try:
+            derivative, entries = self.derivatives[field]
+        except KeyError:
+            return value
+
+        if len(self.history) == 1:
+            increment = self.dt*self.history[0][derivative]
+        else:
+            increment = self.dt*(1.5*self.history[0][derivative] - 0.5*self.history[1][derivative])
+        value[entries] = self.history[0][field][entries] + increment[entries]
+        return value
+
+
+def binomial(n, k):
+    result = 1
+    for i in range(k):
+        result = result*(n - i)//(i + 1)
+    return result
+
+
+predictors = {ConstantPredictor.predictor_id: ConstantPredictor,
+              LinearPredictor.predictor_id: LinearPredictor,
+              QuadraticPredictor.predictor_id: QuadraticPredictor,
+              AdamsBashforthPredictor.predictor_id: AdamsBashforthPredictor}
+
+
+def predictor_from_string(predictor_id, **kwargs):
+    """
+    Returns an instance of the predictor ``predictor_id`` (``Constant``, ``Linear``, ``Quadratic`` or
+    ``AdamsBashforth``)
+
+    Args:
+        predictor_id (str): Predictor name
+        **kwargs: Parameters of the predictor (e.g. the time step ``dt``)
+    """
+    return predictors[predictor_id](**kwargs)
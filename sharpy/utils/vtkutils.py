@@ -0,0 +1,317 @@
+"""VTK output utilities
+
+Helpers shared by the visualisation post-processors (:class:`~sharpy.postproc.aerogridplot.AerogridPlot` and
+:class:`~sharpy.postproc.beamplot.BeamPlot`):
+
+    * Time invariant connectivities and vectorised reshapes of the ``(3, M+1, N+1)`` grid arrays of the
+      timestep info into VTK point and cell arrays.
+
+    * :class:`Grid`, a light container of an unstructured grid that is converted to a VTK object only when written.
+
+    * :class:`AsyncWriter`, which runs the writes in a background thread fed through a bounded queue.
+
+    * Writers for one file per grid and time step (``vtu``), one multi-block file per time step (``multiblock``) or a
+      single time-series file (``vtkhdf``, see :class:`VTKHDFSeries`).
+"""
+import atexit
+import os
+import queue
+import threading
+
+import h5py
+import numpy as np
+from tvtk.api import tvtk, write_data
+from vtkmodules.vtkCommonDataModel import vtkCompositeDataSet
+
+output_formats = ['vtu', 'multiblock', 'vtkhdf']
+
+cell_types = {'quad': tvtk.Quad().cell_type,
+              'line': tvtk.Line().cell_type}
+
+
+def quad_connectivity(m, n):
+    """
+    Connectivity of the ``m x n`` quadrilateral panels of a grid of ``(m + 1) x (n + 1)`` points, numbered with the
+    chordwise index ``i_m`` running fastest (see :func:`grid_points`). The panels are ordered in the same way.
+
+    Args:
+        m (int): number of chordwise panels
+        n (int): number of spanwise panels
+
+    Returns:
+        np.ndarray: ``(m * n, 4)`` connectivity
+    """
+    i_n, i_m = np.meshgrid(np.arange(n), np.arange(m), indexing='ij')
+    node = (i_n * (m + 1) + i_m).ravel()
+    return np.column_stack((node, node + 1, node + m + 2, node + m + 1))
+
+
+def grid_points(array):
+    """
+    Reshapes the ``(k, M+1, N+1)`` grid array into the ``((M+1) * (N+1), k)`` point array, with the chordwise index
+    running fastest.
+    """
+    return np.array(array.transpose(2, 1, 0).reshape((-1, array.shape[0])))
+
+
+def grid_cells(array):
+    """
+    Reshapes the ``(M, N)`` (or ``(k, M, N)``) panel array into the ``(M * N,)`` (or ``(M * N, k)``) cell array,
+    with the chordwise index running fastest.
+    """
+    if array.ndim == 2:
+        return np.array(array.T.reshape(-1))
+    return grid_points(array)
+
+
+class Grid(object):
+    """
+    Unstructured grid of a single cell type.
+
+    The data arrays are kept as ordered lists of ``(name, array)`` tuples: the first entry of the point and cell
+    data is set as the active scalars of the VTK grid.
+
+    Args:
+        points (np.ndarray): ``(n_points, 3)`` coordinates
+        cells (np.ndarray): ``(n_cells, n_vertices)`` connectivity
+        cell_type (str): ``quad`` or ``line``
+    """
+    def __init__(self, points, cells, cell_type):
+        self.points = points
+        self.cells = cells
+        self.cell_type = cell_type
+        self.point_data = []
+        self.cell_data = []
+
+    def add_point_data(self, name, array):
+        self.point_data.append((name, array))
+
+    def add_cell_data(self, name, array):
+        self.cell_data.append((name, array))
+
+    def to_tvtk(self):
+        """Returns the grid as a ``tvtk.UnstructuredGrid``"""
+        ug = tvtk.UnstructuredGrid(points=self.points)
+        ug.set_cells(cell_types[self.cell_type], self.cells)
+        for data, entries in ((ug.cell_data, self.cell_data), (ug.point_data, self.point_data)):
+            for i_array, (name, array) in enumerate(entries):
+                if i_array == 0:
+                    data.scalars = array
+                    data.scalars.name = name
+                else:
+                    data.add_array(array)
+                    data.get_array(i_array).name = name
+        return ug
+
+
+def merge_grids(grids):
+    """
+    Merges grids with the same cell type and data arrays into a single grid, offsetting the connectivities.
+    """
+    if len(grids) == 1:
+        return grids[0]
+    offsets = np.cumsum([0] + [grid.points.shape[0] for grid in grids[:-1]])
+    merged = Grid(np.concatenate([grid.points for grid in grids]),
+                  np.concatenate([grid.cells + offset for grid, offset in zip(grids, offsets)]),
+                  grids[0].cell_type)
+    for i_array, (name, _) in enumerate(grids[0].point_data):
+        merged.add_point_data(name, np.concatenate([grid.point_data[i_array][1] for grid in grids]))
+    for i_array, (name, _) in enumerate(grids[0].cell_data):
+        merged.add_cell_data(name, np.concatenate([grid.cell_data[i_array][1] for grid in grids]))
+    return merged
+
+
+def write_grid(grid, filename):
+    """Writes the grid to ``filename`` (the extension is chosen by ``tvtk.write_data`` if not given)"""
+    write_data(grid.to_tvtk(), filename)
+
+
+def write_points(points, point_data, filename):
+    """
+    Writes a cloud of points with the list of ``(name, array)`` point data to a poly data file ``filename``
+    """
+    mesh = tvtk.PolyData()
+    mesh.points = points
+    for i_array, (name, array) in enumerate(point_data):
+        mesh.point_data.add_array(array)
+        mesh.point_data.get_array(i_array).name = name
+    write_data(mesh, filename)
+
+
+def write_multiblock(blocks, filename):
+    """
+    Writes the grids in the dictionary ``blocks`` as the named blocks of the multi-block file ``filename.vtm``
+    """
+    multiblock = tvtk.MultiBlockDataSet()
+    multiblock.number_of_blocks = len(blocks)
+    for i_block, (name, grid) in enumerate(blocks.items()):
+        multiblock.set_block(i_block, grid.to_tvtk())
+        tvtk.to_vtk(multiblock).GetMetaData(i_block).Set(vtkCompositeDataSet.NAME(), name)
+    writer = tvtk.XMLMultiBlockDataWriter(file_name=filename + '.vtm')
+    writer.set_input_data(multiblock)
+    writer.write()
+
+
+class VTKHDFSeries(object):
+    """
+    Time series of unstructured grids written incrementally to a single VTKHDF file, readable by ParaView (5.12+).
+
+    The points and data arrays are appended at every call to :meth:`append`, while the connectivity is only written
+    when it changes, the time steps referencing the last one written otherwise.
+
+    Args:
+        filename (str): file name (``.vtkhdf`` is appended if there is no extension)
+    """
+    def __init__(self, filename):
+        if len(os.path.splitext(filename)[1]) == 0:
+            filename += '.vtkhdf'
+        self.filename = filename
+        self.n_steps = 0
+        self.topology = None
+
+        with h5py.File(self.filename, 'w') as f:
+            root = f.create_group('VTKHDF')
+            root.attrs['Version'] = np.array([2, 0], dtype=np.int64)
+            root.attrs.create('Type', np.bytes_('UnstructuredGrid'),
+                              dtype=h5py.string_dtype('ascii', len('UnstructuredGrid')))
+            steps = root.create_group('Steps')
+            steps.attrs['NSteps'] = 0
+            for name in ['NumberOfPoints', 'NumberOfCells', 'NumberOfConnectivityIds',
+                         'Connectivity', 'Offsets']:
+                self._create(root, name, (), np.int64)
+            self._create(root, 'Types', (), np.uint8)
+            self._create(root, 'Points', (3,), np.float64)
+            root.create_group('PointData')
+            root.create_group('CellData')
+            self._create(steps, 'Values', (), np.float64)
+            for name in ['PartOffsets', 'NumberOfParts', 'PointOffsets']:
+                self._create(steps, name, (), np.int64)
+            for name in ['CellOffsets', 'ConnectivityIdOffsets']:
+                self._create(steps, name, (1,), np.int64)
+            steps.create_group('PointDataOffsets')
+            steps.create_group('CellDataOffsets')
+
+    @staticmethod
+    def _create(group, name, shape, dtype):
+        group.create_dataset(name, shape=(0,) + shape, maxshape=(None,) + shape, dtype=dtype, chunks=True)
+
+    @staticmethod
+    def _append(dataset, values):
+        values = np.asarray(values)
+        n = dataset.shape[0]
+        dataset.resize(n + values.shape[0], axis=0)
+        dataset[n:] = values
+        return n
+
+    def append(self, time, grid):
+        """
+        Appends the grid as a new time step.
+
+        Args:
+            time (float): time value of the step
+            grid (Grid): grid at the time step
+        """
+        with h5py.File(self.filename, 'a') as f:
+            root = f['VTKHDF']
+            steps = root['Steps']
+
+            topology = (grid.cell_type, grid.cells.shape, grid.points.shape[0])
+            if self.topology is None or topology != self.topology[0] or \
+                    not np.array_equal(grid.cells, self.topology[1]):
+                n_cells, n_vertices = grid.cells.shape
+                part = self._append(root['NumberOfPoints'], [grid.points.shape[0]])
+                self._append(root['NumberOfCells'], [n_cells])
+                self._append(root['NumberOfConnectivityIds'], [grid.cells.size])
+                cell_offset = self._append(root['Types'], np.full((n_cells,), cell_types[grid.cell_type], dtype=np.uint8))
+                self._append(root['Offsets'], np.arange(n_cells + 1) * n_vertices)
+                connectivity_offset = self._append(root['Connectivity'], grid.cells.ravel())
+                self.topology = (topology, np.array(grid.cells), part, cell_offset, connectivity_offset)
+            _, _, part, cell_offset, connectivity_offset = self.topology
+
+            self._append(steps['Values'], [time])
+            self._append(steps['PartOffsets'], [part])
+            self._append(steps['NumberOfParts'], [1])
+            self._append(steps['PointOffsets'], [self._append(root['Points'], grid.points)])
+            self._append(steps['CellOffsets'], [[cell_offset]])
+            self._append(steps['ConnectivityIdOffsets'], [[connectivity_offset]])
+
+            for data_name, entries in (('PointData', grid.point_data), ('CellData', grid.cell_data)):
+                for name, array in entries:
+                    array = np.asarray(array)
+                    if name not in root[data_name]:
+                        self._create(root[data_name], name, array.shape[1:], array.dtype)
+                        self._create(steps[data_name + 'Offsets'], name, (), np.int64)
+                    self._append(steps[data_name + 'Offsets'][name], [self._append(root[data_name][name], array)])
+
+            self.n_steps += 1
+            steps.attrs['NSteps'] = self.n_steps
+
+
+class AsyncWriter(object):
+    """
+    Runs write functions in a background thread.
+
+    The write requests are placed in a queue of at most ``max_queue`` elements, so the caller blocks if the writer
+    falls behind instead of accumulating data in memory. An exception raised in the writer thread stops the writes:
+    the writes queued after it are discarded and the exception is raised again in the caller at every following
+    :meth:`submit`, :meth:`flush` and :meth:`close`. Pending writes are completed at exit.
+
+    Args:
+        asynchronous (bool): if ``False``, the write functions are run by the caller
+        max_queue (int): maximum number of pending writes
+    """
+    def __init__(self, asynchronous=True, max_queue=4):
+        self.asynchronous = asynchronous
+        self.queue = queue.Queue(maxsize=max(max_queue, 1))
+        self.thread = None
+        self.error = None
+
+    def _worker(self):
+        while True:
+            task = self.queue.get()
+            try:
+                if task is None:
+                    return
+                if self.error is None:
+                    function, args, kwargs = task
+                    function(*args, **kwargs)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Queues ``function(*args, **kwargs)``. The arguments must not be modified by the caller afterwards.
+
+        Raises:
+            Exception: the exception raised by a previous write, which is not queued
+        """
+        if not self.asynchronous:
+            function(*args, **kwargs)
+            return
+        self._check()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._worker, daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+        self.queue.put((function, args, kwargs))
+
+    def flush(self):
+        """Waits for the pending writes to finish"""
+        if self.thread is not None:
+            self.queue.join()
+        self._check()
+
+    def close(self):
+        """Completes the pending writes and stops the writer thread"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+            atexit.unregister(self.close)
+        self._check()
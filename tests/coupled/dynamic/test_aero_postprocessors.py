@@ -0,0 +1,87 @@
+import copy
+import unittest
+
+import numpy as np
+
+
+class TestAeroPostprocessors(unittest.TestCase):
+    """
+    Vectorised AeroForcesCalculator, LiftDistribution and StallCheck against their loop versions on the stored
+    response of the flexible Goland wing to a 1-cos gust
+    """
+
+    n_tstep = 15
+
+    @classmethod
+    def setUpClass(cls):
+        from tests.goland_gust import goland_gust_response
+
+        cls.ws, cls.data = goland_gust_response(cls, 'goland_postproc', cls.n_tstep, alpha=4.,
+                                                include_unsteady_force_contribution='on')
+        cls.route = cls.ws.route
+
+    def test_aero_forces_calculator(self):
+        import sharpy.postproc.aeroforcescalculator as aeroforcescalculator
+
+        results = []
+        for method in ['calculate_forces_loop', 'calculate_forces']:
+            data = copy.deepcopy(self.data)
+            data.settings['AeroForcesCalculator'] = {'write_text_file': 'on',
+                                                     'text_file_name': method + '.txt',
+                                                     'folder': self.route + '/output/',
+                                                     'screen_output': 'off'}
+            postproc = aeroforcescalculator.AeroForcesCalculator()
+            postproc.initialise(data)
+            postproc.calculate_forces = getattr(postproc, method)
+            postproc.run()
+            with open(postproc.folder, 'r') as output_file:
+                results.append((data, output_file.read()))
+
+        (data_loop, file_loop), (data_vec, file_vec) = results
+        self.assertEqual(file_loop, file_vec)
+        for tstep_loop, tstep_vec in zip(data_loop.aero.timestep_info, data_vec.aero.timestep_info):
+            for name in ['inertial_steady_forces', 'inertial_unsteady_forces',
+                         'body_steady_forces', 'body_unsteady_forces']:
+                np.testing.assert_allclose(getattr(tstep_vec, name), getattr(tstep_loop, name),
+                                           rtol=1e-12, atol=1e-9, err_msg=name)
+        self.assertGreater(np.max(np.abs(data_vec.aero.timestep_info[-1].inertial_steady_forces)), 0.)
+
+    def test_lift_distribution(self):
+        import sharpy.postproc.liftdistribution as liftdistribution
+
+        postproc = liftdistribution.LiftDistribution()
+        postproc.initialise(self.data, {'normalise': True})
+        for postproc.ts in range(postproc.ts_max):
+            tstep = self.data.aero.timestep_info[postproc.ts]
+            postproc.lift_distribution_loop()
+            lift_loop = copy.deepcopy(tstep.postproc_cell['lift_distribution'])
+            postproc.lift_distribution()
+            for i_surf in range(tstep.n_surf):
+                self.assertEqual(tstep.postproc_cell['lift_distribution'][i_surf].shape,
+                                 (tstep.dimensions[i_surf, 1] + 1,))
+                np.testing.assert_allclose(tstep.postproc_cell['lift_distribution'][i_surf], lift_loop[i_surf],
+                                           rtol=1e-12, atol=1e-12)
+
+    def test_stall_check(self):
+        import sharpy.postproc.stallcheck as stallcheck
+
+        airfoils = np.unique(self.data.aero.aero_dict['airfoil_distribution'])
+        n_stalled = 0
+        for lower, upper in [(-0.2, 0.2), (0.02, 0.05), (-0.1, 0.)]:
+            postproc = stallcheck.StallCheck()
+            postproc.initialise(self.data, {'print_info': False,
+                                            'airfoil_stall_angles': {str(airfoil): [lower, upper]
+                                                                     for airfoil in airfoils}})
+            for postproc.ts in range(postproc.ts_max):
+                postproc.check_stall()
+                tstep = self.data.aero.timestep_info[postproc.ts]
+                stalled_panels, stalled_surfs = postproc.stalled_panels(tstep)
+                stalled_panels_loop, stalled_surfs_loop = postproc.stalled_panels_loop(tstep)
+                self.assertEqual(stalled_panels, stalled_panels_loop)
+                np.testing.assert_array_equal(stalled_surfs, stalled_surfs_loop)
+                n_stalled += np.sum(stalled_surfs)
+        self.assertGreater(n_stalled, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import numpy as np
+import scipy.sparse.linalg as splinalg
+
+from tests.coupled.multibody.double_pendulum.test_double_pendulum_geradin import TestDoublePendulum
+
+
+class TestMultibodySparseSolve(unittest.TestCase):
+    """
+    The sparse LU solve of NonLinearDynamicMultibody, with the column ordering reused between factorisations, against
+    the dense solve of the same systems of the Geradin double pendulum
+    """
+
+    route = os.path.abspath(os.path.dirname(os.path.realpath(__file__))) + '/'
+
+    def setUp(self):
+        TestDoublePendulum.setUp(self)
+
+    def tearDown(self):
+        for extension in ['.aero.h5', '.dyn.h5', '.fem.h5', '.mb.h5', '.solver.txt']:
+            try:
+                os.remove(self.route + 'double_pendulum_geradin' + extension)
+            except FileNotFoundError:
+                pass
+        shutil.rmtree(self.route + 'output/', ignore_errors=True)
+
+    def test_sparse_solve(self):
+        import sharpy.sharpy_main
+        from sharpy.solvers.nonlineardynamicmultibody import NonLinearDynamicMultibody
+
+        solve_sparse = NonLinearDynamicMultibody.solve_sparse
+        systems = []
+
+        def checked_solve_sparse(solver, MB_Asys, rhs):
+            reused_ordering = solver.perm_c is not None
+            sol = solve_sparse(solver, MB_Asys, rhs)
+            systems.append((reused_ordering, MB_Asys.copy(), rhs.copy(), sol.copy(), solver.perm_c.copy()))
+            return sol
+
+        with mock.patch.object(NonLinearDynamicMultibody, 'solve_sparse', checked_solve_sparse):
+            sharpy.sharpy_main.main(['', self.route + 'double_pendulum_geradin.solver.txt'])
+
+        self.assertTrue(any(reused for reused, *_ in systems))
+        for reused_ordering, MB_Asys, rhs, sol, perm_c in systems:
+            dense_sol = np.linalg.solve(MB_Asys.toarray(), rhs)
+            np.testing.assert_allclose(sol, dense_sol, rtol=1e-8, atol=1e-10*np.max(np.abs(dense_sol)))
+
+            if reused_ordering:
+                # the reused ordering gives the fill of a new COLAMD factorisation of the same sparsity pattern
+                lu_reused = splinalg.splu(MB_Asys[:, perm_c], permc_spec='NATURAL')
+                lu_colamd = splinalg.splu(MB_Asys, permc_spec='COLAMD')
+                self.assertLessEqual(lu_reused.L.nnz + lu_reused.U.nnz,
+                                     1.05*(lu_colamd.L.nnz + lu_colamd.U.nnz))
+
+
+if __name__ == '__main__':
+    unittest.main()
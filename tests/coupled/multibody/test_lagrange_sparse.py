@@ -0,0 +1,145 @@
+import ctypes as ct
+import types
+import unittest
+
+import numpy as np
+
+import sharpy.structure.utils.lagrangeconstraints as lagrangeconstraints
+import sharpy.utils.algebra as algebra
+
+
+def generate_system(FoR_movement):
+    """
+    Multibody system with the attributes of ``Beam`` and ``StructTimeStepInfo`` read by the constraints: two
+    bodies of two 3-noded elements clamped at their first node, in a random state
+    """
+    MB_beam = []
+    MB_tstep = []
+    for movement in FoR_movement:
+        num_node = 5
+        beam = types.SimpleNamespace(
+            num_dof=ct.c_int(6*(num_node - 1)),
+            FoR_movement=movement,
+            vdof=np.array([-1, 0, 1, 2, 3]),
+            node_master_elem=np.array([[0, 0], [0, 2], [0, 1], [1, 2], [1, 1]]),
+            ini_info=types.SimpleNamespace(pos=np.random.rand(num_node, 3),
+                                           quat=algebra.euler2quat(np.random.rand(3)),
+                                           for_pos=np.random.rand(6)))
+        tstep = types.SimpleNamespace(quat=algebra.euler2quat(np.random.rand(3)),
+                                      pos=np.random.rand(num_node, 3),
+                                      pos_dot=np.random.rand(num_node, 3),
+                                      psi=np.random.rand(2, 3, 3),
+                                      psi_dot=np.random.rand(2, 3, 3),
+                                      for_pos=np.random.rand(6),
+                                      for_vel=np.random.rand(6))
+        MB_beam.append(beam)
+        MB_tstep.append(tstep)
+
+    sys_size = sum([beam.num_dof.value + (10 if beam.FoR_movement == 'free' else 0) for beam in MB_beam])
+    return MB_beam, MB_tstep, sys_size
+
+
+def constraint_entries():
+    """Constraint definitions (as in the ``.mb.h5`` file) of every registered constraint"""
+    rot_axis = algebra.unit_vector(np.random.rand(3))
+    return {'SampleLagrange': {},
+            'free': {},
+            'hinge_node_FoR': {'node_in_body': 4, 'body': 0, 'body_FoR': 1, 'rot_axisB': rot_axis},
+            'hinge_node_FoR_constant_vel': {'node_in_body': 4, 'body': 0, 'body_FoR': 1, 'rot_axisB': rot_axis,
+                                            'rot_vel': 0.3},
+            'spherical_node_FoR': {'node_in_body': 4, 'body': 0, 'body_FoR': 1},
+            'spherical_FoR': {'body_FoR': 0},
+            'hinge_FoR': {'body_FoR': 0, 'rot_axis_AFoR': rot_axis},
+            'hinge_FoR_wrtG': {'body_FoR': 0, 'rot_axis_AFoR': rot_axis},
+            'fully_constrained_node_FoR': {'node_in_body': 4, 'body': 0, 'body_FoR': 1},
+            'constant_rot_vel_FoR': {'FoR_body': 1, 'rot_vel': np.random.rand(3)},
+            'constant_vel_FoR': {'FoR_body': 1, 'vel': np.random.rand(6)},
+            'lin_vel_node_wrtA': {'body_number': 1, 'node_number': 2, 'velocity': np.random.rand(3)},
+            'lin_vel_node_wrtG': {'body_number': 1, 'node_number': 2, 'velocity': np.random.rand(3)}}
+
+
+class TestSparseLagrangeMatrix(unittest.TestCase):
+    """
+    The sparse contributions of the constraints rebuilt as dense matrices are equal to the output of
+    ``generate_lagrange_matrix``
+    """
+
+    def generate_constraint(self, lc_id, entry):
+        lc = lagrangeconstraints.lc_from_string(lc_id)()
+        lc.initialise(entry, 0)
+        return lc
+
+    def assert_equal_matrices(self, lc_id, lc, lc_sparse, MB_beam, MB_tstep, sys_size, Lambda, Lambda_dot, mode):
+        num_LM_eq = lc._n_eq
+        args = (MB_beam, MB_tstep, 2, num_LM_eq, sys_size, 0.1, Lambda, Lambda_dot, mode)
+        try:
+            LM_C, LM_K, LM_Q = lagrangeconstraints.generate_lagrange_matrix([lc], *args)
+        except ValueError:
+            # equations that cannot be assembled (e.g. lin_vel_node_wrtG in static problems) fail in the same way
+            with self.assertRaises(ValueError):
+                lagrangeconstraints.generate_lagrange_matrix_sparse([lc_sparse], *args)
+            return None, None
+        sparse_C, sparse_K, sparse_Q = lagrangeconstraints.generate_lagrange_matrix_sparse([lc_sparse], *args)
+
+        msg = '%s (%s)' % (lc_id, mode)
+        np.testing.assert_allclose(sparse_C.toarray(), LM_C, rtol=1e-14, atol=1e-15, err_msg=msg)
+        np.testing.assert_allclose(sparse_K.toarray(), LM_K, rtol=1e-14, atol=1e-15, err_msg=msg)
+        np.testing.assert_array_equal(sparse_Q, LM_Q, err_msg=msg)
+        return sparse_C, sparse_K
+
+    def test_registered_constraints(self):
+        np.random.seed(43)
+        entries = constraint_entries()
+        for lc_id in lagrangeconstraints.dict_of_lc.keys():
+            self.assertIn(lc_id, entries, msg='Constraint %s not tested' % lc_id)
+
+            for FoR_movement in [('free', 'free'), ('prescribed', 'free')]:
+                MB_beam, MB_tstep, sys_size = generate_system(FoR_movement)
+                for mode in ['static', 'dynamic']:
+                    lc = self.generate_constraint(lc_id, entries[lc_id])
+                    lc_sparse = self.generate_constraint(lc_id, entries[lc_id])
+                    num_LM_eq = lc._n_eq
+
+                    # the first call with zero multipliers builds the pattern without the blocks that depend on them
+                    for Lambda_dot in [np.zeros((num_LM_eq,)), np.random.rand(num_LM_eq)]:
+                        Lambda = np.random.rand(num_LM_eq)
+                        sparse_C, sparse_K = self.assert_equal_matrices(lc_id, lc, lc_sparse, MB_beam, MB_tstep,
+                                                                        sys_size, Lambda, Lambda_dot, mode)
+
+                    if sparse_C is None:
+                        continue
+
+                    # the pattern is kept in the following iterations
+                    rows = sparse_C.row.copy()
+                    for i_iter in range(2):
+                        MB_tstep[0].quat = algebra.euler2quat(np.random.rand(3))
+                        sparse_C, sparse_K = self.assert_equal_matrices(lc_id, lc, lc_sparse, MB_beam, MB_tstep,
+                                                                        sys_size, np.random.rand(num_LM_eq),
+                                                                        np.random.rand(num_LM_eq), mode)
+                        np.testing.assert_array_equal(sparse_C.row, rows)
+
+    def test_constraint_list(self):
+        np.random.seed(44)
+        entries = constraint_entries()
+        MB_beam, MB_tstep, sys_size = generate_system(('free', 'free'))
+        lc_ids = ['hinge_node_FoR', 'lin_vel_node_wrtG', 'constant_rot_vel_FoR']
+        lc_list = []
+        lc_list_sparse = []
+        ieq = 0
+        for lc_id in lc_ids:
+            for constraints in [lc_list, lc_list_sparse]:
+                constraints.append(lagrangeconstraints.lc_from_string(lc_id)())
+                constraints[-1].initialise(entries[lc_id], ieq)
+            ieq += lc_list[-1]._n_eq
+
+        args = (MB_beam, MB_tstep, 1, ieq, sys_size, 0.1, np.random.rand(ieq), np.random.rand(ieq), 'dynamic')
+        LM_C, LM_K, LM_Q = lagrangeconstraints.generate_lagrange_matrix(lc_list, *args)
+        sparse_C, sparse_K, sparse_Q = lagrangeconstraints.generate_lagrange_matrix_sparse(lc_list_sparse, *args)
+        np.testing.assert_allclose(sparse_C.toarray(), LM_C, rtol=1e-14, atol=1e-15)
+        np.testing.assert_allclose(sparse_K.toarray(), LM_K, rtol=1e-14, atol=1e-15)
+        np.testing.assert_allclose(sparse_Q, LM_Q, rtol=1e-14, atol=1e-15)
+        self.assertLess(sparse_C.nnz, 0.1*(sys_size + ieq)**2)
+
+
+if __name__ == '__main__':
+    unittest.main()
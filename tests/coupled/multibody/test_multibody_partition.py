@@ -0,0 +1,200 @@
+import ctypes as ct
+import unittest
+
+import numpy as np
+
+
+def generate_multibody_beam():
+    """
+    Three bodies in the configuration of a take-off case: a free fuselage along ``x`` and two wings along ``y``
+    with their own FoR, lumped masses on the fuselage and on the right wing and a random deformed state
+    """
+    import sharpy.structure.models.beam as beam
+    import sharpy.utils.algebra as algebra
+
+    np.random.seed(41)
+    num_node_elem = 3
+    num_elem_body = [4, 3, 3]
+    num_elem = sum(num_elem_body)
+    num_node = sum([2*n + 1 for n in num_elem_body])
+
+    coordinates = np.zeros((num_node, 3))
+    connectivities = np.zeros((num_elem, num_node_elem), dtype=int)
+    frame_of_reference_delta = np.zeros((num_elem, num_node_elem, 3))
+    body_number = np.zeros((num_elem,), dtype=int)
+    boundary_conditions = np.zeros((num_node,), dtype=int)
+
+    directions = [np.array([1., 0., 0.]), np.array([0., 1., 0.]), np.array([0., -1., 0.])]
+    for_delta = [np.array([0., 1., 0.]), np.array([-1., 0., 0.]), np.array([1., 0., 0.])]
+    first_node = 0
+    first_elem = 0
+    for ibody, num_elem_ibody in enumerate(num_elem_body):
+        num_node_ibody = 2*num_elem_ibody + 1
+        nodes = first_node + np.arange(num_node_ibody)
+        coordinates[nodes, :] = np.outer(np.linspace(0., 2.*num_elem_ibody, num_node_ibody), directions[ibody])
+        for ielem in range(num_elem_ibody):
+            connectivities[first_elem + ielem, :] = first_node + 2*ielem + np.array([0, 2, 1])
+        frame_of_reference_delta[first_elem:first_elem + num_elem_ibody, :, :] = for_delta[ibody]
+        body_number[first_elem:first_elem + num_elem_ibody] = ibody
+        boundary_conditions[first_node] = 1
+        boundary_conditions[first_node + num_node_ibody - 1] = -1
+        first_node += num_node_ibody
+        first_elem += num_elem_ibody
+
+    stiffness_db = np.zeros((2, 6, 6))
+    mass_db = np.zeros((2, 6, 6))
+    for i in range(2):
+        stiffness_db[i, :, :] = np.diag([1e7, 1e7, 1e7, 1e3, 1e4, 1e4])*(i + 1)
+        mass_db[i, :, :] = np.diag([1., 1., 1., 1e-3, 1e-4, 1e-4])*(i + 1)
+
+    in_data = {'num_node_elem': np.int64(num_node_elem),
+               'num_node': num_node,
+               'num_elem': num_elem,
+               'body_number': body_number,
+               'boundary_conditions': boundary_conditions,
+               'coordinates': coordinates,
+               'connectivities': connectivities,
+               'elem_stiffness': np.arange(num_elem) % 2,
+               'stiffness_db': stiffness_db,
+               'elem_mass': (np.arange(num_elem) + 1) % 2,
+               'mass_db': mass_db,
+               'frame_of_reference_delta': frame_of_reference_delta,
+               'structural_twist': np.random.rand(num_elem, num_node_elem)*0.1,
+               'beam_number': body_number.copy(),
+               'app_forces': np.random.rand(num_node, 6),
+               'lumped_mass': np.array([10., 2., 3.]),
+               'lumped_mass_nodes': np.array([4, 14, 12]),
+               'lumped_mass_inertia': np.random.rand(3, 3, 3),
+               'lumped_mass_position': np.random.rand(3, 3)}
+
+    structure = beam.Beam()
+    structure.ini_mb_dict = dict()
+    for ibody in range(len(num_elem_body)):
+        quat = algebra.euler2quat(np.random.rand(3)*0.5)
+        structure.ini_mb_dict['body_%02d' % ibody] = {
+            'FoR_position': np.random.rand(6),
+            'FoR_velocity': np.random.rand(6),
+            'FoR_acceleration': np.random.rand(6),
+            'quat': quat,
+            'FoR_movement': 'free' if ibody == 0 else 'prescribed'}
+    structure.generate(in_data, {'orientation': algebra.euler2quat(np.array([0., 0.05, 0.])),
+                                 'unsteady': False})
+
+    tstep = structure.timestep_info[-1]
+    for name in ['pos', 'pos_dot', 'psi_dot', 'q', 'dqdt', 'dqddt', 'gravity_forces', 'steady_applied_forces',
+                 'unsteady_applied_forces', 'forces_constraints_nodes', 'forces_constraints_FoR',
+                 'mb_FoR_pos', 'mb_FoR_vel', 'mb_FoR_acc', 'mb_dqddt_quat']:
+        getattr(tstep, name)[:] += np.random.rand(*getattr(tstep, name).shape)
+    tstep.psi[:] += 0.1*np.random.rand(*tstep.psi.shape)
+    for ibody in range(structure.num_bodies):
+        tstep.mb_quat[ibody, :] = algebra.euler2quat(np.random.rand(3))
+
+    return structure
+
+
+class TestMultibodyPartition(unittest.TestCase):
+    """
+    The split and merge of a multibody system with a persistent :class:`MultibodyPartition` are identical (bit for
+    bit) to those extracting the bodies with ``Beam.get_body`` in every call
+    """
+
+    beam_attributes = ['num_node', 'num_elem', 'connectivities', 'elem_stiffness', 'stiffness_db',
+                       'inv_stiffness_db', 'elem_mass', 'mass_db', 'frame_of_reference_delta', 'structural_twist',
+                       'boundary_conditions', 'beam_number', 'lumped_mass', 'lumped_mass_nodes',
+                       'lumped_mass_inertia', 'lumped_mass_position', 'n_lumped_mass', 'steady_app_forces',
+                       'body_number', 'master', 'node_master_elem', 'vdof', 'fdof', 'global_elems_num',
+                       'global_nodes_num', 'FoR_movement']
+
+    tstep_attributes = ['pos', 'pos_dot', 'psi', 'psi_dot', 'quat', 'for_pos', 'for_vel', 'for_acc', 'q', 'dqdt',
+                        'dqddt', 'gravity_forces', 'steady_applied_forces', 'unsteady_applied_forces',
+                        'forces_constraints_nodes', 'forces_constraints_FoR', 'mb_FoR_pos', 'mb_FoR_vel',
+                        'mb_FoR_acc', 'mb_quat', 'mb_dqddt_quat', 'gravity_vector_body', 'total_gravity_forces']
+
+    def assert_identical(self, value, reference, name):
+        if isinstance(reference, ct.c_int):
+            value, reference = value.value, reference.value
+        if reference is None:
+            self.assertIsNone(value, msg=name)
+            return
+        np.testing.assert_array_equal(np.asarray(value), np.asarray(reference), err_msg=name)
+
+    def assert_tstep_identical(self, tstep, reference, name):
+        for attribute in self.tstep_attributes:
+            self.assert_identical(getattr(tstep, attribute), getattr(reference, attribute),
+                                  name + '.' + attribute)
+
+    def assert_split_identical(self, MB_beam, MB_tstep, ref_MB_beam, ref_MB_tstep):
+        self.assertEqual(len(MB_beam), len(ref_MB_beam))
+        for ibody in range(len(ref_MB_beam)):
+            body = MB_beam[ibody]
+            reference = ref_MB_beam[ibody]
+            for attribute in self.beam_attributes:
+                self.assert_identical(getattr(body, attribute), getattr(reference, attribute),
+                                      'body %u: %s' % (ibody, attribute))
+            self.assert_identical(body.num_dof, reference.num_dof, 'body %u: num_dof' % ibody)
+            for key, value in reference.fortran.items():
+                self.assert_identical(body.fortran[key], value, 'body %u: fortran[%s]' % (ibody, key))
+            for ielem in range(reference.num_elem):
+                self.assert_identical(body.elements[ielem].coordinates_def,
+                                      reference.elements[ielem].coordinates_def,
+                                      'body %u: element %u' % (ibody, ielem))
+            self.assert_tstep_identical(body.ini_info, reference.ini_info, 'body %u: ini_info' % ibody)
+            self.assert_tstep_identical(body.timestep_info, reference.timestep_info,
+                                        'body %u: timestep_info' % ibody)
+            self.assert_tstep_identical(MB_tstep[ibody], ref_MB_tstep[ibody], 'body %u: tstep' % ibody)
+
+    def test_partition(self):
+        import sharpy.utils.multibody as mb
+
+        structure = generate_multibody_beam()
+        partition = mb.MultibodyPartition(structure)
+
+        self.assertEqual(partition.num_bodies, 3)
+        for ibody in range(structure.num_bodies):
+            np.testing.assert_array_equal(structure.body_number[partition.elems[ibody]], ibody)
+            np.testing.assert_array_equal(partition.nodes[ibody][partition.connectivities[ibody]],
+                                          structure.connectivities[partition.elems[ibody], :])
+        self.assertEqual([len(i) for i in partition.lumped_masses], [1, 2, 0])
+
+    def test_split_merge(self):
+        import sharpy.utils.algebra as algebra
+        import sharpy.utils.multibody as mb
+
+        structure = generate_multibody_beam()
+        mb_dict = structure.ini_mb_dict
+        partition = mb.MultibodyPartition(structure)
+
+        for ts in [1, 2]:
+            if ts == 2:
+                # a new time step changes the state of the system but not the (cached) bodies
+                structure.timestep_info.append(structure.timestep_info[-1].copy())
+                structure.timestep_info[-1].pos[:] += np.random.rand(*structure.timestep_info[-1].pos.shape)
+                structure.timestep_info[-1].mb_quat[1, :] = algebra.euler2quat(np.random.rand(3))
+            tstep = structure.timestep_info[-1].copy()
+            ref_tstep = tstep.copy()
+
+            MB_beam, MB_tstep = mb.split_multibody(structure, tstep, mb_dict, ts, partition=partition)
+            ref_MB_beam, ref_MB_tstep = mb.split_multibody(structure, ref_tstep, mb_dict, ts)
+            self.assert_split_identical(MB_beam, MB_tstep, ref_MB_beam, ref_MB_tstep)
+
+            for ibody in range(structure.num_bodies):
+                for attribute in ['pos', 'pos_dot', 'psi', 'psi_dot', 'q', 'dqdt', 'dqddt', 'gravity_forces',
+                                  'forces_constraints_nodes', 'forces_constraints_FoR']:
+                    change = np.random.rand(*getattr(MB_tstep[ibody], attribute).shape)
+                    getattr(MB_tstep[ibody], attribute)[:] += change
+                    getattr(ref_MB_tstep[ibody], attribute)[:] += change
+
+            mb.merge_multibody(MB_tstep, MB_beam, structure, tstep, mb_dict, 0.1, partition=partition)
+            mb.merge_multibody(ref_MB_tstep, ref_MB_beam, structure, ref_tstep, mb_dict, 0.1)
+            self.assert_tstep_identical(tstep, ref_tstep, 'merged')
+
+        # the structural information of the bodies is generated only once
+        MB_beam_next, _ = mb.split_multibody(structure, structure.timestep_info[-1].copy(), mb_dict, 3,
+                                             partition=partition)
+        for ibody in range(structure.num_bodies):
+            self.assertIs(MB_beam_next[ibody], MB_beam[ibody])
+            self.assertIs(MB_beam_next[ibody].stiffness_db, structure.stiffness_db)
+
+
+if __name__ == '__main__':
+    unittest.main()
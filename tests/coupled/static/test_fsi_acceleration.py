@@ -0,0 +1,46 @@
+import copy
+import importlib
+import os
+import unittest
+
+import numpy as np
+
+
+class TestFSIAcceleration(unittest.TestCase):
+    """
+    The static coupled solution of the Smith wing with Aitken relaxation and IQN-ILS is the same as with constant
+    relaxation
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        case = 'smith_nog_2deg'
+        importlib.import_module('tests.coupled.static.' + case + '.generate_' + case)
+
+    def run_case(self, accelerator, relaxation_factor):
+        import sharpy.sharpy_main
+        import sharpy.utils.input_arg as input_arg
+
+        solver_path = os.path.abspath(os.path.dirname(os.path.realpath(__file__)) +
+                                      '/smith_nog_2deg/smith_nog_2deg.solver.txt')
+        settings = copy.deepcopy(input_arg.parse_settings(solver_path))
+        settings['SHARPy']['flow'] = ['BeamLoader', 'AerogridLoader', 'StaticCoupled']
+        settings['SHARPy']['write_screen'] = 'off'
+        settings['StaticCoupled']['print_info'] = 'off'
+        settings['StaticCoupled']['fsi_accelerator'] = accelerator
+        settings['StaticCoupled']['relaxation_factor'] = relaxation_factor
+        settings['StaticCoupled']['tolerance'] = 1e-8
+        settings['StaticCoupled']['max_iter'] = 200
+        data = sharpy.sharpy_main.main(sharpy_input_dict=settings)
+        return data.structure.timestep_info[-1].pos.copy()
+
+    def test_converged_state(self):
+        reference = self.run_case('Constant', 0.3)
+        for accelerator in ['Aitken', 'IQN-ILS']:
+            pos = self.run_case(accelerator, 0.3)
+            np.testing.assert_allclose(pos, reference, rtol=1e-5, atol=1e-5*np.max(np.abs(reference)),
+                                       err_msg=accelerator)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import ctypes as ct
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+import scipy.optimize
+
+import sharpy.solvers.trim as trim
+import sharpy.utils.algebra as algebra
+
+
+class AnalyticCoupledSolver(object):
+    """
+    Replaces the coupled solver of the trim routine with analytic resultants of the orientation and thrust. The
+    converged structural state depends on the trim vector only and the state every solution starts from is recorded.
+    """
+    def __init__(self):
+        self.data = None
+        self.weights = np.random.default_rng(26).standard_normal((6, 7))
+        self.initial_pos = []
+
+    def initialise(self, data, custom_settings=None):
+        self.data = data
+
+    def run(self):
+        tstep = self.data.structure.timestep_info[self.data.ts]
+        self.initial_pos.append(tstep.pos.copy())
+        tstep.pos[:, 2] = np.dot(self.inputs(), np.arange(7.))*np.linspace(0., 1., tstep.num_node)
+
+    def inputs(self):
+        tstep = self.data.structure.timestep_info[self.data.ts]
+        return np.concatenate((tstep.quat, self.data.structure.ini_info.steady_applied_forces[0, 0:3]))
+
+    def extract_resultants(self):
+        totals = np.tanh(self.weights.dot(self.inputs()))
+        return totals[0:3], totals[3:6]
+
+
+class TestTrim(unittest.TestCase):
+
+    num_node = 5
+
+    def trim_solver(self, **trim_settings):
+        from sharpy.utils.datastructures import StructTimeStepInfo
+
+        ini_info = StructTimeStepInfo(self.num_node, 2, num_dof=ct.c_int(6*(self.num_node - 1)))
+        ini_info.quat[:] = algebra.euler2quat(np.zeros(3))
+        data = types.SimpleNamespace(ts=0,
+                                     settings={'Trim': dict(print_info=False, **trim_settings)},
+                                     structure=types.SimpleNamespace(ini_info=ini_info,
+                                                                     timestep_info=[ini_info.copy()]),
+                                     aero=types.SimpleNamespace(timestep_info=[None], aero_dict=dict()))
+        solver = trim.Trim()
+        with mock.patch.object(trim.solver_interface, 'initialise_solver', return_value=AnalyticCoupledSolver()):
+            solver.initialise(data)
+        return solver
+
+    def test_parallel_gradient(self):
+        x = np.array([2.*np.pi/180, -1.*np.pi/180, 0.5*np.pi/180, 0.8])
+
+        serial = self.trim_solver(cache_evaluations=False)
+        args = (serial.x_info, serial, -2)
+        grad_serial = scipy.optimize.approx_fprime(x, trim.solver_wrapper, serial.settings['fd_step'].value, *args)
+
+        for fork in [True, False]:
+            with self.subTest(fork=fork):
+                solver = self.trim_solver(num_cores=2)
+                with mock.patch.object(trim, 'fork_available', return_value=fork):
+                    grad = solver.gradient(x, solver.x_info, solver, -2)
+                np.testing.assert_allclose(grad, grad_serial, rtol=1e-10, atol=1e-12)
+
+                # the perturbed points are counted apart from the solutions requested by the optimiser
+                self.assertEqual(solver.cache.n_solves, 1)
+                self.assertEqual(solver.cache.n_fd_solves, len(x))
+                self.assertEqual(len(solver.solver.initial_pos), 1 if fork else len(x) + 1)
+
+                # the perturbed points are answered from the cache
+                for i_var in range(len(x)):
+                    x_pert = x.copy()
+                    x_pert[i_var] += solver.settings['fd_step'].value
+                    trim.solver_wrapper(x_pert, solver.x_info, solver, -2)
+                self.assertEqual(solver.cache.n_hits, len(x))
+
+    def test_warm_start(self):
+        x0 = np.array([1., 0., 0., 1.])
+        x1 = np.array([3., 0., 0., 1.])
+        x2 = np.array([1.2, 0., 0., 1.])
+        x3 = np.array([2.9, 0., 0., 1.])
+
+        solver = self.trim_solver()
+        for x in [x0, x1]:
+            trim.solver_wrapper(x, solver.x_info, solver, -2)
+        # no state is stored without warm start and every solution starts from ini_info
+        self.assertEqual(len(solver.cache.states), 0)
+        for initial_pos in solver.solver.initial_pos:
+            np.testing.assert_array_equal(initial_pos, solver.data.structure.ini_info.pos)
+
+        solver = self.trim_solver(warm_start=True)
+        converged_pos = []
+        for x in [x0, x1, x2, x3]:
+            trim.solver_wrapper(x, solver.x_info, solver, -2)
+            converged_pos.append(solver.data.structure.timestep_info[0].pos.copy())
+        np.testing.assert_array_equal(solver.solver.initial_pos[0], solver.data.structure.ini_info.pos)
+        # every solution starts from the state converged for the closest trim vector evaluated before
+        np.testing.assert_array_equal(solver.solver.initial_pos[1], converged_pos[0])
+        np.testing.assert_array_equal(solver.solver.initial_pos[2], converged_pos[0])
+        np.testing.assert_array_equal(solver.solver.initial_pos[3], converged_pos[1])
+
+        # finite difference solutions are not stored as starting points
+        with mock.patch.object(trim, 'fork_available', return_value=False):
+            solver.gradient(x0, solver.x_info, solver, -2)
+        self.assertEqual(len(solver.cache.states), 4)
+
+        # the oldest states are dropped
+        solver = self.trim_solver(warm_start=True, warm_start_states=2)
+        for x in [x0, x1, x3]:
+            trim.solver_wrapper(x, solver.x_info, solver, -2)
+        np.testing.assert_array_equal([x_state for x_state, _ in solver.cache.states], [x1, x3])
+        x3_pos = solver.data.structure.timestep_info[0].pos.copy()
+        # x0 is no longer available and x2 starts from the closest remaining state
+        trim.solver_wrapper(x2, solver.x_info, solver, -2)
+        np.testing.assert_array_equal(solver.solver.initial_pos[-1], x3_pos)
+
+if __name__ == '__main__':
+    unittest.main()
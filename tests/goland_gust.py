@@ -0,0 +1,101 @@
+"""
+Goland wing cases shared by the tests of the unsteady aerodynamics, load recovery and aerodynamic postprocessors.
+
+The case files are generated in a temporary folder that is removed after the tests of the class that requests them.
+"""
+import shutil
+import tempfile
+
+
+def goland_case(test_class, case_name, alpha=2., Mstar_fact=10):
+    """
+    Generates the case files of the Goland wing in a temporary folder, removed after the tests of ``test_class``.
+
+    Args:
+        test_class (type): ``unittest.TestCase`` subclass, called from its ``setUpClass``
+        case_name (str): Case name
+        alpha (float): Angle of attack in degrees
+        Mstar_fact (int): Wake length in chords
+
+    Returns:
+        tuple: Goland wing template and settings of the case with the screen and log output switched off
+    """
+    import cases.templates.flying_wings as wings
+    import sharpy.utils.input_arg as input_arg
+
+    route = tempfile.mkdtemp()
+    test_class.addClassCleanup(shutil.rmtree, route, ignore_errors=True)
+
+    ws = wings.Goland(M=4,
+                      N=12,
+                      Mstar_fact=Mstar_fact,
+                      u_inf=50.,
+                      alpha=alpha,
+                      rho=1.02,
+                      sweep=0,
+                      physical_time=1.,
+                      n_surfaces=2,
+                      route=route,
+                      case_name=case_name)
+    ws.clean_test_files()
+    ws.update_derived_params()
+    ws.set_default_config_dict()
+    ws.generate_aero_file()
+    ws.generate_fem_file()
+    ws.config.write()
+
+    settings = input_arg.parse_settings(ws.route + '/' + ws.case_name + '.solver.txt')
+    settings['SHARPy']['write_screen'] = 'off'
+    settings['SHARPy']['write_log'] = 'off'
+    return ws, settings
+
+
+def gust_velocity_field(aero_solver_settings, u_inf, gust_length=5., gust_intensity=0.1, offset=2.):
+    """
+    Sets a 1-cos gust as velocity field of the aerodynamic solver.
+
+    Args:
+        aero_solver_settings (dict): Settings of the aerodynamic solver (modified in place)
+        u_inf (float): Free stream velocity
+        gust_length (float): Gust length
+        gust_intensity (float): Gust intensity as a fraction of ``u_inf``
+        offset (float): Distance of the gust to the wing at the start
+    """
+    aero_solver_settings['velocity_field_generator'] = 'GustVelocityField'
+    aero_solver_settings['velocity_field_input'] = {'u_inf': u_inf,
+                                                    'u_inf_direction': [1., 0., 0.],
+                                                    'gust_shape': '1-cos',
+                                                    'gust_parameters': {'gust_length': gust_length,
+                                                                        'gust_intensity': gust_intensity*u_inf},
+                                                    'offset': offset,
+                                                    'relative_motion': 'on'}
+
+
+def goland_gust_response(test_class, case_name, n_tstep, alpha=2., **dynamic_settings):
+    """
+    Runs the static and dynamic coupled response of the flexible Goland wing to a 1-cos gust, without
+    postprocessors.
+
+    Args:
+        test_class (type): ``unittest.TestCase`` subclass, called from its ``setUpClass``
+        case_name (str): Case name
+        n_tstep (int): Number of time steps
+        alpha (float): Angle of attack in degrees
+        **dynamic_settings: Further ``DynamicCoupled`` settings
+
+    Returns:
+        tuple: Goland wing template and output data of the simulation
+    """
+    import sharpy.sharpy_main
+
+    ws, settings = goland_case(test_class, case_name, alpha=alpha)
+    settings['SHARPy']['flow'] = ['BeamLoader', 'AerogridLoader', 'StaticCoupled', 'DynamicCoupled']
+    dynamic = settings['DynamicCoupled']
+    dynamic['print_info'] = 'off'
+    dynamic['n_time_steps'] = n_tstep
+    dynamic['postprocessors'] = []
+    dynamic['postprocessors_settings'] = dict()
+    dynamic.update(dynamic_settings)
+    dynamic['aero_solver_settings']['n_time_steps'] = n_tstep
+    gust_velocity_field(dynamic['aero_solver_settings'], ws.u_inf)
+    return ws, sharpy.sharpy_main.main(sharpy_input_dict=settings)
@@ -0,0 +1,112 @@
+"""
+Test the streaming low-rank Gramian integration used in frequency limited balancing
+"""
+import unittest
+import warnings
+import numpy as np
+import scipy.linalg as scalg
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+import sharpy.rom.utils.librom as librom
+
+
+class TestBalFreq(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(10)
+        self.ss = libss.random_ss(30, 3, 2, dt=0.1)
+        self.settings = {'frequency': 5.,
+                         'method_low': 'trapz',
+                         'options_low': {'points': 6},
+                         'method_high': 'trapz',
+                         'options_high': {'points': 8},
+                         'check_stability': False}
+
+    def reference_hsv(self):
+        """Singular values from the full quadrature factors, solved one frequency at a time"""
+        ss = self.ss
+        kv_low, wv_low = librom.get_trapz_weights(0., 5., 6, False)
+        kv_high, wv_high = librom.get_trapz_weights(5., np.pi / ss.dt, 8, True)
+        kvdt = np.concatenate((kv_low, kv_high)) * ss.dt
+        wv = np.concatenate((wv_low, wv_high)) * ss.dt
+        zv = np.exp(1j * kvdt)
+
+        Eye = np.eye(ss.states)
+        Zc, Zo = [], []
+        for kk in range(len(kvdt)):
+            Qctrl = wv[kk] * np.linalg.solve(zv[kk] * Eye - ss.A, ss.B)
+            Zc += [Qctrl.real, Qctrl.imag]
+            if kk < len(kv_low):
+                Qobs = wv[kk] ** 2 * np.linalg.solve(np.conj(zv[kk]) * Eye - ss.A.T, ss.C.T)
+                Zo += [Qobs.real, Qobs.imag]
+        Zc = np.hstack(Zc)
+        Zo = np.hstack(Zo)
+
+        return Zc, Zo, scalg.svdvals(Zo.T.dot(Zc))
+
+    def test_low_rank_update(self):
+        Q = [np.random.rand(20, 4) for _ in range(8)]
+        L = None
+        for Qk in Q:
+            L = librom.low_rank_update(L, Qk)
+        Z = np.hstack(Q)
+
+        self.assertEqual(L.shape, (20, 20))
+        np.testing.assert_allclose(L.dot(L.T), Z.dot(Z.T), rtol=1e-10, atol=1e-10)
+
+    def test_resolvent_solve(self):
+        zval = np.exp(0.3j)
+        X, Y = librom.resolvent_solve(self.ss.A, zval, self.ss.B, self.ss.C.T)
+        Eye = np.eye(self.ss.states)
+        np.testing.assert_allclose(X, np.linalg.solve(zval * Eye - self.ss.A, self.ss.B), atol=1e-10)
+        np.testing.assert_allclose(Y, np.linalg.solve(np.conj(zval) * Eye - self.ss.A.T, self.ss.C.T), atol=1e-10)
+
+        # sparse matrix with reused column ordering
+        A = libsp.csc_matrix(self.ss.A)
+        perm_c = librom.resolvent_ordering(A, 1.)
+        Xs, Ys = librom.resolvent_solve(A, zval, self.ss.B, self.ss.C.T, perm_c)
+        np.testing.assert_allclose(Xs, X, atol=1e-10)
+        np.testing.assert_allclose(Ys, Y, atol=1e-10)
+
+    def test_resolvent_ordering(self):
+        """The reused column ordering gives the solution and the fill of a new factorisation at every frequency"""
+        import scipy.sparse as sparse
+        import scipy.sparse.linalg as spalg
+
+        rng = np.random.default_rng(35)
+        n = 400
+        A = (0.3 * sparse.random(n, n, density=0.01, format='csc', random_state=rng)
+             - 0.5 * sparse.eye(n, format='csc')).tocsc()
+        B = rng.random((n, 3))
+        Ct = rng.random((n, 2))
+        perm_c = librom.resolvent_ordering(A, 1.)
+
+        for zval in [np.exp(0.1j), np.exp(1.3j), -1.]:
+            X, Y = librom.resolvent_solve(A, zval, B, Ct, perm_c=None)
+            Xs, Ys = librom.resolvent_solve(A, zval, B, Ct, perm_c)
+            np.testing.assert_allclose(Xs, X, rtol=1e-10, atol=1e-12)
+            np.testing.assert_allclose(Ys, Y, rtol=1e-10, atol=1e-12)
+
+            M = (zval * sparse.eye(n, format='csc') - A).tocsc()
+            lu = spalg.splu(M)
+            lu_reused = spalg.splu(M[:, perm_c], permc_spec='NATURAL')
+            self.assertLessEqual(lu_reused.L.nnz + lu_reused.U.nnz, 1.05 * (lu.L.nnz + lu.U.nnz))
+
+    def test_streaming_balfreq(self):
+        Zc, Zo, hsv_ref = self.reference_hsv()
+
+        for num_cores in [1, 3]:
+            settings = self.settings.copy()
+            settings['num_cores'] = num_cores
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                SSb, hsv, T, Ti, Lc, Lo, U, Vh = librom.balfreq(self.ss, settings)
+
+            np.testing.assert_allclose(Lc.dot(Lc.T), Zc.dot(Zc.T), rtol=1e-8, atol=1e-12)
+            np.testing.assert_allclose(Lo.dot(Lo.T), Zo.dot(Zo.T), rtol=1e-8, atol=1e-12)
+            np.testing.assert_allclose(hsv[:10], hsv_ref[:10], rtol=1e-8)
+            np.testing.assert_allclose(Ti.dot(T), np.eye(len(hsv)), atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Test multi-point Krylov ROM construction with cached and parallel factorisations
+"""
+import unittest
+import numpy as np
+import scipy.sparse as scsp
+import sharpy.utils.cout_utils as cout
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+import sharpy.rom.krylov as krylov
+import sharpy.rom.utils.krylovutils as krylovutils
+
+
+class TestKrylovMultipoint(unittest.TestCase):
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+        np.random.seed(40)
+        n = 60
+        A = scsp.diags(-np.linspace(0.5, 20., n)) + 0.05 * scsp.random(n, n, density=0.1, random_state=40)
+        B = np.random.rand(n, 2)
+        C = np.random.rand(2, n)
+        D = np.zeros((2, 2))
+        self.ss = libss.ss(libsp.csc_matrix(A.tocsc()), B, C, D)
+        self.frequency = np.array([0.1j, 2.0j, 10.0j])
+
+    def reduce(self, num_cores):
+        rom = krylov.Krylov()
+        rom.initialise({'algorithm': 'mimo_rational_arnoldi',
+                        'frequency': self.frequency,
+                        'r': 2,
+                        'num_cores': num_cores,
+                        'print_info': False})
+        rom.ss = self.ss
+        Ar, Br, Cr = rom.mimo_rational_arnoldi(self.frequency, 2)
+        return rom, Ar
+
+    def test_block_orthogonalisation(self):
+        blocks = [np.random.rand(50, 4) for _ in range(3)]
+        np.testing.assert_allclose(krylovutils.block_mgs_ortho(blocks), krylovutils.mgs_ortho(np.block(blocks)),
+                                   atol=1e-12)
+
+    def test_parallel_points(self):
+        rom_serial, Ar_serial = self.reduce(1)
+        rom_parallel, Ar_parallel = self.reduce(3)
+
+        np.testing.assert_allclose(rom_parallel.V, rom_serial.V, atol=1e-10)
+        np.testing.assert_allclose(Ar_parallel, Ar_serial, atol=1e-10)
+        self.assertEqual(len(rom_parallel.lu_cache), len(self.frequency))
+
+        # reference: sequential construction with the merged basis orthogonalised after each point
+        V = None
+        for sigma in self.frequency:
+            lu_a = krylovutils.lu_factor(sigma, self.ss.A)
+            Vi = krylovutils.construct_mimo_krylov(2, lu_a, self.ss.B, side='controllability')
+            V = Vi if V is None else krylovutils.mgs_ortho(np.block([V, Vi]))
+        np.testing.assert_allclose(rom_serial.V, V, atol=1e-10)
+
+    def test_cached_factorisations(self):
+        rom, _ = self.reduce(1)
+        lu_a = rom.lu_cache[complex(self.frequency[1])]
+        rom.factorise_points(self.frequency)
+        self.assertIs(rom.lu_factor(self.frequency[1]), lu_a)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Test the low-rank ADI solution of the discrete Lyapunov equations for balanced realisation
+"""
+import unittest
+import numpy as np
+import scipy.linalg as scalg
+import scipy.sparse as scsp
+import sharpy.linear.src.libsparse as libsp
+import sharpy.rom.utils.librom as librom
+
+
+class TestLowRankADI(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(20)
+        n = 120
+        A = scsp.diags(np.linspace(-0.5, 0.9, n)) + 0.02 * scsp.random(n, n, density=0.05, random_state=20)
+        self.A = libsp.csc_matrix(A.tocsc())
+        self.B = np.random.rand(n, 2)
+        self.C = np.random.rand(3, n)
+
+    def test_gramians(self):
+        Ad = self.A.toarray()
+        Wc = scalg.solve_discrete_lyapunov(Ad, self.B.dot(self.B.T))
+        Wo = scalg.solve_discrete_lyapunov(Ad.T, self.C.T.dot(self.C))
+
+        for A in [Ad, self.A]:
+            factors = dict()
+            Zc = librom.lyap_lradi(A, self.B, tol=1e-12, maxiter=500, factors=factors)
+            Zo = librom.lyap_lradi(A, self.C.T, tol=1e-12, maxiter=500, trans=True, factors=factors)
+
+            np.testing.assert_allclose(Zc.dot(Zc.T), Wc, atol=1e-8 * np.max(np.abs(Wc)))
+            np.testing.assert_allclose(Zo.dot(Zo.T), Wo, atol=1e-8 * np.max(np.abs(Wo)))
+
+    def test_cached_factor_fill(self):
+        """The column ordering shared by the cached ADI factorisations gives the fill of a new one at every shift"""
+        import scipy.sparse.linalg as spalg
+
+        factors = dict()
+        librom.lyap_lradi(self.A, self.B, tol=1e-12, maxiter=500, factors=factors)
+        perm_c = factors['perm_c']
+        n = self.A.shape[0]
+        zvals = [key for key in factors if key != 'perm_c']
+        self.assertGreater(len(zvals), 1)
+        for zval in zvals:
+            M = (zval * scsp.eye(n, format='csc') - self.A).tocsc()
+            lu = spalg.splu(M)
+            lu_reused = spalg.splu(M[:, perm_c], permc_spec='NATURAL')
+            self.assertLessEqual(lu_reused.L.nnz + lu_reused.U.nnz, 1.05 * (lu.L.nnz + lu.U.nnz))
+
+    def test_balreal_adi(self):
+        s, T, Tinv, rc, ro = librom.balreal_adi(self.A, self.B, self.C, tol=1e-12, maxiter=500)
+        s_ref = librom.balreal_direct_py(self.A.toarray(), self.B, self.C)[0]
+
+        np.testing.assert_allclose(s[:8], s_ref[:8], rtol=1e-6)
+        np.testing.assert_allclose(Tinv.dot(T)[:8, :8], np.eye(8), atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Test the parametric ROM database and its interpolation
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import scipy.linalg as sclalg
+import sharpy.linear.src.libss as libss
+import sharpy.rom.utils.romdatabase as romdatabase
+
+
+class TestROMDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.database = romdatabase.ROMDatabase(os.path.join(self.folder, 'test.roms.h5'))
+        np.random.seed(10)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    @staticmethod
+    def rom_results(ss, V=None, WT=None):
+        results = {'A': ss.A, 'B': ss.B, 'C': ss.C, 'D': ss.D, 'dt': ss.dt}
+        if V is not None:
+            results['V'] = V
+            results['WT'] = WT
+        return results
+
+    def test_interpolation(self):
+        u_inf = [10., 20., 40.]
+        mass = ['m0', 'm1']
+        ss_list = dict()
+        i_rom = 0
+        for m in mass:
+            for u in u_inf:
+                ss = libss.random_ss(4, 2, 3, dt=0.1)
+                ss_list[(m, u)] = ss
+                self.database.add('case_%05u' % i_rom, {'u_inf': u, 'mass': m}, self.rom_results(ss),
+                                  update_index=False)
+                i_rom += 1
+        self.database.write_index()
+
+        rom = romdatabase.ROMInterpolator(self.database.file_name, method_proj=None)
+        self.assertEqual(rom.categorical, ['mass'])
+        self.assertEqual(rom.numerical, ['u_inf'])
+
+        # grid points are recovered
+        ss_int = rom(u_inf=20., mass='m1')
+        np.testing.assert_array_almost_equal(ss_int.A, ss_list[('m1', 20.)].A)
+        np.testing.assert_array_almost_equal(ss_int.D, ss_list[('m1', 20.)].D)
+        self.assertEqual(ss_int.dt, 0.1)
+
+        # linear interpolation within the cell
+        ss_int = rom(u_inf=25., mass='m0')
+        np.testing.assert_array_almost_equal(ss_int.B, 0.75*ss_list[('m0', 20.)].B + 0.25*ss_list[('m0', 40.)].B)
+
+        with self.assertRaises(ValueError):
+            rom(u_inf=50., mass='m0')
+        with self.assertRaises(ValueError):
+            rom(u_inf=20., mass='m2')
+
+    def test_projection(self):
+        """
+        ROMs obtained from the same full order system with rotated bases are equal once projected onto common
+        generalised coordinates
+        """
+        ss_full = libss.random_ss(8, 2, 3, dt=0.1)
+        V0 = sclalg.qr(np.random.rand(8, 4), mode='economic')[0]
+        ss_ref = libss.ss(V0.T.dot(ss_full.A.dot(V0)), V0.T.dot(ss_full.B), ss_full.C.dot(V0), ss_full.D, dt=0.1)
+
+        for i_rom, u in enumerate([10., 20.]):
+            Q = sclalg.qr(np.random.rand(4, 4))[0]
+            V = V0.dot(Q)
+            ss = libss.ss(V.T.dot(ss_full.A.dot(V)), V.T.dot(ss_full.B), ss_full.C.dot(V), ss_full.D, dt=0.1)
+            self.database.add('case_%05u' % i_rom, {'u_inf': u}, self.rom_results(ss, V, V.T))
+
+        rom = romdatabase.ROMInterpolator(self.database, method_proj='weakMAC')
+        ss_int = rom(u_inf=12.)
+
+        wv = np.array([0.1, 1.])
+        np.testing.assert_array_almost_equal(libss.freqresp(ss_int, wv), libss.freqresp(ss_ref, wv))
+
+
+if __name__ == '__main__':
+    unittest.main()
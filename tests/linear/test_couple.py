@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import sharpy.linear.src.libss as libss
+
+
+class TestCoupler(unittest.TestCase):
+    """
+    Compares the incremental coupling of a fixed system with several updated systems against ``libss.couple``
+    """
+
+    def setUp(self):
+        np.random.seed(30)
+        self.ss01 = libss.random_ss(20, 8, 6, dt=0.1)
+        self.K12 = np.random.rand(8, 5)
+        self.K21 = 0.1 * np.random.rand(4, 6)
+
+    def compare(self, ss02_list):
+        coupler = libss.Coupler(self.ss01, self.K12, self.K21)
+        for ss02 in ss02_list:
+            ss_ref = libss.couple(self.ss01, ss02, self.K12, self.K21)
+            ss = coupler(ss02)
+            for mat in ['A', 'B', 'C', 'D']:
+                np.testing.assert_allclose(getattr(ss, mat), getattr(ss_ref, mat), atol=1e-12)
+
+    def test_feedthrough(self):
+        ss02_list = [libss.random_ss(6, 4, 5, dt=0.1) for _ in range(3)]
+        for ss02 in ss02_list:
+            ss02.D *= 0.1
+        self.compare(ss02_list)
+
+    def test_mixed_feedthrough(self):
+        ss02_list = [libss.random_ss(6, 4, 5, dt=0.1) for _ in range(4)]
+        ss02_list[1].D[:] = 0.
+        ss02_list[2].D[:] = 0.
+        self.compare(ss02_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import sharpy.linear.src.lingebm as lingebm
+
+
+class TestNewmark(unittest.TestCase):
+    """
+    Compares the factorisation based Newmark-beta discretisation against the one using the explicit inverse of the
+    mass matrix
+    """
+
+    def setUp(self):
+        np.random.seed(20)
+        N = 12
+        L = np.random.rand(N, N)
+        self.M = L.dot(L.T) + N * np.eye(N)
+        L = np.random.rand(N, N)
+        self.K = 1e3 * (L.dot(L.T) + N * np.eye(N))
+        self.C = 0.1 * np.random.rand(N, N)
+
+    def compare(self, M, C, K):
+        dt = 1e-2
+        ss_ref = lingebm.newmark_ss(np.linalg.inv(M), C, K, dt, num_damp=1e-3)
+        ss = lingebm.newmark_ss_factorised(M, C, K, dt, num_damp=1e-3)
+        for i_mat in range(4):
+            np.testing.assert_allclose(ss[i_mat], ss_ref[i_mat], rtol=1e-8, atol=1e-10)
+
+    def test_symmetric(self):
+        self.compare(self.M, 0.5 * (self.C + self.C.T), self.K)
+        self.assertEqual(lingebm.factorise(self.M)[0], 'cholesky')
+
+    def test_non_symmetric(self):
+        M = self.M.copy()
+        M[0, 1] += 1.
+        self.compare(M, self.C, self.K + 10. * np.random.rand(*self.K.shape))
+        self.assertEqual(lingebm.factorise(M)[0], 'lu')
+
+    def test_input_matrix(self):
+        dt = 1e-2
+        B = np.random.rand(self.M.shape[0], 3)
+        ss_ref = lingebm.newmark_ss_factorised(self.M, self.C, self.K, dt, num_damp=1e-3)
+        ss = lingebm.newmark_ss_factorised(self.M, self.C, self.K, dt, num_damp=1e-3, B=B)
+        np.testing.assert_allclose(ss[0], ss_ref[0], rtol=1e-12, atol=1e-14)
+        np.testing.assert_allclose(ss[1], ss_ref[1].dot(B), rtol=1e-8, atol=1e-12)
+        np.testing.assert_allclose(ss[3], ss_ref[3].dot(B), rtol=1e-8, atol=1e-12)
+
+    def test_invert_factorised(self):
+        M = self.M.copy()
+        for fact_type in ['cholesky', 'lu']:
+            fact = lingebm.factorise(M)
+            self.assertEqual(fact[0], fact_type)
+            np.testing.assert_allclose(lingebm.invert_factorised(fact), np.linalg.inv(M), rtol=1e-10, atol=1e-14)
+            M[0, 1] += 1.
+
+
+if __name__ == '__main__':
+    unittest.main()
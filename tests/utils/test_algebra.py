@@ -574,6 +574,38 @@ class TestAlgebra(unittest.TestCase):
         np.testing.assert_array_almost_equal(Pag_quat.dot(aircraft_nose_rotated), aircraft_nose,
                                              err_msg='Error in projection from A to G using quaternions')
 
+    def test_crv2rotation_vec(self):
+        """
+        Checks the vectorised rotation matrices against crv2rotation, including
+        zero and small rotations
+        """
+        psi = np.pi * (2. * np.random.default_rng(42).random((100, 3)) - 1)
+        psi[0, :] = 0.
+        psi[1, :] = 1e-16
+        psi[2, :] *= 1e-9
+
+        rot = algebra.crv2rotation_vec(psi)
+        for i_psi in range(psi.shape[0]):
+            np.testing.assert_allclose(rot[i_psi], algebra.crv2rotation(psi[i_psi]), atol=1e-14)
+
+    def test_rotation2crv_vec(self):
+        """
+        Checks the vectorised rotation vectors and tangential operators against rotation2crv and crv2tan, including
+        zero, small and close to pi rotations
+        """
+        psi = np.pi * (2. * np.random.default_rng(42).random((100, 3)) - 1)
+        psi[0, :] = 0.
+        psi[1, :] = 1e-16
+        psi[2, :] *= 1e-9
+        psi[3:10, :] *= (np.pi - 1e-6) / np.linalg.norm(psi[3:10, :], axis=1)[:, None]
+
+        rot = algebra.crv2rotation_vec(psi)
+        crv = algebra.rotation2crv_vec(rot)
+        tan = algebra.crv2tan_vec(psi)
+        for i_psi in range(psi.shape[0]):
+            np.testing.assert_allclose(crv[i_psi], algebra.rotation2crv(rot[i_psi]), atol=1e-12)
+            np.testing.assert_allclose(tan[i_psi], algebra.crv2tan(psi[i_psi]), atol=1e-14)
+
 # if __name__=='__main__':
 # unittest.main()
 # # T=TestAlgebra()
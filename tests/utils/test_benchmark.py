@@ -0,0 +1,117 @@
+"""
+Test the benchmark harness: discovery and timing of the suites, results database and regression detection
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import sharpy.utils.benchmark as benchmark
+
+suite = '''
+import time
+from sharpy.utils.benchmark import SkipBenchmark, repeat_setup
+
+
+class Fast(object):
+
+    def setup(self):
+        self.delay = 1e-3
+
+    def time_sleep(self):
+        time.sleep(self.delay)
+
+    def track_delay(self):
+        return 1e3*self.delay
+
+    def not_a_benchmark(self):
+        pass
+
+
+def reset_calls(suite):
+    suite.calls = []
+
+
+class Stateful(object):
+
+    lengths = []
+
+    def setup(self):
+        self.calls = None
+
+    @repeat_setup(reset_calls)
+    def time_append(self):
+        self.calls.append(None)
+        self.lengths.append(len(self.calls))
+
+
+class Unavailable(object):
+
+    def setup(self):
+        raise SkipBenchmark('missing library')
+
+    def time_nothing(self):
+        pass
+'''
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.route = tempfile.mkdtemp()
+        with open(os.path.join(self.route, 'bench_dummy.py'), 'w') as f:
+            f.write(suite)
+
+    def tearDown(self):
+        shutil.rmtree(self.route)
+
+    def test_run_suites(self):
+        suites = benchmark.discover(self.route)
+        self.assertEqual([(name, methods) for name, _, methods in suites],
+                         [('bench_dummy.Fast', ['time_sleep', 'track_delay']),
+                          ('bench_dummy.Stateful', ['time_append']),
+                          ('bench_dummy.Unavailable', ['time_nothing'])])
+
+        results, skipped = benchmark.run_suites(suites, select='Fast|Unavailable', repeat=3, print_info=False)
+        self.assertEqual(list(results.keys()), ['bench_dummy.Fast.time_sleep', 'bench_dummy.Fast.track_delay'])
+        self.assertEqual(results['bench_dummy.Fast.track_delay'], {'value': 1.})
+        self.assertEqual(list(skipped.keys()), ['bench_dummy.Unavailable.time_nothing'])
+        self.assertGreaterEqual(results['bench_dummy.Fast.time_sleep']['min'], 1e-3)
+        self.assertEqual(results['bench_dummy.Fast.time_sleep']['repeat'], 3)
+
+        results, skipped = benchmark.run_suites(suites, select='Unavailable', print_info=False)
+        self.assertEqual(len(results), 0)
+        self.assertEqual(len(skipped), 1)
+
+    def test_repeat_setup(self):
+        suites = benchmark.discover(self.route)
+        stateful = [suite for suite in suites if suite[0] == 'bench_dummy.Stateful'][0]
+        results, _ = benchmark.run_suites([stateful], repeat=4, number=3, print_info=False)
+        # the state is rebuilt before every timing of a single call
+        self.assertEqual(results['bench_dummy.Stateful.time_append']['number'], 1)
+        self.assertEqual(results['bench_dummy.Stateful.time_append']['repeat'], 4)
+        self.assertEqual(stateful[1].lengths, [1, 1, 1, 1])
+
+    def test_regressions(self):
+        database = benchmark.ResultsDatabase(os.path.join(self.route, 'results', 'benchmarks.json'))
+        for median in [1., 1.2, 0.9]:
+            database.append({'a': {'median': median}, 'b': {'median': 2. * median}}, commit='', machine='test')
+
+        database = benchmark.ResultsDatabase(database.filename)
+        self.assertEqual(len(database.history('a')), 3)
+        reference = database.reference(num_runs=2, machine='test')
+        self.assertAlmostEqual(reference['a'], 1.05)
+        self.assertAlmostEqual(reference['b'], 2.1)
+
+        regressions = benchmark.find_regressions({'a': {'median': 1.1}, 'b': {'median': 2.6}, 'c': {'median': 1.}},
+                                                 reference, threshold=0.1)
+        self.assertEqual([regression[0] for regression in regressions], ['b'])
+
+        # tracked values are compared as the times
+        database.append({'a': {'value': 10.}}, commit='', machine='test')
+        self.assertEqual(database.history('a')[-1][2], 10.)
+        regressions = benchmark.find_regressions({'a': {'value': 12.}}, {'a': 10.}, threshold=0.1)
+        self.assertEqual([regression[0] for regression in regressions], ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
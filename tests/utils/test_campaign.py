@@ -0,0 +1,111 @@
+import sharpy.utils.campaign as campaign
+import numpy as np
+import unittest
+import tempfile
+import shutil
+import os
+
+
+class TestCampaign(unittest.TestCase):
+    """
+    Tests the campaign utilities that do not require running SHARPy
+    """
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_generate_case_list(self):
+        parameters = {'A.a': [1, 2, 3],
+                      'B.b.c': ['x', 'y']}
+        samples = [{'A.a': 10, 'B.b.c': 'z'}]
+        case_list = campaign.generate_case_list(parameters, samples)
+
+        self.assertEqual(len(case_list), 7)
+        self.assertEqual(case_list[0], {'A.a': 1, 'B.b.c': 'x'})
+        self.assertEqual(case_list[1], {'A.a': 1, 'B.b.c': 'y'})
+        self.assertEqual(case_list[-1], samples[0])
+
+    def test_case_settings(self):
+        base_settings = {'SHARPy': {'flow': ['BeamLoader'], 'case': 'test'},
+                         'StaticUvlm': {'velocity_field_input': {'u_inf': 1.}}}
+        case = campaign.Campaign(base_settings,
+                                 parameters={'StaticUvlm.velocity_field_input.u_inf': [10., 20.]},
+                                 output_folder=self.folder)
+        case_id, settings, case_folder = case.case_settings(1)
+
+        self.assertEqual(case_id, 'case_00001')
+        self.assertEqual(settings['StaticUvlm']['velocity_field_input']['u_inf'], 20.)
+        self.assertEqual(settings['SHARPy']['log_folder'], case_folder)
+        # base settings are not modified
+        self.assertEqual(case.base_settings['StaticUvlm']['velocity_field_input']['u_inf'], 1.)
+
+    def test_settings_names(self):
+        settings = {'SHARPy': {'flow': ['BeamLoader', 'DynamicCoupled'], 'case': 'test'},
+                    'DynamicCoupled': {'postprocessors': ['BeamPlot'],
+                                       'aero_solver_settings': {'velocity_field_generator': 'GustVelocityField'},
+                                       'n_time_steps': 10}}
+        names = campaign.settings_names(settings)
+
+        for name in ['BeamLoader', 'DynamicCoupled', 'BeamPlot', 'GustVelocityField', 'test']:
+            self.assertIn(name, names)
+        self.assertNotIn(10, names)
+
+    def test_results_store(self):
+        store = campaign.ResultsStore(os.path.join(self.folder, 'test.results.h5'))
+        self.assertEqual(store.completed_cases(), dict())
+
+        store.write('case_00000', {'A.a': 1.}, 'completed', 1, 0.5, {'lift': np.arange(3.)})
+        store.write('case_00001', {'A.a': 2.}, 'failed', 2, 0.1, error='Error')
+        self.assertEqual(list(store.completed_cases()), ['case_00000'])
+
+        # a retried case replaces the previous record
+        store.write('case_00001', {'A.a': 2.}, 'completed', 3, 0.1, {'lift': np.ones(3)})
+        results = store.read()
+        self.assertEqual(sorted(store.completed_cases()), ['case_00000', 'case_00001'])
+        self.assertEqual(results['case_00001']['attempts'], 3)
+        self.assertEqual(results['case_00000']['parameters']['A.a'], 1.)
+        np.testing.assert_array_equal(results['case_00000']['results']['lift'], np.arange(3.))
+        self.assertEqual(store.completed_cases()['case_00000'], campaign.parameters_hash({'A.a': 1.}))
+
+    def test_isolate_nested_folders(self):
+        base_settings = {'SHARPy': {'flow': ['BeamLoader'], 'case': 'test'},
+                         'DynamicCoupled': {'postprocessors': ['BeamPlot', 'AerogridPlot'],
+                                            'postprocessors_settings': {'BeamPlot': {'folder': './output/'},
+                                                                        'AerogridPlot': {'folder': './output/',
+                                                                                         'u_inf': 1.}}}}
+        case = campaign.Campaign(base_settings, parameters={'A.a': [1, 2]}, output_folder=self.folder)
+        _, settings, case_folder = case.case_settings(1)
+
+        postproc_settings = settings['DynamicCoupled']['postprocessors_settings']
+        self.assertEqual(postproc_settings['BeamPlot']['folder'], case_folder)
+        self.assertEqual(postproc_settings['AerogridPlot']['folder'], case_folder)
+        self.assertEqual(postproc_settings['AerogridPlot']['u_inf'], 1.)
+        self.assertEqual(case.base_settings['DynamicCoupled']['postprocessors_settings']['BeamPlot']['folder'],
+                         './output/')
+
+    def test_pending_cases(self):
+        """Stored cases are only skipped if their parameters are those of the current case list"""
+        base_settings = {'SHARPy': {'flow': [], 'case': 'test'}}
+        case = campaign.Campaign(base_settings, parameters={'A.a': [1., 2.], 'B.b': ['x']},
+                                 output_folder=self.folder)
+        self.assertEqual(case.pending_cases(), [0, 1])
+        for i_case in range(2):
+            case.store.write(campaign.case_id(i_case), case.case_list[i_case], 'completed', 1, 0.1)
+        self.assertEqual(case.pending_cases(), [])
+
+        # reordered and extended grid
+        case = campaign.Campaign(base_settings, parameters={'B.b': ['x'], 'A.a': [2., 1., 3.]},
+                                 output_folder=self.folder)
+        self.assertEqual(case.pending_cases(), [0, 1, 2])
+        case = campaign.Campaign(base_settings, parameters={'B.b': ['x'], 'A.a': [1., 2., 3.]},
+                                 output_folder=self.folder)
+        self.assertEqual(case.pending_cases(), [2])
+        case.resume = False
+        self.assertEqual(case.pending_cases(), [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import ctypes as ct
+import numpy as np
+import unittest
+
+import sharpy.utils.algebra as algebra
+
+
+class TestStructTimeStepInfo(unittest.TestCase):
+    """
+    The vectorised frame of reference changes of ``StructTimeStepInfo`` are checked against the node by node
+    reference implementations
+    """
+
+    num_node = 21
+    num_elem = 10
+    num_bodies = 3
+
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+
+    def generate_tstep(self, psi):
+        from sharpy.utils.datastructures import StructTimeStepInfo
+
+        tstep = StructTimeStepInfo(self.num_node, self.num_elem, 3, num_dof=ct.c_int(6*(self.num_node - 1)),
+                                   num_bodies=self.num_bodies)
+        tstep.pos[:] = self.rng.random((self.num_node, 3))
+        tstep.pos_dot[:] = self.rng.random((self.num_node, 3))
+        tstep.psi[:] = psi.reshape((self.num_elem, 3, 3))
+        tstep.psi_dot[:] = self.rng.random((self.num_elem, 3, 3))
+        tstep.gravity_forces[:] = self.rng.random((self.num_node, 6))
+        tstep.for_pos[:] = self.rng.random((6,))
+        tstep.mb_FoR_pos[:] = self.rng.random((self.num_bodies, 6))
+        tstep.mb_FoR_vel[:] = self.rng.random((self.num_bodies, 6))
+        tstep.mb_FoR_acc[:] = self.rng.random((self.num_bodies, 6))
+        for ibody in range(self.num_bodies):
+            tstep.mb_quat[ibody, :] = algebra.euler2quat(np.pi*(2.*self.rng.random((3,)) - 1.))
+        tstep.quat = tstep.mb_quat[0, :].copy()
+        return tstep
+
+    def random_psi(self):
+        psi = np.pi*(2.*self.rng.random((self.num_elem*3, 3)) - 1.)
+        # zero, small and close to pi rotations
+        psi[0, :] = 0.
+        psi[1, :] = 1e-16
+        psi[2:5, :] *= 1e-9
+        psi[5:12, :] *= (np.pi - 1e-6)/np.linalg.norm(psi[5:12, :], axis=1)[:, None]
+        return psi
+
+    def assert_tstep_close(self, tstep, reference):
+        for name in ['pos', 'pos_dot', 'gravity_forces', 'for_pos', 'for_vel', 'for_acc', 'quat', 'dqdt']:
+            np.testing.assert_allclose(getattr(tstep, name), getattr(reference, name), rtol=1e-10, atol=1e-10,
+                                       err_msg=name)
+        # rotation2crv resolves rotations close to zero up to the accuracy of arccos(1 - eps) ~ 1e-8
+        for name in ['psi', 'psi_dot']:
+            np.testing.assert_allclose(getattr(tstep, name), getattr(reference, name), rtol=1e-8, atol=1e-7,
+                                       err_msg=name)
+
+    def test_change_AFoR(self):
+        for _ in range(5):
+            tstep = self.generate_tstep(self.random_psi())
+            reference = tstep.copy()
+            for ibody in range(self.num_bodies):
+                tstep.change_to_local_AFoR(ibody)
+                reference.change_to_local_AFoR_loop(ibody)
+                self.assert_tstep_close(tstep, reference)
+
+                tstep.change_to_global_AFoR(ibody)
+                reference.change_to_global_AFoR_loop(ibody)
+                self.assert_tstep_close(tstep, reference)
+
+    def test_glob_pos(self):
+        tstep = self.generate_tstep(self.random_psi())
+        for include_rbm in [True, False]:
+            np.testing.assert_allclose(tstep.glob_pos(include_rbm), tstep.glob_pos_loop(include_rbm),
+                                       rtol=1e-14, atol=1e-14)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+import sharpy.utils.fsi_acceleration as fsi_acceleration
+
+
+class ModelFSI(object):
+    """
+    Fixed point problem with the structure of the FSI iterations: the interface forces ``x`` give the displacements
+    ``u = C x`` and the new forces ``H(x) = f0 + A u + 0.1 sin(u)``. Without relaxation the iterations diverge.
+    """
+    def __init__(self, n=30, seed=46):
+        np.random.seed(seed)
+        Q, _ = np.linalg.qr(np.random.rand(n, n))
+        self.C = np.dot(Q*np.linspace(0.1, 1., n), Q.T)
+        self.A = np.dot(Q*np.linspace(-1.6, -0.2, n), Q.T)
+        self.f0 = np.random.rand(n)
+
+    def forces(self, x):
+        u = np.dot(self.C, x)
+        return self.f0 + np.dot(self.A, u) + 0.1*np.sin(u)
+
+    def solve(self, accelerator, x0, coeff=0.5, tolerance=1e-11, max_iter=500):
+        accelerator.new_step()
+        x = x0.copy()
+        for i_iter in range(max_iter):
+            new = self.forces(x)
+            if np.linalg.norm(new - x) < tolerance*np.linalg.norm(new):
+                return new, i_iter
+            x = accelerator.relax(x, new, coeff)
+        raise RuntimeError('Not converged')
+
+
+class TestFSIAcceleration(unittest.TestCase):
+
+    def test_constant(self):
+        accelerator = fsi_acceleration.accelerator_from_string('Constant')
+        previous = np.random.rand(10)
+        new = np.random.rand(10)
+        np.testing.assert_array_equal(accelerator.relax(previous, new, 0.3), 0.7*new + 0.3*previous)
+
+    def test_converged_state(self):
+        """The accelerated iterations converge to the solution with constant relaxation in fewer iterations"""
+        problem = ModelFSI()
+        x0 = np.zeros_like(problem.f0)
+        reference, iterations_constant = problem.solve(fsi_acceleration.ConstantRelaxation(), x0)
+
+        for accelerator_id in ['Aitken', 'IQN-ILS']:
+            accelerator = fsi_acceleration.accelerator_from_string(accelerator_id)
+            solution, iterations = problem.solve(accelerator, x0)
+            np.testing.assert_allclose(solution, reference, rtol=1e-9, atol=1e-9, err_msg=accelerator_id)
+            self.assertLess(iterations, iterations_constant, msg=accelerator_id)
+
+    def test_reuse(self):
+        """The IQN-ILS iterations of the previous steps reduce the iterations of the following ones"""
+        problem = ModelFSI(n=60)
+        f0 = problem.f0.copy()
+        iterations = dict()
+        for reuse_steps in [0, 2]:
+            accelerator = fsi_acceleration.accelerator_from_string('IQN-ILS', reuse_steps=reuse_steps)
+            constant = fsi_acceleration.ConstantRelaxation()
+            x = np.zeros_like(f0)
+            iterations[reuse_steps] = 0
+            for i_step in range(10):
+                # slowly varying loads, as in consecutive time steps
+                problem.f0 = f0*(1. + 0.05*i_step)
+                reference, _ = problem.solve(constant, x, tolerance=1e-8)
+                x, step_iterations = problem.solve(accelerator, x, tolerance=1e-8)
+                np.testing.assert_allclose(x, reference, rtol=1e-6, atol=1e-6)
+                iterations[reuse_steps] += step_iterations
+            self.assertLessEqual(len(accelerator.history), reuse_steps)
+
+        self.assertLess(iterations[2], iterations[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
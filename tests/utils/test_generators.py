@@ -0,0 +1,53 @@
+"""
+Test the grid generation and the batched evaluation of the velocity field generators used in PlotFlowField
+"""
+import unittest
+import numpy as np
+import sharpy.generators
+import sharpy.utils.generator_interface as gen_interface
+import sharpy.utils.vtkutils as vtkutils
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_gridbox(self):
+        gridbox = gen_interface.generator_from_string('GridBox')()
+        gridbox.initialise({'coords_0': [0., -1., 0.],
+                            'coords_1': [3., 1., 2.],
+                            'spacing': [1., 0.5, 1.],
+                            'moving': True})
+        for_pos = np.array([0.5, 0., 1.])
+        vtk_info, grid = gridbox.generate({'for_pos': for_pos})
+
+        self.assertEqual(len(grid), 3)
+        for iz in range(3):
+            for ix in range(4):
+                for iy in range(5):
+                    np.testing.assert_array_equal(grid[iz][:, ix, iy],
+                                                  np.array([ix, -1. + 0.5*iy, iz]) + for_pos)
+
+        # VTK ordering of the points: x index running fastest, then y and z
+        points = np.concatenate([vtkutils.grid_points(grid_z) for grid_z in grid])
+        np.testing.assert_array_equal(points[:, 0], np.tile(np.arange(4), 15) + for_pos[0])
+        np.testing.assert_array_equal(points[:, 2], np.repeat(np.arange(3), 20) + for_pos[2])
+
+    def test_generate_at_points(self):
+        shear = gen_interface.generator_from_string('ShearVelocityField')()
+        shear.initialise({'u_inf': 10.,
+                          'u_inf_direction': [1., 0., 0.],
+                          'shear_direction': [0., 0., 1.],
+                          'shear_exp': 0.2,
+                          'h_ref': 2.})
+
+        np.random.seed(1)
+        zeta = [np.random.rand(3, 4, 5) + 1., np.random.rand(3, 2, 3) + 1.]
+        uext = [np.zeros_like(zeta_surf) for zeta_surf in zeta]
+        shear.generate({'zeta': zeta, 'override': True}, uext)
+
+        points = np.concatenate([vtkutils.grid_points(zeta_surf) for zeta_surf in zeta])
+        u_points = shear.generate_at_points({}, points)
+        np.testing.assert_allclose(u_points, np.concatenate([vtkutils.grid_points(u_surf) for u_surf in uext]))
+
+
+if __name__ == '__main__':
+    unittest.main()
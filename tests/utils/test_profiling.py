@@ -0,0 +1,97 @@
+"""
+Test the timer registry used to profile the solvers
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import sharpy.utils.profiling as profiling
+from sharpy.utils.solver_interface import solver, BaseSolver
+
+
+@solver
+class _ProfiledSolver(BaseSolver):
+    solver_id = '_ProfiledSolver'
+
+    def initialise(self, data):
+        pass
+
+    def run(self):
+        time.sleep(1e-3)
+        return 1
+
+
+@solver
+class _ProfiledSubSolver(_ProfiledSolver):
+    solver_id = '_ProfiledSubSolver'
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = profiling.Profiler()
+        self.profiler.enable()
+
+    def tearDown(self):
+        profiling.profiler.enable(False)
+        profiling.profiler.reset()
+
+    def test_timers(self):
+        @self.profiler.timed('function')
+        def function(x):
+            return 2 * x
+
+        with self.profiler.timer('block'):
+            self.assertEqual(function(1), 2)
+        for ts in range(1, 4):
+            self.profiler.set_timestep(ts)
+            for k in range(ts):
+                function(k)
+                self.profiler.count('iterations')
+        self.profiler.set_timestep(None)
+        function(0)
+
+        summary = self.profiler.summary()
+        self.assertEqual(summary['timers']['function']['calls'], 8)
+        self.assertEqual(summary['timers']['block']['calls'], 1)
+        self.assertGreaterEqual(summary['timers']['block']['total'], summary['timers']['block']['min'])
+        self.assertEqual(summary['counters']['iterations'], 6)
+        self.assertEqual([step['ts'] for step in summary['timesteps']], [1, 2, 3])
+        self.assertEqual([step['timers']['function']['calls'] for step in summary['timesteps']], [1, 2, 3])
+        self.assertEqual([step['counters']['iterations'] for step in summary['timesteps']], [1, 2, 3])
+        for step in summary['timesteps']:
+            self.assertGreater(step['max_memory'], 0)
+
+    def test_disabled(self):
+        self.profiler.enable(False)
+        with self.profiler.timer('block'):
+            pass
+        self.profiler.count('iterations')
+        self.profiler.set_timestep(1)
+        self.assertEqual(self.profiler.summary()['timers'], dict())
+        self.assertEqual(self.profiler.summary()['timesteps'], [])
+
+    def test_solver_instrumentation(self):
+        profiling.profiler.reset()
+        profiling.profiler.enable()
+        self.assertEqual(_ProfiledSolver().run(), 1)
+        _ProfiledSubSolver().run()
+        _ProfiledSubSolver().run()
+
+        route = tempfile.mkdtemp()
+        try:
+            profiling.profiler.write(os.path.join(route, 'output', 'profile.json'))
+            with open(os.path.join(route, 'output', 'profile.json')) as f:
+                timers = json.load(f)['timers']
+        finally:
+            shutil.rmtree(route)
+
+        self.assertEqual(timers['solver/_ProfiledSolver']['calls'], 1)
+        self.assertEqual(timers['solver/_ProfiledSubSolver']['calls'], 2)
+        self.assertGreaterEqual(timers['solver/_ProfiledSolver']['total'], 1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
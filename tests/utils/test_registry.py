@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import sharpy.utils.registry as registry
+import sharpy.utils.sharpydir as sharpydir
+
+
+def run_isolated(code):
+    """Runs ``code`` in a new interpreter and returns the lines it prints"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = sharpydir.SharpyDir + os.pathsep + env.get('PYTHONPATH', '')
+    output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            env=env, universal_newlines=True, check=True)
+    return output.stdout.splitlines()
+
+
+class TestLazyRegistry(unittest.TestCase):
+
+    def test_scan(self):
+        source = ("import sharpy.utils.solver_interface as solver_interface\n"
+                  "\n"
+                  "@solver_interface.solver\n"
+                  "class First(object):\n"
+                  "    solver_id = 'First'\n"
+                  "\n"
+                  "class NotASolver(object):\n"
+                  "    solver_id = 'NotASolver'\n"
+                  "\n"
+                  "@solver\n"
+                  "class Second(object):\n"
+                  "    \"\"\"Docstring\"\"\"\n"
+                  "    solver_id = \"Second\"\n"
+                  "    solver_classification = 'other'\n")
+        self.assertEqual(registry.LazyRegistry('solver').scan(source), ['First', 'Second'])
+        self.assertEqual(registry.LazyRegistry('generator').scan(source), [])
+
+    def test_packages_not_imported(self):
+        """The solvers, post-processors, generators and controllers are found without importing their modules"""
+        lines = run_isolated(
+            "import sys\n"
+            "import sharpy.solvers, sharpy.postproc, sharpy.generators, sharpy.controllers\n"
+            "import sharpy.utils.solver_interface as solver_interface\n"
+            "import sharpy.utils.generator_interface as generator_interface\n"
+            "import sharpy.utils.controller_interface as controller_interface\n"
+            "print(len([m for m in sys.modules if m.split('.')[:2] in [['sharpy', 'solvers'], ['sharpy', 'postproc'],"
+            " ['sharpy', 'generators'], ['sharpy', 'controllers']] and m.count('.') > 1]))\n"
+            "print(' '.join(sorted(solver_interface.dict_of_solvers.available())))\n"
+            "print(' '.join(sorted(generator_interface.dict_of_generators.available())))\n"
+            "print(' '.join(sorted(controller_interface.dict_of_controllers.available())))\n")
+
+        self.assertEqual(lines[0], '0')
+        for name in ['BeamLoader', 'StaticCoupled', 'DynamicCoupled', 'LinearAssembler', 'PlotFlowField',
+                     'BeamPlot', 'AerogridPlot', '_BaseStructural']:
+            self.assertIn(name, lines[1].split())
+        for name in ['SteadyVelocityField', 'GustVelocityField', 'GridBox']:
+            self.assertIn(name, lines[2].split())
+        self.assertIn('ControlSurfacePidController', lines[3].split())
+
+    def test_minimal_flow(self):
+        """A static aerodynamic flow does not load the visualisation and reduced order modelling libraries"""
+        lines = run_isolated(
+            "import sys\n"
+            "import sharpy.solvers, sharpy.postproc, sharpy.generators, sharpy.controllers\n"
+            "import sharpy.utils.solver_interface as solver_interface\n"
+            "for solver_name in ['BeamLoader', 'AerogridLoader', 'StaticUvlm']:\n"
+            "    solver_interface.initialise_solver(solver_name, print_info=False)\n"
+            "print(' '.join(sorted(solver_interface.dict_of_solvers.keys())))\n"
+            "print(' '.join(m for m in sys.modules if m.split('.')[0] == 'tvtk' or m.startswith('sharpy.rom')))\n")
+
+        for name in ['BeamLoader', 'AerogridLoader', 'StaticUvlm']:
+            self.assertIn(name, lines[0].split())
+        self.assertNotIn('DynamicCoupled', lines[0].split())
+        self.assertNotIn('BeamPlot', lines[0].split())
+        self.assertEqual(lines[1:], [''])
+
+    def test_missing_name(self):
+        import sharpy.generators
+        import sharpy.utils.generator_interface as generator_interface
+
+        self.assertEqual(generator_interface.generator_from_string('GridBox').generator_id, 'GridBox')
+        with self.assertRaises(KeyError):
+            generator_interface.generator_from_string('NotAGenerator')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,10 @@ import sharpy.utils.settings as settings
 import sharpy.utils.exceptions as exceptions
 import sharpy.utils.cout_utils as cout
 from copy import deepcopy
+import ctypes as ct
 import numpy as np
 import unittest
+import unittest.mock
 
 
 class TestSettings(unittest.TestCase):
@@ -148,3 +150,144 @@ class TestSettings(unittest.TestCase):
             result = settings.to_custom_types(temp_in_dict, types_dict, temp_default_dict)
 
 
+
+    def assert_same_value(self, value, reference, name):
+        self.assertIs(type(value), type(reference), msg=name)
+        if isinstance(reference, ct._SimpleCData):
+            self.assertEqual(value.value, reference.value, msg=name)
+        elif isinstance(reference, np.ndarray):
+            self.assertEqual(value.dtype, reference.dtype, msg=name)
+            np.testing.assert_array_equal(value, reference, err_msg=name)
+        elif isinstance(reference, (list, tuple)):
+            self.assertEqual(len(value), len(reference), msg=name)
+            for i in range(len(reference)):
+                self.assert_same_value(value[i], reference[i], name + '[%u]' % i)
+        else:
+            self.assertEqual(value, reference, msg=name)
+
+    def convert_both(self, in_dict, types, default, options=dict()):
+        """Converts ``in_dict`` with the compiled and the reference implementations"""
+        reference = deepcopy(in_dict)
+        try:
+            settings.to_custom_types_uncompiled(reference, types, default, options)
+        except Exception as error:
+            # the reference stops at the first error, which is also reported if there are more
+            with self.assertRaises(Exception) as compiled_error:
+                settings.to_custom_types(deepcopy(in_dict), types, default, options)
+            if isinstance(compiled_error.exception, exceptions.NotValidSettings):
+                self.assertIn(type(error), [type(e) for e in compiled_error.exception.errors.values()])
+            else:
+                self.assertIs(type(compiled_error.exception), type(error))
+            return None, None
+
+        converted = deepcopy(in_dict)
+        settings.to_custom_types(converted, types, default, options)
+        return converted, reference
+
+    def test_registered_defaults(self):
+        """The defaults of every registered solver, generator and controller are converted as before"""
+        import sharpy.solvers
+        import sharpy.postproc
+        import sharpy.generators
+        import sharpy.controllers
+        import sharpy.utils.solver_interface as solver_interface
+        import sharpy.utils.generator_interface as generator_interface
+        import sharpy.utils.controller_interface as controller_interface
+
+        for registry in [solver_interface.dict_of_solvers, generator_interface.dict_of_generators,
+                         controller_interface.dict_of_controllers]:
+            registry.load_all()
+            for name, cls in list(registry.items()):
+                types = getattr(cls, 'settings_types', dict())
+                default = getattr(cls, 'settings_default', dict())
+                options = getattr(cls, 'settings_options', dict())
+                if not isinstance(types, dict):
+                    continue
+
+                for i_call in range(2):
+                    # the second call uses the memoised conversion
+                    converted, reference = self.convert_both(dict(), types, default, options)
+                    if reference is None:
+                        break
+                    self.assertEqual(list(converted.keys()), list(reference.keys()), msg=name)
+                    for k in reference:
+                        self.assert_same_value(converted[k], reference[k], '%s: %s' % (name, k))
+
+    def test_given_values(self):
+        types = {'int_var': 'int', 'float_var': 'float', 'bool_var': 'bool', 'str_var': 'str',
+                 'list_var': 'list(str)', 'float_list_var': 'list(float)', 'int_list_var': 'list(int)',
+                 'complex_list_var': 'list(complex)', 'dict_list_var': 'list(dict)', 'dict_var': 'dict'}
+        default = {'int_var': 1, 'float_var': 1., 'bool_var': True, 'str_var': 'a', 'list_var': ['a'],
+                   'float_list_var': np.zeros((2,)), 'int_list_var': np.zeros((2,), dtype=int),
+                   'complex_list_var': np.zeros((2,), dtype=complex), 'dict_list_var': [], 'dict_var': dict()}
+        options = {'int_var': [1, 2, 3], 'str_var': ['a', 'b'], 'list_var': ['a', 'b', 'c']}
+        inputs = [dict(),
+                  {'int_var': '2', 'float_var': '2.5', 'bool_var': 'off', 'str_var': 'b', 'list_var': [' b', 'c '],
+                   'float_list_var': '[1.5, 2.5]', 'int_list_var': '[1 2 3]', 'complex_list_var': '1.5, 2.5',
+                   'dict_list_var': ["{'a': 1}"], 'dict_var': {'a': 1}},
+                  {'int_var': 3, 'float_var': ct.c_double(3.5), 'bool_var': ct.c_bool(False),
+                   'float_list_var': [1, '2.5'], 'int_list_var': ['1', 2.], 'complex_list_var': np.ones((3,))}]
+
+        for in_dict in inputs:
+            for i_call in range(2):
+                converted, reference = self.convert_both(in_dict, types, default, options)
+                for k in reference:
+                    self.assert_same_value(converted[k], reference[k], k)
+
+        # memoised values are not shared between conversions
+        first = {'float_list_var': '[1.5, 2.5]'}
+        second = deepcopy(first)
+        settings.to_custom_types(first, types, default, options)
+        settings.to_custom_types(second, types, default, options)
+        self.assertIsNot(first['int_var'], second['int_var'])
+        self.assertIsNot(first['float_list_var'], second['float_list_var'])
+
+    def test_compiled_schema(self):
+        types = {'int_var': 'int'}
+        schema = settings.compile_schema(types)
+        self.assertIs(settings.compile_schema(types), schema)
+
+        types['float_var'] = 'float'
+        self.assertIsNot(settings.compile_schema(types), schema)
+        self.assertEqual(settings.compile_schema(types).unknown_keys({'int_var': 1, 'flaot_var': 1.}),
+                         ['flaot_var'])
+
+        with self.assertRaises(TypeError):
+            settings.compile_schema({'var': 'not_a_type'})
+
+    def test_errors_reported_together(self):
+        types = {'int_var': 'int', 'float_var': 'float', 'str_var': 'str', 'dict_var': 'dict'}
+        default = {'int_var': None, 'float_var': None, 'str_var': 'a', 'dict_var': dict()}
+        options = {'str_var': ['a', 'b']}
+
+        with self.assertRaises(exceptions.NotValidSettings) as error:
+            settings.to_custom_types({'str_var': 'c', 'dict_var': 1., 'flaot_var': 1.}, types, default, options)
+        self.assertEqual(sorted(error.exception.errors.keys()), ['dict_var', 'float_var', 'int_var', 'str_var'])
+        self.assertIsInstance(error.exception.errors['int_var'], exceptions.NoDefaultValueException)
+        self.assertIsInstance(error.exception.errors['str_var'], exceptions.NotValidSetting)
+        self.assertEqual(error.exception.unknown_keys, ['flaot_var'])
+
+        # a single error is raised as such
+        with self.assertRaises(exceptions.NoDefaultValueException):
+            settings.to_custom_types({'float_var': 1.}, types, default, options)
+
+    def test_single_unknown_key(self):
+        types = {'int_var': 'int', 'float_var': 'float'}
+        default = {'int_var': 1, 'float_var': None}
+
+        # the misspelt key is reported with the error of the setting it was meant for
+        with self.assertRaises(exceptions.NotValidSettings) as error:
+            settings.to_custom_types({'flaot_var': 1.}, types, default)
+        self.assertEqual(list(error.exception.errors.keys()), ['float_var'])
+        self.assertEqual(error.exception.unknown_keys, ['flaot_var'])
+
+        # without errors the unknown key is ignored with a warning
+        with unittest.mock.patch.object(cout, 'cout_wrap') as cout_wrap:
+            in_dict = {'float_var': 1., 'itn_var': 2}
+            settings.to_custom_types(in_dict, types, default)
+        self.assertEqual(in_dict['int_var'].value, 1)
+        self.assertTrue(any('itn_var' in call[0][0] for call in cout_wrap.call_args_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import types
+import unittest
+
+import numpy as np
+
+import sharpy.utils.structural_predictor as structural_predictor
+
+
+class PolynomialTrajectory(object):
+    """
+    Structural time steps whose fields are polynomials of time, with consistent time derivatives
+    """
+    def __init__(self, degree, num_dof=12, num_node=5, num_elem=2, seed=47):
+        np.random.seed(seed)
+        self.degree = degree
+        self.shapes = {'q': (num_dof + 10,),
+                       'for_vel': (6,),
+                       'for_pos': (6,),
+                       'pos': (num_node, 3),
+                       'psi': (num_elem, 3, 3)}
+        self.coefficients = {field: np.random.rand(degree + 1, *shape) for field, shape in self.shapes.items()}
+
+    def evaluate(self, field, t, derivative=0):
+        value = np.zeros(self.shapes[field])
+        for power in range(derivative, self.degree + 1):
+            factor = np.prod(np.arange(power - derivative + 1, power + 1))
+            value += factor*self.coefficients[field][power]*t**(power - derivative)
+        return value
+
+    def tstep(self, t):
+        tstep = types.SimpleNamespace()
+        tstep.q = self.evaluate('q', t)
+        tstep.dqdt = self.evaluate('q', t, 1)
+        tstep.dqddt = self.evaluate('q', t, 2)
+        tstep.for_vel = self.evaluate('for_vel', t)
+        tstep.for_acc = self.evaluate('for_vel', t, 1)
+        tstep.for_pos = self.evaluate('for_pos', t)
+        tstep.quat = np.array([1., 0., 0., 0.])
+        tstep.pos = self.evaluate('pos', t)
+        tstep.pos_dot = self.evaluate('pos', t, 1)
+        tstep.pos_ddot = self.evaluate('pos', t, 2)
+        tstep.psi = self.evaluate('psi', t)
+        tstep.psi_dot = self.evaluate('psi', t, 1)
+        tstep.psi_ddot = self.evaluate('psi', t, 2)
+        return tstep
+
+
+class TestStructuralPredictor(unittest.TestCase):
+
+    dt = 0.1
+
+    def predict(self, predictor_id, trajectory, n_steps=4):
+        predictor = structural_predictor.predictor_from_string(predictor_id, dt=self.dt)
+        for i_step in range(n_steps):
+            predictor.add_step(trajectory.tstep(i_step*self.dt))
+        self.assertLessEqual(len(predictor.history), predictor.n_steps)
+        return predictor.predict(trajectory.tstep((n_steps - 1)*self.dt)), trajectory.tstep(n_steps*self.dt)
+
+    def test_exact_for_polynomials(self):
+        """The predictors are exact for polynomial trajectories up to their order"""
+        for predictor_id, degree in [('Constant', 0),
+                                     ('Linear', 1),
+                                     ('Quadratic', 2),
+                                     ('AdamsBashforth', 2)]:
+            for i_degree in range(degree + 1):
+                prediction, exact = self.predict(predictor_id, PolynomialTrajectory(i_degree))
+                for field in ['q', 'dqdt', 'for_vel', 'for_pos', 'pos', 'pos_dot', 'psi', 'psi_dot']:
+                    entries = np.s_[...]
+                    if predictor_id == 'AdamsBashforth' and i_degree > 1:
+                        # extrapolated linearly
+                        if field == 'for_pos':
+                            continue
+                        if field == 'q':
+                            entries = np.s_[:-10]
+                    np.testing.assert_allclose(getattr(prediction, field)[entries], getattr(exact, field)[entries],
+                                               rtol=1e-10, atol=1e-10,
+                                               err_msg='%s %s degree %u' % (predictor_id, field, i_degree))
+
+    def test_not_exact_above_order(self):
+        prediction, exact = self.predict('Linear', PolynomialTrajectory(2))
+        self.assertGreater(np.max(np.abs(prediction.q - exact.q)), 1e-6)
+
+    def test_reduced_order(self):
+        """With fewer stored steps the order of the prediction is reduced"""
+        trajectory = PolynomialTrajectory(1)
+        predictor = structural_predictor.predictor_from_string('Quadratic', dt=self.dt)
+        predictor.add_step(trajectory.tstep(0.))
+        predictor.add_step(trajectory.tstep(self.dt))
+        prediction = predictor.predict(trajectory.tstep(self.dt))
+        np.testing.assert_allclose(prediction.q, trajectory.tstep(2*self.dt).q, rtol=1e-10, atol=1e-10)
+
+    def test_constant(self):
+        """The constant predictor does not modify the time step"""
+        trajectory = PolynomialTrajectory(2)
+        predictor = structural_predictor.predictor_from_string('Constant')
+        predictor.add_step(trajectory.tstep(0.))
+        tstep = trajectory.tstep(self.dt)
+        q = tstep.q.copy()
+        self.assertIs(predictor.predict(tstep), tstep)
+        np.testing.assert_array_equal(tstep.q, q)
+
+    def test_unit_quaternion(self):
+        predictor = structural_predictor.predictor_from_string('Linear')
+        for angle in [0., 0.2]:
+            tstep = PolynomialTrajectory(0).tstep(0.)
+            tstep.quat = np.array([np.cos(0.5*angle), np.sin(0.5*angle), 0., 0.])
+            predictor.add_step(tstep)
+        prediction = predictor.predict(PolynomialTrajectory(0).tstep(0.))
+        self.assertAlmostEqual(np.linalg.norm(prediction.quat), 1.)
+
+
+if __name__ == '__main__':
+    unittest.main()
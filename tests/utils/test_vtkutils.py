@@ -0,0 +1,93 @@
+import sharpy.utils.vtkutils as vtkutils
+import numpy as np
+import unittest
+import tempfile
+import shutil
+import os
+
+
+class TestVTKUtils(unittest.TestCase):
+    """
+    Tests the vectorised VTK output utilities
+    """
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_grid_arrays(self):
+        m, n = 3, 4
+        zeta = np.random.rand(3, m + 1, n + 1)
+        gamma = np.random.rand(m, n)
+
+        # reference ordering, as in the loops over panels with the chordwise index running fastest
+        coords = []
+        conn = []
+        panel_gamma = []
+        node_counter = -1
+        for i_n in range(n + 1):
+            for i_m in range(m + 1):
+                node_counter += 1
+                coords.append(zeta[:, i_m, i_n])
+                if i_n < n and i_m < m:
+                    conn.append([node_counter, node_counter + 1, node_counter + m + 2, node_counter + m + 1])
+                    panel_gamma.append(gamma[i_m, i_n])
+
+        np.testing.assert_array_equal(vtkutils.grid_points(zeta), np.array(coords))
+        np.testing.assert_array_equal(vtkutils.quad_connectivity(m, n), np.array(conn))
+        np.testing.assert_array_equal(vtkutils.grid_cells(gamma), np.array(panel_gamma))
+
+    def test_async_writer(self):
+        written = []
+        writer = vtkutils.AsyncWriter(asynchronous=True, max_queue=2)
+        for i in range(10):
+            writer.submit(written.append, i)
+        writer.flush()
+        self.assertEqual(written, list(range(10)))
+
+        # errors in the writer thread are raised in the caller and no further writes are accepted
+        writer.submit(np.load, os.path.join(self.folder, 'missing.npy'))
+        with self.assertRaises(FileNotFoundError):
+            writer.flush()
+        with self.assertRaises(FileNotFoundError):
+            writer.submit(written.append, 10)
+        with self.assertRaises(FileNotFoundError):
+            writer.close()
+        self.assertEqual(written, list(range(10)))
+        self.assertIsNone(writer.thread)
+
+    def test_vtkhdf_series(self):
+        import h5py
+
+        m, n = 2, 3
+        grids = []
+        series = vtkutils.VTKHDFSeries(os.path.join(self.folder, 'series'))
+        for i_step in range(3):
+            grid = vtkutils.Grid(vtkutils.grid_points(np.random.rand(3, m + 1, n + 1)),
+                                 vtkutils.quad_connectivity(m, n), 'quad')
+            grid.add_cell_data('panel_gamma', np.random.rand(m * n))
+            grid.add_point_data('n_id', np.arange((m + 1) * (n + 1)))
+            series.append(0.1 * i_step, grid)
+            grids.append(grid)
+
+        with h5py.File(series.filename, 'r') as f:
+            root = f['VTKHDF']
+            self.assertEqual(root['Steps'].attrs['NSteps'], 3)
+            # the connectivity is written once
+            self.assertEqual(root['Connectivity'].shape[0], m * n * 4)
+            np.testing.assert_array_equal(root['Steps/ConnectivityIdOffsets'][:, 0], np.zeros(3))
+            offsets = root['Steps/PointOffsets'][:]
+            cell_offsets = root['Steps/CellDataOffsets/panel_gamma'][:]
+            for i_step, grid in enumerate(grids):
+                n_points = grid.points.shape[0]
+                np.testing.assert_array_equal(root['Points'][offsets[i_step]:offsets[i_step] + n_points],
+                                              grid.points)
+                np.testing.assert_array_equal(
+                    root['CellData/panel_gamma'][cell_offsets[i_step]:cell_offsets[i_step] + m * n],
+                    grid.cell_data[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import copy
+import unittest
+
+import numpy as np
+
+
+class TestWakeManagementGoland(unittest.TestCase):
+    """
+    Lift of the rigid Goland wing with the managed wake against the full wake, in steady flow and through a 1-cos gust
+    """
+
+    n_tstep = 60
+
+    @classmethod
+    def setUpClass(cls):
+        from tests.goland_gust import goland_case
+
+        cls.ws, cls.settings = goland_case(cls, 'goland_wake', Mstar_fact=15)
+
+    def run_case(self, gust, wake_management):
+        import sharpy.sharpy_main
+        from tests.goland_gust import gust_velocity_field
+
+        settings = copy.deepcopy(self.settings)
+        settings['SHARPy']['flow'] = ['BeamLoader', 'AerogridLoader', 'StaticUvlm', 'DynamicUVLM']
+        dynamic = settings['DynamicUVLM']
+        dynamic['print_info'] = 'off'
+        dynamic['n_time_steps'] = self.n_tstep
+        dynamic['include_unsteady_force_contribution'] = 'off'
+        dynamic['postprocessors'] = []
+        dynamic['postprocessors_settings'] = dict()
+        step = dynamic['aero_solver_settings']
+        step['print_info'] = 'off'
+        step['convection_scheme'] = 2
+        step['n_time_steps'] = self.n_tstep
+        step['wake_management'] = wake_management
+        step['wake_near_rows'] = 10
+        step['wake_merge_rows'] = 4
+        step['wake_tolerance'] = 1e-3
+        if gust:
+            gust_velocity_field(step, self.ws.u_inf, gust_length=10., gust_intensity=0.05, offset=5.)
+
+        data = sharpy.sharpy_main.main(sharpy_input_dict=settings)
+        lift = np.array([sum(np.sum(forces[2, :, :]) for forces in tstep.forces)
+                         for tstep in data.aero.timestep_info[1:]])
+        n_wake_panels = np.array([np.sum(tstep.dimensions_star[:, 0]*tstep.dimensions_star[:, 1])
+                                  for tstep in data.aero.timestep_info[1:]])
+        return lift, n_wake_panels
+
+    def test_lift(self):
+        for gust in [False, True]:
+            reference, reference_panels = self.run_case(gust, 'None')
+            for wake_management in ['Merge', 'Truncate']:
+                lift, n_wake_panels = self.run_case(gust, wake_management)
+                msg = '%s wake with gust %s' % (wake_management, gust)
+                np.testing.assert_allclose(lift, reference, rtol=0., atol=1e-2*np.max(np.abs(reference)),
+                                           err_msg=msg)
+                self.assertLess(n_wake_panels[-1], reference_panels[-1], msg=msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import types
+import unittest
+
+import numpy as np
+
+import sharpy.aero.utils.wake_management as wake_management
+
+
+class PlanarWake(object):
+    """
+    Flat rectangular wing with a frozen wake convected with the free stream. The circulation shed at every time step
+    is given by ``shed_gamma(it)``, constant along the span.
+    """
+    def __init__(self, shed_gamma, M=4, N=8, mstar=60, chord=1., span=8., u_inf=10.):
+        self.shed_gamma = shed_gamma
+        self.dx = chord/M
+        self.dt = self.dx/u_inf
+        self.u_inf = u_inf
+        self.mstar = mstar
+
+        x = np.linspace(0., chord, M + 1)
+        y = np.linspace(-0.5*span, 0.5*span, N + 1)
+        zeta = np.zeros((3, M + 1, N + 1))
+        zeta[0, :, :] = x[:, None]
+        zeta[1, :, :] = y[None, :]
+        self.y = y
+
+        tstep = types.SimpleNamespace()
+        tstep.zeta = [zeta]
+        tstep.zeta_dot = [np.zeros_like(zeta)]
+        tstep.u_ext = [np.zeros_like(zeta)]
+        tstep.u_ext[0][0, :, :] = u_inf
+        tstep.dimensions_star = np.array([[mstar, N]])
+        tstep.wake_row_span = None
+        zeta_star = np.zeros((3, mstar + 1, N + 1))
+        zeta_star[0, :, :] = chord + self.dx*np.arange(mstar + 1)[:, None]
+        zeta_star[1, :, :] = y[None, :]
+        tstep.zeta_star = [zeta_star]
+        tstep.u_ext_star = [np.zeros_like(zeta_star)]
+        tstep.gamma_star = [np.array([[shed_gamma(-i_row)]*N for i_row in range(mstar)])]
+        self.tstep = tstep
+        self.it = 0
+
+    def convect(self, manager=None):
+        """Step of the wake as convected by the UVLM library: shift of the rows, dropping the last one"""
+        tstep = self.tstep
+        self.it += 1
+        if manager is not None:
+            manager.manage(tstep)
+        zeta_star = tstep.zeta_star[0]
+        zeta_star[0, :, :] += self.dx
+        zeta_star[:, 1:, :] = zeta_star[:, :-1, :].copy()
+        zeta_star[:, 0, :] = tstep.zeta[0][:, -1, :]
+        gamma_star = tstep.gamma_star[0]
+        gamma_star[1:, :] = gamma_star[:-1, :].copy()
+        gamma_star[0, :] = self.shed_gamma(self.it)
+        if manager is not None:
+            manager.convected(tstep)
+
+    def induced_velocity(self, points=None):
+        if points is None:
+            points = wake_management.collocation_points(self.tstep.zeta[0])
+        zeta_star = self.tstep.zeta_star[0]
+        gamma_star = self.tstep.gamma_star[0]
+        velocity = np.zeros_like(points)
+        for i_row in range(gamma_star.shape[0]):
+            velocity += wake_management.induced_velocity_row(zeta_star[:, i_row:i_row + 2, :], gamma_star[i_row, :],
+                                                             points)
+        return velocity
+
+
+def steady(it):
+    return 1.
+
+
+def gust(it):
+    return 1. + 0.5*np.sin(2.*np.pi*it/24.)
+
+
+class TestWakeManagement(unittest.TestCase):
+
+    def manager(self, management_id, wake):
+        return wake_management.wake_manager_from_string(management_id,
+                                                        wake.tstep.dimensions_star[:, 0],
+                                                        near_rows=12,
+                                                        merge_rows=4,
+                                                        tolerance=1e-3)
+
+    def test_induced_velocity(self):
+        """A long wake of constant circulation induces the velocity of a horseshoe vortex"""
+        wake = PlanarWake(steady, mstar=4000)
+        span = wake.y[-1] - wake.y[0]
+        points = np.zeros((3, 3))
+        points[:, 0] = [0.2, 0.5, 0.9]
+        velocity = wake.induced_velocity(points)
+
+        d = 1. - points[:, 0]
+        h = 0.5*span
+        r = np.sqrt(d**2 + h**2)
+        # upstream of the bound vortex the upwash of the bound vortex is larger than the downwash of the legs
+        horseshoe = 1./(4.*np.pi)*(span/(d*r) - 2./h*(1. - d/r))
+        np.testing.assert_allclose(velocity[:, :2], 0., atol=1e-12)
+        np.testing.assert_allclose(np.abs(velocity[:, 2]), horseshoe, rtol=1e-4)
+
+    def test_merge_conserves_impulse(self):
+        wake = PlanarWake(gust)
+        tstep = wake.tstep
+        impulse = np.sum(tstep.gamma_star[0]*wake_management.panel_areas(tstep.zeta_star[0]), axis=0)
+        manager = self.manager('Merge', wake)
+        manager.manage(tstep)
+
+        n_rows = tstep.gamma_star[0].shape[0]
+        self.assertLess(n_rows, wake.mstar)
+        self.assertEqual(tstep.dimensions_star[0, 0], n_rows)
+        self.assertEqual(tstep.zeta_star[0].shape[1], n_rows + 1)
+        self.assertEqual(tstep.u_ext_star[0].shape, tstep.zeta_star[0].shape)
+        # the padding row has zero circulation and area
+        np.testing.assert_allclose(np.sum(tstep.gamma_star[0]*wake_management.panel_areas(tstep.zeta_star[0]), axis=0),
+                                   impulse, rtol=1e-12)
+        self.assertEqual(np.sum(tstep.wake_row_span[0]), wake.mstar)
+
+    def run_wake(self, shed_gamma, management_id, n_steps=60):
+        full = PlanarWake(shed_gamma)
+        managed = PlanarWake(shed_gamma)
+        manager = self.manager(management_id, managed)
+        u_inf = full.u_inf
+
+        max_rows = 0
+        max_change = 0.
+        for i_step in range(n_steps):
+            full.convect()
+            managed.convect(manager)
+            n_rows = managed.tstep.gamma_star[0].shape[0]
+            max_rows = max(max_rows, n_rows)
+            self.assertEqual(managed.tstep.dimensions_star[0, 0], n_rows)
+            self.assertEqual(len(managed.tstep.wake_row_span[0]), n_rows)
+
+            # lift is proportional to the downwash at the collocation points of the flat wing
+            change = np.max(np.abs(managed.induced_velocity() - full.induced_velocity()))
+            max_change = max(max_change, change/u_inf)
+
+        return max_rows, max_change, managed
+
+    def test_merge(self):
+        for shed_gamma in [steady, gust]:
+            max_rows, max_change, managed = self.run_wake(shed_gamma, 'Merge')
+            manager = self.manager('Merge', managed)
+            self.assertLessEqual(max_rows, manager.merged_rows(managed.mstar), msg=shed_gamma.__name__)
+            self.assertLess(max_rows, managed.mstar, msg=shed_gamma.__name__)
+            self.assertLess(max_change, 1e-3, msg=shed_gamma.__name__)
+
+    def test_truncate(self):
+        for shed_gamma in [steady, gust]:
+            max_rows, max_change, managed = self.run_wake(shed_gamma, 'Truncate')
+            self.assertLessEqual(max_rows, managed.mstar, msg=shed_gamma.__name__)
+            self.assertGreaterEqual(managed.tstep.gamma_star[0].shape[0], 12, msg=shed_gamma.__name__)
+            self.assertLess(max_change, 2e-3, msg=shed_gamma.__name__)
+
+    def test_truncate_tolerance(self):
+        wake = PlanarWake(steady)
+        tolerance = 1e-3
+        manager = wake_management.wake_manager_from_string('Truncate', [wake.mstar], near_rows=2,
+                                                           tolerance=tolerance)
+        velocity = wake.induced_velocity()
+        manager.manage(wake.tstep)
+        n_rows = wake.tstep.gamma_star[0].shape[0]
+        self.assertLess(n_rows, wake.mstar)
+        self.assertLessEqual(np.max(np.linalg.norm(wake.induced_velocity() - velocity, axis=1)),
+                             tolerance*wake.u_inf)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+
+def tip_displacement(data):
+    return {'tip_z': data.structure.timestep_info[-1].pos[-1, 2]}
+
+
+class TestCampaignResume(unittest.TestCase):
+    """
+    Runs and resumes a campaign of static cantilever beams under their own weight, with the gravity as parameter
+    """
+
+    num_node = 11
+
+    def setUp(self):
+        import sharpy.utils.generate_cases as gc
+
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, ignore_errors=True)
+
+        beam = gc.StructuralInformation()
+        node_pos = np.zeros((self.num_node, 3))
+        node_pos[:, 0] = np.linspace(0., 5., self.num_node)
+        beam.generate_uniform_sym_beam(node_pos, 1., 1e-3, 1e7, 1e7, 1e4, 1e4, num_node_elem=3)
+        beam.boundary_conditions[0] = 1
+        beam.boundary_conditions[-1] = -1
+        beam.generate_fem_file(self.folder + '/', 'cantilever')
+
+        self.base_settings = {'SHARPy': {'case': 'cantilever',
+                                         'route': self.folder + '/',
+                                         'flow': ['BeamLoader', 'NonLinearStatic', 'BeamPlot'],
+                                         'write_screen': 'off'},
+                              'BeamLoader': {'unsteady': 'off'},
+                              'NonLinearStatic': {'print_info': 'off',
+                                                  'max_iterations': 99,
+                                                  'num_load_steps': 5,
+                                                  'min_delta': 1e-8,
+                                                  'gravity_on': 'on',
+                                                  'gravity': 9.81},
+                              'BeamPlot': {'folder': './output/'}}
+
+    def campaign(self, gravity):
+        import sharpy.utils.campaign as campaign
+
+        return campaign.Campaign(self.base_settings,
+                                 parameters={'NonLinearStatic.gravity': gravity},
+                                 output_folder=self.folder + '/campaign/',
+                                 num_cores=2,
+                                 postprocess='tests.xbeam.test_campaign_resume:tip_displacement')
+
+    def test_resume(self):
+        results = self.campaign([5., 10.]).run()
+        self.assertEqual(sorted(results), ['case_00000', 'case_00001'])
+        for case in results.values():
+            self.assertEqual(case['status'], 'completed')
+            self.assertEqual(case['attempts'], 1)
+        tip = {case['parameters']['NonLinearStatic.gravity']: case['results']['tip_z'] for case in results.values()}
+        self.assertLess(tip[10.], tip[5.])
+        # every case writes its output to its own folder
+        for case_id in results:
+            self.assertTrue(os.path.isdir(self.folder + '/campaign/' + case_id + '/cantilever/beam/'))
+
+        # resumed with the same grid: nothing is run again
+        campaign = self.campaign([5., 10.])
+        self.assertEqual(campaign.pending_cases(), [])
+        resumed = campaign.run()
+        for case_id, case in results.items():
+            self.assertEqual(resumed[case_id]['wall_time'], case['wall_time'])
+
+        # reordered and extended grid: the cases with different parameters are run again
+        campaign = self.campaign([10., 5., 10.])
+        self.assertEqual(campaign.pending_cases(), [0, 1])
+        resumed = campaign.run()
+        self.assertEqual(resumed['case_00002']['wall_time'], results['case_00001']['wall_time'])
+        for case in resumed.values():
+            self.assertEqual(case['status'], 'completed')
+            self.assertAlmostEqual(case['results']['tip_z'], tip[case['parameters']['NonLinearStatic.gravity']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import copy
+import types
+import unittest
+
+import numpy as np
+
+import sharpy.utils.algebra as algebra
+from sharpy.structure.utils.loadrecovery import BeamLoadRecovery, stack_timesteps
+
+
+def straight_beam(num_elem=6, length=3., num_node_elem=3):
+    """Straight beam along x with the material frame aligned with A and two stiffness properties"""
+    num_node = (num_node_elem - 1)*num_elem + 1
+    beam = types.SimpleNamespace()
+    beam.num_elem = num_elem
+    beam.num_node = num_node
+    beam.connectivities = np.zeros((num_elem, num_node_elem), dtype=int)
+    for ielem in range(num_elem):
+        beam.connectivities[ielem, :] = (num_node_elem - 1)*ielem + np.array([0, 2, 1][:num_node_elem])
+    beam.stiffness_db = np.array([np.diag([1e6, 2e5, 3e5, 4e3, 5e3, 6e3]),
+                                  np.diag([2e6, 4e5, 6e5, 8e3, 1e4, 1.2e4])])
+    beam.elem_stiffness = np.arange(num_elem) % 2
+    beam.ini_info = types.SimpleNamespace()
+    beam.ini_info.pos = np.zeros((num_node, 3))
+    beam.ini_info.pos[:, 0] = np.linspace(0., length, num_node)
+    beam.ini_info.psi = np.zeros((num_elem, num_node_elem, 3))
+    return beam
+
+
+def element_x(beam, pos):
+    return pos[beam.connectivities, 0]
+
+
+class TestBeamLoadRecovery(unittest.TestCase):
+
+    def test_undeformed(self):
+        beam = straight_beam()
+        beam.ini_info.pos[:, 2] = 0.1*beam.ini_info.pos[:, 0]**2
+        beam.ini_info.psi[:, :, 1] = 0.05*element_x(beam, beam.ini_info.pos)
+        recovery = BeamLoadRecovery(beam)
+        strain, loads = recovery.strain_and_loads(*stack_timesteps([beam.ini_info, beam.ini_info]))
+        self.assertEqual(loads.shape, (2, beam.num_elem, 6))
+        np.testing.assert_array_equal(strain, 0.)
+        np.testing.assert_array_equal(loads, 0.)
+
+    def test_extension_and_torsion(self):
+        beam = straight_beam()
+        recovery = BeamLoadRecovery(beam)
+        stiffness = beam.stiffness_db[beam.elem_stiffness]
+
+        eps = 1e-3
+        twist = 0.2
+        tstep = types.SimpleNamespace()
+        tstep.pos = beam.ini_info.pos*(1. + eps)
+        tstep.psi = np.zeros_like(beam.ini_info.psi)
+        tstep.psi[:, :, 0] = twist*element_x(beam, beam.ini_info.pos)
+        strain, loads = recovery.strain_and_loads(*stack_timesteps([tstep]))
+
+        np.testing.assert_allclose(loads[0, :, 0], stiffness[:, 0, 0]*eps, rtol=1e-10)
+        np.testing.assert_allclose(loads[0, :, 3], stiffness[:, 3, 3]*twist, rtol=1e-10)
+        np.testing.assert_allclose(loads[0, :, [1, 2, 4, 5]], 0., atol=1e-8)
+
+    def test_rigid_body_motion(self):
+        """A rigid rotation and translation of the beam does not change the force strains"""
+        beam = straight_beam()
+        recovery = BeamLoadRecovery(beam)
+        rotation = algebra.crv2rotation(np.array([0.3, -0.2, 0.5]))
+
+        tstep = types.SimpleNamespace()
+        tstep.pos = beam.ini_info.pos.dot(rotation.T) + np.array([1., 2., 3.])
+        tstep.psi = algebra.rotation2crv_vec(np.matmul(rotation, algebra.crv2rotation_vec(
+            beam.ini_info.psi.reshape((-1, 3))))).reshape(beam.ini_info.psi.shape)
+        strain, loads = recovery.strain_and_loads(*stack_timesteps([tstep]))
+        np.testing.assert_allclose(strain, 0., atol=1e-12)
+
+    def test_batched_equals_single_steps(self):
+        beam = straight_beam()
+        recovery = BeamLoadRecovery(beam)
+        np.random.seed(49)
+        timesteps = []
+        for it in range(5):
+            tstep = types.SimpleNamespace()
+            tstep.pos = beam.ini_info.pos + 0.05*np.random.rand(*beam.ini_info.pos.shape)
+            tstep.psi = beam.ini_info.psi + 0.1*np.random.rand(*beam.ini_info.psi.shape)
+            timesteps.append(tstep)
+
+        strain, loads = recovery.strain_and_loads(*stack_timesteps(timesteps))
+        coords_a = recovery.coords_a(stack_timesteps(timesteps)[0])
+        for it, tstep in enumerate(timesteps):
+            strain_it, loads_it = recovery.strain_and_loads(*stack_timesteps([tstep]))
+            np.testing.assert_allclose(strain[it], strain_it[0], rtol=1e-14)
+            np.testing.assert_allclose(loads[it], loads_it[0], rtol=1e-14)
+            np.testing.assert_array_equal(coords_a[it], tstep.pos[beam.connectivities[:, 2], :])
+
+
+class TestBeamLoadsXbeam(unittest.TestCase):
+    """
+    Loads of the batched recovery against ``cbeam3_loads`` of the xbeam library over the dynamic response of the
+    flexible Goland wing to a 1-cos gust
+    """
+
+    n_tstep = 20
+
+    @classmethod
+    def setUpClass(cls):
+        from tests.goland_gust import goland_gust_response
+
+        cls.ws, cls.data = goland_gust_response(cls, 'goland_loads', cls.n_tstep)
+
+    def test_loads_history(self):
+        import sharpy.structure.utils.xbeamlib as xbeamlib
+        import sharpy.postproc.beamloads as beamloads
+
+        structure = self.data.structure
+        self.assertGreater(len(structure.timestep_info), self.n_tstep)
+
+        postproc = beamloads.BeamLoads()
+        postproc.initialise(self.data, {'csv_output': False})
+        postproc.run(online=False)
+
+        max_moment = 0.
+        for it, tstep in enumerate(structure.timestep_info):
+            strain, loads = xbeamlib.cbeam3_loads(structure, it)
+            np.testing.assert_allclose(tstep.postproc_cell['strain'], strain, rtol=1e-8, atol=1e-12,
+                                       err_msg='time step %u' % it)
+            np.testing.assert_allclose(tstep.postproc_cell['loads'], loads, rtol=1e-8,
+                                       atol=1e-8*np.max(np.abs(loads)), err_msg='time step %u' % it)
+            np.testing.assert_array_equal(tstep.postproc_cell['coords_a'], tstep.pos[structure.connectivities[:, 2]])
+            max_moment = max(max_moment, np.max(np.abs(loads[:, 4])))
+        self.assertGreater(max_moment, 0.)
+
+    def test_xbeam_loads_setting(self):
+        import sharpy.postproc.beamloads as beamloads
+
+        data = copy.copy(self.data)
+        postproc = beamloads.BeamLoads()
+        postproc.initialise(data, {'csv_output': False, 'xbeam_loads': True})
+        postproc.run(online=True)
+        tstep = data.structure.timestep_info[-1]
+        recovery = BeamLoadRecovery(data.structure)
+        strain, loads = recovery.strain_and_loads(*stack_timesteps([tstep]))
+        np.testing.assert_allclose(tstep.postproc_cell['loads'], loads[0], rtol=1e-8,
+                                   atol=1e-8*np.max(np.abs(loads)))
+
+
+if __name__ == '__main__':
+    unittest.main()
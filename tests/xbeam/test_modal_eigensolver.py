@@ -0,0 +1,52 @@
+import numpy as np
+import unittest
+import sharpy.structure.utils.modalutils as modalutils
+
+
+class TestUndampedModes(unittest.TestCase):
+    """
+    Tests the symmetric eigenvalue solvers for the undamped modes against the eigenvalues of ``M^{-1}K``
+    """
+
+    def setUp(self):
+        # fixed-free spring-mass chain with a random distribution of masses and springs
+        np.random.seed(1)
+        n = 200
+        k = 1e3 * (1. + np.random.rand(n))
+        m = 1. + np.random.rand(n)
+        self.K = np.diag(k + np.append(k[1:], 0.)) - np.diag(k[1:], 1) - np.diag(k[1:], -1)
+        self.M = np.diag(m)
+        # consistent mass-like coupling
+        self.M += 0.1 * (np.diag(m[1:], 1) + np.diag(m[1:], -1))
+
+        eigenvalues = np.linalg.eigvals(np.linalg.solve(self.M, self.K)).real
+        self.reference = np.sort(eigenvalues)
+
+    def test_sparse_and_dense(self):
+        num_modes = 10
+        for use_sparse in [True, False]:
+            with self.subTest(use_sparse=use_sparse):
+                eigenvalues, eigenvectors = modalutils.undamped_modes(self.M, self.K, num_modes,
+                                                                      use_sparse=use_sparse)
+                np.testing.assert_allclose(eigenvalues, self.reference[:num_modes], rtol=1e-8)
+
+                # mass normalised and satisfy the eigenvalue problem
+                np.testing.assert_allclose(eigenvectors.T.dot(self.M.dot(eigenvectors)), np.eye(num_modes),
+                                           atol=1e-8)
+                np.testing.assert_allclose(self.K.dot(eigenvectors), self.M.dot(eigenvectors) * eigenvalues,
+                                           rtol=1e-6, atol=1e-6 * np.max(eigenvalues))
+
+    def test_all_modes(self):
+        # sparse solver cannot compute all the modes, dense fallback is used
+        eigenvalues, _ = modalutils.undamped_modes(self.M, self.K, self.M.shape[0])
+        np.testing.assert_allclose(eigenvalues, self.reference, rtol=1e-8)
+
+    def test_is_symmetric(self):
+        self.assertTrue(modalutils.is_symmetric(self.K))
+        K = self.K.copy()
+        K[0, 1] += 1.
+        self.assertFalse(modalutils.is_symmetric(K))
+
+
+if __name__ == '__main__':
+    unittest.main()